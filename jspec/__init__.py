@@ -4,6 +4,23 @@
 from . import scanner
 from . import matcher
 from . import entity
+from . import cache
+from . import macro
+from . import placeholder
+from . import limits
+from . import collect
+from . import partial
+from . import registry
+from . import fused
+from . import tiered
+from . import plan
+from . import fuzz
+from . import generator
+from . import risk
+from . import validator
+from . import path
+from . import incremental
+from . import instrument
 
 __version__ = "2.1.4"
 
@@ -17,10 +34,10 @@ def _encode(spec):
         raise TypeError("Expecting a JSPEC not %s" % spec.__class__) 
     return str(spec)
 
-def _match(spec, element):
+def _match(spec, element, cache=None, macros=None, limits=None):
     if not isinstance(spec, entity.JSPEC):
         raise TypeError("Expecting a JSPEC not %s" % spec.__class__) 
-    return matcher.match(spec, element)
+    return tiered.match(spec, element, cache=cache, macros=macros, limits=limits)
 
 def load(file, pretty=False, indent=None):
     """Loads the file ``file`` as a JSPEC.
@@ -91,13 +108,21 @@ def dumps(spec):
     """
     return _encode(spec)
 
-def check(spec, element):
+def check(spec, element, cache=None, macros=None, limits=None):
     """Determine if the Python native JSON object ``element`` is a good match
     for the JSPEC ``spec``.
 
     Args:
         spec (jspec.JSPEC): The JSPEC instance to attempt to match.
         element (obj): The Python native JSON object to attempt to match.
+        cache (jspec.cache.SubtreeCache): Optional. A cache of results for
+            large JSON subtrees, which can be shared between checks against
+            ``spec`` so repeated subtrees are only matched once.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros. None
+            means macros are resolved from the environment variables.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for the check. None means the check is unlimited.
 
     Returns:
         bool: Whether ``element`` is a good match for ``spec``.
@@ -106,8 +131,237 @@ def check(spec, element):
     Raises:
         TypeError: If the input for ``spec`` is not a jspec.JSPEC.
         ValueError: If ``spec`` contains any unsupported classes
+        jspec.limits.JSPECLimitError: If the check exceeds any of ``limits``.
     """
-    return _match(spec, element)
+    return _match(spec, element, cache=cache, macros=macros, limits=limits)
+
+def check_all(spec, element, max_errors=None, cache=None, macros=None, limits=None):
+    """Collect every failure of the Python native JSON object ``element`` to
+    match the JSPEC ``spec``, in a single pass.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to attempt to match.
+        element (obj): The Python native JSON object to attempt to match.
+        max_errors (int): Optional. The maximum number of failures to collect.
+            None means every failure is collected.
+        cache (jspec.cache.SubtreeCache): Optional. A cache of results for
+            large JSON subtrees.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for the check.
+
+    Returns:
+        list: The failures, each a ``jspec.collect.Failure`` with a location
+            and reason, which is empty if ``element`` is a good match.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+        ValueError: If ``spec`` contains any unsupported classes
+        jspec.limits.JSPECLimitError: If the check exceeds any of ``limits``.
+    """
+    if not isinstance(spec, entity.JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return collect.collect(spec, element, max_errors=max_errors, cache=cache, macros=macros, limits=limits)
+
+def extract(spec, element, macros=None, limits=None):
+    """Determine if the Python native JSON object ``element`` is a good match
+    for the JSPEC ``spec``, and extract the elements bound by the named terms
+    of ``spec``, e.g. ``{"id": @id int}``, in the same pass.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to attempt to match.
+        element (obj): The Python native JSON object to attempt to match.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for the check.
+
+    Returns:
+        bool: Whether ``element`` is a good match for ``spec``.
+        str: If it was a bad match, the reason why the match failed.
+        dict: If it was a good match, the element bound to each name. A name
+            bound more than once is bound to the last element matched.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+        ValueError: If ``spec`` contains any unsupported classes
+        jspec.limits.JSPECLimitError: If the check exceeds any of ``limits``.
+    """
+    if not isinstance(spec, entity.JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return matcher.extract(spec, element, macros=macros, limits=limits)
+
+def check_paths(spec, element, selectors, cache=None, macros=None, limits=None):
+    """Determine if the parts of the Python native JSON object ``element``
+    selected by ``selectors`` are a good match for the parts of the JSPEC
+    ``spec`` they are bound to. The rest of ``element`` is not checked.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to attempt to match.
+        element (obj): The Python native JSON object to attempt to match.
+        selectors (list): JSONPath-like selectors, e.g. ['$.order.items',
+            '$.customer'], see ``jspec.path.parse_selector``.
+        cache (jspec.cache.SubtreeCache): Optional. A cache of results for
+            large JSON subtrees.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for the check.
+
+    Returns:
+        bool: Whether the selected parts of ``element`` are a good match.
+        str: If it was a bad match, the reason why the match failed.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+        ValueError: If a selector is invalid, or does not select a part of
+            ``spec`` which every good match must match.
+        jspec.limits.JSPECLimitError: If the check exceeds any of ``limits``.
+    """
+    if not isinstance(spec, entity.JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return partial.match(spec, element, selectors, cache=cache, macros=macros, limits=limits)
+
+def check_many(specs, element, cache=None, macros=None, limits=None):
+    """Checks the Python native JSON object ``element`` against each of the
+    JSPECs ``specs``, walking ``element`` once.
+
+    Args:
+        specs (list): The jspec.JSPEC instances to attempt to match.
+        element (obj): The Python native JSON object to attempt to match.
+        cache (jspec.cache.SubtreeCache): Optional. A cache of results for
+            large JSON subtrees.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for all of the checks together.
+
+    Returns:
+        list: For each JSPEC in ``specs``, a tuple of whether ``element`` is a
+            good match, and if it was a bad match, the reason why the match
+            failed, as returned by ``check``.
+
+    Raises:
+        TypeError: If any of ``specs`` is not a jspec.JSPEC.
+        jspec.limits.JSPECLimitError: If the checks exceed any of ``limits``.
+    """
+    for spec in specs:
+        if not isinstance(spec, entity.JSPEC):
+            raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return fused.match(specs, element, cache=cache, macros=macros, limits=limits)
+
+def explain(spec):
+    """Explains how the JSPEC ``spec`` is matched, like the plan of a SQL
+    query. The string of the returned plan is a report with a line for each
+    JSPEC term, showing its matching strategy, what is known about the
+    elements it matches, and an estimate of its worst-case cost.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to explain.
+
+    Returns:
+        jspec.plan.Plan: The plan for ``spec``, with the worst-case estimate
+            and warnings about JSPEC terms which may take more than linear time.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+    """
+    if not isinstance(spec, entity.JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return plan.plan(spec)
+
+def analyze(spec):
+    """Finds the parts of the JSPEC ``spec`` which can make matching slow,
+    such as array captures which overlap the JSPEC terms after them, or
+    object captures with regex keys, without matching any JSON.
+
+    Args:
+        spec (str/jspec.JSPEC): The JSPEC document, or a JSPEC instance which
+            is analyzed as its serialization.
+
+    Returns:
+        jspec.risk.Analysis: The findings for ``spec``, each with a severity,
+            an estimate of its worst-case complexity and its line and column
+            in the JSPEC document, and the worst case of all of them.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a string or a jspec.JSPEC.
+        jspec.JSPECDecodeError: Any error with decoding ``spec`` as a JSPEC.
+    """
+    if not isinstance(spec, (str, entity.JSPEC)):
+        raise TypeError("Expecting a string or a JSPEC not %s" % spec.__class__)
+    return risk.analyze(spec)
+
+def generate(spec, n, seed=None, macros=None, verify=True):
+    """Generates ``n`` random JSONs which are good matches for the JSPEC
+    ``spec``, e.g. to build a corpus for benchmarks. Capture multipliers,
+    placeholder inequalities, ellipses and a common subset of regexes are
+    honoured.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to generate JSONs for.
+        n (int): The number of JSONs to generate.
+        seed (int): Optional. The seed for the random choices, the same seed
+            generates the same JSONs.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros. None
+            means macros are resolved from the environment variables.
+        verify (bool): Optional. Default is True, if False the JSONs are not
+            checked against ``spec``, which is faster for JSPECs whose JSONs
+            take many steps to check.
+
+    Returns:
+        iterator: The Python native JSON objects, generated as they are
+            iterated over.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+        jspec.generator.JSPECGenerateError: If a JSON can not be generated,
+            e.g. for an unsupported regex or a missing macro.
+    """
+    if not isinstance(spec, entity.JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return generator.generate(spec, n, seed=seed, macros=macros, verify=verify)
+
+def compile(spec, cache=None, payload_cache=None, macros=None, macros_per_check=False, limits=None, hooks=None):
+    """Returns a validator for the JSPEC ``spec``, which can be used to check
+    many JSONs against ``spec``.
+
+    Args:
+        spec (jspec.JSPEC): The JSPEC instance to be checked against.
+        cache (jspec.cache.SubtreeCache): Optional. A cache of results for
+            large JSON subtrees.
+        payload_cache (jspec.cache.PayloadCache): Optional. A cache of results
+            for serialized JSON payloads, used by ``Validator.check_json``.
+        macros (jspec.macro.MacroResolver/dict/callable): Optional. The
+            resolver, or the source of the values, for JSPEC macros. None
+            means macros are resolved from the environment variables.
+        macros_per_check (bool): Optional. Default is False, if True JSPEC
+            macros are resolved for every check rather than once for the
+            validator.
+        limits (jspec.limits.Limits): Optional. The limits on the steps, time
+            and JSON sizes for each check. None means checks are unlimited.
+        hooks (jspec.instrument.Hooks): Optional. The instrumentation hooks
+            called before and after each JSPEC term is matched, e.g. a
+            ``jspec.instrument.Profile``. None means the hooks installed with
+            ``jspec.instrument.install`` are used, if any.
+
+    Returns:
+        jspec.validator.Validator: The validator for ``spec``.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a jspec.JSPEC.
+    """
+    return validator.Validator(
+        spec,
+        cache=cache,
+        payload_cache=payload_cache,
+        macros=macros,
+        macros_per_check=macros_per_check,
+        limits=limits,
+        hooks=hooks,
+    )
 
 def checks(document, element):
     """Determine if the Python native JSON object ``element`` is a good match
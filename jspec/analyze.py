@@ -0,0 +1,75 @@
+"""Command-line tool to find the parts of JSPEC documents which can make
+matching slow, for running on every change to the JSPEC documents.
+
+Usage:
+
+    $ python3 -m jspec.analyze <jspec_file> [<jspec_file> ...]
+
+    -- Analyze a JSPEC file
+    $ python3 -m jspec.analyze ./specs/event.jspec
+    ./specs/event.jspec:3:5: medium O(n^2) at $.items - 1 unbounded array capture(s) can match the same JSON elements as the JSPEC terms after them, so a failing match tries every split of the JSON array between them
+    ./specs/event.jspec: worst case O(n^2)
+
+    The flag --raw-jspec can also be used to give the raw JSPEC document
+    instead of file paths. The exit code is 1 if there are any findings with
+    a severity of at least the --fail-on severity, which is 'medium' by
+    default.
+"""
+
+def main():
+    import argparse
+    import jspec
+
+    prog = 'python3 -m jspec.analyze'
+    description = ('A simple command line tool to find the parts of JSPEC documents which can make matching slow')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        'jspec_files',
+        nargs='*',
+        type=argparse.FileType(encoding="utf-8"),
+        help='the JSPEC files to be analyzed'
+    )
+    parser.add_argument(
+        '--raw-jspec',
+        dest='jspec_raw',
+        default=None,
+        help='raw JSPEC document, if none is provided in the other args'
+    )
+    parser.add_argument(
+        '--fail-on',
+        dest='fail_on',
+        choices=jspec.risk.SEVERITIES,
+        default='medium',
+        help='the least severity of a finding which fails the analysis'
+    )
+    options = parser.parse_args()
+
+    if options.jspec_files:
+        documents = [(file.name, file.read()) for file in options.jspec_files]
+    elif options.jspec_raw is not None:
+        documents = [('<raw-jspec>', options.jspec_raw)]
+    else:
+        raise SystemExit("The --raw-jspec flag value is not a valid JSPEC")
+
+    failed = False
+    for name, document in documents:
+        try:
+            analysis = jspec.analyze(document)
+        except jspec.scanner.JSPECDecodeError as exc:
+            raise SystemExit("%s: %s" % (name, exc))
+        for finding in analysis.findings:
+            sys.stdout.write("%s:%d:%d: %s %s at %s - %s\n" % (
+                name, finding.line, finding.column, finding.severity,
+                finding.complexity, finding.loc, finding.msg,
+            ))
+        sys.stdout.write("%s: worst case %s\n" % (name, analysis.complexity))
+        failed = failed or bool(analysis.at_least(options.fail_on))
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -0,0 +1,19 @@
+"""Benchmarks for the jspec module, to spot performance regressions in the
+scanner, the matcher and pretty printing.
+
+The benchmark cases are in ``jspec.bench.cases``, and are run, summarized
+and compared against a saved baseline with ``jspec.bench.runner``. The
+memory cases, for the memory held by loaded JSPECs and allocated while
+matching, are in ``jspec.bench.memory``, and the scaling cases, for the
+growth of the time with the size of the input, are in
+``jspec.bench.scaling``. From the command line, use ``python3 -m jspec.bench``.
+The throughput and the latency percentiles of checks under concurrent load
+are measured with ``jspec.bench.load``, from the command line with
+``python3 -m jspec.loadtest``.
+"""
+
+from . import runner
+from . import cases
+from . import memory
+from . import scaling
+from . import load
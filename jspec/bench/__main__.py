@@ -0,0 +1,123 @@
+"""Command-line tool to run the benchmarks for the jspec module.
+
+Usage:
+
+    $ python3 -m jspec.bench [<case> ...]
+
+    -- Run the scanner benchmarks, saving the results as a baseline
+    $ python3 -m jspec.bench scan --output baseline.json
+    case	median	spread	number
+    scan.huge.plain	0.00912	0.00011	10
+    ...
+
+    -- Compare the benchmarks against the baseline
+    $ python3 -m jspec.bench scan --baseline baseline.json --threshold 0.1
+    case	median	spread	number	change
+    scan.huge.plain	0.00905	0.00009	10	-0.8%
+    ...
+
+    Cases are given by name or by the prefix of their names, e.g. 'match' or
+    'match.array', and --list prints the case names. With --baseline, the exit
+    code is 1 if the median of any case exceeds its baseline median by more
+    than the --threshold fraction.
+
+    -- Measure the memory held by loaded JSPECs and allocated while matching
+    $ python3 -m jspec.bench --memory load --output memory.json
+    case	median	spread	number
+    load.huge	301384	0	1
+    ...
+
+    With --memory, the memory cases are run instead, in bytes, and are
+    compared against a baseline in the same way.
+
+    -- Check the time of the matcher grows no faster than its bound
+    $ python3 -m jspec.bench --scaling match.object
+    case	exponent	bound
+    match.object.capture	1.02	1.50
+    ...
+
+    With --scaling, the scaling cases are timed at increasing sizes instead,
+    and the exit code is 1 if the fitted growth exponent of any case exceeds
+    its bound.
+"""
+
+def main():
+    import argparse
+    from jspec.bench import cases
+    from jspec.bench import memory
+    from jspec.bench import runner
+    from jspec.bench import scaling
+
+    prog = 'python3 -m jspec.bench'
+    description = ('A simple command line tool to run the benchmarks for the jspec module')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument('names', nargs='*', help='the names, or prefixes of the names, of the cases to run')
+    parser.add_argument('--list', action='store_true', help='print the case names and exit')
+    parser.add_argument('--memory', action='store_true', help='run the memory cases instead of the timing cases')
+    parser.add_argument('--scaling', action='store_true', help='run the scaling cases instead of the timing cases')
+    parser.add_argument('--repeat', type=int, default=None, help='the number of times each case is measured')
+    parser.add_argument('--min-time', type=float, default=runner.MIN_TIME, help='the least seconds for each repeat')
+    parser.add_argument('--number', type=int, default=None, help='the number of calls for each repeat')
+    parser.add_argument('--output', type=argparse.FileType('w', encoding="utf-8"), default=None, help='the file to write the JSON results to')
+    parser.add_argument('--baseline', type=argparse.FileType(encoding="utf-8"), default=None, help='the JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=runner.THRESHOLD, help='the fraction of the baseline which is a regression')
+    options = parser.parse_args()
+
+    if options.memory and options.scaling:
+        parser.error("--memory and --scaling cannot be used together")
+    if options.scaling and (options.output or options.baseline):
+        parser.error("--output and --baseline cannot be used with --scaling")
+
+    suite = memory.CASES if options.memory else scaling.CASES if options.scaling else cases.CASES
+    if options.list:
+        sys.stdout.write("".join("%s\n" % name for name in sorted(suite)))
+        return
+    unknown = [n for n in options.names if not any(c == n or c.startswith(n + ".") for c in suite)]
+    if unknown:
+        raise SystemExit("Unknown benchmark case(s): %s" % ", ".join(unknown))
+
+    if options.scaling:
+        growths = scaling.run(names=options.names, repeat=options.repeat or scaling.REPEAT)
+        sys.stdout.write('case\texponent\tbound\n')
+        for growth in growths:
+            sys.stdout.write('%s\t%.2f\t%.2f\n' % (growth.name, growth.exponent, growth.bound))
+        if any(growth.exceeded() for growth in growths):
+            raise SystemExit(1)
+        return
+
+    baseline = runner.load(options.baseline) if options.baseline else None
+    if options.memory:
+        results = memory.run(names=options.names, repeat=options.repeat or runner.REPEAT)
+    else:
+        results = runner.run(
+            cases.CASES,
+            names=options.names,
+            repeat=options.repeat or runner.REPEAT,
+            min_time=options.min_time,
+            number=options.number,
+        )
+    if options.output:
+        runner.save(results, options.output)
+
+    # Bytes are whole numbers, seconds are shown to 6 significant figures
+    value = '%d' if options.memory else '%.6g'
+    row = '%s\t' + value + '\t' + value + '\t%d'
+    if baseline is None:
+        sys.stdout.write('case\tmedian\tspread\tnumber\n')
+        for result in results:
+            sys.stdout.write(row % (result.name, result.median, result.spread, result.number) + '\n')
+        return
+    changes = dict((change.name, change) for change in runner.compare(results, baseline, options.threshold))
+    sys.stdout.write('case\tmedian\tspread\tnumber\tchange\n')
+    for result in results:
+        change = changes[result.name]
+        sys.stdout.write(row % (result.name, result.median, result.spread, result.number) + '\t%s\n' % change.describe())
+    if any(change.regressed() for change in changes.values()):
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -0,0 +1,192 @@
+"""The benchmark cases for the jspec module.
+
+Each case is a function which sets up the JSPEC and the JSON, outside of the
+timing, and returns the function to be timed. Cases are named by what they
+exercise, e.g. ``scan.*`` for the scanner, ``match.*`` for the matcher and
+``fail.*`` for the messages of bad matches, so a group of cases can be run
+by its prefix.
+
+The ``match.*`` and ``fail.*`` cases use ``jspec.matcher.match`` directly,
+so they time the matcher itself rather than the compiled tier which
+``jspec.check`` moves a JSPEC to after many checks.
+"""
+
+import jspec
+from jspec import matcher
+from jspec import tiered
+
+WIDTH = 200
+"""int: The number of pairs in the wide objects."""
+
+LENGTH = 500
+"""int: The number of elements in the long arrays."""
+
+DEPTH = 100
+"""int: The number of levels in the deeply nested JSPECs and JSONs."""
+
+UNION = 40
+"""int: The number of alternatives in the discriminated unions."""
+
+CASES = dict()
+"""dict: The function to set up each benchmark case, for each case name."""
+
+SMALL_JSPEC = """{
+    // An event from a device
+    "id": <MY_ID>,
+    "timestamp": number,
+    "kind": ("click" | "view"),
+    "data": [
+        (
+            {
+                "longitude": real,
+                "latitude": real
+            }
+        )x?
+    ],
+    ...
+}"""
+
+def case(name):
+    """Returns a decorator which registers the function as the benchmark
+    case ``name``."""
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+def huge_jspec():
+    """Returns a JSPEC document with ``WIDTH`` pairs of many kinds of term."""
+    terms = (
+        'int', 'real > 0.5', 'string', '"[a-z]+[0-9]*"', 'bool', 'null',
+        '[(int)x?]', '{"a": int, ...}', '(int | string)', '!null', 'uuid',
+    )
+    pairs = ['    // Pair %d\n    "key%d": %s' % (i, i, terms[i % len(terms)]) for i in range(WIDTH)]
+    return "{\n%s\n}" % ",\n".join(pairs)
+
+def union_jspec(alternatives):
+    """Returns a JSPEC document of a discriminated union of ``alternatives``
+    objects, told apart by the value of their "type" pair."""
+    return "(%s)" % " | ".join('{"type": "kind%d", "value%d": int, ...}' % (i, i) for i in range(alternatives))
+
+def union_json(alternatives):
+    """Returns a JSON matching the last alternative of ``union_jspec``."""
+    last = alternatives - 1
+    return {"type": "kind%d" % last, "value%d" % last: last, "extra": True}
+
+def nested_jspec(depth):
+    """Returns a JSPEC document of objects nested ``depth`` levels deep."""
+    return '{"a": ' * depth + 'int' + '}' * depth
+
+def nested_json(depth, leaf):
+    """Returns a JSON of objects nested ``depth`` levels deep around ``leaf``."""
+    element = leaf
+    for _ in range(depth):
+        element = {"a": element}
+    return element
+
+def wide_json(width):
+    """Returns a JSON object with ``width`` pairs of int values."""
+    return dict(("key%d" % i, i) for i in range(width))
+
+def wide_jspec(width):
+    """Returns a JSPEC document for the JSON objects of ``wide_json``."""
+    return "{%s}" % ", ".join('"key%d": int' % i for i in range(width))
+
+def _match(spec, element):
+    return lambda: matcher.match(spec, element)
+
+@case("scan.small.plain")
+def scan_small_plain():
+    return lambda: jspec.loads(SMALL_JSPEC)
+
+@case("scan.small.pretty")
+def scan_small_pretty():
+    return lambda: jspec.loads(SMALL_JSPEC, pretty=True)
+
+@case("scan.huge.plain")
+def scan_huge_plain():
+    document = huge_jspec()
+    return lambda: jspec.loads(document)
+
+@case("scan.huge.pretty")
+def scan_huge_pretty():
+    document = huge_jspec()
+    return lambda: jspec.loads(document, pretty=True)
+
+@case("match.object.wide")
+def match_object_wide():
+    return _match(jspec.loads(wide_jspec(WIDTH)), wide_json(WIDTH))
+
+@case("match.object.capture")
+def match_object_capture():
+    return _match(jspec.loads('{("key[0-9]+": int)x?}'), wide_json(WIDTH))
+
+@case("match.object.ellipsis")
+def match_object_ellipsis():
+    return _match(jspec.loads('{"key0": int, "key1": int, ...}'), wide_json(WIDTH))
+
+@case("match.array.long")
+def match_array_long():
+    return _match(jspec.loads('[%s]' % ", ".join(["int"] * LENGTH)), list(range(LENGTH)))
+
+@case("match.array.capture")
+def match_array_capture():
+    return _match(jspec.loads('[(int)x?]'), list(range(LENGTH)))
+
+@case("match.array.captures")
+def match_array_captures():
+    element = list(range(LENGTH // 2)) + ["x"] * (LENGTH // 2)
+    return _match(jspec.loads('[(int)x?, (string)x?]'), element)
+
+@case("match.nested.deep")
+def match_nested_deep():
+    return _match(jspec.loads(nested_jspec(DEPTH)), nested_json(DEPTH, 1))
+
+@case("match.string.format")
+def match_string_format():
+    element = ["123e4567-e89b-12d3-a456-426614174000"] * LENGTH
+    return _match(jspec.loads('[(uuid)x?]'), element)
+
+@case("match.string.regex")
+def match_string_regex():
+    element = ["123e4567-e89b-12d3-a456-426614174000"] * LENGTH
+    regex = "[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    return _match(jspec.loads('[("%s")x?]' % regex), element)
+
+@case("match.compiled.wide")
+def match_compiled_wide():
+    spec = jspec.loads(wide_jspec(WIDTH))
+    tiered.force(spec, tiered.COMPILED)
+    element = wide_json(WIDTH)
+    return lambda: jspec.check(spec, element)
+
+@case("match.union.interpreted")
+def match_union_interpreted():
+    return _match(jspec.loads(union_jspec(UNION)), union_json(UNION))
+
+@case("match.union.compiled")
+def match_union_compiled():
+    spec = jspec.loads(union_jspec(UNION))
+    tiered.force(spec, tiered.COMPILED)
+    element = union_json(UNION)
+    return lambda: jspec.check(spec, element)
+
+@case("fail.object.missing")
+def fail_object_missing():
+    element = wide_json(WIDTH)
+    del element["key%d" % (WIDTH - 1)]
+    return _match(jspec.loads(wide_jspec(WIDTH)), element)
+
+@case("fail.array.last")
+def fail_array_last():
+    return _match(jspec.loads('[(int)x?, null]'), list(range(LENGTH)) + ["x"])
+
+@case("fail.nested.deep")
+def fail_nested_deep():
+    return _match(jspec.loads(nested_jspec(DEPTH)), nested_json(DEPTH, "x"))
+
+@case("fail.check_all")
+def fail_check_all():
+    spec = jspec.loads(wide_jspec(WIDTH))
+    element = dict((key, str(value)) for key, value in wide_json(WIDTH).items())
+    return lambda: jspec.check_all(spec, element)
@@ -0,0 +1,323 @@
+"""Measures the throughput and the latency of checks under concurrent load.
+
+A load run checks a corpus of JSONs against a JSPEC from many workers at once,
+either threads sharing one JSPEC, which shows any contention and the effect
+of the GIL on the matcher, or processes with a JSPEC each. Every worker first
+warms up with ``WARMUP`` checks, then all workers start together and check
+the corpus over and over for ``duration`` seconds, recording the latency of
+each check in a ``Histogram``.
+
+The histogram is in the style of an HDR histogram: latencies are recorded in
+nanoseconds into buckets whose width grows with the latency, so any latency
+is known to ``significant`` decimal digits while the number of buckets only
+grows with the logarithm of the range. The histograms of the workers are
+merged, and a load run is summarized by its throughput and the latency
+``PERCENTILES``.
+"""
+
+import math
+import queue
+import threading
+import time
+import multiprocessing
+
+import jspec
+from .. import tiered
+
+THREAD = "thread"
+"""str: The mode for workers which are threads sharing one JSPEC."""
+
+PROCESS = "process"
+"""str: The mode for workers which are processes with a JSPEC each."""
+
+MODES = (THREAD, PROCESS)
+"""tuple: The modes of the workers of a load run."""
+
+CHECK = "check"
+"""str: The engine which checks with ``jspec.check``."""
+
+VALIDATOR = "validator"
+"""str: The engine which checks with a validator from ``jspec.compile``."""
+
+ENGINES = (CHECK, VALIDATOR)
+"""tuple: The engines a load run can check with."""
+
+WORKERS = (1, 2, 4, 8)
+"""tuple: The default numbers of workers to run the load with."""
+
+DURATION = 1.0
+"""float: The default number of seconds each load run checks for."""
+
+WARMUP = 2 * tiered.THRESHOLD
+"""int: The number of checks each worker makes before it is measured, enough
+for ``jspec.check`` to move the JSPEC to the compiled tier."""
+
+SIGNIFICANT = 2
+"""int: The default number of significant decimal digits of a histogram."""
+
+PERCENTILES = (50, 95, 99, 99.9)
+"""tuple: The latency percentiles which summarize a load run."""
+
+class Histogram:
+    """Class for an HDR style histogram of latencies in nanoseconds.
+
+    Attributes:
+        significant (int): The number of significant decimal digits each
+            recorded value is known to
+        counts (dict): The number of values recorded in each bucket, by the
+            lowest value of the bucket
+        count (int): The number of values recorded
+        total (int): The sum of the values recorded
+        min (int): The least value recorded, None if there are none
+        max (int): The greatest value recorded, None if there are none
+    """
+
+    def __init__(self, significant=SIGNIFICANT):
+        self.significant = significant
+        self.counts = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        # Values below 2 ** bits each have a bucket of their own, and above it
+        # the buckets of each power of 2 are 2 ** (bits - 1) wide
+        self._bits = int(math.ceil(math.log2(2 * 10 ** significant)))
+
+    def __repr__(self):
+        return "Histogram(count=%d, p50=%s, max=%s)" % (self.count, self.percentile(50), self.max)
+
+    def record(self, value, count=1):
+        """Records the non-negative int ``value``, ``count`` times."""
+        key = self._lowest(value)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Adds the values recorded in the histogram ``other``, which has the
+        same number of significant digits."""
+        if other.significant != self.significant:
+            raise ValueError("Cannot merge histograms of %d and %d significant digits" % (self.significant, other.significant))
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def mean(self):
+        """Returns the mean of the values recorded, None if there are none."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """Returns the value below which ``percent`` percent of the values
+        recorded fall, as the highest value of its bucket, or None if there
+        are none."""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(percent / 100 * self.count)))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(self._highest(key), self.max)
+        return self.max
+
+    def as_dict(self):
+        """Returns the histogram as a JSON serializable dict."""
+        return {
+            "significant": self.significant,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean(),
+            "counts": [[key, count] for key, count in sorted(self.counts.items())],
+        }
+
+    def _lowest(self, value):
+        shift = max(value.bit_length() - self._bits, 0)
+        return (value >> shift) << shift
+
+    def _highest(self, key):
+        shift = max(key.bit_length() - self._bits, 0)
+        return key + (1 << shift) - 1
+
+class LoadResult:
+    """Class for the summary of a load run.
+
+    Attributes:
+        workers (int): The number of workers
+        mode (str): Whether the workers were threads or processes
+        engine (str): The engine the workers checked with
+        calls (int): The number of checks made by all the workers
+        elapsed (float): The most seconds any worker checked for, from the
+            start of all the workers
+        histogram (Histogram): The latencies of the checks of all the workers
+    """
+
+    def __init__(self, workers, mode, engine, calls, elapsed, histogram):
+        self.workers = workers
+        self.mode = mode
+        self.engine = engine
+        self.calls = calls
+        self.elapsed = elapsed
+        self.histogram = histogram
+
+    def __repr__(self):
+        return "LoadResult(workers=%d, throughput=%.1f/s, p99=%sns)" % (self.workers, self.throughput, self.histogram.percentile(99))
+
+    @property
+    def throughput(self):
+        """float: The number of checks per second by all the workers."""
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+    def percentiles(self):
+        """Returns the latency in nanoseconds for each of ``PERCENTILES``."""
+        return dict((percent, self.histogram.percentile(percent)) for percent in PERCENTILES)
+
+    def as_dict(self):
+        """Returns the result as a JSON serializable dict."""
+        return {
+            "workers": self.workers,
+            "mode": self.mode,
+            "engine": self.engine,
+            "calls": self.calls,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "percentiles": dict((label(percent), value) for percent, value in self.percentiles().items()),
+            "histogram": self.histogram.as_dict(),
+        }
+
+def label(percent):
+    """Returns the label of a percentile, e.g. "p99" for 99 and "p999" for
+    99.9."""
+    return "p%s" % ("%g" % percent).replace(".", "")
+
+def measure(document, corpus, workers, mode=THREAD, engine=CHECK, duration=DURATION, significant=SIGNIFICANT):
+    """Checks the corpus against the JSPEC from many workers at once.
+
+    Args:
+        document (str): The JSPEC document
+        corpus (list): The Python native objects representing the JSONs to
+            check, over and over
+        workers (int): The number of workers
+        mode (str, optional): Whether the workers are ``THREAD`` or
+            ``PROCESS``
+        engine (str, optional): Whether the workers check with ``CHECK`` or
+            ``VALIDATOR``
+        duration (float, optional): The number of seconds each worker checks
+            for
+        significant (int, optional): The number of significant decimal digits
+            of the latency histogram
+
+    Returns:
+        LoadResult: The number of checks and their latencies.
+
+    Raises:
+        ValueError: If the mode, the engine or the corpus are not valid.
+        JSPECDecodeError: Raised if the JSPEC document is not valid.
+        RuntimeError: If a check fails with an error in any worker.
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown load mode '%s'" % mode)
+    if engine not in ENGINES:
+        raise ValueError("Unknown load engine '%s'" % engine)
+    if not corpus:
+        raise ValueError("Expecting at least one JSON in the corpus")
+    # The threads share one JSPEC, as a server checking requests would, and
+    # the processes each scan the document again
+    spec = jspec.loads(document)
+    if mode == THREAD:
+        barrier, results = threading.Barrier(workers), queue.Queue()
+        start = lambda args: threading.Thread(target=_work, args=args)
+    else:
+        context = multiprocessing.get_context()
+        spec = document
+        barrier, results = context.Barrier(workers), context.Queue()
+        start = lambda args: context.Process(target=_work, args=args)
+    runners = [start((spec, corpus, engine, duration, significant, barrier, results)) for _ in range(workers)]
+    for runner in runners:
+        runner.start()
+    # Every worker puts exactly one result, which is taken before joining so
+    # no process blocks on a full queue
+    outcomes = [results.get() for _ in runners]
+    for runner in runners:
+        runner.join()
+    errors = [outcome for outcome in outcomes if isinstance(outcome, str)]
+    if errors:
+        raise RuntimeError("Load worker failed: %s" % errors[0])
+    histogram = Histogram(significant)
+    for _, _, worker_histogram in outcomes:
+        histogram.merge(worker_histogram)
+    calls = sum(calls for calls, _, _ in outcomes)
+    elapsed = max(elapsed for _, elapsed, _ in outcomes)
+    return LoadResult(workers, mode, engine, calls, elapsed, histogram)
+
+def run(document, corpus, workers=WORKERS, mode=THREAD, engine=CHECK, duration=DURATION, significant=SIGNIFICANT):
+    """Runs the load with each number of workers, to show how the throughput
+    and the latency scale with the number of workers.
+
+    Args:
+        document (str): The JSPEC document
+        corpus (list): The Python native objects representing the JSONs to
+            check, over and over
+        workers (list, optional): The numbers of workers
+        mode (str, optional): Whether the workers are ``THREAD`` or
+            ``PROCESS``
+        engine (str, optional): Whether the workers check with ``CHECK`` or
+            ``VALIDATOR``
+        duration (float, optional): The number of seconds each load run
+            checks for
+        significant (int, optional): The number of significant decimal digits
+            of the latency histograms
+
+    Returns:
+        list: The LoadResult for each number of workers, in order.
+    """
+    return [
+        measure(document, corpus, n, mode=mode, engine=engine, duration=duration, significant=significant)
+        for n in workers
+    ]
+
+def _engine(spec, engine):
+    if engine == VALIDATOR:
+        return jspec.compile(spec).check
+    return lambda element: jspec.check(spec, element)
+
+def _work(spec, corpus, engine, duration, significant, barrier, results):
+    try:
+        if isinstance(spec, str):
+            spec = jspec.loads(spec)
+        check = _engine(spec, engine)
+        for i in range(WARMUP):
+            check(corpus[i % len(corpus)])
+    except Exception as exc:
+        barrier.abort()
+        results.put("%s: %s" % (exc.__class__.__name__, exc))
+        return
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        results.put("another worker failed to start")
+        return
+    histogram = Histogram(significant)
+    calls = 0
+    clock = time.perf_counter
+    start = clock()
+    deadline = start + duration
+    try:
+        while True:
+            for element in corpus:
+                before = clock()
+                check(element)
+                after = clock()
+                histogram.record(int((after - before) * 1e9))
+                calls += 1
+                if after >= deadline:
+                    results.put((calls, after - start, histogram))
+                    return
+    except Exception as exc:
+        results.put("%s: %s" % (exc.__class__.__name__, exc))
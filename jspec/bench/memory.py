@@ -0,0 +1,239 @@
+"""Measures the memory held by loaded JSPECs and allocated while matching,
+with ``tracemalloc``.
+
+The footprint of a JSPEC is the memory still allocated once its document has
+been loaded, and is broken down by the class of each JSPEC entity: the
+objects reachable from a JSPEC entity, which were allocated while loading and
+are not reached through another JSPEC entity first, count towards its class.
+The part of the footprint which is not found this way, e.g. the storage of
+the attributes of instances, counts towards ``OTHER``.
+
+The peak of a match is the most memory allocated at once while checking a
+JSON, above the memory allocated before the check.
+
+The memory cases are summarized as ``jspec.bench.runner.Result`` instances
+in bytes, so they are saved, loaded and compared against a baseline the same
+way as the timing cases.
+"""
+
+import gc
+import sys
+import tracemalloc
+import types
+
+import jspec
+from jspec import entity
+from jspec import matcher
+from . import cases
+from . import runner
+
+REPEAT = 3
+"""int: The default number of times each memory case is measured."""
+
+OTHER = "other"
+"""str: The name for the part of a footprint not found in any JSPEC entity."""
+
+SHARED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+"""tuple: The classes of objects which are never part of a footprint."""
+
+CASES = dict()
+"""dict: The function to set up each memory case, for each case name."""
+
+class Footprint:
+    """Class for the memory held by a loaded JSPEC.
+
+    Attributes:
+        size (int): The number of bytes still allocated after loading
+        classes (dict): The number of JSPEC entities and the number of bytes
+            for the name of each class of JSPEC entity, and ``OTHER``
+    """
+
+    def __init__(self, size, classes):
+        self.size = size
+        self.classes = classes
+
+    def __repr__(self):
+        return "Footprint(size=%d, entities=%d)" % (self.size, self.entities())
+
+    def entities(self):
+        """Returns the number of JSPEC entities."""
+        return sum(count for count, _ in self.classes.values())
+
+    def as_dict(self):
+        """Returns the footprint as a JSON serializable dict."""
+        return {
+            "size": self.size,
+            "classes": dict((name, {"count": count, "size": size}) for name, (count, size) in self.classes.items()),
+        }
+
+def footprint(document, pretty=False):
+    """Measures the memory held by the JSPEC loaded from ``document``.
+
+    Args:
+        document (str): The JSPEC document
+        pretty (bool, optional): Whether the JSPEC is loaded in pretty mode
+
+    Returns:
+        Footprint: The memory still allocated after loading, broken down by
+            the class of each JSPEC entity.
+    """
+    # Loading once first leaves the caches of the re module and the scanner
+    # warm, so they are not counted as part of the JSPEC
+    jspec.loads(document, pretty=pretty)
+    gc.collect()
+    started = _start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        spec = jspec.loads(document, pretty=pretty)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+        classes = _classes(spec)
+    finally:
+        _stop(started)
+    counted = sum(s for _, s in classes.values())
+    classes[OTHER] = (0, max(size - counted, 0))
+    return Footprint(size, classes)
+
+def peak(spec, element, check=None):
+    """Measures the most memory allocated at once while checking the JSON
+    ``element`` against the JSPEC ``spec``.
+
+    Args:
+        spec (JSPEC): The JSPEC to check against
+        element (obj): The Python native object representing a JSON
+        check (callable, optional): The function called with ``spec`` and
+            ``element``, ``jspec.matcher.match`` when omitted
+
+    Returns:
+        int: The peak number of bytes allocated during the check, above the
+            number allocated before it.
+
+    Note:
+        If ``tracemalloc`` is already tracing, its traces are cleared.
+    """
+    check = check or matcher.match
+    gc.collect()
+    started = _start()
+    try:
+        # Clearing the traces clears the peak of the previous measurement
+        tracemalloc.clear_traces()
+        before = tracemalloc.get_traced_memory()[0]
+        check(spec, element)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        _stop(started)
+
+def case(name):
+    """Returns a decorator which registers the function as the memory case
+    ``name``. The function returns a callable which measures the case, in
+    bytes, and may return a detail of the measurement as well."""
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+def run(names=None, repeat=REPEAT):
+    """Runs the memory cases.
+
+    Args:
+        names (list, optional): The names, or prefixes of the names, of the
+            cases to run, omit for every case
+        repeat (int, optional): The number of times each case is measured
+
+    Returns:
+        list: The Result for each case run, in bytes and in name order, with
+            the footprint of the ``load.*`` cases as its detail.
+    """
+    results = list()
+    for name in sorted(CASES):
+        if names and not any(name == n or name.startswith(n + ".") for n in names):
+            continue
+        func = CASES[name]()
+        values, detail = list(), None
+        for _ in range(repeat):
+            value, detail = func()
+            values.append(value)
+        results.append(runner.Result(name, values, unit="B", detail=detail))
+    return results
+
+def _start():
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start()
+    return True
+
+def _stop(started):
+    if started:
+        tracemalloc.stop()
+
+def _classes(spec):
+    classes = dict()
+    seen = set()
+    stack = [(spec.base, None)]
+    while stack:
+        obj, owner = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, entity.JSPECEntity):
+            owner = obj.__class__.__name__
+            count, size = classes.get(owner, (0, 0))
+            classes[owner] = (count + 1, size)
+        if owner is not None and tracemalloc.get_object_traceback(obj) is not None:
+            count, size = classes[owner]
+            classes[owner] = (count, size + sys.getsizeof(obj))
+        stack.extend((referent, owner) for referent in gc.get_referents(obj))
+    return classes
+
+def _footprint(document):
+    def measure():
+        result = footprint(document)
+        return result.size, result.as_dict()
+    return measure
+
+def _peak(spec, element, check=None):
+    return lambda: (peak(spec, element, check), None)
+
+@case("load.small")
+def load_small():
+    return _footprint(cases.SMALL_JSPEC)
+
+@case("load.huge")
+def load_huge():
+    return _footprint(cases.huge_jspec())
+
+@case("load.wide")
+def load_wide():
+    return _footprint(cases.wide_jspec(cases.WIDTH))
+
+@case("load.nested")
+def load_nested():
+    return _footprint(cases.nested_jspec(cases.DEPTH))
+
+@case("check.object.wide")
+def check_object_wide():
+    return _peak(jspec.loads(cases.wide_jspec(cases.WIDTH)), cases.wide_json(cases.WIDTH))
+
+@case("check.array.capture")
+def check_array_capture():
+    return _peak(jspec.loads('[(int)x?]'), list(range(cases.LENGTH)))
+
+@case("check.nested.deep")
+def check_nested_deep():
+    return _peak(jspec.loads(cases.nested_jspec(cases.DEPTH)), cases.nested_json(cases.DEPTH, 1))
+
+@case("check.compiled.wide")
+def check_compiled_wide():
+    spec = jspec.loads(cases.wide_jspec(cases.WIDTH))
+    jspec.tiered.force(spec, jspec.tiered.COMPILED)
+    return _peak(spec, cases.wide_json(cases.WIDTH), jspec.check)
+
+@case("fail.object.missing")
+def fail_object_missing():
+    element = cases.wide_json(cases.WIDTH)
+    del element["key%d" % (cases.WIDTH - 1)]
+    return _peak(jspec.loads(cases.wide_jspec(cases.WIDTH)), element)
+
+@case("fail.array.last")
+def fail_array_last():
+    return _peak(jspec.loads('[(int)x?, null]'), list(range(cases.LENGTH)) + ["x"])
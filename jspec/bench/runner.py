@@ -0,0 +1,231 @@
+"""Runs benchmark cases, summarizes their measurements and compares them
+against a saved baseline.
+
+Each case is timed ``repeat`` times, each time over ``number`` calls, where
+``number`` is calibrated so each repeat takes at least ``min_time`` seconds.
+A case is summarized by the median time per call and its spread, the
+interquartile range, which are stable over noisy repeats where the mean and
+the standard deviation are not. The memory cases of ``jspec.bench.memory``
+are summarized the same way, in bytes.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import time
+
+from .. import __version__
+
+REPEAT = 7
+"""int: The default number of times each case is timed."""
+
+MIN_TIME = 0.05
+"""float: The default least number of seconds for each repeat of a case."""
+
+THRESHOLD = 0.25
+"""float: The default fraction of the baseline median which a median can
+exceed before it is a regression."""
+
+class Result:
+    """Class for the summary of the measurements of a benchmark case.
+
+    Attributes:
+        name (str): The name of the benchmark case
+        values (list): The measurements, e.g. the seconds per call for each
+            repeat
+        number (int): The number of calls for each measurement
+        unit (str): The unit of the measurements, e.g. "s" or "B"
+        detail (dict): Any JSON serializable detail of the measurements, e.g.
+            the breakdown of a memory footprint
+    """
+
+    def __init__(self, name, values, number=1, unit="s", detail=None):
+        self.name = name
+        self.values = sorted(values)
+        self.number = number
+        self.unit = unit
+        self.detail = detail
+
+    def __repr__(self):
+        return "Result(%r, median=%.6g%s, spread=%.6g%s)" % (self.name, self.median, self.unit, self.spread, self.unit)
+
+    @property
+    def median(self):
+        """float: The median of the measurements."""
+        return statistics.median(self.values)
+
+    @property
+    def spread(self):
+        """float: The interquartile range of the measurements."""
+        return _percentile(self.values, 75) - _percentile(self.values, 25)
+
+    def as_dict(self):
+        """Returns the result as a JSON serializable dict."""
+        result = {
+            "median": self.median,
+            "spread": self.spread,
+            "min": self.values[0],
+            "max": self.values[-1],
+            "repeat": len(self.values),
+            "number": self.number,
+            "unit": self.unit,
+        }
+        if self.detail is not None:
+            result["detail"] = self.detail
+        return result
+
+class Change:
+    """Class for the change of a benchmark case from its baseline.
+
+    Attributes:
+        name (str): The name of the benchmark case
+        baseline (float): The median of the baseline, None if the case is new
+        current (float): The median of the current result, None if the case
+            is missing
+        threshold (float): The fraction of the baseline which the current
+            median can exceed before it is a regression
+    """
+
+    def __init__(self, name, baseline, current, threshold):
+        self.name = name
+        self.baseline = baseline
+        self.current = current
+        self.threshold = threshold
+
+    def __repr__(self):
+        return "Change(%r, %s)" % (self.name, self.describe())
+
+    @property
+    def ratio(self):
+        """float: The current median over the baseline median, None if
+        either is missing."""
+        if self.baseline is None or self.current is None:
+            return None
+        if self.baseline == 0:
+            return 1.0 if self.current == 0 else float("inf")
+        return self.current / self.baseline
+
+    def regressed(self):
+        """Returns whether the current median exceeds the baseline by more
+        than the threshold."""
+        ratio = self.ratio
+        return ratio is not None and ratio > 1 + self.threshold
+
+    def describe(self):
+        """Returns a short description of the change."""
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "missing"
+        return "%+.1f%%%s" % (100 * (self.ratio - 1), " REGRESSION" if self.regressed() else "")
+
+def calibrate(func, min_time=MIN_TIME):
+    """Returns the number of calls of ``func`` which take at least
+    ``min_time`` seconds, as 1, 2, 5, 10, 20, 50, ... calls."""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if _time(func, number * factor) >= min_time:
+                return number * factor
+        number *= 10
+
+def measure(name, func, repeat=REPEAT, min_time=MIN_TIME, number=None):
+    """Times the calls of ``func``.
+
+    Args:
+        name (str): The name of the benchmark case
+        func (callable): The function to be called, with no arguments
+        repeat (int, optional): The number of times the calls are timed
+        min_time (float, optional): The least number of seconds for each
+            repeat, used to calibrate the number of calls
+        number (int, optional): The number of calls for each repeat, which
+            is calibrated when omitted
+
+    Returns:
+        Result: The seconds per call for each repeat.
+    """
+    if number is None:
+        number = calibrate(func, min_time)
+    values = [_time(func, number) / number for _ in range(repeat)]
+    return Result(name, values, number)
+
+def run(cases, names=None, repeat=REPEAT, min_time=MIN_TIME, number=None):
+    """Runs the benchmark cases.
+
+    Args:
+        cases (dict): The functions for each case name, which each set up the
+            case and return the function to be timed
+        names (list, optional): The names, or prefixes of the names, of the
+            cases to run, omit for every case
+        repeat (int, optional): The number of times each case is timed
+        min_time (float, optional): The least number of seconds for each
+            repeat of a case
+        number (int, optional): The number of calls for each repeat, which
+            is calibrated for each case when omitted
+
+    Returns:
+        list: The Result for each case run, in name order.
+    """
+    results = list()
+    for name in sorted(cases):
+        if names and not any(name == n or name.startswith(n + ".") for n in names):
+            continue
+        func = cases[name]()
+        results.append(measure(name, func, repeat=repeat, min_time=min_time, number=number))
+    return results
+
+def report(results):
+    """Returns the results as a JSON serializable dict, along with the
+    versions of jspec and Python they were measured with."""
+    return {
+        "jspec": __version__,
+        "python": platform.python_version(),
+        "results": dict((result.name, result.as_dict()) for result in results),
+    }
+
+def save(results, file):
+    """Writes the report of the results to ``file`` as JSON."""
+    json.dump(report(results), file, indent=2, sort_keys=True)
+    file.write("\n")
+
+def load(file):
+    """Reads the medians for each case name from a report in ``file``."""
+    return dict((name, result["median"]) for name, result in json.load(file)["results"].items())
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Compares the results against a baseline.
+
+    Args:
+        results (list): The Result for each case
+        baseline (dict): The baseline median for each case name, as read by
+            ``load``
+        threshold (float, optional): The fraction of the baseline median
+            which a median can exceed before it is a regression
+
+    Returns:
+        list: The Change for each case in the results or the baseline, in
+            name order.
+    """
+    current = dict((result.name, result.median) for result in results)
+    names = sorted(set(current) | set(baseline))
+    return [Change(name, baseline.get(name), current.get(name), threshold) for name in names]
+
+def _time(func, number):
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+def _percentile(values, percent):
+    # Linear interpolation between the closest ranks of the sorted values
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
@@ -0,0 +1,217 @@
+"""Measures how the time of the scanner and the matcher grows with the size of
+their input, to catch an accidental quadratic path which the fixed size cases
+of ``jspec.bench.cases`` would only show as a slower median.
+
+Each scaling case is timed at geometrically increasing sizes, and the growth
+exponent ``k`` of ``time ~ size ** k`` is fitted by least squares over the
+logarithms of the sizes and the times. A case fails its bound if the exponent
+exceeds it. The bounds are ``LINEAR`` and ``N_LOG_N``, which are loose, as
+the noise of timing and the caches of the processor add to the exponent of a
+linear case at these sizes, while a quadratic path shows an exponent near 2.
+"""
+
+import math
+
+import jspec
+from jspec import matcher
+from . import cases
+from . import runner
+
+SIZES = (1000, 2000, 4000, 8000)
+"""tuple: The default sizes each scaling case is timed at."""
+
+REPEAT = 3
+"""int: The default number of times each size is timed, of which the least
+time is kept."""
+
+MIN_TIME = 0.01
+"""float: The default least number of seconds for each repeat of a size."""
+
+LINEAR = 1.5
+"""float: The bound on the growth exponent of linear cases."""
+
+N_LOG_N = 1.6
+"""float: The bound on the growth exponent of ``n log n`` cases."""
+
+CASES = dict()
+"""dict: The function to set up each scaling case for a size, and the bound on
+its growth exponent, for each case name."""
+
+class Growth:
+    """Class for the growth of the time of a scaling case with its size.
+
+    Attributes:
+        name (str): The name of the scaling case
+        sizes (list): The sizes the case was timed at
+        times (list): The least seconds per call at each size
+        bound (float): The bound on the growth exponent
+    """
+
+    def __init__(self, name, sizes, times, bound):
+        self.name = name
+        self.sizes = list(sizes)
+        self.times = list(times)
+        self.bound = bound
+
+    def __repr__(self):
+        return "Growth(%r, exponent=%.2f, bound=%.2f)" % (self.name, self.exponent, self.bound)
+
+    @property
+    def exponent(self):
+        """float: The fitted growth exponent of the times."""
+        return exponent(self.sizes, self.times)
+
+    def exceeded(self):
+        """Returns whether the growth exponent exceeds the bound."""
+        return self.exponent > self.bound
+
+    def as_dict(self):
+        """Returns the growth as a JSON serializable dict."""
+        return {
+            "sizes": self.sizes,
+            "times": self.times,
+            "exponent": self.exponent,
+            "bound": self.bound,
+        }
+
+def exponent(sizes, times):
+    """Fits the growth exponent ``k`` of ``time ~ size ** k``.
+
+    Args:
+        sizes (list): The sizes, at least two of which differ
+        times (list): The positive time for each size
+
+    Returns:
+        float: The least squares slope of the logarithms of the times against
+            the logarithms of the sizes.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(time) for time in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return covariance / variance
+
+def case(name, bound):
+    """Returns a decorator which registers the function as the scaling case
+    ``name``, with the bound ``bound`` on its growth exponent. The function is
+    called with a size, sets up the case and returns the function to be
+    timed."""
+    def register(func):
+        CASES[name] = (func, bound)
+        return func
+    return register
+
+def measure(name, setup, bound, sizes=SIZES, repeat=REPEAT, min_time=MIN_TIME):
+    """Times a scaling case at each size.
+
+    Args:
+        name (str): The name of the scaling case
+        setup (callable): The function called with a size, which returns the
+            function to be timed
+        bound (float): The bound on the growth exponent
+        sizes (list, optional): The sizes to time the case at
+        repeat (int, optional): The number of times each size is timed
+        min_time (float, optional): The least number of seconds for each
+            repeat of a size
+
+    Returns:
+        Growth: The least seconds per call at each size.
+    """
+    times = list()
+    for size in sizes:
+        result = runner.measure(name, setup(size), repeat=repeat, min_time=min_time)
+        times.append(result.values[0])
+    return Growth(name, sizes, times, bound)
+
+def run(names=None, sizes=SIZES, repeat=REPEAT, min_time=MIN_TIME):
+    """Runs the scaling cases.
+
+    Args:
+        names (list, optional): The names, or prefixes of the names, of the
+            cases to run, omit for every case
+        sizes (list, optional): The sizes to time each case at
+        repeat (int, optional): The number of times each size is timed
+        min_time (float, optional): The least number of seconds for each
+            repeat of a size
+
+    Returns:
+        list: The Growth of each case run, in name order.
+    """
+    growths = list()
+    for name in sorted(CASES):
+        if names and not any(name == n or name.startswith(n + ".") for n in names):
+            continue
+        setup, bound = CASES[name]
+        growths.append(measure(name, setup, bound, sizes=sizes, repeat=repeat, min_time=min_time))
+    return growths
+
+def _match(spec, element):
+    return lambda: matcher.match(spec, element)
+
+@case("scan.object.wide", LINEAR)
+def scan_object_wide(size):
+    document = cases.wide_jspec(size)
+    return lambda: jspec.loads(document)
+
+@case("scan.object.pretty", LINEAR)
+def scan_object_pretty(size):
+    document = cases.wide_jspec(size)
+    return lambda: jspec.loads(document, pretty=True)
+
+@case("scan.array.long", LINEAR)
+def scan_array_long(size):
+    document = '[%s]' % ", ".join(["int"] * size)
+    return lambda: jspec.loads(document)
+
+@case("match.object.wide", LINEAR)
+def match_object_wide(size):
+    return _match(jspec.loads(cases.wide_jspec(size)), cases.wide_json(size))
+
+@case("match.object.ellipsis", LINEAR)
+def match_object_ellipsis(size):
+    return _match(jspec.loads('{"key0": int, ...}'), cases.wide_json(size))
+
+@case("match.object.capture", LINEAR)
+def match_object_capture(size):
+    return _match(jspec.loads('{("key[0-9]+": int)x?}'), cases.wide_json(size))
+
+@case("match.object.mixed", LINEAR)
+def match_object_mixed(size):
+    return _match(jspec.loads('{"key0": int, ("key[0-9]+": int)x?, ...}'), cases.wide_json(size))
+
+@case("match.array.long", LINEAR)
+def match_array_long(size):
+    return _match(jspec.loads('[%s]' % ", ".join(["int"] * size)), list(range(size)))
+
+@case("match.array.capture", N_LOG_N)
+def match_array_capture(size):
+    return _match(jspec.loads('[(int)x?]'), list(range(size)))
+
+@case("match.array.captures", N_LOG_N)
+def match_array_captures(size):
+    element = list(range(size // 2)) + ["x"] * (size // 2)
+    return _match(jspec.loads('[(int)x?, (string)x?]'), element)
+
+@case("fail.object.missing", LINEAR)
+def fail_object_missing(size):
+    element = cases.wide_json(size)
+    del element["key%d" % (size - 1)]
+    return _match(jspec.loads(cases.wide_jspec(size)), element)
+
+@case("fail.object.ellipsis", LINEAR)
+def fail_object_ellipsis(size):
+    element = cases.wide_json(size)
+    element["key0"] = "x"
+    return _match(jspec.loads('{"key0": int, ...}'), element)
+
+@case("fail.object.capture", N_LOG_N)
+def fail_object_capture(size):
+    element = cases.wide_json(size)
+    element["key%d" % (size - 1)] = "x"
+    return _match(jspec.loads('{("key[0-9]+": int)x?}'), element)
+
+@case("fail.array.last", N_LOG_N)
+def fail_array_last(size):
+    return _match(jspec.loads('[(int)x?, null]'), list(range(size)) + ["x"])
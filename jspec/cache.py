@@ -0,0 +1,331 @@
+"""Module for caching the results of matching JSPECs against JSON across
+multiple calls to ``match``.
+"""
+
+import hashlib
+import heapq
+import json
+import time
+from collections import OrderedDict
+
+from .entity import JSPECEntity
+
+class SubtreeCache:
+    """This class represents a bounded cache of match results for JSON
+    subtrees.
+
+    Each entry maps a JSPEC term and the canonical digest of a JSON object or
+    array to the result of matching them, so a repeated subtree which arrives
+    in a different JSON (e.g. the same customer object embedded in many
+    messages) is only matched once against each JSPEC term. Only subtrees with
+    at least ``min_size`` elements are hashed and cached, since smaller
+    subtrees are cheaper to match than to hash.
+
+    Results for JSPEC terms with macros are keyed by the values of the macros
+    as well, see ``jspec.matcher.match_cached``, so the cache can be shared by
+    matches with different macros.
+
+    Two eviction policies are supported, once the cache holds ``maxsize``
+    entries:
+        'lru': the least recently used entry is evicted.
+        'size': the entry with the smallest subtree is evicted, with the
+            priority of an entry being refreshed whenever it is used, so large
+            subtrees are kept for longer than small ones (GreedyDual-Size).
+
+    Attributes:
+        maxsize (int): The maximum number of entries in the cache
+        min_size (int): The minimum number of elements in a JSON subtree for
+            it to be cached
+        policy (str): The eviction policy, either 'lru' or 'size'
+        hits (int): The number of lookups which found an entry
+        misses (int): The number of lookups which did not find an entry
+        evictions (int): The number of entries that have been evicted
+
+    Args:
+        maxsize (int, optional): The maximum number of entries in the cache
+        min_size (int, optional): The minimum number of elements in a JSON
+            subtree for it to be cached
+        policy (str, optional): The eviction policy, either 'lru' or 'size'
+    """
+
+    POLICIES = ("lru", "size")
+    """tuple: The supported eviction policies.
+    """
+
+    def __init__(self, maxsize=1024, min_size=64, policy="lru"):
+        if policy not in self.POLICIES:
+            raise ValueError("Unsupported eviction policy '%s', expected one of %s" % (policy, ", ".join(self.POLICIES)))
+        if maxsize < 1:
+            raise ValueError("The maximum size of the cache must be at least 1")
+        self.maxsize = maxsize
+        self.min_size = min_size
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._heap = list()
+        self._clock = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def describe(self, element, digests):
+        """Returns the number of elements in the JSON subtree ``element`` and
+        its canonical digest.
+
+        The digests of nested subtrees are built from the digests of their
+        children, so describing every subtree in a JSON is linear in its size.
+
+        Args:
+            element (obj): The Python native object representing a JSON
+                element
+            digests (dict): The descriptions of JSON objects and arrays that
+                have already been described, keyed by identity. The elements
+                must be kept alive for as long as this dict is used.
+
+        Returns:
+            int: The number of elements in the JSON subtree.
+            str: The canonical form of the JSON subtree, which is a digest if
+                it has at least ``self.min_size`` elements.
+        """
+        if isinstance(element, dict):
+            known = digests.get(id(element))
+            if known is not None:
+                return known
+            size, parts = 1, list()
+            for key in sorted(element):
+                child_size, child = self.describe(element[key], digests)
+                size += child_size
+                parts.append(json.dumps(key) + ":" + child)
+            body = "{" + ",".join(parts) + "}"
+        elif isinstance(element, list):
+            known = digests.get(id(element))
+            if known is not None:
+                return known
+            size, parts = 1, list()
+            for value in element:
+                child_size, child = self.describe(value, digests)
+                size += child_size
+                parts.append(child)
+            body = "[" + ",".join(parts) + "]"
+        else:
+            return 1, json.dumps(element)
+        if size >= self.min_size:
+            body = "#" + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        digests[id(element)] = (size, body)
+        return size, body
+
+    def get(self, term, digest):
+        """Returns the cached value for the JSPEC term ``term`` and the JSON
+        subtree with digest ``digest``, or None if there is no such entry.
+        """
+        entry = self._entries.get((id(term), digest))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            self._entries.move_to_end((id(term), digest))
+        else:
+            self._touch((id(term), digest), entry)
+        return entry[2]
+
+    def put(self, term, digest, size, value):
+        """Stores ``value`` for the JSPEC term ``term`` and the JSON subtree
+        with digest ``digest`` and ``size`` elements, evicting an entry if the
+        cache is full.
+        """
+        key = (id(term), digest)
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._evict()
+        entry = [term, size, value, 0]
+        self._entries[key] = entry
+        if self.policy == "size":
+            self._touch(key, entry)
+
+    def hit_rate(self):
+        """Returns the fraction of lookups which found an entry."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Returns a dict of the statistics for the cache."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def clear(self):
+        """Removes all the entries and resets the statistics."""
+        self.__init__(self.maxsize, self.min_size, self.policy)
+
+    def discard(self, term):
+        """Removes the entries for the JSPEC term ``term`` and the JSPEC terms
+        nested in it, leaving the entries for every other JSPEC term, e.g. of
+        the other JSPECs of a cache shared by many validators.
+
+        Args:
+            term (JSPECTerm): The JSPEC term.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        ids = set()
+        stack = [term]
+        while stack:
+            entity = stack.pop()
+            ids.add(id(entity))
+            for value in (getattr(entity, "spec", None), getattr(entity, "entities", None)):
+                if isinstance(value, (list, tuple, set, frozenset)):
+                    stack.extend(child for child in value if isinstance(child, JSPECEntity))
+                elif isinstance(value, JSPECEntity):
+                    stack.append(value)
+        keys = [key for key in self._entries if key[0] in ids]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def _touch(self, key, entry):
+        """Sets the priority for the entry under the 'size' policy."""
+        entry[3] = self._clock + entry[1]
+        heapq.heappush(self._heap, (entry[3], key))
+        if len(self._heap) > 4 * self.maxsize:
+            self._heap = [(e[3], k) for k, e in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _evict(self):
+        """Evicts one entry according to ``self.policy``."""
+        if self.policy == "lru":
+            self._entries.popitem(last=False)
+        else:
+            while True:
+                priority, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is not None and entry[3] == priority:
+                    break
+            self._clock = priority
+            del self._entries[key]
+        self.evictions += 1
+
+class PayloadCache:
+    """This class represents a bounded cache of match results for serialized
+    JSON payloads.
+
+    Each entry maps the digest of a JSPEC and the digest of the raw JSON bytes
+    to the result of matching them, so a retried request or a redelivered
+    message is neither decoded nor matched again. Since the digest of the JSPEC
+    is part of the key, entries for a JSPEC which has changed are never used.
+
+    Entries expire ``ttl`` seconds after they are stored, and the least
+    recently used entries are evicted once the estimated memory used by the
+    entries exceeds ``max_bytes``.
+
+    Attributes:
+        max_bytes (int): The maximum estimated memory used by the entries
+        ttl (float/None): The number of seconds an entry is valid for, or None
+            if entries do not expire
+        hits (int): The number of lookups which found an entry
+        misses (int): The number of lookups which did not find an entry
+        evictions (int): The number of entries that have been evicted or have
+            expired
+
+    Args:
+        max_bytes (int, optional): The maximum estimated memory used by the
+            entries
+        ttl (float, optional): The number of seconds an entry is valid for,
+            omit for entries to never expire
+        clock (func, optional): Function returning the current time in
+            seconds, used for expiring entries
+    """
+
+    ENTRY_OVERHEAD = 200
+    """int: The estimated number of bytes used by an entry, excluding the
+    failure reason.
+    """
+
+    def __init__(self, max_bytes=1 << 20, ttl=None, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def digest(data):
+        """Returns the digest of the JSPEC serialization or JSON payload
+        ``data``, which is a string or bytes."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, spec_digest, payload):
+        """Returns the cached ``(bool, str)`` result for the JSPEC with digest
+        ``spec_digest`` and the raw JSON ``payload``, or None if there is no
+        such entry.
+        """
+        key = (spec_digest, self.digest(payload))
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and self._clock() >= entry[0]:
+            self._remove(key)
+            self.evictions += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, spec_digest, payload, result):
+        """Stores the ``(bool, str)`` ``result`` for the JSPEC with digest
+        ``spec_digest`` and the raw JSON ``payload``."""
+        key = (spec_digest, self.digest(payload))
+        if key in self._entries:
+            self._remove(key)
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        size = self.ENTRY_OVERHEAD + len(result[1])
+        self._entries[key] = (expires, result, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, spec_digest=None):
+        """Removes the entries for the JSPEC with digest ``spec_digest``, or
+        all the entries if it is omitted."""
+        for key in list(self._entries):
+            if spec_digest is None or key[0] == spec_digest:
+                self._remove(key)
+
+    def hit_rate(self):
+        """Returns the fraction of lookups which found an entry."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Returns a dict of the statistics for the cache."""
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def _remove(self, key):
+        """Removes the entry for ``key``."""
+        self._bytes -= self._entries.pop(key)[2]
@@ -0,0 +1,200 @@
+"""Module for collecting every failure when matching a JSPEC against a JSON.
+
+``match`` returns a single reason for a bad match. Here, when a JSPEC term
+fails to match, the failure is broken down into the failures of its parts,
+wherever the parts of the JSON are bound to parts of the JSPEC regardless of
+backtracking:
+    JSPEC objects: the value of each pair with a literal key is matched
+        against the JSON value with that key, and the remaining JSON pairs are
+        matched against the object captures.
+    JSPEC arrays: where a JSPEC array is a list of JSPEC terms, optionally
+        followed by a single array capture (e.g. ``[(int)x?]`` or
+        ``[string, ...]``), each JSON element is matched against its JSPEC term
+        or the capture.
+    JSPEC conditionals: where every logical operator is an AND, each failing
+        JSPEC term is broken down.
+    JSPEC named terms: the named JSPEC term is broken down.
+Anything else, e.g. a JSPEC array with a capture before a JSPEC term, is
+reported as the single failure returned by ``match``.
+
+Each JSPEC term is only broken down if it has failed to match, and the
+results of matching JSON objects and arrays are memoized, so collecting the
+failures costs about the same as matching the JSON.
+"""
+
+from . import matcher
+from . import path
+from .entity import (
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectCaptureGroup,
+    JSPECArray,
+    JSPECArrayPlaceholder,
+    JSPECTerm,
+    JSPECConditional,
+    JSPECNamedTerm,
+    JSPECLogicalOperatorAnd,
+)
+
+class Failure:
+    """This class represents a single failure found whilst matching a JSPEC
+    against a JSON.
+
+    Attributes:
+        loc (str): The location in the JSON where the match failed
+        msg (str): The reason the match failed
+
+    Args:
+        loc (str): The location in the JSON where the match failed
+        msg (str): The reason the match failed
+    """
+
+    def __init__(self, loc, msg):
+        self.loc = loc
+        self.msg = msg
+
+    def __eq__(self, other):
+        return isinstance(other, Failure) and self.loc == other.loc and self.msg == other.msg
+
+    def __repr__(self):
+        return self.reason()
+
+    def reason(self):
+        """Returns the formatted reason, as returned by ``match``."""
+        return "At location %s - %s" % (self.loc, self.msg)
+
+def collect(spec, element, max_errors=None, cache=None, macros=None, limits=None, hooks=None):
+    """Match the JSPEC against the JSON, collecting every failure.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        element (obj): A Python native object representing a JSON
+        max_errors (int, optional): The maximum number of failures to collect,
+            omit to collect every failure
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees, shared between calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done by the match.
+        hooks (Hooks, optional): The instrumentation hooks for the match.
+
+    Returns:
+        list: The ``Failure`` instances, in the order they were found, which
+            is empty if the JSON is a good match.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of ``limits``.
+    """
+    ctx = matcher.Context(cache, macros, limits, hooks=hooks)
+    failures = list()
+    collect_element("$", spec.base, element, ctx, failures, max_errors)
+    return failures
+
+def collect_element(loc, term, element, ctx, failures, max_errors):
+    """Match the JSPEC term against the JSON element, appending its failures
+    to ``failures``.
+
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+        failures (list): The failures collected so far
+        max_errors (int/None): The maximum number of failures to collect
+    """
+    if _full(failures, max_errors):
+        return
+    result = matcher.match_element(loc, term, element, ctx)
+    if result:
+        return
+    while isinstance(term, JSPECNamedTerm):
+        term = term.term()
+    count = len(failures)
+    if isinstance(element, dict) and path.object_bindings(term) is not None:
+        collect_object(loc, term, element, ctx, failures, max_errors)
+    elif isinstance(element, list) and _array_layout(term) is not None:
+        collect_array(loc, term, element, ctx, failures, max_errors)
+    elif _conjunction(term):
+        for conjunct in term.spec[::2]:
+            collect_element(loc, conjunct, element, ctx, failures, max_errors)
+    if len(failures) == count:
+        _add(failures, max_errors, Failure(result.loc, result.msg))
+
+def collect_object(loc, term, element, ctx, failures, max_errors):
+    """Break down the failure of a JSPEC object where every pair has a literal
+    key."""
+    pairs = sorted((p for p in term.spec if isinstance(p, JSPECObjectPair)), key=lambda p: p.key().spec)
+    captures = set(p for p in term.spec if isinstance(p, JSPECObjectCaptureGroup))
+    remaining = dict(element)
+    for pair in pairs:
+        key = pair.key().spec
+        if key in remaining:
+            collect_element(loc + "." + key, pair.value(), remaining.pop(key), ctx, failures, max_errors)
+        else:
+            _add(failures, max_errors, Failure(loc, "failed to find a JSON pair for the JSPEC pair '%s'" % pair))
+    if remaining or captures:
+        result = matcher.match_element(loc, JSPECObject(captures), remaining, ctx)
+        if not result:
+            _add(failures, max_errors, Failure(result.loc, result.msg))
+
+def collect_array(loc, term, element, ctx, failures, max_errors):
+    """Break down the failure of a JSPEC array of JSPEC terms, optionally
+    followed by a single array capture."""
+    terms, capture = _array_layout(term)
+    for idx, spec in enumerate(terms[:len(element)]):
+        collect_element("%s[%s]" % (loc, idx), spec, element[idx], ctx, failures, max_errors)
+    if len(element) < len(terms):
+        _add(failures, max_errors, Failure(loc, "exhausted JSON array, no JSON element left to match '%s'" % terms[len(element)]))
+        return
+    start = len(terms)
+    rest = element[start:]
+    if capture is None:
+        if rest:
+            _add(failures, max_errors, Failure("%s[%s]" % (loc, start), "exhausted JSPEC array, no JSPEC term left to match '%s'" % rest[0]))
+        return
+    minimum, maximum = capture.multiplier.minimum, capture.multiplier.maximum
+    for idx in range(start, start + (len(rest) if maximum is None else min(len(rest), maximum))):
+        if _full(failures, max_errors):
+            return
+        if len(capture.entities) == 1:
+            collect_element("%s[%s]" % (loc, idx), capture.entities[0], element[idx], ctx, failures, max_errors)
+            continue
+        _, result = matcher.match_array_capture_group("%s[%s]" % (loc, idx), capture, element[idx], 0, 0, ctx)
+        if not result:
+            _add(failures, max_errors, Failure(result.loc, result.msg))
+    if minimum is not None and len(rest) < minimum:
+        _add(failures, max_errors, Failure(loc, "exhausted JSON array, no JSON element left to match '%s'" % capture))
+    if maximum is not None and len(rest) > maximum:
+        _add(failures, max_errors, Failure("%s[%s]" % (loc, start + maximum), "exhausted JSPEC array, no JSPEC term left to match '%s'" % rest[maximum]))
+
+def _array_layout(term):
+    """Returns the JSPEC terms and the trailing array capture (or None) of the
+    JSPEC array ``term``, or None if it is not of that form."""
+    if not isinstance(term, JSPECArray) or isinstance(term, JSPECArrayPlaceholder):
+        return None
+    spec = term.spec
+    count = 0
+    while count < len(spec) and isinstance(spec[count], JSPECTerm):
+        count += 1
+    if count == len(spec):
+        return spec, None
+    if count == len(spec) - 1:
+        return spec[:count], spec[count]
+    return None
+
+def _conjunction(term):
+    """Returns whether ``term`` is a JSPEC conditional where every logical
+    operator is an AND."""
+    return term.__class__ is JSPECConditional and all(
+        op.__class__ is JSPECLogicalOperatorAnd for op in term.spec[1::2]
+    )
+
+def _full(failures, max_errors):
+    """Returns whether ``max_errors`` failures have been collected."""
+    return max_errors is not None and len(failures) >= max_errors
+
+def _add(failures, max_errors, failure):
+    """Appends ``failure`` unless ``max_errors`` failures have been
+    collected."""
+    if not _full(failures, max_errors):
+        failures.append(failure)
@@ -0,0 +1,512 @@
+"""Module for differential testing of the matching engines against the
+reference matcher, ``jspec.matcher.match``.
+
+Every other way of matching a JSPEC, e.g. the compiled tier, validators, the
+subtree and payload caches, fused and partial matching, incremental
+revalidation and collecting failures, must give the same result as the
+reference matcher, including the reason for a bad match. Each engine is a
+function of a JSPEC and a JSON returning that result, registered in
+``ENGINES``. The incremental engine also patches the JSON into a random
+mutant of itself, with the JSON patch returned by ``diff``, and checks the
+revalidated result against the reference matcher on the patched JSON.
+Engines which do not promise the same reason, such as collecting every
+failure, are only compared on whether the match was good.
+
+The search is property based, with a seeded ``random.Random``:
+    JSPECs: random trees of JSPEC objects, arrays, object and array captures,
+        ellipses, conditionals, negations, named terms, placeholders,
+        inequalities and literals, rendered as JSPEC documents.
+    JSONs: for each JSPEC, JSONs generated to match it (see
+        ``jspec.generator``), near misses mutated from them (see
+        ``jspec.fuzz.mutate``) and random JSONs.
+Each JSPEC and JSON is matched by the reference matcher and by every engine,
+and when an engine diverges, the JSPEC and the JSON are minimized: parts of
+the JSPEC tree and the JSON are removed or replaced by their own parts for as
+long as the engine still diverges, which leaves a small counterexample.
+"""
+
+import copy
+import json
+import random
+
+from . import collect
+from . import fused
+from . import fuzz
+from . import generator
+from . import incremental
+from . import limits
+from . import matcher
+from . import partial
+from . import tiered
+from .cache import PayloadCache, SubtreeCache
+from .registry import SpecRegistry
+from .scanner import JSPECDecodeError, scan
+from .validator import Validator
+
+MAX_STEPS = 20000
+"""int: The maximum number of steps for the reference matcher, JSPECs and
+JSONs which take more are skipped rather than compared."""
+
+MAX_DEPTH = 3
+"""int: The default maximum depth of the random JSPEC trees."""
+
+ELEMENTS = 6
+"""int: The default number of JSONs matched against each random JSPEC."""
+
+MAX_SHRINKS = 500
+"""int: The maximum number of smaller counterexamples tried when minimizing."""
+
+ENGINES = dict()
+"""dict: The function of each engine, called with a JSPEC and a JSON and
+returning whether it was a good match and the reason, and whether the reason
+is compared, for each engine name."""
+
+KEYS = ('"a"', '"b"', '"c"', '"k[0-9]"', '"[ab]"', "string")
+"""tuple: The keys of the JSPEC object pairs of random JSPECs."""
+
+LEAVES = (
+    "int", "real", "number", "string", "bool", "null", "true", "*", "object",
+    "array", "1", "2.5", '"a"', '"[a-c]+"', "int > 0", "int <= 2",
+    "real < 1.5", "number >= 0", "uuid", "date",
+)
+"""tuple: The leaves of random JSPECs."""
+
+MULTIPLIERS = ("x?", "x1", "x2", "x1-2", "x?-2", "x1-?")
+"""tuple: The multipliers of the captures of random JSPECs."""
+
+OPERATORS = ("|", "&", "^")
+"""tuple: The logical operators of random JSPEC conditionals and captures."""
+
+class Divergence:
+    """This class represents a JSPEC and a JSON for which an engine gives a
+    different result to the reference matcher.
+
+    Attributes:
+        engine (str): The name of the engine
+        document (str): The JSPEC document
+        element (obj): The Python native object representing the JSON
+        expected (tuple): The result of the reference matcher
+        got (tuple/str): The result of the engine, or the error it raised
+        node (tuple): The tree of the JSPEC document, see ``render``
+    """
+
+    def __init__(self, engine, document, element, expected, got, node=None):
+        self.engine = engine
+        self.document = document
+        self.element = element
+        self.expected = expected
+        self.got = got
+        self.node = node
+
+    def __repr__(self):
+        return "Divergence(%r, %s, %s)" % (self.engine, self.document, json.dumps(self.element))
+
+    def describe(self):
+        """Returns a description of the divergence, over several lines."""
+        return "\n".join([
+            "engine: %s" % self.engine,
+            "jspec: %s" % self.document,
+            "json: %s" % json.dumps(self.element, sort_keys=True),
+            "expected: %r" % (self.expected,),
+            "got: %r" % (self.got,),
+        ])
+
+def engine(name, exact=True):
+    """Returns a decorator which registers the function as the engine
+    ``name``. Set ``exact`` to False if the engine does not promise the same
+    reason for a bad match as the reference matcher."""
+    def register(func):
+        ENGINES[name] = (func, exact)
+        return func
+    return register
+
+def reference(spec, element):
+    """Returns the result of the reference matcher, or None if it takes more
+    than ``MAX_STEPS`` steps."""
+    try:
+        matcher.match(spec, element, limits=limits.Limits(max_steps=MAX_STEPS))
+    except limits.JSPECLimitError:
+        return None
+    return matcher.match(spec, element)
+
+def compare(document, element, engines=None, node=None):
+    """Matches the JSON against the JSPEC with the reference matcher and with
+    each engine.
+
+    Each engine is given its own JSPEC, scanned from ``document``, and its own
+    copy of the JSON, so no engine sees the state left by another.
+
+    Args:
+        document (str): The JSPEC document
+        element (obj): The Python native object representing the JSON
+        engines (list, optional): The names of the engines, omit for every
+            engine
+        node (tuple, optional): The tree of the JSPEC document, kept with the
+            divergences for minimizing them
+
+    Returns:
+        list: The Divergence of each engine which gives a different result,
+            empty if the reference matcher takes too many steps.
+
+    Raises:
+        JSPECDecodeError: Raised if the JSPEC document is not valid.
+    """
+    expected = reference(scan(document), element)
+    if expected is None:
+        return list()
+    divergences = list()
+    for name in sorted(engines or ENGINES):
+        func, exact = ENGINES[name]
+        try:
+            got = func(scan(document), copy.deepcopy(element))
+        except Exception as exc:
+            got = "%s: %s" % (exc.__class__.__name__, exc)
+        if isinstance(got, str) or got[0] != expected[0] or (exact and got[1] != expected[1]):
+            divergences.append(Divergence(name, document, element, expected, got, node))
+    return divergences
+
+def search(iterations=100, seed=None, engines=None, elements=ELEMENTS, max_depth=MAX_DEPTH, minimize=True):
+    """Searches for JSPECs and JSONs for which an engine diverges from the
+    reference matcher.
+
+    Args:
+        iterations (int, optional): The number of random JSPECs
+        seed (int, optional): The seed for the random JSPECs and JSONs, omit
+            for a different search each time
+        engines (list, optional): The names of the engines, omit for every
+            engine
+        elements (int, optional): The number of JSONs matched against each
+            random JSPEC
+        max_depth (int, optional): The maximum depth of the random JSPECs
+        minimize (bool, optional): Whether each divergence is minimized
+
+    Returns:
+        list: The first Divergence found for each engine, in engine order.
+
+    Raises:
+        ValueError: If any engine is unknown.
+    """
+    unknown = [name for name in (engines or ()) if name not in ENGINES]
+    if unknown:
+        raise ValueError("Unknown engine(s): %s" % ", ".join(unknown))
+    rng = random.Random(seed)
+    found = dict()
+    for _ in range(iterations):
+        node, spec = random_spec(rng, max_depth)
+        document = render(node)
+        pending = [name for name in (engines or sorted(ENGINES)) if name not in found]
+        if not pending:
+            break
+        for element in random_elements(spec, rng, elements):
+            for divergence in compare(document, element, pending, node):
+                if divergence.engine not in found:
+                    found[divergence.engine] = shrink(divergence) if minimize else divergence
+            pending = [name for name in pending if name not in found]
+    return [found[name] for name in sorted(found)]
+
+def shrink(divergence):
+    """Minimizes a divergence, by removing or replacing parts of its JSPEC
+    tree and its JSON for as long as the engine still diverges.
+
+    Args:
+        divergence (Divergence): The divergence, with the tree of its JSPEC
+
+    Returns:
+        Divergence: The smallest divergence found for the same engine.
+    """
+    engines = [divergence.engine]
+    tries = 0
+    improved = True
+    while improved and tries < MAX_SHRINKS:
+        improved = False
+        candidates = [(node, divergence.element) for node in _smaller_nodes(divergence.node)] if divergence.node else []
+        candidates.extend((divergence.node, element) for element in _smaller_elements(divergence.element))
+        for node, element in candidates:
+            tries += 1
+            if tries > MAX_SHRINKS:
+                break
+            document = render(node) if node else divergence.document
+            try:
+                found = compare(document, element, engines, node)
+            except JSPECDecodeError:
+                continue
+            if found:
+                divergence = found[0]
+                improved = True
+                break
+    return divergence
+
+def random_spec(rng, max_depth=MAX_DEPTH):
+    """Returns a random JSPEC tree and its JSPEC.
+
+    Args:
+        rng (random.Random): The source of randomness
+        max_depth (int, optional): The maximum depth of the tree
+
+    Returns:
+        tuple: The tree, see ``render``
+        JSPEC: The JSPEC scanned from the rendered tree.
+    """
+    while True:
+        node = _random_term(rng, max_depth)
+        try:
+            return node, scan(render(node))
+        except JSPECDecodeError:
+            continue
+
+def random_elements(spec, rng, n=ELEMENTS):
+    """Returns random JSONs for the JSPEC: JSONs generated to match it, near
+    misses mutated from them and random JSONs.
+
+    Args:
+        spec (JSPEC): The JSPEC
+        rng (random.Random): The source of randomness
+        n (int, optional): The number of JSONs
+
+    Returns:
+        list: The Python native objects representing the JSONs.
+    """
+    gen = generator.Generator(seed=rng.random(), max_repeat=2)
+    words = fuzz.dictionary(spec)
+    elements = list()
+    for i in range(n):
+        kind = i % 3
+        if kind == 2:
+            elements.append(gen.element(depth=MAX_DEPTH))
+            continue
+        try:
+            element = generator.generate_one(spec, gen, verify=False)
+        except generator.JSPECGenerateError:
+            element = gen.element(depth=MAX_DEPTH)
+        if kind == 1:
+            element = fuzz.mutate(element, rng, max_size=256, words=words)
+        elements.append(element)
+    return elements
+
+def render(node):
+    """Returns the JSPEC document of a JSPEC tree.
+
+    A tree is a tuple of its kind, a string and a tuple of its children:
+        ("leaf", term, ()): A JSPEC term such as "int" or '"a"'
+        ("object", "", children): A JSPEC object of its pairs, captures and
+            ellipsis
+        ("pair", key, (value,)): A JSPEC object pair
+        ("object_capture", multiplier, pairs): A JSPEC object capture of its
+            pairs, joined by "|"
+        ("array", "", children): A JSPEC array of its terms, captures and
+            ellipsis
+        ("array_capture", multiplier, terms): A JSPEC array capture of its
+            terms, joined by "|"
+        ("ellipsis", "...", ()): A JSPEC object or array ellipsis
+        ("conditional", operator, terms): A JSPEC conditional of its terms,
+            joined by the operator
+        ("negation", "", (term,)): A JSPEC negation
+        ("named", name, (term,)): A JSPEC named term
+    """
+    kind, value, children = node
+    if kind in ("leaf", "ellipsis"):
+        return value
+    if kind == "object":
+        return "{%s}" % ", ".join(render(child) for child in children)
+    if kind == "pair":
+        return "%s: %s" % (value, render(children[0]))
+    if kind == "object_capture":
+        return "(%s)%s" % (" | ".join(render(child) for child in children), value)
+    if kind == "array":
+        return "[%s]" % ", ".join(render(child) for child in children)
+    if kind == "array_capture":
+        return "(%s)%s" % (" | ".join(render(child) for child in children), value)
+    if kind == "conditional":
+        return "(%s)" % (" %s " % value).join(render(child) for child in children)
+    if kind == "negation":
+        return "!%s" % render(children[0])
+    if kind == "named":
+        return "@%s %s" % (value, render(children[0]))
+    raise ValueError("Unknown JSPEC tree of kind %s" % kind)
+
+def _random_term(rng, depth):
+    kinds = ["leaf"] * 3
+    if depth > 0:
+        kinds += ["object", "object", "array", "array", "conditional", "negation", "named"]
+    kind = rng.choice(kinds)
+    if kind == "leaf":
+        return ("leaf", rng.choice(LEAVES), ())
+    if kind == "object":
+        children = list()
+        for key in rng.sample(KEYS, rng.randint(0, 3)):
+            children.append(("pair", key, (_random_term(rng, depth - 1),)))
+        if rng.random() < 0.4:
+            pairs = tuple(("pair", key, (_random_term(rng, depth - 1),)) for key in rng.sample(KEYS, rng.randint(1, 2)))
+            children.append(("object_capture", rng.choice(MULTIPLIERS), pairs))
+        if rng.random() < 0.4:
+            children.append(("ellipsis", "...", ()))
+        return ("object", "", tuple(children))
+    if kind == "array":
+        children = list()
+        for _ in range(rng.randint(0, 3)):
+            if rng.random() < 0.3:
+                terms = tuple(_random_term(rng, depth - 1) for _ in range(rng.randint(1, 2)))
+                children.append(("array_capture", rng.choice(MULTIPLIERS), terms))
+            elif rng.random() < 0.1:
+                children.append(("ellipsis", "...", ()))
+            else:
+                children.append(_random_term(rng, depth - 1))
+        return ("array", "", tuple(children))
+    if kind == "conditional":
+        terms = tuple(_random_term(rng, depth - 1) for _ in range(rng.randint(2, 3)))
+        return ("conditional", rng.choice(OPERATORS), terms)
+    if kind == "negation":
+        return ("negation", "", (_random_term(rng, depth - 1),))
+    return ("named", rng.choice("xyz"), (_random_term(rng, depth - 1),))
+
+_MIN_CHILDREN = {"object": 0, "array": 0, "conditional": 2}
+
+def _smaller_nodes(node):
+    kind, value, children = node
+    if kind not in ("object", "array", "pair"):
+        # A term may be replaced by any of its own terms
+        for child in children:
+            if child[0] not in ("pair", "ellipsis", "object_capture", "array_capture"):
+                yield child
+        if kind != "leaf":
+            yield ("leaf", "int", ())
+    if kind in ("object", "array"):
+        for child in children:
+            if child[0] == "array_capture":
+                yield from child[2]
+    if len(children) > _MIN_CHILDREN.get(kind, 1):
+        for i in range(len(children)):
+            yield (kind, value, children[:i] + children[i + 1:])
+    for i, child in enumerate(children):
+        for smaller in _smaller_nodes(child):
+            yield (kind, value, children[:i] + (smaller,) + children[i + 1:])
+
+def diff(source, target, pointer=""):
+    """Returns a JSON patch (RFC 6902) which turns the JSON ``source`` into
+    the JSON ``target``, replacing only the JSON elements which differ.
+
+    Args:
+        source (obj): The Python native object representing the JSON before
+        target (obj): The Python native object representing the JSON after
+        pointer (str, optional): The JSON pointer of ``source``
+
+    Returns:
+        list: The operations of the JSON patch.
+    """
+    if json.dumps(source, sort_keys=True) == json.dumps(target, sort_keys=True):
+        return list()
+    if isinstance(source, dict) and isinstance(target, dict):
+        patch = list()
+        for key in sorted(source):
+            member = pointer + "/" + key.replace("~", "~0").replace("/", "~1")
+            if key not in target:
+                patch.append({"op": "remove", "path": member})
+            else:
+                patch.extend(diff(source[key], target[key], member))
+        for key in sorted(target):
+            if key not in source:
+                member = pointer + "/" + key.replace("~", "~0").replace("/", "~1")
+                patch.append({"op": "add", "path": member, "value": target[key]})
+        return patch
+    if isinstance(source, list) and isinstance(target, list):
+        patch = list()
+        for i in range(min(len(source), len(target))):
+            patch.extend(diff(source[i], target[i], "%s/%d" % (pointer, i)))
+        for i in range(len(source) - 1, len(target) - 1, -1):
+            patch.append({"op": "remove", "path": "%s/%d" % (pointer, i)})
+        for value in target[len(source):]:
+            patch.append({"op": "add", "path": pointer + "/-", "value": value})
+        return patch
+    return [{"op": "replace", "path": pointer, "value": target}]
+
+def _smaller_elements(element):
+    if isinstance(element, dict):
+        for key in list(element):
+            yield dict((k, v) for k, v in element.items() if k != key)
+        for key, value in element.items():
+            for smaller in _smaller_elements(value):
+                yield dict((k, smaller if k == key else v) for k, v in element.items())
+    elif isinstance(element, list):
+        for i in range(len(element)):
+            yield element[:i] + element[i + 1:]
+        for i, value in enumerate(element):
+            for smaller in _smaller_elements(value):
+                yield element[:i] + [smaller] + element[i + 1:]
+    elif isinstance(element, str) and len(element) > 1:
+        yield element[:1]
+    elif isinstance(element, (int, float)) and not isinstance(element, bool) and element != 0:
+        yield 0
+
+def _same(first, second):
+    # A cached result must be the result it was cached from
+    if first != second:
+        return "cached result %r differs from %r" % (second, first)
+    return first
+
+@engine("compiled")
+def compiled(spec, element):
+    tiered.force(spec, tiered.COMPILED)
+    return tiered.match(spec, element)
+
+@engine("validator")
+def validator(spec, element):
+    return Validator(spec).check(element)
+
+@engine("payload")
+def payload(spec, element):
+    checker = Validator(spec, payload_cache=PayloadCache())
+    document = json.dumps(element)
+    return _same(checker.check_json(document), checker.check_json(document))
+
+@engine("subtree")
+def subtree(spec, element):
+    cache = SubtreeCache(min_size=0)
+    return _same(matcher.match(spec, element, cache=cache), matcher.match(spec, element, cache=cache))
+
+@engine("limits")
+def limited(spec, element):
+    return matcher.match(spec, element, limits=limits.Limits(max_steps=10 * MAX_STEPS))
+
+@engine("extract")
+def extract(spec, element):
+    return matcher.extract(spec, element)[:2]
+
+@engine("fused")
+def fused_many(spec, element):
+    return fused.match([spec, spec], element)[0]
+
+@engine("partial")
+def partial_root(spec, element):
+    return partial.match(spec, element, ["$"])
+
+@engine("incremental")
+def incremental_patch(spec, element):
+    # The JSON is patched into a random mutant of itself, seeded by the JSON
+    # so a divergence is the same each time it is minimized
+    rng = random.Random(json.dumps(element, sort_keys=True))
+    # Parsed again so no JSON elements are shared, which a patch would change
+    # in more than one place
+    element = mutant = json.loads(json.dumps(element))
+    for _ in range(rng.randint(1, 3)):
+        mutant = fuzz.mutate(mutant, rng, words=fuzz.dictionary(spec))
+    patch = diff(element, mutant)
+    patched = incremental.apply_patch(copy.deepcopy(element), copy.deepcopy(patch))[0]
+    expected = reference(spec, patched)
+    state = incremental.validate(spec, element)
+    if expected is None:
+        return state.result
+    got = incremental.revalidate(state, copy.deepcopy(patch)).result
+    if got != expected:
+        return "revalidated result %r after the patch %s differs from %r" % (got, json.dumps(patch), expected)
+    return state.result
+
+@engine("collect", exact=False)
+def collect_all(spec, element):
+    failures = collect.collect(spec, element)
+    return not failures, failures[0].reason() if failures else ""
+
+@engine("registry", exact=False)
+def registry(spec, element):
+    specs = SpecRegistry()
+    specs.add("spec", spec)
+    return specs.match_all(element) == ["spec"], ""
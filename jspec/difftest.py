@@ -0,0 +1,63 @@
+"""Command-line tool to search for JSPEC and JSON documents for which a
+matching engine gives a different result to the reference matcher.
+
+Usage:
+
+    $ python3 -m jspec.difftest [--iterations <count>] [--seed <seed>]
+
+    -- Compare every engine against the reference matcher for 1000 JSPECs
+    $ python3 -m jspec.difftest --iterations 1000 --seed 1
+    engine: compiled
+    jspec: [(int)x?, "a"]
+    json: [1, "a"]
+    expected: (True, '')
+    got: (False, "...")
+
+    Each divergence is minimized to a small JSPEC and JSON before it is
+    printed, unless --no-minimize is given, and the exit code is 1 if any
+    engine diverges. Engines are chosen with --engine, which can be given more
+    than once, and --list prints their names.
+"""
+
+def main():
+    import argparse
+    from jspec import differential
+
+    prog = 'python3 -m jspec.difftest'
+    description = ('A simple command line tool to search for JSPEC and JSON documents for which a matching engine differs from the reference matcher')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument('--iterations', type=int, default=100, help='the number of random JSPEC documents')
+    parser.add_argument('--seed', type=int, default=None, help='the seed for the random JSPEC and JSON documents')
+    parser.add_argument(
+        '--engine',
+        dest='engines',
+        action='append',
+        default=None,
+        help='the name of an engine to compare, can be given more than once'
+    )
+    parser.add_argument('--no-minimize', dest='minimize', action='store_false', help='do not minimize the divergences found')
+    parser.add_argument('--list', action='store_true', help='print the engine names and exit')
+    options = parser.parse_args()
+
+    if options.list:
+        sys.stdout.write("".join("%s\n" % name for name in sorted(differential.ENGINES)))
+        return
+    try:
+        divergences = differential.search(
+            iterations=options.iterations,
+            seed=options.seed,
+            engines=options.engines,
+            minimize=options.minimize,
+        )
+    except ValueError as exc:
+        raise SystemExit(exc)
+    sys.stdout.write("".join("%s\n\n" % divergence.describe() for divergence in divergences))
+    if divergences:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -21,6 +21,15 @@ class JSPEC:
         base (JSPECTerm): The base JSPEC term for this JSPEC.
         _pretty_string (str/None): A pretty string version of the JSPEC, if one
             is known, else None
+        _selectors (dict): The JSPEC terms selected by selectors, keyed by the
+            selector, cached by ``jspec.partial``
+        _checks (int): The number of checks against the JSPEC, counted by
+            ``jspec.tiered``
+        _tier (str): The tier the JSPEC is checked in, see ``jspec.tiered``
+        _forced_tier (str/None): The tier the JSPEC is forced to stay in, or
+            None
+        _compiled (tuple/None): The compiled closure for the base JSPEC term,
+            once the JSPEC has been compiled by ``jspec.tiered``
 
     Args:
         term (JSPECTerm): The term to set as the base JSPEC term for this
@@ -30,6 +39,11 @@ class JSPEC:
     def __init__(self, term):
         self.base = term
         self._pretty_string = None
+        self._selectors = dict()
+        self._checks = 0
+        self._tier = "interpreted"
+        self._forced_tier = None
+        self._compiled = None
 
     def __str__(self):
         if self._pretty_string:
@@ -73,6 +87,8 @@ class JSPECTerm(JSPECEntity):
         spec (obj): A Python native object, used to determine if a JSON
             element matches the JSPEC term
         string (str): The serialization of the JSPEC entity
+        _macros (tuple/None): The names of the JSPEC macros in the JSPEC term,
+            cached by ``jspec.macro.names``
 
     Args:
         value (obj): Python native object used to be converted to create
@@ -90,6 +106,7 @@ class JSPECTerm(JSPECEntity):
     def __init__(self, value):
         self.spec = self._converter(value)
         self.string = self._serializer(value)
+        self._macros = None
 
     def __eq__(self, other):
         if self.__class__ != other.__class__:
@@ -122,6 +139,11 @@ class JSPECObject(JSPECTerm):
             }
             where each pair_n is a ``JSPECObjectPair`` or a
             ``JSPECObjectCaptureGroup``.
+
+    Attributes:
+        _pairs (tuple/None): The JSPEC object pairs with literal keys, by key,
+            and the other JSPEC object pairs and captures, cached by
+            ``jspec.matcher``
     """
 
     COVERTER = lambda pairs: pairs
@@ -133,6 +155,10 @@ class JSPECObject(JSPECTerm):
     curly parentheses.
     """
 
+    def __init__(self, value):
+        JSPECTerm.__init__(self, value)
+        self._pairs = None
+
     def satisfied_captures(self):
         return (
             all(isinstance(spec, JSPECCapture) for spec in self.spec)
@@ -222,6 +248,11 @@ class JSPECArray(JSPECTerm):
             ]
             where each value_x is a ``JSPECTerm`` or a
             ``JSPECArrayCaptureGroup``.
+
+    Attributes:
+        _suffixes (tuple/None): Whether each suffix of the JSPEC array only
+            has satisfied captures, and only has exhausted captures, cached by
+            ``jspec.matcher``
     """
 
     COVERTER = list
@@ -232,6 +263,10 @@ class JSPECArray(JSPECTerm):
     """func: Serialize the ``values`` by applying str.
     """
 
+    def __init__(self, value):
+        JSPECTerm.__init__(self, value)
+        self._suffixes = None
+
     def satisfied_captures(self):
         return (
             all(isinstance(spec, JSPECCapture) for spec in self.spec)
@@ -431,6 +466,11 @@ class JSPECConditional(JSPECTerm):
             ]
         where each term_x is a JSPECTerm, each operator_y is a
         JSPECLogicalOperator.
+
+    Attributes:
+        _union (tuple/None): The discriminator key and the terms for each of
+            its values, if this is a discriminated union, cached by
+            ``jspec.matcher``
     """
 
     COVERTER = list
@@ -443,6 +483,43 @@ class JSPECConditional(JSPECTerm):
     rounded parentheses.
     """
 
+    def __init__(self, value):
+        JSPECTerm.__init__(self, value)
+        self._union = None
+
+class JSPECNamedTerm(JSPECTerm):
+    """This class represents a JSPEC named term.
+
+    A JSPEC named term is a JSPEC term with a name, which binds the JSON
+    element it matches to the name, like a named group in a regex.
+
+    A JSON element will match with an instance of this class, provided it
+    matches the JSPEC term.
+
+    Args:
+        value (tuple): Tuple of the form:
+            value = (
+                name,
+                term,
+            )
+            where name is a string and term is a JSPECTerm.
+    """
+
+    COVERTER = tuple
+    """func: Converts the ``value`` into a Python tuple.
+    """
+
+    SERIALIZER = lambda value: "@%s %s" % value
+    """func: Serialize the ``value`` as the name preceded by an at sign, then
+    the serialization of the term.
+    """
+
+    def name(self):
+        return self.spec[0]
+
+    def term(self):
+        return self.spec[1]
+
 class JSPECLogicalOperator(JSPECEntity):
     """This class is the base class that represents a JSPEC logical operator.
     
@@ -624,6 +701,27 @@ class JSPECNumberPlaceholder(JSPECConditional):
     ``values``.
     """
 
+class JSPECCustomPlaceholder(JSPECTerm):
+    """This class represents a JSPEC custom placeholder.
+
+    A custom placeholder is a keyword registered with ``jspec.placeholder``,
+    such as 'uuid', which is serialized as the keyword itself.
+
+    A JSON element will match with an instance of this class, provided it
+    satisfies the predicate registered for the keyword.
+
+    Args:
+        name (str): The registered keyword of the placeholder.
+    """
+
+    COVERTER = str
+    """func: Converts the ``name`` into a Python string.
+    """
+
+    SERIALIZER = lambda name: name
+    """func: Returns the keyword of the placeholder.
+    """
+
 class JSPECInequality(JSPECEntity):
     """This class represents a JSPEC inequality symbol.
     
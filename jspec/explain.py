@@ -0,0 +1,60 @@
+"""Command-line tool to explain how a JSPEC document is matched.
+
+Usage:
+
+    $ python3 -m jspec.explain <jspec_file>
+
+    -- Explain a JSPEC file
+    $ python3 -m jspec.explain ./test/assets/load.jspec
+    $  key lookup  O(n*m)  keys: "key"; pairs = 1  {"key": "value"}
+      $.key  literal  O(1)  "value"
+
+    Worst case: O(n*m)
+
+    The flag --raw-jspec can also be used to give the raw JSPEC document
+    instead of a file path. The exit code is 1 if there are any warnings.
+"""
+
+def main():
+    import argparse
+    import jspec
+
+    prog = 'python3 -m jspec.explain'
+    description = ('A simple command line tool to explain how a JSPEC document is matched')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        'jspec_file',
+        nargs='?',
+        type=argparse.FileType(encoding="utf-8"),
+        default=None,
+        help='a JSPEC file to be explained'
+    )
+    parser.add_argument(
+        '--raw-jspec',
+        dest='jspec_raw',
+        default=None,
+        help='raw JSPEC document, if none is provided in the other args'
+    )
+    options = parser.parse_args()
+
+    try:
+        if options.jspec_file is None:
+            if options.jspec_raw is None:
+                raise ValueError("The --raw-jspec flag value is not a valid JSPEC")
+            spec = jspec.loads(options.jspec_raw)
+        else:
+            spec = jspec.load(options.jspec_file)
+        explained = jspec.explain(spec)
+        sys.stdout.write(str(explained))
+        sys.stdout.write('\n')
+    except (jspec.scanner.JSPECDecodeError, ValueError) as exc:
+        raise SystemExit(exc)
+    if explained.warnings:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -0,0 +1,147 @@
+"""Module for the string formats of the built-in format placeholders.
+
+Each format is checked with string length and character tests, and by parsing
+the numeric components, rather than with a regex, since these checks are run
+for every JSON string matched against a format placeholder.
+"""
+
+import ipaddress
+
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+"""frozenset: Characters allowed in the hex groups of a UUID."""
+
+DIGITS = frozenset("0123456789")
+"""frozenset: ASCII digits, ``str.isdigit`` also accepts other digits."""
+
+EMAIL_LOCAL_CHARACTERS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!#$%&'*+-/=?^_`{|}~."
+)
+"""frozenset: Characters allowed in the local part of an email address."""
+
+DOMAIN_CHARACTERS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-"
+)
+"""frozenset: Characters allowed in a label of a domain name."""
+
+DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+"""tuple: The maximum number of days in each month, indexed from 1."""
+
+def is_uuid(element):
+    """Returns whether ``element`` is a UUID in its canonical hex form, e.g.
+    '123e4567-e89b-12d3-a456-426614174000'."""
+    if not isinstance(element, str) or len(element) != 36:
+        return False
+    if element[8] != "-" or element[13] != "-" or element[18] != "-" or element[23] != "-":
+        return False
+    digits = element.replace("-", "")
+    return len(digits) == 32 and HEX_DIGITS.issuperset(digits)
+
+def is_date(element):
+    """Returns whether ``element`` is an RFC 3339 full-date, e.g.
+    '2021-02-28'."""
+    if not isinstance(element, str) or len(element) != 10:
+        return False
+    return _is_date(element)
+
+def is_date_time(element):
+    """Returns whether ``element`` is an RFC 3339 date-time, e.g.
+    '2021-02-28T13:45:00.5Z' or '2021-02-28T13:45:00+01:00'."""
+    if not isinstance(element, str) or len(element) < 20:
+        return False
+    if element[10] not in "Tt" or not _is_date(element[:10]):
+        return False
+    if element[13] != ":" or element[16] != ":" or not DIGITS.issuperset(element[11:13] + element[14:16] + element[17:19]):
+        return False
+    if int(element[11:13]) > 23 or int(element[14:16]) > 59 or int(element[17:19]) > 60:
+        return False
+    idx = 19
+    if element[idx] == ".":
+        end = idx + 1
+        while end < len(element) and element[end] in DIGITS:
+            end += 1
+        if end == idx + 1:
+            return False
+        idx = end
+    offset = element[idx:]
+    if offset in ("Z", "z"):
+        return True
+    if len(offset) != 6 or offset[0] not in "+-" or offset[3] != ":":
+        return False
+    if not DIGITS.issuperset(offset[1:3] + offset[4:6]):
+        return False
+    return int(offset[1:3]) <= 23 and int(offset[4:6]) <= 59
+
+def is_ipv4(element):
+    """Returns whether ``element`` is an IPv4 address in dotted decimal form,
+    without leading zeros, e.g. '192.168.0.1'."""
+    if not isinstance(element, str) or not 7 <= len(element) <= 15:
+        return False
+    parts = element.split(".")
+    if len(parts) != 4:
+        return False
+    for part in parts:
+        if not part or len(part) > 3 or not DIGITS.issuperset(part):
+            return False
+        if part[0] == "0" and part != "0":
+            return False
+        if int(part) > 255:
+            return False
+    return True
+
+def is_ipv6(element):
+    """Returns whether ``element`` is an IPv6 address, without a scope, e.g.
+    '2001:db8::1'."""
+    if not isinstance(element, str) or not 2 <= len(element) <= 45 or "%" in element:
+        return False
+    try:
+        ipaddress.IPv6Address(element)
+    except ValueError:
+        return False
+    return True
+
+def is_email(element):
+    """Returns whether ``element`` looks like an email address, i.e. an
+    unquoted local part and a domain name with at least two labels, e.g.
+    'someone@example.com'."""
+    if not isinstance(element, str) or len(element) > 254:
+        return False
+    local, at, domain = element.rpartition("@")
+    if not at or not local or len(local) > 64 or not EMAIL_LOCAL_CHARACTERS.issuperset(local):
+        return False
+    if local[0] == "." or local[-1] == "." or ".." in local:
+        return False
+    labels = domain.split(".")
+    if len(labels) < 2:
+        return False
+    for label in labels:
+        if not label or len(label) > 63 or not DOMAIN_CHARACTERS.issuperset(label):
+            return False
+        if label[0] == "-" or label[-1] == "-":
+            return False
+    return True
+
+def _is_date(string):
+    """Returns whether the 10 character string ``string`` is an RFC 3339
+    full-date."""
+    if string[4] != "-" or string[7] != "-":
+        return False
+    year, month, day = string[:4], string[5:7], string[8:10]
+    if not DIGITS.issuperset(year + month + day):
+        return False
+    year, month, day = int(year), int(month), int(day)
+    if not 1 <= month <= 12 or not 1 <= day <= DAYS_IN_MONTH[month]:
+        return False
+    if month == 2 and day == 29:
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return True
+
+FORMATS = (
+    ("uuid", is_uuid, "a UUID"),
+    ("date", is_date, "an RFC 3339 date"),
+    ("date-time", is_date_time, "an RFC 3339 date-time"),
+    ("ipv4", is_ipv4, "an IPv4 address"),
+    ("ipv6", is_ipv6, "an IPv6 address"),
+    ("email", is_email, "an email address"),
+)
+"""tuple: The keyword, predicate and description of each built-in format
+placeholder."""
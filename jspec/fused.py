@@ -0,0 +1,168 @@
+"""Module for matching several JSPECs against the same JSON in one pass.
+
+The JSON is walked once. At each JSON object or array, the JSPEC terms bound
+to its children (see ``jspec.path``) are gathered from every JSPEC, so each
+subtree is only visited for the JSPECs which constrain it, and the results
+for the subtrees are kept in a memo table shared by the JSPECs. Identical
+JSPEC terms, which are common when JSPECs are layered on each other, share
+their entries in the memo table, so each is only matched once against a
+JSON element. Each JSPEC is then matched against the JSON, taking the results
+for its subtrees from the memo table, so the result for each JSPEC is exactly
+the result of ``match``.
+"""
+
+from . import matcher
+from . import path
+from .entity import (
+    JSPECEntity,
+    JSPECTerm,
+    JSPECNamedTerm,
+)
+
+class SharedMemo(dict):
+    """This class represents a memo table for ``matcher.Context``, where the
+    entries for identical JSPEC terms are shared.
+
+    The keys of the memo table start with the identity of the JSPEC term,
+    which is replaced by the identity of the first identical JSPEC term.
+
+    Attributes:
+        aliases (dict): The identity of the first identical JSPEC term, keyed
+            by the identity of each JSPEC term
+        terms (list): The JSPEC terms in ``aliases``, kept so their identities
+            can not be reused
+
+    Args:
+        specs (list): The JSPECs whose JSPEC terms are shared
+    """
+
+    def __init__(self, specs):
+        dict.__init__(self)
+        self.aliases = dict()
+        self.terms = list()
+        first = dict()
+        for spec in specs:
+            for term in _terms(spec.base):
+                canonical = first.setdefault((term.__class__, term.string), term)
+                if canonical is not term and canonical == term:
+                    self.aliases[id(term)] = id(canonical)
+                    self.terms.append(term)
+
+    def get(self, key, default=None):
+        term_id = self.aliases.get(key[0])
+        if term_id is not None:
+            key = (term_id,) + key[1:]
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        term_id = self.aliases.get(key[0])
+        if term_id is not None:
+            key = (term_id,) + key[1:]
+        dict.__setitem__(self, key, value)
+
+def match(specs, element, cache=None, macros=None, limits=None):
+    """Determine if each of the JSPECs matches the JSON, walking the JSON
+    once.
+
+    Args:
+        specs (list): The JSPECs to be checked against
+        element (obj): A Python native object representing a JSON
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees, shared between calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done for all of the
+            JSPECs together.
+
+    Returns:
+        list: For each JSPEC, a tuple of whether it was a good match, and
+            details on why the match failed if it was a bad match, otherwise
+            an empty string, as returned by ``matcher.match``.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of ``limits``.
+    """
+    ctx = matcher.Context(cache, macros, limits)
+    ctx.memo = SharedMemo(specs)
+    terms = _distinct(ctx.memo, [spec.base for spec in specs])
+    walk("$", terms, element, ctx)
+    results = list()
+    for spec in specs:
+        result = matcher.match_element("$", spec.base, element, ctx)
+        results.append((bool(result), result.reason()))
+    return results
+
+def walk(loc, terms, element, ctx):
+    """Match the JSPEC terms against the JSON object or array, after walking
+    its children with the JSPEC terms bound to them, storing each result in
+    the memo table of ``ctx``.
+
+    Args:
+        loc (str): The current location in the JSON
+        terms (list): The distinct JSPEC terms to match against ``element``
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+    """
+    if not isinstance(element, (dict, list)):
+        return
+    ctx.containers.append(element)
+    try:
+        _walk_children(loc, terms, element, ctx)
+    finally:
+        ctx.containers.pop()
+    for term in terms:
+        matcher.match_element(loc, term, element, ctx)
+
+def _walk_children(loc, terms, element, ctx):
+    """Walk the children of the JSON object or array with the JSPEC terms
+    bound to them, see ``walk``."""
+    if isinstance(element, dict):
+        children = dict()
+        for term in terms:
+            for key, value in (path.object_bindings(_unnamed(term)) or dict()).items():
+                if key in element:
+                    children.setdefault(key, list()).append(value)
+        for key, values in children.items():
+            walk(loc + "." + key, _distinct(ctx.memo, values), element[key], ctx)
+    else:
+        children = dict()
+        for term in terms:
+            term = _unnamed(term)
+            for idx, value in enumerate((path.array_bindings(term) or list())[:len(element)]):
+                children.setdefault(("%s[%s]" % (loc, idx), idx), list()).append(value)
+            value = path.array_element_binding(term)
+            if value is not None:
+                # Array captures match their JSPEC terms at the location of
+                # the JSON array.
+                for idx in range(len(element)):
+                    children.setdefault((loc, idx), list()).append(value)
+        for (child_loc, idx), values in children.items():
+            walk(child_loc, _distinct(ctx.memo, values), element[idx], ctx)
+
+def _unnamed(term):
+    """Returns the JSPEC term named by any JSPEC named terms."""
+    while isinstance(term, JSPECNamedTerm):
+        term = term.term()
+    return term
+
+def _distinct(memo, terms):
+    """Returns the JSPEC terms, without any which are identical to an earlier
+    JSPEC term in the shared memo table ``memo``."""
+    distinct = dict()
+    for term in terms:
+        distinct.setdefault(memo.aliases.get(id(term), id(term)), term)
+    return list(distinct.values())
+
+def _terms(entity):
+    """Yields the JSPEC term ``entity`` and every JSPEC term within it."""
+    stack = [entity]
+    while stack:
+        entity = stack.pop()
+        if isinstance(entity, JSPECTerm):
+            yield entity
+        for attr in ("spec", "entities"):
+            value = getattr(entity, attr, None)
+            if isinstance(value, JSPECEntity):
+                stack.append(value)
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                stack.extend(v for v in value if isinstance(v, JSPECEntity))
@@ -0,0 +1,418 @@
+"""Module for searching for JSONs which are slow to match against a JSPEC.
+
+Starting from a JSON shaped like the JSPEC, and any seed JSONs, the search
+repeatedly mutates the slowest JSONs found so far, growing arrays, objects
+and strings and replacing elements with elements of other types, and keeps
+the mutants which take the most work to match. New keys and elements are
+taken from the words of the JSPEC, its strings and numbers and the literal
+parts of its regex patterns, so mutants reach the parts of the JSPEC guarded
+by them, such as an object capture with a regex key. The work is measured as the
+number of steps taken by the matcher (see ``jspec.limits``), or the time taken.
+
+The size of each JSON, the length of its serialization, is bounded, so the
+search finds the JSONs with the most work for their size, such as a JSON
+array which makes the captures of a JSPEC array backtrack, rather than just
+the largest JSONs. The slowest JSONs are saved as a regression corpus, which
+can be replayed against the JSPEC after it changes.
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+
+from . import limits
+from . import matcher
+from .entity import (
+    JSPECEntity,
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECNegation,
+    JSPECConditional,
+    JSPECNamedTerm,
+    JSPECObjectPlaceholder,
+    JSPECArrayPlaceholder,
+    JSPECStringPlaceholder,
+    JSPECBooleanPlaceholder,
+    JSPECIntPlaceholder,
+    JSPECRealPlaceholder,
+    JSPECNumberPlaceholder,
+)
+from .path import REGEX_METACHARACTERS
+
+METRICS = ("steps", "time")
+"""tuple: The measures of the work done to match a JSON."""
+
+SCALARS = (0, 1, -1, 1.5, "", "a", True, False, None)
+"""tuple: The JSON elements which replace elements of other types."""
+
+MAX_STEPS = 1000000
+"""int: The default maximum number of steps for matching each JSON, so a JSON
+which makes the matcher run for too long ends the search."""
+
+class Sample:
+    """This class represents the work done to match a JSON against a JSPEC.
+
+    Attributes:
+        element (obj): The Python native object representing the JSON
+        steps (int): The number of steps taken
+        seconds (float): The time taken in seconds
+        size (int): The length of the serialization of the JSON
+        good (bool/None): Whether the JSON was a good match, or None if the
+            match exceeded the maximum number of steps
+    """
+
+    def __init__(self, element, steps, seconds, size, good):
+        self.element = element
+        self.steps = steps
+        self.seconds = seconds
+        self.size = size
+        self.good = good
+
+    def __repr__(self):
+        return "Sample(steps=%d, seconds=%.6f, size=%d)" % (self.steps, self.seconds, self.size)
+
+    def exceeded(self):
+        """Returns whether the match exceeded the maximum number of steps."""
+        return self.good is None
+
+    def digest(self):
+        """Returns the hex digest of the canonical serialization of the JSON."""
+        return hashlib.sha1(_dumps(self.element).encode("utf-8")).hexdigest()
+
+def measure(spec, element, macros=None, max_steps=MAX_STEPS):
+    """Match the JSON against the JSPEC, measuring the work done.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        element (obj): A Python native object representing a JSON
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        max_steps (int/None, optional): The maximum number of steps, after
+            which the match is abandoned.
+
+    Returns:
+        Sample: The work done to match ``element``.
+    """
+    ctx = matcher.Context(None, macros, limits.Limits(max_steps=max_steps))
+    start = time.perf_counter()
+    try:
+        good = bool(matcher.match_element("$", spec.base, element, ctx))
+    except limits.JSPECLimitError:
+        good = None
+    seconds = time.perf_counter() - start
+    return Sample(element, ctx.steps, seconds, len(_dumps(element)), good)
+
+def search(spec, iterations=1000, max_size=1024, metric="steps", seeds=None,
+        keep=10, seed=None, macros=None, max_steps=MAX_STEPS):
+    """Search for the JSONs which take the most work to match against the
+    JSPEC.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        iterations (int, optional): The number of mutants to measure.
+        max_size (int, optional): The maximum length of the serialization of
+            each JSON.
+        metric (str, optional): The measure of the work done, one of
+            ``METRICS``.
+        seeds (list, optional): The JSONs to start from, as well as a JSON
+            shaped like ``spec``.
+        keep (int, optional): The number of the slowest JSONs to keep.
+        seed (int, optional): The seed for the random mutations, omit for a
+            different search each time.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        max_steps (int/None, optional): The maximum number of steps for
+            matching each JSON. The search ends early once a JSON exceeds it.
+
+    Returns:
+        list: The ``Sample`` of each of the slowest JSONs, the slowest first.
+
+    Raises:
+        ValueError: If ``metric`` is not one of ``METRICS``.
+    """
+    if metric not in METRICS:
+        raise ValueError("Expecting a metric in %s not '%s'" % (", ".join(METRICS), metric))
+    # Ties are broken by the smaller JSON, and the steps are counted exactly,
+    # so a search with a seed finds the same JSONs each time.
+    rank = (lambda s: (s.steps, -s.size)) if metric == "steps" else (lambda s: (s.seconds, s.steps))
+    rng = random.Random(seed)
+    words = dictionary(spec)
+    samples = dict()
+    for element in [example(spec.base)] + list(seeds or list()):
+        if len(_dumps(element)) <= max_size:
+            sample = measure(spec, element, macros, max_steps)
+            samples[sample.digest()] = sample
+    if not samples:
+        sample = measure(spec, None, macros, max_steps)
+        samples[sample.digest()] = sample
+    slowest = sorted(samples.values(), key=rank, reverse=True)[:keep]
+    for _ in range(iterations):
+        if slowest[0].exceeded():
+            break
+        element = rng.choice(slowest).element
+        for _ in range(rng.randint(1, 3)):
+            element = mutate(element, rng, max_size, words)
+        sample = measure(spec, element, macros, max_steps)
+        digest = sample.digest()
+        if digest in samples:
+            continue
+        samples[digest] = sample
+        if len(slowest) < keep or rank(sample) > rank(slowest[-1]):
+            slowest = sorted(slowest + [sample], key=rank, reverse=True)[:keep]
+    return slowest
+
+def mutate(element, rng, max_size=None, words=()):
+    """Returns a copy of the JSON with a single random mutation.
+
+    One JSON element within ``element`` is chosen, and a JSON array is grown,
+    doubled or shrunk, a JSON object has a pair added or removed, a JSON
+    string is grown, or the element is replaced by an element of another type.
+
+    Args:
+        element (obj): A Python native object representing a JSON
+        rng (random.Random): The source of randomness
+        max_size (int, optional): The maximum length of the serialization of
+            the mutant. A mutant which is too large is not returned.
+        words (tuple, optional): The strings and numbers to use in new keys
+            and elements, as well as ``SCALARS``.
+
+    Returns:
+        obj: The mutant, or a copy of ``element`` if no mutant is small
+            enough.
+    """
+    for _ in range(8):
+        mutant = json.loads(_dumps(element))
+        slots = list(_slots(mutant))
+        parent, key = rng.choice(slots)
+        value = mutant if parent is None else parent[key]
+        value = rng.choice(MUTATIONS[_kind(value)])(value, rng, words)
+        if parent is None:
+            mutant = value
+        else:
+            parent[key] = value
+        if max_size is None or len(_dumps(mutant)) <= max_size:
+            return mutant
+    return json.loads(_dumps(element))
+
+def save(samples, directory):
+    """Save the JSON of each sample as a file in ``directory``, named by its
+    digest, so saving the same JSON again replaces its file.
+
+    Args:
+        samples (list): The ``Sample`` instances
+        directory (str): The path of the directory, which is created if it
+            does not exist
+
+    Returns:
+        list: The paths of the files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = list()
+    for sample in samples:
+        path = os.path.join(directory, "%s.json" % sample.digest())
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(_dumps(sample.element))
+            file.write("\n")
+        paths.append(path)
+    return paths
+
+def replay(spec, directory, macros=None, max_steps=MAX_STEPS):
+    """Measure each JSON saved in ``directory`` against the JSPEC, e.g. to
+    check a changed JSPEC against a regression corpus.
+
+    Returns:
+        list: The file name and ``Sample`` of each JSON, in the order of the
+            file names.
+    """
+    results = list()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as file:
+            element = json.load(file)
+        results.append((name, measure(spec, element, macros, max_steps)))
+    return results
+
+def dictionary(spec):
+    """Returns the words of the JSPEC, which are its JSPEC strings and object
+    keys, with any regex metacharacters removed, and its numbers.
+
+    Args:
+        spec (JSPEC): The JSPEC.
+
+    Returns:
+        tuple: The distinct strings and numbers, in a fixed order.
+    """
+    words = set()
+    stack = [spec.base]
+    while stack:
+        entity = stack.pop()
+        if entity.__class__ is JSPECString:
+            words.add("".join(c for c in entity.spec if c not in REGEX_METACHARACTERS))
+        elif entity.__class__ in (JSPECInt, JSPECReal):
+            words.add(entity.spec)
+        elif isinstance(entity, (JSPECIntPlaceholder, JSPECRealPlaceholder, JSPECNumberPlaceholder)):
+            if entity.spec is not None:
+                words.add(entity.spec[1])
+        for attr in ("spec", "entities"):
+            value = getattr(entity, attr, None)
+            if isinstance(value, JSPECEntity):
+                stack.append(value)
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                stack.extend(v for v in value if isinstance(v, JSPECEntity))
+    return tuple(sorted(words, key=lambda w: (isinstance(w, str), str(w))))
+
+def example(term):
+    """Returns a JSON shaped like the JSPEC term, which need not match it, to
+    start a search from.
+
+    Args:
+        term (JSPECTerm): The JSPEC term.
+
+    Returns:
+        obj: A Python native object representing a JSON.
+    """
+    for cls in term.__class__.__mro__:
+        build = EXAMPLES.get(cls)
+        if build is not None:
+            return build(term)
+    return None
+
+def _dumps(element):
+    return json.dumps(element, sort_keys=True, separators=(",", ":"))
+
+def _slots(element):
+    """Yields the parent and key of every JSON element within ``element``,
+    where the parent of ``element`` itself is None."""
+    yield None, None
+    stack = [element] if isinstance(element, (dict, list)) else list()
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            yield container, key
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+
+def _kind(value):
+    if isinstance(value, (dict, list, str)):
+        return type(value)
+    return None
+
+def _replace(value, rng, words):
+    choices = [s for s in SCALARS + tuple(words) + ([], {}) if type(s) is not type(value) or s != value]
+    return rng.choice(choices)
+
+def _append_copy(value, rng, words):
+    return value + [rng.choice(value) if value else _word(rng, words)]
+
+def _append_other(value, rng, words):
+    return value + [_replace(value[-1] if value else None, rng, words)]
+
+def _insert_copy(value, rng, words):
+    idx = rng.randint(0, len(value))
+    return value[:idx] + [rng.choice(value) if value else _word(rng, words)] + value[idx:]
+
+def _double(value, rng, words):
+    return value + json.loads(_dumps(value))
+
+def _remove(value, rng, words):
+    if not value:
+        return value
+    if isinstance(value, list):
+        idx = rng.randrange(len(value))
+        return value[:idx] + value[idx + 1:]
+    key = rng.choice(sorted(value))
+    return dict((k, v) for k, v in value.items() if k != key)
+
+def _add_pair(value, rng, words):
+    keys = sorted(value) + [w for w in words if isinstance(w, str)]
+    key = rng.choice(keys) if keys else ""
+    new_key = key + rng.choice("abcxyz0_")
+    new_value = value[key] if key in value else _word(rng, words)
+    mutant = dict(value)
+    mutant[new_key] = new_value
+    return mutant
+
+def _grow_string(value, rng, words):
+    return value + (value or rng.choice("abcxyz0_"))
+
+def _word(rng, words):
+    return rng.choice(SCALARS + tuple(words))
+
+def _append_character(value, rng, words):
+    return value + rng.choice("abcxyz0_ ")
+
+MUTATIONS = {
+    list: (_append_copy, _append_other, _insert_copy, _double, _remove, _replace),
+    dict: (_add_pair, _add_pair, _remove, _replace),
+    str: (_grow_string, _append_character, _replace),
+    None: (_replace,),
+}
+"""dict: The mutations for each kind of JSON element, keyed by the Python
+native type, or None for any other JSON element."""
+
+def _example_object(term):
+    element = dict()
+    for pair in term.spec:
+        if isinstance(pair, JSPECObjectPair) and not isinstance(pair.key(), JSPECStringPlaceholder):
+            if not REGEX_METACHARACTERS.intersection(pair.key().spec):
+                element[pair.key().spec] = example(pair.value())
+    return element
+
+def _example_array(term):
+    element = list()
+    for entity in term.spec:
+        if isinstance(entity, JSPECArrayCaptureGroup):
+            element.extend(example(entity.entities[0]) for _ in range(entity.multiplier.minimum or 0))
+        else:
+            element.append(example(entity))
+    return element
+
+def _example_string(term):
+    return "" if REGEX_METACHARACTERS.intersection(term.spec) else term.spec
+
+def _example_literal(term):
+    return term.spec
+
+def _example_inequality(default):
+    def build(term):
+        if term.spec is None:
+            return default
+        symbol, value = term.spec
+        return value + {">": 1, "<": -1, "!=": 1}.get(str(symbol), 0)
+    return build
+
+def _example_negation(term):
+    return 0 if isinstance(example(term.spec), type(None)) else None
+
+EXAMPLES = {
+    JSPECObjectPlaceholder: lambda term: dict(),
+    JSPECArrayPlaceholder: lambda term: list(),
+    JSPECStringPlaceholder: lambda term: "",
+    JSPECBooleanPlaceholder: lambda term: False,
+    JSPECIntPlaceholder: _example_inequality(0),
+    JSPECRealPlaceholder: _example_inequality(0.0),
+    JSPECNumberPlaceholder: _example_inequality(0),
+    JSPECObject: _example_object,
+    JSPECArray: _example_array,
+    JSPECString: _example_string,
+    JSPECInt: _example_literal,
+    JSPECReal: _example_literal,
+    JSPECBoolean: _example_literal,
+    JSPECNull: _example_literal,
+    JSPECNegation: _example_negation,
+    JSPECConditional: lambda term: example(term.spec[0]),
+    JSPECNamedTerm: lambda term: example(term.term()),
+}
+"""dict: The function building the example JSON for each class of JSPEC term,
+found by the method resolution order of the class."""
@@ -0,0 +1,88 @@
+"""Command-line tool to generate random JSON documents which match a JSPEC
+document, written as NDJSON for building benchmark corpora.
+
+Usage:
+
+    $ python3 -m jspec.generate <jspec_file> -n <count>
+
+    -- Generate three JSON documents for a JSPEC file
+    $ python3 -m jspec.generate ./specs/event.jspec -n 3 --seed 1
+    {"id":"k2TgS7","size":412}
+    {"id":"Qx0","size":87}
+    {"id":"bW9aLm1","size":905}
+
+    The flag --raw-jspec can also be used to give the raw JSPEC document
+    instead of a file path. Macros can be given with --macro NAME=VALUE, where
+    VALUE is JSON, and are otherwise resolved from the environment variables.
+"""
+
+def main():
+    import argparse
+    import json
+    import jspec
+
+    prog = 'python3 -m jspec.generate'
+    description = ('A simple command line tool to generate random JSON documents which match a JSPEC document')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        'jspec_file',
+        nargs='?',
+        type=argparse.FileType(encoding="utf-8"),
+        default=None,
+        help='a JSPEC file to generate JSON documents for'
+    )
+    parser.add_argument(
+        '--raw-jspec',
+        dest='jspec_raw',
+        default=None,
+        help='raw JSPEC document, if none is provided in the other args'
+    )
+    parser.add_argument('-n', dest='count', type=int, default=1, help='the number of JSON documents to generate')
+    parser.add_argument('--seed', type=int, default=None, help='the seed for the random JSON documents')
+    parser.add_argument(
+        '--macro',
+        dest='macros',
+        action='append',
+        default=list(),
+        help='a macro value as NAME=JSON, can be given more than once'
+    )
+    parser.add_argument(
+        '--no-verify',
+        dest='verify',
+        action='store_false',
+        help='do not check each JSON document against the JSPEC document'
+    )
+    options = parser.parse_args()
+
+    try:
+        if options.jspec_file is None:
+            if options.jspec_raw is None:
+                raise ValueError("The --raw-jspec flag value is not a valid JSPEC")
+            spec = jspec.loads(options.jspec_raw)
+        else:
+            spec = jspec.load(options.jspec_file)
+        macros = None
+        if options.macros:
+            macros = dict()
+            for option in options.macros:
+                name, sep, value = option.partition('=')
+                if not sep:
+                    raise ValueError("The --macro flag value '%s' is not NAME=JSON" % option)
+                macros[name] = json.loads(value)
+        jspec.generator.write_ndjson(
+            spec,
+            options.count,
+            sys.stdout,
+            seed=options.seed,
+            macros=macros,
+            verify=options.verify,
+        )
+    except (jspec.scanner.JSPECDecodeError, ValueError) as exc:
+        raise SystemExit(exc)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
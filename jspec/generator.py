@@ -0,0 +1,580 @@
+"""Module for generating random JSONs which match a JSPEC.
+
+Each JSON is built from the JSPEC terms:
+    JSPEC objects: a pair for each JSPEC pair, with a key made for a regex or
+        string placeholder key, and between the minimum and maximum number of
+        pairs for each object capture. An ellipsis adds a few random pairs.
+    JSPEC arrays: an element for each JSPEC term, and between the minimum and
+        maximum number of elements for each array capture. An ellipsis adds a
+        few random elements. Unbounded captures and string lengths are capped
+        by ``max_repeat``.
+    JSPEC strings: a string made for the regex pattern, for the common subset
+        of literals, character classes, alternations, groups, backreferences
+        and repeats.
+    placeholders: a random element of the type, within any inequality, and a
+        string of the format for the format placeholders, e.g. 'uuid'.
+    macros: the value resolved from the macros given.
+    conditionals and negations: a random alternative, or a random element,
+        which is kept if it matches. A conjunction of number placeholders,
+        e.g. (int >= 1 & int <= 12), gives a number within all of their
+        inequalities.
+Each JSON is then checked against the JSPEC, and built again if it does not
+match, e.g. when a key made for an object capture is taken by a JSPEC pair
+with a regex key, so every JSON generated is a good match. Checking can be
+turned off, for JSPECs whose JSONs take many steps to check, e.g. JSPEC
+objects with an ellipsis and many pairs, at the risk of the odd JSON which
+does not match.
+
+The JSONs are generated one at a time, so a corpus of any size can be written
+as NDJSON without holding it in memory.
+"""
+
+import json
+import math
+import random
+import string as characters
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from . import limits
+from . import macro
+from . import matcher
+from .entity import (
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectCaptureGroup,
+    JSPECObjectEllipsis,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECArrayEllipsis,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECWildcard,
+    JSPECNegation,
+    JSPECMacro,
+    JSPECConditional,
+    JSPECLogicalOperatorAnd,
+    JSPECNamedTerm,
+    JSPECObjectPlaceholder,
+    JSPECArrayPlaceholder,
+    JSPECStringPlaceholder,
+    JSPECBooleanPlaceholder,
+    JSPECIntPlaceholder,
+    JSPECRealPlaceholder,
+    JSPECNumberPlaceholder,
+    JSPECCustomPlaceholder,
+)
+
+MAX_REPEAT = 8
+"""int: The default number of extra elements, pairs or characters for an
+unbounded capture, ellipsis or regex repeat."""
+
+ATTEMPTS = 100
+"""int: The number of times a JSON, or part of one, is built before giving
+up."""
+
+MAX_STEPS = 100000
+"""int: The maximum number of steps for checking a JSON against the JSPEC. A
+JSON which takes more steps, e.g. by making the captures of the JSPEC
+backtrack, is built again."""
+
+SPAN = 1000
+"""int: The width of the range of numbers generated for a number placeholder,
+starting from the bound of any inequality."""
+
+WORD_CHARACTERS = characters.ascii_letters + characters.digits + "_"
+"""str: The characters for random strings and the '\\w' regex class."""
+
+PRINTABLE_CHARACTERS = characters.ascii_letters + characters.digits + " -_.:/@"
+"""str: The characters for the '.' regex class and negated regex classes."""
+
+class JSPECGenerateError(ValueError):
+    """Subclass of ValueError, raised when a JSON matching a JSPEC can not be
+    generated.
+
+    Attributes:
+        loc (str): The location in the JSON which could not be generated
+
+    Args:
+        msg (str): The unformatted error message
+        loc (str): The location in the JSON which could not be generated
+    """
+
+    def __init__(self, msg, loc):
+        self.loc = loc
+        ValueError.__init__(self, "At location %s - %s" % (loc, msg))
+
+class Generator:
+    """This class represents the state of generating JSONs for a JSPEC.
+
+    Attributes:
+        rng (random.Random): The source of randomness
+        macros (MacroResolver): The resolver for the values of JSPEC macros
+        max_repeat (int): The number of extra elements, pairs or characters
+            for an unbounded capture, ellipsis or regex repeat
+
+    Args:
+        seed (int, optional): The seed for the random JSONs, omit for
+            different JSONs each time.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        max_repeat (int, optional): The number of extra elements, pairs or
+            characters for an unbounded capture, ellipsis or regex repeat.
+    """
+
+    def __init__(self, seed=None, macros=None, max_repeat=MAX_REPEAT):
+        self.rng = random.Random(seed)
+        self.macros = macro.resolver(macros)
+        self.max_repeat = max_repeat
+
+    def matches(self, term, element):
+        """Returns whether the JSON element matches the JSPEC term within
+        ``MAX_STEPS`` steps."""
+        ctx = matcher.Context(None, self.macros, limits.Limits(max_steps=MAX_STEPS))
+        try:
+            return bool(matcher.match_element("$", term, element, ctx))
+        except limits.JSPECLimitError:
+            return False
+
+    def repeat(self, minimum, maximum):
+        """Returns a random count between ``minimum`` and ``maximum``, where
+        None is 0 for ``minimum`` and unbounded for ``maximum``."""
+        minimum = minimum or 0
+        if maximum is None:
+            maximum = minimum + self.max_repeat
+        return self.rng.randint(minimum, maximum)
+
+    def element(self, depth=2):
+        """Returns a random JSON element, nested at most ``depth`` deep."""
+        kinds = ("null", "bool", "int", "real", "string") + (("array", "object") if depth > 0 else ())
+        kind = self.rng.choice(kinds)
+        if kind == "null":
+            return None
+        if kind == "bool":
+            return self.rng.random() < 0.5
+        if kind == "int":
+            return self.rng.randint(-SPAN, SPAN)
+        if kind == "real":
+            return round(self.rng.uniform(-SPAN, SPAN), 3)
+        if kind == "string":
+            return self.word()
+        if kind == "array":
+            return [self.element(depth - 1) for _ in range(self.rng.randint(0, 3))]
+        return dict((self.word(), self.element(depth - 1)) for _ in range(self.rng.randint(0, 3)))
+
+    def word(self, minimum=1):
+        """Returns a random string of word characters."""
+        length = self.rng.randint(minimum, minimum + self.max_repeat)
+        return "".join(self.rng.choice(WORD_CHARACTERS) for _ in range(length))
+
+def generate(spec, n, seed=None, macros=None, max_repeat=MAX_REPEAT, verify=True):
+    """Yields ``n`` random JSONs which match the JSPEC ``spec``, one at a time.
+
+    Args:
+        spec (JSPEC): The JSPEC to be matched
+        n (int): The number of JSONs
+        seed (int, optional): The seed for the random JSONs, omit for
+            different JSONs each time.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        max_repeat (int, optional): The number of extra elements, pairs or
+            characters for an unbounded capture, ellipsis or regex repeat.
+        verify (bool, optional): Whether each JSON is checked against
+            ``spec``, and built again if it does not match.
+
+    Yields:
+        obj: A Python native object representing a JSON which matches
+            ``spec``.
+
+    Raises:
+        JSPECGenerateError: If a JSON matching ``spec`` can not be generated,
+            e.g. for a regex outside of the supported subset or a missing
+            macro.
+    """
+    gen = Generator(seed, macros, max_repeat)
+    for _ in range(n):
+        yield generate_one(spec, gen, verify)
+
+def generate_one(spec, gen, verify=True):
+    """Returns a random JSON which matches the JSPEC ``spec``.
+
+    Args:
+        spec (JSPEC): The JSPEC to be matched
+        gen (Generator): The state of generating JSONs
+        verify (bool, optional): Whether the JSON is checked against
+            ``spec``, and built again if it does not match.
+
+    Returns:
+        obj: A Python native object representing a JSON which matches
+            ``spec``.
+
+    Raises:
+        JSPECGenerateError: If a JSON matching ``spec`` can not be generated.
+    """
+    for _ in range(ATTEMPTS):
+        element = generate_term("$", spec.base, gen)
+        if not verify or gen.matches(spec.base, element):
+            return element
+    raise JSPECGenerateError("failed to generate a JSON matching '%s' after %d attempts" % (spec, ATTEMPTS), "$")
+
+def write_ndjson(spec, n, file, seed=None, macros=None, max_repeat=MAX_REPEAT, verify=True):
+    """Write ``n`` random JSONs which match the JSPEC ``spec`` to ``file`` as
+    NDJSON, a line for each JSON, generating them one at a time.
+
+    Args:
+        spec (JSPEC): The JSPEC to be matched
+        n (int): The number of JSONs
+        file (file): File to write to. Must support the write method.
+        seed (int, optional): The seed for the random JSONs.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        max_repeat (int, optional): The number of extra elements, pairs or
+            characters for an unbounded capture, ellipsis or regex repeat.
+        verify (bool, optional): Whether each JSON is checked against
+            ``spec``, and built again if it does not match.
+
+    Returns:
+        int: The number of JSONs written.
+
+    Raises:
+        JSPECGenerateError: If a JSON matching ``spec`` can not be generated.
+    """
+    count = 0
+    for element in generate(spec, n, seed, macros, max_repeat, verify):
+        file.write(json.dumps(element, separators=(",", ":")))
+        file.write("\n")
+        count += 1
+    return count
+
+def generate_term(loc, term, gen):
+    """Returns a random JSON element for the JSPEC term, which is likely, but
+    not certain, to match it.
+
+    Args:
+        loc (str): The location in the JSON of the element
+        term (JSPECTerm): The JSPEC term
+        gen (Generator): The state of generating JSONs
+
+    Returns:
+        obj: A Python native object representing a JSON element.
+
+    Raises:
+        JSPECGenerateError: If an element for ``term`` can not be generated.
+    """
+    for cls in term.__class__.__mro__:
+        builder = GENERATORS.get(cls)
+        if builder is not None:
+            return builder(loc, term, gen)
+    return _generate_matching(loc, term, gen)
+
+def generate_string(loc, pattern, gen):
+    """Returns a random string which fully matches the regex ``pattern``.
+
+    Args:
+        loc (str): The location in the JSON of the string
+        pattern (str): The regex pattern
+        gen (Generator): The state of generating JSONs
+
+    Returns:
+        str: The string.
+
+    Raises:
+        JSPECGenerateError: If ``pattern`` is not a valid regex, or uses a
+            feature outside of the supported subset, e.g. lookarounds.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        raise JSPECGenerateError("invalid regex pattern '%s'" % pattern, loc) from None
+    groups = dict()
+    try:
+        return _regex(parsed, gen, groups)
+    except KeyError as err:
+        raise JSPECGenerateError("unsupported regex feature %s in the pattern '%s'" % (err.args[0], pattern), loc) from None
+
+def _generate_object(loc, term, gen):
+    element = dict()
+    for entity in sorted(term.spec, key=str):
+        if isinstance(entity, JSPECObjectEllipsis):
+            for _ in range(gen.rng.randint(0, 3)):
+                _add_pair(loc, element, JSPECStringPlaceholder(), JSPECWildcard(), gen)
+        elif isinstance(entity, JSPECObjectCaptureGroup):
+            pairs = entity.entities[::2]
+            if len(pairs) > 1 and _conjunction(entity.entities):
+                # Every pair must match, so the key is made for the first and
+                # the value for all of their values
+                values = list(entity.entities)
+                values[::2] = [pair.value() for pair in pairs]
+                pairs = [JSPECObjectPair((pairs[0].key(), JSPECConditional(values)))]
+            for _ in range(gen.repeat(entity.multiplier.minimum, entity.multiplier.maximum)):
+                pair = gen.rng.choice(pairs)
+                _add_pair(loc, element, pair.key(), pair.value(), gen)
+        else:
+            _add_pair(loc, element, entity.key(), entity.value(), gen)
+    return element
+
+def _add_pair(loc, element, key, value, gen):
+    """Adds a pair for the JSPEC object pair key and value to the JSON object
+    ``element``, with a key which is not already in ``element``."""
+    for _ in range(ATTEMPTS):
+        if isinstance(key, JSPECStringPlaceholder):
+            name = gen.word()
+        else:
+            name = generate_string(loc, key.spec, gen)
+        if name not in element:
+            element[name] = generate_term(loc + "." + name, value, gen)
+            return
+    raise JSPECGenerateError("failed to generate a new key for the JSPEC pair key '%s'" % key, loc)
+
+def _generate_array(loc, term, gen):
+    element = list()
+    for entity in term.spec:
+        if isinstance(entity, JSPECArrayEllipsis):
+            count = gen.rng.randint(0, 3)
+            element.extend(gen.element() for _ in range(count))
+        elif isinstance(entity, JSPECArrayCaptureGroup):
+            term = entity.entities[0] if len(entity.entities) == 1 else JSPECConditional(entity.entities)
+            for _ in range(gen.repeat(entity.multiplier.minimum, entity.multiplier.maximum)):
+                element.append(generate_term("%s[%d]" % (loc, len(element)), term, gen))
+        else:
+            element.append(generate_term("%s[%d]" % (loc, len(element)), entity, gen))
+    return element
+
+def _generate_string(loc, term, gen):
+    return generate_string(loc, term.spec, gen)
+
+def _generate_literal(loc, term, gen):
+    return term.spec
+
+def _generate_number(kind):
+    """Returns the generator for an int, real or number placeholder."""
+    def build(loc, term, gen):
+        return _generate_bounded(loc, term, (term,), kind, gen)
+    return build
+
+def _bounds(terms):
+    """Returns the intersection of the inequalities of the number
+    placeholders ``terms``, as a pair of the lowest number and whether it is
+    excluded, and a pair of the highest, where None is unbounded."""
+    low, high = (None, False), (None, False)
+    for term in terms:
+        if term.spec is None:
+            continue
+        symbol, value = term.spec
+        strict = str(symbol) in ("<", ">")
+        if str(symbol) in ("<", "<="):
+            if high[0] is None or value < high[0] or (value == high[0] and strict):
+                high = (value, strict)
+        elif low[0] is None or value > low[0] or (value == low[0] and strict):
+            low = (value, strict)
+    return low, high
+
+def _generate_bounded(loc, term, numbers, kind, gen):
+    """Returns a random number matching the JSPEC term, drawn from the
+    intersection of the inequalities of the number placeholders ``numbers``,
+    each of which ``term`` must satisfy. ``kind`` is int or float, or None for
+    either."""
+    (low, low_strict), (high, high_strict) = _bounds(numbers)
+    if low is None and high is None:
+        low, high = -SPAN, SPAN
+    elif low is None:
+        low = high - SPAN
+    elif high is None:
+        high = low + SPAN
+    first = math.floor(low) + 1 if low_strict else math.ceil(low)
+    last = math.ceil(high) - 1 if high_strict else math.floor(high)
+    ints = first <= last
+    reals = low < high or (low == high and not (low_strict or high_strict))
+    if not (ints if kind is int else reals):
+        raise JSPECGenerateError("no number matches '%s'" % term, loc)
+    chosen = kind if kind is not None or not ints else gen.rng.choice((int, float))
+    for _ in range(ATTEMPTS):
+        if chosen is int:
+            number = gen.rng.randint(int(first), int(last))
+        else:
+            number = gen.rng.uniform(low, high)
+            if gen.matches(term, round(number, 3)):
+                return round(number, 3)
+        if gen.matches(term, number):
+            return number
+    raise JSPECGenerateError("failed to generate a JSON element matching '%s'" % term, loc)
+
+NUMBER_KINDS = {
+    JSPECIntPlaceholder: int,
+    JSPECRealPlaceholder: float,
+    JSPECNumberPlaceholder: None,
+}
+"""dict: The kind of number of each class of number placeholder, None for
+either an int or a real."""
+
+def _generate_custom(loc, term, gen):
+    builder = FORMAT_GENERATORS.get(term.spec)
+    if builder is not None:
+        return builder(gen)
+    return _generate_matching(loc, term, gen)
+
+def _generate_macro(loc, term, gen):
+    status, value = gen.macros.resolve(term.spec)
+    if status == macro.MACRO_MISSING:
+        raise JSPECGenerateError("failed to find the JSPEC macro '%s'" % term, loc)
+    if status == macro.MACRO_INVALID:
+        raise JSPECGenerateError("failed to parse the JSPEC macro '%s' as a JSON element" % term, loc)
+    return json.loads(json.dumps(value))
+
+def _generate_conditional(loc, term, gen):
+    alternatives = term.spec[::2]
+    if _conjunction(term.spec):
+        numbers = [t for t in alternatives if t.__class__ in NUMBER_KINDS]
+        if numbers:
+            kinds = set(NUMBER_KINDS[t.__class__] for t in numbers) - {None}
+            if len(kinds) > 1:
+                raise JSPECGenerateError("no number matches '%s'" % term, loc)
+            return _generate_bounded(loc, term, numbers, kinds.pop() if kinds else None, gen)
+    for _ in range(ATTEMPTS):
+        element = generate_term(loc, gen.rng.choice(alternatives), gen)
+        if gen.matches(term, element):
+            return element
+    raise JSPECGenerateError("failed to generate a JSON element matching '%s'" % term, loc)
+
+def _conjunction(entities):
+    """Returns whether the logical statement ``entities`` only has AND
+    operators."""
+    return all(isinstance(op, JSPECLogicalOperatorAnd) for op in entities[1::2])
+
+def _generate_matching(loc, term, gen):
+    """Returns a random JSON element which matches the JSPEC term, trying
+    random elements, e.g. for a JSPEC negation."""
+    for _ in range(ATTEMPTS):
+        element = gen.element()
+        if gen.matches(term, element):
+            return element
+    raise JSPECGenerateError("failed to generate a JSON element matching '%s'" % term, loc)
+
+GENERATORS = {
+    JSPECObjectPlaceholder: lambda loc, term, gen: dict((gen.word(), gen.element(1)) for _ in range(gen.rng.randint(0, 3))),
+    JSPECArrayPlaceholder: lambda loc, term, gen: [gen.element(1) for _ in range(gen.rng.randint(0, 3))],
+    JSPECStringPlaceholder: lambda loc, term, gen: gen.word(0),
+    JSPECBooleanPlaceholder: lambda loc, term, gen: gen.rng.random() < 0.5,
+    JSPECIntPlaceholder: _generate_number(int),
+    JSPECRealPlaceholder: _generate_number(float),
+    JSPECNumberPlaceholder: _generate_number(None),
+    JSPECCustomPlaceholder: _generate_custom,
+    JSPECObject: _generate_object,
+    JSPECArray: _generate_array,
+    JSPECString: _generate_string,
+    JSPECInt: _generate_literal,
+    JSPECReal: _generate_literal,
+    JSPECBoolean: _generate_literal,
+    JSPECNull: _generate_literal,
+    JSPECWildcard: lambda loc, term, gen: gen.element(),
+    JSPECNegation: _generate_matching,
+    JSPECMacro: _generate_macro,
+    JSPECConditional: _generate_conditional,
+    JSPECNamedTerm: lambda loc, term, gen: generate_term(loc, term.term(), gen),
+}
+"""dict: The function generating a JSON element for each class of JSPEC term,
+found by the method resolution order of the class, so placeholders come
+before the classes they subclass. Any other JSPEC term, e.g. a JSPEC term with
+a registered matcher, is generated by trying random JSON elements."""
+
+def _uuid(gen):
+    digits = "%032x" % gen.rng.getrandbits(128)
+    return "-".join((digits[:8], digits[8:12], digits[12:16], digits[16:20], digits[20:]))
+
+def _date(gen):
+    month = gen.rng.randint(1, 12)
+    return "%04d-%02d-%02d" % (gen.rng.randint(1970, 2099), month, gen.rng.randint(1, 28))
+
+def _date_time(gen):
+    return "%sT%02d:%02d:%02dZ" % (_date(gen), gen.rng.randint(0, 23), gen.rng.randint(0, 59), gen.rng.randint(0, 59))
+
+def _ipv4(gen):
+    return ".".join(str(gen.rng.randint(0, 255)) for _ in range(4))
+
+def _ipv6(gen):
+    return ":".join("%x" % gen.rng.getrandbits(16) for _ in range(8))
+
+def _email(gen):
+    domain = "".join(gen.rng.choice(characters.ascii_lowercase) for _ in range(gen.rng.randint(1, 12)))
+    return "%s@%s.%s" % (gen.word(), domain, gen.rng.choice(("com", "org", "net", "io")))
+
+FORMAT_GENERATORS = {
+    "uuid": _uuid,
+    "date": _date,
+    "date-time": _date_time,
+    "ipv4": _ipv4,
+    "ipv6": _ipv6,
+    "email": _email,
+}
+"""dict: The function generating a string for each format placeholder, keyed
+by its keyword. Other custom placeholders are generated by trying random JSON
+elements against their predicate."""
+
+def _regex(parsed, gen, groups):
+    """Returns a random string for the parsed regex, raising a KeyError for an
+    unsupported feature."""
+    return "".join(REGEX_GENERATORS[op.name](value, gen, groups) for op, value in parsed)
+
+def _regex_in(items, gen, groups):
+    negate = items and items[0][0].name == "NEGATE"
+    chars = set()
+    for op, value in items[1:] if negate else items:
+        if op.name == "LITERAL":
+            chars.add(chr(value))
+        elif op.name == "RANGE":
+            chars.update(chr(c) for c in range(value[0], min(value[1], value[0] + 256) + 1))
+        elif op.name == "CATEGORY":
+            chars.update(REGEX_CATEGORIES[value.name])
+        else:
+            raise KeyError(op.name)
+    if negate:
+        chars = set(PRINTABLE_CHARACTERS) - chars
+    if not chars:
+        raise KeyError("empty character class")
+    return gen.rng.choice(sorted(chars))
+
+def _regex_repeat(value, gen, groups):
+    minimum, maximum, item = value
+    if maximum == sre_parse.MAXREPEAT:
+        maximum = minimum + gen.max_repeat
+    return "".join(_regex(item, gen, groups) for _ in range(gen.rng.randint(minimum, maximum)))
+
+def _regex_subpattern(value, gen, groups):
+    group, item = value[0], value[-1]
+    text = _regex(item, gen, groups)
+    if group is not None:
+        groups[group] = text
+    return text
+
+REGEX_GENERATORS = {
+    "LITERAL": lambda value, gen, groups: chr(value),
+    "NOT_LITERAL": lambda value, gen, groups: gen.rng.choice([c for c in PRINTABLE_CHARACTERS if ord(c) != value]),
+    "ANY": lambda value, gen, groups: gen.rng.choice(PRINTABLE_CHARACTERS),
+    "IN": _regex_in,
+    "BRANCH": lambda value, gen, groups: _regex(gen.rng.choice(value[1]), gen, groups),
+    "SUBPATTERN": _regex_subpattern,
+    "MAX_REPEAT": _regex_repeat,
+    "MIN_REPEAT": _regex_repeat,
+    "POSSESSIVE_REPEAT": _regex_repeat,
+    "ATOMIC_GROUP": lambda value, gen, groups: _regex(value, gen, groups),
+    "GROUPREF": lambda value, gen, groups: groups.get(value, ""),
+    "AT": lambda value, gen, groups: "",
+}
+"""dict: The function generating a string for each regex opcode, keyed by its
+name. The anchors are ignored, since JSPEC strings fully match."""
+
+REGEX_CATEGORIES = {
+    "CATEGORY_DIGIT": characters.digits,
+    "CATEGORY_NOT_DIGIT": characters.ascii_letters + " _-",
+    "CATEGORY_WORD": WORD_CHARACTERS,
+    "CATEGORY_NOT_WORD": " -.:/@",
+    "CATEGORY_SPACE": " \t",
+    "CATEGORY_NOT_SPACE": WORD_CHARACTERS,
+}
+"""dict: The characters for each regex class, e.g. '\\d', keyed by its name."""
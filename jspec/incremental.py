@@ -0,0 +1,316 @@
+"""Module for revalidating a JSON against a JSPEC after it has been modified
+by a JSON patch (RFC 6902).
+
+Rather than matching the whole JSON again, only the JSON elements touched by
+the patch are matched again, each against the JSPEC term bound to its location
+(see ``jspec.path``). For a large JSON modified by a small patch, this is
+proportional to the size of the patch and the depth of the locations it
+touches, rather than the size of the JSON.
+"""
+
+import copy
+
+from . import matcher
+from . import path
+from .entity import JSPEC
+
+class JSONPatchError(ValueError):
+    """Subclass of ValueError, raised when a JSON patch can not be applied.
+
+    Args:
+        msg (str): The reason the JSON patch could not be applied
+        index (int): The index of the operation in the JSON patch that failed
+    """
+
+    def __init__(self, msg, index):
+        self.index = index
+        ValueError.__init__(self, "Operation %d - %s" % (index, msg))
+
+class ValidationState:
+    """This class represents the result of matching a JSON against a JSPEC.
+
+    Attributes:
+        spec (JSPEC): The JSPEC that was checked against
+        document (obj): The Python native object representing the JSON
+        result (tuple): The bool and reason returned from matching
+            ``document`` against ``spec``
+        revalidated (list/None): The locations in ``document`` which were
+            matched again when the state was created by ``revalidate``, or
+            None if the whole of ``document`` was matched
+
+    Args:
+        spec (JSPEC): The JSPEC that was checked against
+        document (obj): The Python native object representing the JSON
+        result (tuple): The bool and reason returned from matching
+            ``document`` against ``spec``
+        revalidated (list, optional): The locations in ``document`` which were
+            matched again
+    """
+
+    def __init__(self, spec, document, result, revalidated=None):
+        self.spec = spec
+        self.document = document
+        self.result = result
+        self.revalidated = revalidated
+
+    def __bool__(self):
+        return bool(self.result[0])
+
+def validate(spec, document):
+    """Match the JSON ``document`` against the JSPEC ``spec``, returning the
+    state which can be used to revalidate ``document`` after patching it.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        document (obj): The Python native object representing the JSON
+
+    Returns:
+        ValidationState: The result of matching ``document`` against ``spec``.
+
+    Raises:
+        TypeError: If the input for ``spec`` is not a JSPEC.
+    """
+    if not isinstance(spec, JSPEC):
+        raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+    return ValidationState(spec, document, matcher.match(spec, document))
+
+def revalidate(state, patch):
+    """Apply the JSON patch ``patch`` to the JSON of the validation state
+    ``state`` and determine if the patched JSON still matches the JSPEC.
+
+    The JSON is patched in place. If ``state`` was a good match, only the JSON
+    elements touched by the patch are matched again. If any of them is a bad
+    match, or ``state`` was a bad match, the whole JSON is matched again, so
+    the reason returned is always the same as for ``jspec.check``.
+
+    Args:
+        state (ValidationState): The state of the JSON before it is patched
+        patch (list): The JSON patch, a list of operations as defined in
+            RFC 6902
+
+    Returns:
+        ValidationState: The state of the patched JSON.
+
+    Raises:
+        JSONPatchError: If the patch can not be applied, in which case the JSON
+            is left unchanged.
+    """
+    document, touched = apply_patch(state.document, patch)
+    spec = state.spec
+    if not state.result[0]:
+        return ValidationState(spec, document, matcher.match(spec, document))
+    ctx = matcher.Context()
+    revalidated = list()
+    for tokens in _outermost(touched):
+        term, element, loc, _ = path.resolve(spec.base, document, tokens)
+        if loc in revalidated:
+            continue
+        revalidated.append(loc)
+        if not matcher.match_element(loc, term, element, ctx):
+            return ValidationState(spec, document, matcher.match(spec, document))
+    return ValidationState(spec, document, (True, ""), revalidated)
+
+def apply_patch(document, patch):
+    """Apply the JSON patch ``patch`` to the JSON ``document`` in place.
+
+    Either every operation in ``patch`` is applied or, if any operation fails,
+    none of them are.
+
+    Args:
+        document (obj): The Python native object representing the JSON
+        patch (list): The JSON patch, a list of operations as defined in
+            RFC 6902
+
+    Returns:
+        obj: The patched JSON, which is only a different object to
+            ``document`` if the root of the JSON was replaced.
+        list: The reference tokens of each location whose JSON element has
+            changed, or whose JSON object keys or JSON array length have
+            changed.
+
+    Raises:
+        JSONPatchError: If the patch can not be applied.
+    """
+    if not isinstance(patch, list):
+        raise JSONPatchError("expected a JSON patch to be a list of operations", 0)
+    undo = list()
+    touched = list()
+    try:
+        for index, operation in enumerate(patch):
+            document = _apply_operation(document, operation, index, undo, touched)
+    except JSONPatchError:
+        for restore in reversed(undo):
+            document = restore(document)
+        raise
+    return document, touched
+
+def _apply_operation(document, operation, index, undo, touched):
+    """Apply a single JSON patch operation, appending a function to ``undo``
+    that reverts it, and the changed locations to ``touched``."""
+    if not isinstance(operation, dict):
+        raise JSONPatchError("expected an operation to be an object", index)
+    op = operation.get("op")
+    tokens = _pointer(operation, "path", index)
+    if op == "add":
+        return _add(document, tokens, _value(operation, index), index, undo, touched)
+    if op == "remove":
+        return _remove(document, tokens, index, undo, touched)[0]
+    if op == "replace":
+        return _replace(document, tokens, _value(operation, index), index, undo, touched)
+    if op == "move":
+        source = _pointer(operation, "from", index)
+        if tokens[:len(source)] == source and tokens != source:
+            raise JSONPatchError("can not move a location into one of its children", index)
+        document, value = _remove(document, source, index, undo, touched)
+        return _add(document, tokens, value, index, undo, touched)
+    if op == "copy":
+        value = copy.deepcopy(_get(document, _pointer(operation, "from", index), index))
+        return _add(document, tokens, value, index, undo, touched)
+    if op == "test":
+        if not _equal(_get(document, tokens, index), _value(operation, index)):
+            raise JSONPatchError("test failed at '%s'" % operation["path"], index)
+        return document
+    raise JSONPatchError("unknown operation '%s'" % op, index)
+
+def _pointer(operation, member, index):
+    """Returns the reference tokens for the JSON pointer in ``member`` of the
+    operation."""
+    if member not in operation:
+        raise JSONPatchError("missing '%s'" % member, index)
+    try:
+        return path.parse_pointer(operation[member])
+    except ValueError as vle:
+        raise JSONPatchError(str(vle), index) from None
+
+def _value(operation, index):
+    """Returns the value of the operation."""
+    if "value" not in operation:
+        raise JSONPatchError("missing 'value'", index)
+    return operation["value"]
+
+def _get(document, tokens, index):
+    """Returns the JSON element at the location of the reference tokens."""
+    element = document
+    for token in tokens:
+        element, token = _child(element, token, index, tokens)
+    return element
+
+def _child(element, token, index, tokens):
+    """Returns the child of the JSON element for the reference token, and the
+    key or array index of the child."""
+    if isinstance(element, dict) and token in element:
+        return element[token], token
+    if isinstance(element, list):
+        idx = path.array_index(token, len(element))
+        if idx is not None:
+            return element[idx], idx
+    raise JSONPatchError("location '/%s' does not exist" % "/".join(tokens), index)
+
+def _parent(document, tokens, index):
+    """Returns the parent JSON element of the location of the reference
+    tokens."""
+    return _get(document, tokens[:-1], index)
+
+def _add(document, tokens, value, index, undo, touched):
+    """Add ``value`` at the location of the reference tokens."""
+    if not tokens:
+        undo.append(_restore_root(document))
+        touched.append([])
+        return value
+    parent, token = _parent(document, tokens, index), tokens[-1]
+    if isinstance(parent, dict):
+        if token in parent:
+            undo.append(_restore_item(parent, token, parent[token]))
+            touched.append(tokens)
+        else:
+            undo.append(_restore_removal(parent, token))
+            touched.append(tokens[:-1])
+        parent[token] = value
+        return document
+    if isinstance(parent, list):
+        idx = len(parent) if token == "-" else path.array_index(token, len(parent) + 1)
+        if idx is None:
+            raise JSONPatchError("invalid array index '%s'" % token, index)
+        parent.insert(idx, value)
+        undo.append(_restore_removal(parent, idx))
+        touched.append(tokens[:-1])
+        return document
+    raise JSONPatchError("location '/%s' does not exist" % "/".join(tokens[:-1]), index)
+
+def _replace(document, tokens, value, index, undo, touched):
+    """Replace the JSON element at the location of the reference tokens with
+    ``value``."""
+    if not tokens:
+        undo.append(_restore_root(document))
+        touched.append([])
+        return value
+    parent = _parent(document, tokens, index)
+    previous, key = _child(parent, tokens[-1], index, tokens)
+    parent[key] = value
+    undo.append(_restore_item(parent, key, previous))
+    touched.append(tokens)
+    return document
+
+def _remove(document, tokens, index, undo, touched):
+    """Remove the JSON element at the location of the reference tokens,
+    returning the document and the removed JSON element."""
+    if not tokens:
+        raise JSONPatchError("can not remove the root of the JSON", index)
+    parent = _parent(document, tokens, index)
+    value, key = _child(parent, tokens[-1], index, tokens)
+    if isinstance(parent, dict):
+        del parent[key]
+        undo.append(_restore_item(parent, key, value))
+    else:
+        parent.pop(key)
+        undo.append(_restore_insertion(parent, key, value))
+    touched.append(tokens[:-1])
+    return document, value
+
+def _restore_root(previous):
+    """Returns a function which reverts replacing the root of the JSON."""
+    def restore(document):
+        return previous
+    return restore
+
+def _restore_item(parent, key, value):
+    """Returns a function which sets ``parent[key]`` back to ``value``."""
+    def restore(document):
+        parent[key] = value
+        return document
+    return restore
+
+def _restore_removal(parent, key):
+    """Returns a function which removes ``key`` from ``parent``."""
+    def restore(document):
+        parent.pop(key)
+        return document
+    return restore
+
+def _restore_insertion(parent, idx, value):
+    """Returns a function which inserts ``value`` back into the array
+    ``parent`` at ``idx``."""
+    def restore(document):
+        parent.insert(idx, value)
+        return document
+    return restore
+
+def _equal(a, b):
+    """Returns whether two JSON elements are equal, without treating booleans
+    as numbers."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a.__class__ == b.__class__ and a == b
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+def _outermost(touched):
+    """Returns the reference tokens in ``touched`` which are not within any of
+    the other reference tokens."""
+    outermost = list()
+    for tokens in sorted(touched, key=len):
+        if not any(tokens[:len(other)] == other for other in outermost):
+            outermost.append(tokens)
+    return outermost
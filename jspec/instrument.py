@@ -0,0 +1,152 @@
+"""Module for instrumenting the matcher with hooks called for each JSPEC term.
+
+Hooks are an instance of ``Hooks`` whose ``enter`` method is called before a
+JSPEC term is matched against a JSON element, and whose ``exit`` method is
+called after, with the result and the duration of the match. They are either
+installed globally with ``install``, for every match, or given to a single
+match or validator, e.g. ``jspec.compile(spec, hooks=Profile())``.
+
+Instrumentation costs nothing whilst no hooks are in use. The matching
+function for each class of JSPEC term is found in a dispatch table, and a
+match with hooks is given its own table of matching functions wrapped by
+``wrap``, which is chosen once when the match starts, so a match without
+hooks runs exactly the same code as if this module did not exist. Results
+taken from the memo table or from a cache are not matched again, so the
+hooks are not called for them, and checks made whilst hooks are installed
+are always interpreted, see ``jspec.tiered``.
+"""
+
+import time
+
+_installed = None
+
+class Hooks:
+    """This class is the base class for instrumentation hooks, whose methods
+    do nothing. Subclasses override ``enter`` and ``exit``.
+    """
+
+    def enter(self, term, loc, element):
+        """Called before the JSPEC term is matched against the JSON element.
+
+        Args:
+            term (JSPECTerm): The JSPEC term, whose class is the type of the
+                JSPEC node
+            loc (str): The location of the JSON element, e.g. "$.a[0]"
+            element (obj): The Python native object representing the JSON
+                element
+        """
+
+    def exit(self, term, loc, element, result, duration):
+        """Called after the JSPEC term is matched against the JSON element.
+
+        Args:
+            term (JSPECTerm): The JSPEC term
+            loc (str): The location of the JSON element
+            element (obj): The Python native object representing the JSON
+                element
+            result (Result/None): The result of the match, or None if it
+                raised an error, e.g. for exceeding a limit
+            duration (float): The seconds taken by the match, including the
+                matches of the JSPEC terms nested in ``term``
+        """
+
+class Profile(Hooks):
+    """This class represents hooks which profile where the time of matching
+    goes, by the class of each JSPEC term, or by any other key.
+
+    Attributes:
+        key (func): The function of a JSPEC term and a location returning the
+            key the match is counted under
+        stats (dict): For each key, a list of the number of matches, the
+            number of bad matches, the total seconds of the matches and the
+            seconds of the matches less the matches nested in them
+
+    Args:
+        key (func, optional): The function of a JSPEC term and a location
+            returning the key the match is counted under. Omit to count
+            matches by the name of the class of the JSPEC term.
+    """
+
+    def __init__(self, key=None):
+        self.key = key if key is not None else (lambda term, loc: term.__class__.__name__)
+        self.stats = dict()
+        self._nested = list()
+
+    def enter(self, term, loc, element):
+        self._nested.append(0.0)
+
+    def exit(self, term, loc, element, result, duration):
+        nested = self._nested.pop()
+        if self._nested:
+            self._nested[-1] += duration
+        key = self.key(term, loc)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += not result
+        stats[2] += duration
+        stats[3] += duration - nested
+
+    def clear(self):
+        """Removes the statistics of every match."""
+        self.stats.clear()
+        del self._nested[:]
+
+    def report(self):
+        """Returns a table of the statistics of each key, with the keys which
+        took the most seconds, less the matches nested in them, first."""
+        lines = ["key\tcalls\tfailures\ttotal\tself"]
+        for key, (calls, failures, total, own) in sorted(self.stats.items(), key=lambda item: -item[1][3]):
+            lines.append("%s\t%d\t%d\t%.6f\t%.6f" % (key, calls, failures, total, own))
+        return "\n".join(lines)
+
+def wrap(func, hooks):
+    """Returns the matching function ``func`` wrapped so it calls the hooks.
+
+    Args:
+        func (func): The matching function, see ``jspec.matcher.register``
+        hooks (Hooks): The hooks
+
+    Returns:
+        func: The matching function calling ``hooks.enter`` before and
+            ``hooks.exit`` after ``func``.
+    """
+    enter = hooks.enter
+    leave = hooks.exit
+    clock = time.perf_counter
+    def instrumented(loc, term, element, ctx):
+        enter(term, loc, element)
+        start = clock()
+        try:
+            result = func(loc, term, element, ctx)
+        except BaseException:
+            leave(term, loc, element, None, clock() - start)
+            raise
+        leave(term, loc, element, result, clock() - start)
+        return result
+    return instrumented
+
+def install(hooks):
+    """Installs the hooks globally, for every match which is not given hooks
+    of its own, replacing any hooks already installed.
+
+    Args:
+        hooks (Hooks): The hooks
+
+    Raises:
+        TypeError: If ``hooks`` is not an instance of ``Hooks``.
+    """
+    global _installed
+    if not isinstance(hooks, Hooks):
+        raise TypeError("Expecting Hooks not %s" % hooks.__class__)
+    _installed = hooks
+
+def uninstall():
+    """Uninstalls the hooks installed globally, if any."""
+    global _installed
+    _installed = None
+
+def installed():
+    """Returns the hooks installed globally, or None."""
+    return _installed
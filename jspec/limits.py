@@ -0,0 +1,116 @@
+"""Module for bounding the work done when matching a JSPEC against a JSON.
+
+Matching JSPEC objects and arrays with captures can backtrack, so the time to
+match some JSONs can grow exponentially with their size. A ``Limits`` passed
+to ``match`` bounds the number of steps, the time taken and the size of the
+JSON elements visited, and a ``JSPECLimitError`` is raised as soon as any limit
+is exceeded.
+"""
+
+import time
+
+class JSPECLimitError(ValueError):
+    """Subclass of ValueError, raised when matching exceeds one of its limits.
+
+    Attributes:
+        loc (str): The location in the JSON where the limit was exceeded
+        limit (str): The name of the limit that was exceeded, e.g. 'max_steps'
+
+    Args:
+        msg (str): The unformatted error message
+        loc (str): The location in the JSON where the limit was exceeded
+        limit (str): The name of the limit that was exceeded
+    """
+
+    def __init__(self, msg, loc, limit):
+        self.loc = loc
+        self.limit = limit
+        ValueError.__init__(self, "At location %s - %s" % (loc, msg))
+
+class Limits:
+    """This class represents the limits on the work done by a single call to
+    ``match``.
+
+    A step is taken each time a JSPEC term is matched against a JSON element,
+    including when backtracking. The JSON limits only apply to the JSON
+    elements visited whilst matching.
+
+    Attributes:
+        max_steps (int/None): The maximum number of steps
+        timeout (float/None): The maximum number of seconds for each match
+        max_depth (int/None): The maximum nesting depth of JSON objects and
+            arrays, where the root object or array has a depth of 1
+        max_container_size (int/None): The maximum number of pairs in a JSON
+            object or elements in a JSON array
+        max_string_length (int/None): The maximum length of a JSON string
+        clock (func): Function returning the current time in seconds
+
+    Args:
+        max_steps (int, optional): The maximum number of steps
+        timeout (float, optional): The maximum number of seconds for each
+            match
+        max_depth (int, optional): The maximum nesting depth of JSON objects
+            and arrays
+        max_container_size (int, optional): The maximum number of pairs in a
+            JSON object or elements in a JSON array
+        max_string_length (int, optional): The maximum length of a JSON string
+        clock (func, optional): Function returning the current time in
+            seconds, used for ``timeout``
+    """
+
+    CLOCK_INTERVAL = 64
+    """int: The number of steps between each time the clock is read.
+    """
+
+    def __init__(self, max_steps=None, timeout=None, max_depth=None,
+            max_container_size=None, max_string_length=None, clock=time.monotonic):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.max_container_size = max_container_size
+        self.max_string_length = max_string_length
+        self.clock = clock
+
+    def deadline(self):
+        """Returns the time by which a match starting now must finish, or None
+        if there is no timeout."""
+        if self.timeout is None:
+            return None
+        return self.clock() + self.timeout
+
+    def check(self, loc, element, depth, ctx):
+        """Take a step, matching a JSPEC term against the JSON element
+        ``element`` at location ``loc`` and nesting depth ``depth``.
+
+        Args:
+            loc (str): The current location in the JSON
+            element (obj): The Python native object representing a JSON element
+            depth (int): The nesting depth of ``element``, if it is a JSON
+                object or array
+            ctx (Context): The state of the current match, holding the number
+                of steps taken and the deadline
+
+        Raises:
+            JSPECLimitError: If any of the limits is exceeded.
+        """
+        ctx.steps += 1
+        if self.max_steps is not None and ctx.steps > self.max_steps:
+            raise JSPECLimitError("exceeded the maximum of %d steps" % self.max_steps, loc, "max_steps")
+        if ctx.deadline is not None and ctx.steps % self.CLOCK_INTERVAL == 0 and self.clock() > ctx.deadline:
+            raise JSPECLimitError("exceeded the timeout of %s seconds" % self.timeout, loc, "timeout")
+        if isinstance(element, str):
+            if self.max_string_length is not None and len(element) > self.max_string_length:
+                raise JSPECLimitError(
+                    "exceeded the maximum string length of %d, got %d" % (self.max_string_length, len(element)),
+                    loc,
+                    "max_string_length",
+                )
+        elif isinstance(element, (dict, list)):
+            if self.max_depth is not None and depth > self.max_depth:
+                raise JSPECLimitError("exceeded the maximum depth of %d" % self.max_depth, loc, "max_depth")
+            if self.max_container_size is not None and len(element) > self.max_container_size:
+                raise JSPECLimitError(
+                    "exceeded the maximum container size of %d, got %d" % (self.max_container_size, len(element)),
+                    loc,
+                    "max_container_size",
+                )
@@ -0,0 +1,98 @@
+"""Command-line tool to measure the throughput and the latency percentiles of
+checking a corpus of JSON documents against a JSPEC document from many
+workers at once.
+
+Usage:
+
+    $ python3 -m jspec.loadtest <jspec_file> --corpus <ndjson_file>
+
+    -- Check a corpus from 1, 2 and 4 threads, for 2 seconds each
+    $ python3 -m jspec.generate ./specs/event.jspec -n 1000 > corpus.ndjson
+    $ python3 -m jspec.loadtest ./specs/event.jspec --corpus corpus.ndjson --workers 1 2 4 --duration 2
+    workers	throughput	speedup	p50	p95	p99	p999	max
+    1	41230.5	1.00	22.1	30.5	41.0	118.3	950.2
+    ...
+
+    Throughput is in checks per second, speedup is the throughput over the
+    throughput of the first number of workers, and the latencies are in
+    microseconds. The workers are threads sharing one JSPEC unless
+    --processes is given, and check with jspec.check unless --engine
+    validator is given. The flag --raw-jspec can also be used to give the raw
+    JSPEC document instead of a file path, and --output writes the results,
+    with their latency histograms, as JSON.
+"""
+
+def main():
+    import argparse
+    import json
+    import jspec
+    from jspec.bench import load
+
+    prog = 'python3 -m jspec.loadtest'
+    description = ('A simple command line tool to measure the throughput and the latency of checking JSON documents against a JSPEC document under concurrent load')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        'jspec_file',
+        nargs='?',
+        type=argparse.FileType(encoding="utf-8"),
+        default=None,
+        help='a JSPEC file to check against'
+    )
+    parser.add_argument(
+        '--raw-jspec',
+        dest='jspec_raw',
+        default=None,
+        help='raw JSPEC document, if none is provided in the other args'
+    )
+    parser.add_argument('--corpus', type=argparse.FileType(encoding="utf-8"), required=True, help='an NDJSON file of the JSON documents to check')
+    parser.add_argument('--workers', type=int, nargs='+', default=list(load.WORKERS), help='the numbers of workers to run the load with')
+    parser.add_argument('--processes', action='store_true', help='run the workers as processes rather than threads')
+    parser.add_argument('--engine', choices=load.ENGINES, default=load.CHECK, help='check with jspec.check or with a validator')
+    parser.add_argument('--duration', type=float, default=load.DURATION, help='the number of seconds each load runs for')
+    parser.add_argument('--significant', type=int, default=load.SIGNIFICANT, help='the significant digits of the latency histograms')
+    parser.add_argument('--output', type=argparse.FileType('w', encoding="utf-8"), default=None, help='the file to write the JSON results to')
+    options = parser.parse_args()
+
+    try:
+        if options.jspec_file is None:
+            if options.jspec_raw is None:
+                raise ValueError("The --raw-jspec flag value is not a valid JSPEC")
+            document = options.jspec_raw
+        else:
+            document = options.jspec_file.read()
+        corpus = [json.loads(line) for line in options.corpus if line.strip()]
+        if any(n < 1 for n in options.workers):
+            raise ValueError("The --workers flag values must be at least 1")
+        results = load.run(
+            document,
+            corpus,
+            workers=options.workers,
+            mode=load.PROCESS if options.processes else load.THREAD,
+            engine=options.engine,
+            duration=options.duration,
+            significant=options.significant,
+        )
+    except (jspec.scanner.JSPECDecodeError, ValueError, RuntimeError) as exc:
+        raise SystemExit(exc)
+
+    if options.output:
+        json.dump([result.as_dict() for result in results], options.output, indent=2, sort_keys=True)
+        options.output.write("\n")
+    labels = [load.label(percent) for percent in load.PERCENTILES]
+    sys.stdout.write('workers\tthroughput\tspeedup\t%s\tmax\n' % '\t'.join(labels))
+    for result in results:
+        latencies = [result.percentiles()[percent] for percent in load.PERCENTILES] + [result.histogram.max]
+        speedup = result.throughput / results[0].throughput if results[0].throughput else 0.0
+        sys.stdout.write('%d\t%.1f\t%.2f\t%s\n' % (
+            result.workers,
+            result.throughput,
+            speedup,
+            '\t'.join('%.1f' % (latency / 1000) for latency in latencies),
+        ))
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -0,0 +1,166 @@
+"""Module for resolving the values of JSPEC macros.
+"""
+
+import json
+import os
+
+from .entity import JSPECEntity, JSPECMacro
+
+MACRO_FOUND = 0
+"""int: The macro was resolved to a Python native JSON value."""
+
+MACRO_MISSING = 1
+"""int: The macro is not defined."""
+
+MACRO_INVALID = 2
+"""int: The macro is defined, but is not a JSON element."""
+
+class MacroResolver:
+    """This class represents a source of values for JSPEC macros.
+
+    Each macro is resolved and parsed at most once by a resolver, however many
+    times it is matched, so a resolver should be created for each call to
+    ``match`` or each validator, depending on how long the values of the macros
+    should be fixed for.
+
+    The source of the values can be:
+        None: the environment variables ``environ``, read when each macro is
+            first resolved, which are parsed as JSON. This is the default.
+        dict: a mapping of macro names to Python native JSON values.
+        callable: a function taking a macro name and returning its Python
+            native JSON value, raising a KeyError if the macro is not defined.
+    A value from a dict or callable which is not a JSON element, e.g. a set,
+    is invalid, as is an environment variable which is not a JSON.
+
+    Attributes:
+        source (dict/callable/None): The source of the values of the macros
+        environ (dict): The environment variables, used if ``source`` is None
+
+    Args:
+        source (dict/callable/None, optional): The source of the values of the
+            macros, omit to use the environment variables
+        environ (dict, optional): The environment variables, omit to use
+            ``os.environ``
+    """
+
+    def __init__(self, source=None, environ=None):
+        if source is not None and not isinstance(source, dict) and not callable(source):
+            raise TypeError("Expecting a dict or callable as a macro source not %s" % source.__class__)
+        self.source = source
+        self.environ = os.environ if environ is None else environ
+        self._resolved = dict()
+
+    def resolve(self, name):
+        """Returns the resolved value of the macro ``name``.
+
+        Args:
+            name (str): The name of the JSPEC macro.
+
+        Returns:
+            int: Either ``MACRO_FOUND``, ``MACRO_MISSING`` or
+                ``MACRO_INVALID``.
+            obj: The Python native JSON value of the macro, if it was found.
+        """
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            resolved = self._resolved[name] = self._load(name)
+        return resolved
+
+    def fingerprint(self, names):
+        """Returns a string which is the same for two resolvers if and only if
+        they resolve each of the macros ``names`` to the same value, e.g. to
+        key cached results which depend on the macros.
+
+        Args:
+            names (tuple): The names of the JSPEC macros.
+
+        Returns:
+            str: The canonical serialization of the resolved macros.
+        """
+        return json.dumps([self.resolve(name) for name in names], sort_keys=True)
+
+    def matches(self, name, element):
+        """Returns whether the value of the macro ``name``, which must have been
+        resolved, equals the JSON element ``element``.
+
+        JSON objects and arrays of different sizes are rejected without
+        comparing their contents.
+        """
+        value = self._resolved[name][1]
+        if isinstance(value, (dict, list)):
+            if not isinstance(element, (dict, list)) or isinstance(element, dict) != isinstance(value, dict):
+                return False
+            if len(value) != len(element):
+                return False
+        return value == element
+
+    def _load(self, name):
+        """Loads the value of the macro ``name`` from ``self.source``."""
+        if self.source is None:
+            string_value = self.environ.get(name)
+            if string_value is None:
+                return MACRO_MISSING, None
+            try:
+                return MACRO_FOUND, json.loads(string_value)
+            except json.decoder.JSONDecodeError:
+                return MACRO_INVALID, None
+        if isinstance(self.source, dict):
+            if name not in self.source:
+                return MACRO_MISSING, None
+            return _native(self.source[name])
+        try:
+            value = self.source(name)
+        except KeyError:
+            return MACRO_MISSING, None
+        return _native(value)
+
+def _native(value):
+    """Returns the value of a macro from a dict or callable as a Python native
+    JSON value, or ``MACRO_INVALID`` if it is not a JSON element, e.g. a set
+    or a datetime, so the value is compared and serialized like a JSON."""
+    try:
+        return MACRO_FOUND, json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return MACRO_INVALID, None
+
+def names(term):
+    """Returns the names of the JSPEC macros in the JSPEC term ``term`` and the
+    JSPEC terms nested in it, which are worked out once for each JSPEC term.
+
+    Args:
+        term (JSPECTerm): The JSPEC term.
+
+    Returns:
+        tuple: The sorted names of the JSPEC macros.
+    """
+    if term._macros is None:
+        found = set()
+        stack = [term]
+        while stack:
+            entity = stack.pop()
+            if isinstance(entity, JSPECMacro):
+                found.add(entity.spec)
+                continue
+            for value in (getattr(entity, "spec", None), getattr(entity, "entities", None)):
+                if isinstance(value, (list, tuple, set, frozenset)):
+                    stack.extend(child for child in value if isinstance(child, JSPECEntity))
+                elif isinstance(value, JSPECEntity):
+                    stack.append(value)
+        term._macros = tuple(sorted(found))
+    return term._macros
+
+def snapshot():
+    """Returns a resolver for the current environment variables, which is not
+    affected by any later changes to them.
+
+    Returns:
+        MacroResolver: The resolver for a copy of the environment variables.
+    """
+    return MacroResolver(environ=dict(os.environ))
+
+def resolver(macros=None):
+    """Returns a resolver for ``macros``, which is either a resolver, or a
+    source of the values of macros to create a new resolver for."""
+    if isinstance(macros, MacroResolver):
+        return macros
+    return MacroResolver(macros)
@@ -2,9 +2,13 @@
 """
 
 import json
-import os
 import re
 
+from . import instrument
+from . import macro
+from . import path
+from . import placeholder
+
 from .entity import (
     JSPECTerm,
     JSPECObject,
@@ -19,6 +23,7 @@ from .entity import (
     JSPECNegation,
     JSPECMacro,
     JSPECConditional,
+    JSPECNamedTerm,
     JSPECLogicalOperatorAnd,
     JSPECLogicalOperatorOr,
     JSPECLogicalOperatorXor,
@@ -29,12 +34,14 @@ from .entity import (
     JSPECIntPlaceholder,
     JSPECRealPlaceholder,
     JSPECNumberPlaceholder,
+    JSPECCustomPlaceholder,
     JSPECInequalityLessThan,
     JSPECInequalityLessThanOrEqualTo,
     JSPECInequalityMoreThan,
     JSPECInequalityMoreThanOrEqualTo,
     JSPECArrayCaptureGroup,
     JSPECObjectCaptureGroup,
+    JSPECObjectEllipsis,
 )
 
 PYTHON_NATIVE = (
@@ -107,6 +114,76 @@ class Result:
         self.capture_metadata = term, element
         return self
 
+    def copy(self):
+        """Returns a copy of this result, including ``self.capture_metadata``"""
+        return Result(self.res, self.loc, self.msg).with_capture_metadata(*self.capture_metadata)
+
+class Context:
+    """This class represents the state of a single call to ``match``.
+
+    A new context is created for each call to ``match`` and is passed through
+    every matching function, so any state held here is discarded once the
+    match is complete.
+
+    Attributes:
+        memo (dict): Results of matching JSPEC terms against JSON objects and
+            arrays, keyed by the identity of the JSPEC term, the identity of
+            the JSON element and the location. Each value is a tuple:
+            entry = (
+                term,
+                element,
+                result,
+            )
+            where term and element are kept so their identities can not be
+            reused while the entry exists, and result is the ``Result``.
+        cache (SubtreeCache/None): The cache of results shared between calls
+            to ``match``, or None if results are not cached.
+        digests (dict): The sizes and canonical digests of the JSON objects
+            and arrays described by ``cache``, keyed by identity.
+        macros (MacroResolver): The resolver for the values of JSPEC macros.
+        limits (Limits/None): The limits on the work done by the match, or
+            None if it is unlimited.
+        steps (int): The number of steps taken, counted if there are limits.
+        deadline (float/None): The time by which the match must finish, or
+            None if there is no timeout.
+        containers (list): The JSON objects and arrays enclosing the current
+            JSON element, tracked if there are limits.
+        trail (list/None): The names and JSON elements bound by JSPEC named
+            terms, in the order they were bound, or None if named terms are
+            not being extracted. Bindings made by a match which then fails, or
+            which is abandoned when backtracking, are removed.
+        hooks (Hooks/None): The instrumentation hooks called for each JSPEC
+            term matched, or None if the match is not instrumented.
+        dispatch (dict): The matching functions for each class of JSPEC term,
+            which is ``_DISPATCH`` unless the match is instrumented, when it
+            holds the matching functions wrapped to call ``hooks``.
+
+    Args:
+        cache (SubtreeCache, optional): The cache of results shared between
+            calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros. Omit to resolve macros
+            from the environment variables once for this match.
+        limits (Limits, optional): The limits on the work done by the match.
+        extract (bool, optional): Whether to extract the JSON elements bound
+            by JSPEC named terms.
+        hooks (Hooks, optional): The instrumentation hooks for the match. Omit
+            to use the hooks installed globally, if any.
+    """
+
+    def __init__(self, cache=None, macros=None, limits=None, extract=False, hooks=None):
+        self.memo = dict()
+        self.cache = cache
+        self.digests = dict()
+        self.macros = macro.resolver(macros)
+        self.limits = limits
+        self.steps = 0
+        self.deadline = limits.deadline() if limits is not None else None
+        self.containers = list()
+        self.trail = list() if extract else None
+        self.hooks = hooks if hooks is not None else instrument.installed()
+        self.dispatch = _DISPATCH if self.hooks is None else dict()
+
 def GoodMatch():
     """Returns an instance of ``Result`` as a good match."""
     return Result(True)
@@ -116,98 +193,316 @@ def BadMatch(loc, msg):
     and ``msg``."""
     return Result(False, loc, msg)
 
-def match(spec, element):
+def match(spec, element, cache=None, macros=None, limits=None, hooks=None):
     """Determine if the JSPEC matches the JSON.
 
     Args:
         spec (JSPEC): The JSPEC to be checked against
         element (obj): A Python native object representing a JSON
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees, shared between calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros. Omit to resolve macros
+            from the environment variables.
+        limits (Limits, optional): The limits on the work done by the match.
+        hooks (Hooks, optional): The instrumentation hooks for the match, see
+            ``jspec.instrument``.
 
     Returns:
         bool: ``True`` if it was a good match, otherwise ``False``.
         str: Details on why the match failed if it was a bad match, otherwise
             an empty string.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of ``limits``.
     """
+    ctx = Context(cache, macros, limits, hooks=hooks)
     try:
-        result = match_element('$', spec.base, element)
+        result = match_element('$', spec.base, element, ctx)
     except ValueError as vle:
         raise vle
     return bool(result), result.reason()
 
-def match_element(loc, term, element):
+def extract(spec, element, cache=None, macros=None, limits=None, hooks=None):
+    """Determine if the JSPEC matches the JSON, extracting the JSON elements
+    bound by the JSPEC named terms of the match.
+
+    Results for subtrees are not taken from ``cache`` whilst extracting, since
+    the cache does not hold the bindings.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        element (obj): A Python native object representing a JSON
+        cache (SubtreeCache, optional): Unused, accepted so the arguments are
+            the same as ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done by the match.
+        hooks (Hooks, optional): The instrumentation hooks for the match.
+
+    Returns:
+        bool: ``True`` if it was a good match, otherwise ``False``.
+        str: Details on why the match failed if it was a bad match, otherwise
+            an empty string.
+        dict: The JSON element bound to each name for a good match, otherwise
+            an empty dict. If a name is bound more than once, e.g. inside an
+            array capture, it is bound to the last JSON element matched.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of ``limits``.
+    """
+    ctx = Context(None, macros, limits, extract=True, hooks=hooks)
+    result = match_element('$', spec.base, element, ctx)
+    if not result:
+        return False, result.reason(), dict()
+    return True, "", dict(ctx.trail)
+
+def match_element(loc, term, element, ctx):
     """Determine if the JSPEC term matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECTerm): The JSPEC term.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+
+    Returns:
+        Result: The result of whether the JSPEC term matches the JSON element.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of the limits of ``ctx``.
+    """
+    if ctx.limits is not None:
+        return match_limited(loc, term, element, ctx)
+    return match_memoized(loc, term, element, ctx)
+
+def match_memoized(loc, term, element, ctx):
+    """Determine if the JSPEC term matches the JSON element, taking the result
+    for a JSON object or array from the memo table of ``ctx`` if it has already
+    been matched at this location.
+
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+
+    Returns:
+        Result: The result of whether the JSPEC term matches the JSON element.
+    """
+    if ctx.trail is not None:
+        return match_extracting(loc, term, element, ctx)
+    if not isinstance(element, (dict, list)):
+        return match_term(loc, term, element, ctx)
+    key = (id(term), id(element), loc)
+    entry = ctx.memo.get(key)
+    if entry is not None:
+        return entry[2].copy()
+    if ctx.cache is None:
+        result = match_term(loc, term, element, ctx)
+    else:
+        result = match_cached(loc, term, element, ctx)
+    ctx.memo[key] = (term, element, result.copy())
+    return result
+
+def match_extracting(loc, term, element, ctx):
+    """Determine if the JSPEC term matches the JSON element, as for
+    ``match_memoized``, keeping the bindings of JSPEC named terms in the trail
+    of ``ctx``.
+
+    The bindings made by a failed match are removed from the trail. The memo
+    table also holds the bindings made by each good match, which are added to
+    the trail again whenever the result is taken from the memo table.
+
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC term matches the JSON element.
     """
-    if isinstance(term, JSPECObjectPlaceholder):
-        return match_object_placeholder(loc, term, element)
+    trail = ctx.trail
+    mark = len(trail)
+    if not isinstance(element, (dict, list)):
+        result = match_term(loc, term, element, ctx)
+        if not result:
+            del trail[mark:]
+        return result
+    key = (id(term), id(element), loc)
+    entry = ctx.memo.get(key)
+    if entry is not None:
+        if entry[2]:
+            trail.extend(entry[3])
+        return entry[2].copy()
+    result = match_term(loc, term, element, ctx)
+    if not result:
+        del trail[mark:]
+    ctx.memo[key] = (term, element, result.copy(), trail[mark:])
+    return result
+
+def rewind(ctx, mark):
+    """Remove the bindings made since the trail of ``ctx`` had length
+    ``mark``, after abandoning a good match whilst backtracking."""
+    if ctx.trail is not None:
+        del ctx.trail[mark:]
+
+def trail_mark(ctx):
+    """Returns the current length of the trail of ``ctx``, see ``rewind``."""
+    return len(ctx.trail) if ctx.trail is not None else 0
+
+def match_limited(loc, term, element, ctx):
+    """Determine if the JSPEC term matches the JSON element, as for
+    ``match_memoized``, taking a step against the limits of ``ctx``.
+
+    The nesting depth of the JSON element is the number of JSON objects and
+    arrays enclosing it, which are tracked in ``ctx``. Matching the same JSON
+    object or array against another JSPEC term, e.g. the terms of a JSPEC
+    conditional, does not increase the depth.
 
-    if isinstance(term, JSPECArrayPlaceholder):
-        return match_array_placeholder(loc, term, element)
-    
-    if isinstance(term, JSPECStringPlaceholder):
-        return match_string_placeholder(loc, term, element)
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
-    if isinstance(term, JSPECBooleanPlaceholder):
-        return match_boolean_placeholder(loc, term, element)
+    Returns:
+        Result: The result of whether the JSPEC term matches the JSON element.
 
-    if isinstance(term, JSPECIntPlaceholder):
-        return match_int_placeholder(loc, term, element)
+    Raises:
+        JSPECLimitError: If the match exceeds any of the limits of ``ctx``.
+    """
+    containers = ctx.containers
+    nested = isinstance(element, (dict, list)) and not (containers and containers[-1] is element)
+    ctx.limits.check(loc, element, len(containers) + nested, ctx)
+    if not nested:
+        return match_memoized(loc, term, element, ctx)
+    containers.append(element)
+    try:
+        return match_memoized(loc, term, element, ctx)
+    finally:
+        containers.pop()
 
-    if isinstance(term, JSPECRealPlaceholder):
-        return match_real_placeholder(loc, term, element)
+def match_cached(loc, term, element, ctx):
+    """Determine if the JSPEC term matches the JSON object or array, using the
+    results in the cache of ``ctx`` for subtrees that are large enough to be
+    cached.
 
-    if isinstance(term, JSPECNumberPlaceholder):
-        return match_number_placeholder(loc, term, element)
+    Cached results are stored relative to ``loc``, so a subtree that is
+    cached at one location can be used at any other location. The result for
+    a JSPEC term with macros is also keyed by the values the macro resolver of
+    ``ctx`` gives them, so matches with different macros, e.g. from two
+    validators sharing the cache, never use each other's results.
 
-    if isinstance(term, JSPECObject):
-        return match_object(loc, term, element)
-   
-    if isinstance(term, JSPECArray):
-        return match_array(loc, term, element)
-    
-    if isinstance(term, JSPECString):
-        return match_string(loc, term, element)
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON object or
+            array
+        ctx (Context): The state of the current match
 
-    if isinstance(term, JSPECInt):
-        return match_int(loc, term, element)
+    Returns:
+        Result: The result of whether the JSPEC term matches the JSON element.
+    """
+    cache = ctx.cache
+    size, digest = cache.describe(element, ctx.digests)
+    if size < cache.min_size:
+        return match_term(loc, term, element, ctx)
+    macros = macro.names(term)
+    if macros:
+        digest = "%s@%s" % (digest, ctx.macros.fingerprint(macros))
+    value = cache.get(term, digest)
+    if value is not None:
+        res, loc_suffix, msg, capture_metadata = value
+        if res:
+            return GoodMatch().with_capture_metadata(*capture_metadata)
+        return BadMatch(loc + loc_suffix, msg).with_capture_metadata(*capture_metadata)
+    result = match_term(loc, term, element, ctx)
+    if result.res:
+        cache.put(term, digest, size, (True, "", "", result.capture_metadata))
+    elif result.loc.startswith(loc):
+        cache.put(term, digest, size, (False, result.loc[len(loc):], result.msg, result.capture_metadata))
+    return result
+
+def match_term(loc, term, element, ctx):
+    """Determine if the JSPEC term matches the JSON element, by calling the
+    matching function for the class of the JSPEC term.
+
+    Unlike ``match_element``, the result is never taken from or stored in the
+    memo table of ``ctx``. The matching function is found in the dispatch
+    table of ``ctx``, so an instrumented match calls its hooks.
 
-    if isinstance(term, JSPECReal):
-        return match_real(loc, term, element)
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECTerm): The JSPEC term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
-    if isinstance(term, JSPECBoolean):
-        return match_boolean(loc, term, element)
+    Returns:
+        Result: The result of whether the JSPEC term matches the JSON element.
+    """
+    func = ctx.dispatch.get(term.__class__)
+    if func is None:
+        func = matcher_for(term.__class__)
+        if ctx.hooks is not None:
+            func = ctx.dispatch[term.__class__] = instrument.wrap(func, ctx.hooks)
+    return func(loc, term, element, ctx)
 
-    if isinstance(term, JSPECNull):
-        return match_null(loc, term, element)  
+def matcher_for(cls):
+    """Returns the matching function for the JSPEC term class ``cls``.
 
-    if isinstance(term, JSPECWildcard):
-        return match_wildcard(loc, term, element)
+    The function registered for the nearest class in the method resolution
+    order of ``cls`` is used, and is remembered for ``cls`` so later lookups
+    are a single dict lookup.
 
-    if isinstance(term, JSPECNegation):
-        return match_negation(loc, term, element)
+    Args:
+        cls (type): The class of the JSPEC term
 
-    if isinstance(term, JSPECMacro):
-        return match_macro(loc, term, element)
+    Returns:
+        func: The matching function for the JSPEC term class.
 
-    if isinstance(term, JSPECConditional):
-        return match_conditional(loc, term, element)
+    Raises:
+        ValueError: If there is no matching function for ``cls``.
+    """
+    func = _DISPATCH.get(cls)
+    if func is not None:
+        return func
+    for base in cls.__mro__:
+        func = MATCHERS.get(base)
+        if func is not None:
+            _DISPATCH[cls] = func
+            return func
+    raise ValueError("JSPEC do not support elements of class %s" % cls)
+
+def register(cls, func):
+    """Register ``func`` as the matching function for the JSPEC term class
+    ``cls`` and its subclasses.
 
-    raise ValueError("JSPEC do not support elements of class %s" % term.__class__)
+    Args:
+        cls (type): The class of the JSPEC term
+        func (func): The matching function, called with the location, the JSPEC
+            term, the JSON element and the state of the current match, and
+            returning a ``Result``
+    """
+    MATCHERS[cls] = func
+    _DISPATCH.clear()
+    _DISPATCH.update(MATCHERS)
 
-def match_object(loc, term, element):
+def match_object(loc, term, element, ctx):
     """Determine if the JSPEC object matches the JSON element.
 
+    The JSPEC object pairs with literal keys are matched first, by looking up
+    their keys in the JSON object, and the JSON pairs which only the ellipsis
+    can match are then left to it. Any JSON pairs left are matched against
+    the other JSPEC object pairs and captures by ``match_object_traverse``,
+    unless a lone capture matches all of them in one pass.
+
     Args:
         loc (str): The current location in the JSON
         term (JSPECObject): The JSPEC object.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC object matches the JSON element
@@ -217,9 +512,120 @@ def match_object(loc, term, element):
     for spec_pair in term.spec:
         if not isinstance(spec_pair, (JSPECObjectPair, JSPECObjectCaptureGroup)):
             raise ValueError("JSPEC objects do not support object paris of class %s" % spec_pair.__class__)
-    return match_object_traverse(loc, term, element, 0, 0)
+    literal, others = _object_pairs(term)
+
+    # A JSPEC object pair with a literal key can only match the JSON pair with
+    # that key, so it is looked up rather than searched for
+    failed = list()
+    matched = set()
+    for key, spec_pair in literal.items():
+        if key in element and bool(match_element(loc + "." + key, spec_pair.value(), element[key], ctx)):
+            matched.add(key)
+        else:
+            failed.append(spec_pair)
+    count = len(matched)
+    if matched:
+        element = {k: v for k, v in element.items() if k not in matched}
+
+    # The JSON pairs which nothing but the ellipsis can match are left to it,
+    # and every JSON pair is once the match has failed, which leaves the
+    # search below to find the message
+    ellipsis = [p for p in others if isinstance(p, JSPECObjectEllipsis)]
+    captures = [p for p in others if not isinstance(p, JSPECObjectEllipsis)]
+    if ellipsis and element:
+        mark = trail_mark(ctx)
+        kept = dict()
+        if not failed:
+            kept = {k: v for k, v in element.items() if any(_object_entry_matches(loc, p, (k, v), ctx) for p in captures)}
+        rewind(ctx, mark)
+        count += len(element) - len(kept)
+        element = kept
+
+    if not failed:
+        if not captures and (ellipsis or not element):
+            return GoodMatch()
+        if len(captures) == 1 and isinstance(captures[0], JSPECObjectCaptureGroup):
+            # A lone capture matches every JSON pair left or the match fails
+            result = _match_object_capture_all(loc, captures[0], element, bool(ellipsis), count, ctx)
+            if result is not None:
+                return result
+    if count or failed:
+        term = JSPECObject(set(failed + others))
+    return match_object_traverse(loc, term, element, count, count, ctx)
+
+def _object_pairs(term):
+    """Returns the JSPEC object pairs of the JSPEC object ``term`` with literal
+    keys, by key, and a list of its other JSPEC object pairs and captures. Pairs
+    with the same literal key are left with the others. They are worked out
+    once for each JSPEC object."""
+    if term._pairs is None:
+        literal = dict()
+        others = list()
+        for spec_pair in term.spec:
+            if isinstance(spec_pair, JSPECObjectPair) and path.literal_key(spec_pair.key()):
+                literal.setdefault(spec_pair.key().spec, list()).append(spec_pair)
+            else:
+                others.append(spec_pair)
+        for key, pairs in list(literal.items()):
+            if len(pairs) > 1:
+                others.extend(pairs)
+                del literal[key]
+        term._pairs = dict((key, pairs[0]) for key, pairs in literal.items()), others
+    return term._pairs
+
+def _object_entry_matches(loc, spec_pair, element_pair, ctx):
+    """Returns whether the JSON object pair matches the JSPEC object pair or
+    counts towards the JSPEC object capture ``spec_pair``."""
+    if isinstance(spec_pair, JSPECObjectPair):
+        return bool(match_object_pair(loc, spec_pair, element_pair, ctx))
+    if spec_pair.exhausted():
+        return False
+    return bool(match_object_capture_group(loc, spec_pair, element_pair, 0, 0, ctx)[1])
+
+def _match_object_capture_all(loc, capture, element, ellipsis, count, ctx):
+    """Returns the result of matching the JSON object pairs in ``element``
+    against the lone JSPEC object capture, or None if it is left to
+    ``match_object_traverse``.
+
+    It is a good match if every JSON pair counts towards the capture, within
+    its multiplier, and any JSON pairs over the maximum of the capture are
+    left to the JSPEC object ellipsis, if there is one. Without an ellipsis, a
+    JSON pair which the capture does not match can never be matched, so the
+    match has failed without trying every order of the JSON pairs the capture
+    does match, as ``match_object_traverse`` would, see ``_capture_failure``.
+    """
+    minimum = capture.multiplier.minimum or 0
+    maximum = capture.multiplier.maximum
+    mark = trail_mark(ctx)
+    failing = list()
+    for element_pair in element.items():
+        if not _object_entry_matches(loc, capture, element_pair, ctx):
+            if ellipsis:
+                rewind(ctx, mark)
+                return None
+            failing.append(element_pair)
+    if failing:
+        rewind(ctx, mark)
+        matching = len(element) - len(failing)
+        if maximum is not None and maximum <= matching:
+            return None
+        return _capture_failure(loc, capture, element, failing, count, ctx)
+    if len(element) < minimum or (not ellipsis and maximum is not None and len(element) > maximum):
+        rewind(ctx, mark)
+        return None
+    return GoodMatch()
 
-def match_object_traverse(loc, term, element, term_count, element_count):
+def _capture_failure(loc, capture, element, failing, count, ctx):
+    """Returns the bad match for a lone JSPEC object capture which does not
+    match the JSON pairs ``failing`` of ``element``. With one such JSON pair,
+    it is the reason the capture gives for that pair. With several, no
+    order of the JSON pairs can match, and every JSON pair is listed."""
+    if len(failing) > 1:
+        return BadMatch(loc, "failed to match the following JSON pairs: [%s]" % ", ".join([(json.dumps(k)+": "+json.dumps(v)) for k,v in sorted(element.items())])).with_capture_metadata(count, count)
+    _, result = match_object_capture_group(loc, capture, failing[0], count, count, ctx)
+    return result
+
+def match_object_traverse(loc, term, element, term_count, element_count, ctx):
     """Traverse through the JSPEC object and JSON object to help determine if
     the JSPEC object matches the JSON object.
 
@@ -231,6 +637,7 @@ def match_object_traverse(loc, term, element, term_count, element_count):
             matched
         element_count (int): The number of JSON object pairs that have been
             matched
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC object matches the JSON object
@@ -247,25 +654,27 @@ def match_object_traverse(loc, term, element, term_count, element_count):
 
     bad_matches = [BadMatch(loc, "empty spec")]
     bad_element_pairs = list()
+    mark = trail_mark(ctx)
     for spec_pair in spec:
         for element_pair in element.items():
+            rewind(ctx, mark)
             if isinstance(spec_pair, JSPECObjectPair):
-                result = match_object_pair(loc, spec_pair, element_pair).with_capture_metadata(term_count, element_count)
+                result = match_object_pair(loc, spec_pair, element_pair, ctx).with_capture_metadata(term_count, element_count)
                 if bool(result):
                     new_term = JSPECObject(set(p for p in spec if p != spec_pair))
-                    new_element = dict(p for p in element.items() if p != element_pair)
-                    return match_object_traverse(loc, new_term, new_element, term_count+1, element_count+1)
+                    new_element = {k: v for k, v in element.items() if k != element_pair[0]}
+                    return match_object_traverse(loc, new_term, new_element, term_count+1, element_count+1, ctx)
                 bad_matches.append(result)
                 bad_element_pairs.append(element_pair)
                 continue
             capture = spec_pair
             if capture.exhausted():
                 continue
-            reduced_capture, result = match_object_capture_group(loc, capture, element_pair, term_count, element_count)
+            reduced_capture, result = match_object_capture_group(loc, capture, element_pair, term_count, element_count, ctx)
             if bool(result):
                 new_term = JSPECObject(set((p if p != capture else reduced_capture) for p in spec))
-                new_element = dict(p for p in element.items() if p != element_pair)
-                result = match_object_traverse(loc, new_term, new_element, term_count+1, element_count+1)
+                new_element = {k: v for k, v in element.items() if k != element_pair[0]}
+                result = match_object_traverse(loc, new_term, new_element, term_count+1, element_count+1, ctx)
                 if bool(result):
                     return result
             bad_matches.append(result)
@@ -276,7 +685,7 @@ def match_object_traverse(loc, term, element, term_count, element_count):
         return BadMatch(loc, "failed to match the following JSON pairs: [%s]" % ", ".join([(json.dumps(k)+": "+json.dumps(v)) for k,v in sorted(bad_element_pairs)]))
     return bad_matches[0]
 
-def match_object_pair(loc, spec_pair, obj_pair):
+def match_object_pair(loc, spec_pair, obj_pair, ctx):
     """Determine if the JSPEC object pair matches the JSON object pair.
 
     Args:
@@ -284,20 +693,21 @@ def match_object_pair(loc, spec_pair, obj_pair):
         term (JSPECObjectPair): The JSPEC object pair.
         element (tuple): The Python native object representing a JSON object
             pair
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC object pair matches the JSON
             object pair
     """
-    key_result = match_element(loc, spec_pair.key(), obj_pair[0])
+    key_result = match_element(loc, spec_pair.key(), obj_pair[0], ctx)
     if not bool(key_result):
         return key_result
-    value_result = match_element(loc + "." + obj_pair[0], spec_pair.value(), obj_pair[1])
+    value_result = match_element(loc + "." + obj_pair[0], spec_pair.value(), obj_pair[1], ctx)
     if not bool(value_result):
         return value_result
     return GoodMatch()
 
-def match_object_capture_group(loc, capture, element_pair, term_count, element_count):
+def match_object_capture_group(loc, capture, element_pair, term_count, element_count, ctx):
     """Determine if the given JSON object pair can count towards an object pair
     in the JSPEC object capture.
 
@@ -310,6 +720,7 @@ def match_object_capture_group(loc, capture, element_pair, term_count, element_c
             matched
         element_count (int): The number of JSON object pairs that have been
             matched
+        ctx (Context): The state of the current match
 
     Returns:
         JSPECObjectCaptureGroup/None: If the JSON object pair can count towards
@@ -318,14 +729,14 @@ def match_object_capture_group(loc, capture, element_pair, term_count, element_c
         Result: The result of whether the JSON object pair can count towards an
             object pair in the JSPEC object capture.
     """
-    result = match_object_pair(loc, capture.entities[0], element_pair)
+    result = match_object_pair(loc, capture.entities[0], element_pair, ctx)
     value = bool(result)
     i = 1
     while i < len(capture.entities):
         operator = capture.entities[i]
         spec_pair = capture.entities[i+1]
         i += 2
-        result = match_object_pair(loc, spec_pair, element_pair)
+        result = match_object_pair(loc, spec_pair, element_pair, ctx)
         if operator.__class__ == JSPECLogicalOperatorAnd:
             value = value and bool(result)
         elif operator.__class__ == JSPECLogicalOperatorOr:
@@ -336,13 +747,14 @@ def match_object_capture_group(loc, capture, element_pair, term_count, element_c
         return capture.reduced(), GoodMatch()
     return None, BadMatch(loc, "failed object capture, '%s: %s' failed to match '%s'" % (json.dumps(element_pair[0]), json.dumps(element_pair[1]), capture)).with_capture_metadata(term_count, element_count)
 
-def match_array(loc, term, element):
+def match_array(loc, term, element, ctx):
     """Determine if the JSPEC array matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECArray): The JSPEC array.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC array matches the JSON element
@@ -352,12 +764,19 @@ def match_array(loc, term, element):
     for spec in term.spec:
         if not isinstance(spec, (JSPECTerm, JSPECArrayCaptureGroup)):
             raise ValueError("JSPEC arrays do not support elements of class %s" % spec.__class__)
-    return match_array_traverse(loc, term, element, 0, 0)
+    return match_array_traverse(loc, term, element, 0, 0, ctx)
 
-def match_array_traverse(loc, term, element, term_idx, element_idx):
+def match_array_traverse(loc, term, element, term_idx, element_idx, ctx):
     """Traverse through the JSPEC array and JSON array to help determine if the
     JSPEC array matches the JSON array.
 
+    The traversal moves through both arrays by index, rather than matching
+    slices of them, and only branches at satisfied array captures, where the
+    capture either ends after the next JSON element, continues after it, or
+    ends before it. Each branch is a frame on an explicit stack instead of a
+    recursive call, so the length of the JSON array is not bounded by the
+    recursion limit.
+
     Args:
         loc (str): The current location in the JSON
         term (JSPECArray): The JSPEC array.
@@ -366,56 +785,102 @@ def match_array_traverse(loc, term, element, term_idx, element_idx):
             up to
         element_idx (int): The current index in the JSON array that has been
             matched up to
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC array matches the JSON array
     """
     spec = term.spec
+    satisfied, exhausted = _array_suffixes(term)
+    head = spec[0] if spec else None
+    stack = [_array_frame(loc, spec, satisfied, exhausted, element, term_idx, element_idx, 0, head, 0, ctx)]
+    result = None
+    while stack:
+        try:
+            branch = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            continue
+        pos, head, idx = branch
+        stack.append(_array_frame(loc, spec, satisfied, exhausted, element, term_idx, element_idx, pos, head, idx, ctx))
+        result = None
+    return result
+
+def _array_frame(loc, spec, satisfied, exhausted, element, term_offset, element_offset, pos, head, idx, ctx):
+    # A frame of ``match_array_traverse``, matching ``[head] + spec[pos+1:]``
+    # against ``element[idx:]``. It yields the (pos, head, idx) of each branch
+    # and is sent the result of the branch.
+    while True:
+        term_idx = term_offset + pos
+        element_idx = element_offset + idx
+
+        if idx == len(element):
+            if head is None or (isinstance(head, JSPECArrayCaptureGroup) and head.satisfied() and satisfied[pos+1]):
+                return GoodMatch()
+            return BadMatch(loc, "exhausted JSON array, no JSON element left to match '%s'" % head).with_capture_metadata(term_idx, element_idx)
+
+        if head is None or (isinstance(head, JSPECArrayCaptureGroup) and head.exhausted() and exhausted[pos+1]):
+            return BadMatch(loc + "[%s]" % element_idx, "exhausted JSPEC array, no JSPEC term left to match '%s'" % element[idx]).with_capture_metadata(term_idx, element_idx)
+
+        following = spec[pos+1] if pos + 1 < len(spec) else None
+
+        if isinstance(head, JSPECTerm):
+            result = match_element("%s[%s]" % (loc,  element_idx), head, element[idx], ctx).with_capture_metadata(term_idx, element_idx)
+            if not bool(result):
+                return result
+            pos, head, idx = pos + 1, following, idx + 1
+            continue
 
-    if len(element) == 0:
-        if term.satisfied_captures():
-            return GoodMatch()
-        return BadMatch(loc, "exhausted JSON array, no JSON element left to match '%s'" % spec[0]).with_capture_metadata(term_idx, element_idx)
+        capture = head
 
-    if term.exhausted_captures():
-        return BadMatch(loc + "[%s]" % element_idx, "exhausted JSPEC array, no JSPEC term left to match '%s'" % element[0]).with_capture_metadata(term_idx, element_idx)
-        
+        if capture.exhausted():
+            pos, head = pos + 1, following
+            continue
 
-    if isinstance(spec[0], JSPECTerm):
-        result = match_element("%s[%s]" % (loc,  element_idx), spec[0], element[0]).with_capture_metadata(term_idx, element_idx)
-        if not bool(result):
-            return result
-        return match_array_traverse(loc, JSPECArray(spec[1:]), element[1:], term_idx+1, element_idx+1)
-    
-    capture = spec[0]
-    
-    if capture.exhausted():
-        return match_array_traverse(loc, JSPECArray(spec[1:]), element,  term_idx+1, element_idx)
-    
-    if capture.satisfied():
-        best_bad_match = BadMatch(loc, "")
-        reduced_capture, result = match_array_capture_group(loc, capture, element[0], term_idx, element_idx)
-        if bool(result):
-            result = match_array_traverse(loc, JSPECArray(spec[1:]), element[1:], term_idx+1, element_idx+1)
+        if capture.satisfied():
+            best_bad_match = BadMatch(loc, "")
+            mark = trail_mark(ctx)
+            reduced_capture, result = match_array_capture_group(loc, capture, element[idx], term_idx, element_idx, ctx)
             if bool(result):
-                return result
-            best_bad_match = result if best_bad_match < result else best_bad_match
-            result = match_array_traverse(loc, JSPECArray([reduced_capture] + spec[1:]), element[1:], term_idx, element_idx+1)
+                captured = trail_mark(ctx)
+                result = yield pos + 1, following, idx + 1
+                if bool(result):
+                    return result
+                best_bad_match = result if best_bad_match < result else best_bad_match
+                rewind(ctx, captured)
+                result = yield pos, reduced_capture, idx + 1
+                if bool(result):
+                    return result
+                best_bad_match = result if best_bad_match < result else best_bad_match
+            rewind(ctx, mark)
+            result = yield pos + 1, following, idx
             if bool(result):
                 return result
             best_bad_match = result if best_bad_match < result else best_bad_match
-        result = match_array_traverse(loc, JSPECArray(spec[1:]), element, term_idx+1, element_idx)
-        if bool(result):
-            return result
-        best_bad_match = result if best_bad_match < result else best_bad_match
-        return best_bad_match
+            return best_bad_match
 
-    reduced_capture, result = match_array_capture_group(loc, capture, element[0], term_idx, element_idx)
-    if not bool(result):
-        return result
-    return match_array_traverse(loc, JSPECArray([reduced_capture] + spec[1:]), element[1:], term_idx, element_idx+1)
-
-def match_array_capture_group(loc, capture, element, term_idx, element_idx):
+        reduced_capture, result = match_array_capture_group(loc, capture, element[idx], term_idx, element_idx, ctx)
+        if not bool(result):
+            return result
+        head, idx = reduced_capture, idx + 1
+
+def _array_suffixes(term):
+    """Returns whether each suffix of the JSPEC array ``term`` only has
+    satisfied captures, and whether it only has exhausted captures, as two
+    lists indexed by the start of the suffix, with an entry for the empty
+    suffix. They are worked out once for each JSPEC array."""
+    if term._suffixes is None:
+        satisfied = [True]
+        exhausted = [True]
+        for spec in reversed(term.spec):
+            capture = isinstance(spec, JSPECArrayCaptureGroup)
+            satisfied.append(satisfied[-1] and capture and spec.satisfied())
+            exhausted.append(exhausted[-1] and capture and spec.exhausted())
+        term._suffixes = satisfied[::-1], exhausted[::-1]
+    return term._suffixes
+
+def match_array_capture_group(loc, capture, element, term_idx, element_idx, ctx):
     """Determine if the given JSON element can count towards an element in the
     JSPEC array capture.
 
@@ -427,6 +892,7 @@ def match_array_capture_group(loc, capture, element, term_idx, element_idx):
             up to
         element_idx (int): The current index in the JSON array that has been
             matched up to
+        ctx (Context): The state of the current match
 
     Returns:
         JSPECArrayCaptureGroup/None: If the JSON element can count towards an
@@ -435,14 +901,14 @@ def match_array_capture_group(loc, capture, element, term_idx, element_idx):
         Result: The result of whether the JSON element can count towards an
             element in the JSPEC array capture
     """
-    result = match_element(loc, capture.entities[0], element)
+    result = match_element(loc, capture.entities[0], element, ctx)
     value = bool(result)
     i = 1
     while i < len(capture.entities):
         operator = capture.entities[i]
         spec_element = capture.entities[i+1]
         i += 2
-        result = match_element(loc, spec_element, element)
+        result = match_element(loc, spec_element, element, ctx)
         if operator.__class__ == JSPECLogicalOperatorAnd:
             value = value and bool(result)
         elif operator.__class__ == JSPECLogicalOperatorOr:
@@ -453,13 +919,14 @@ def match_array_capture_group(loc, capture, element, term_idx, element_idx):
         return capture.reduced(), GoodMatch()
     return None, BadMatch(loc, "failed array capture, '%s' failed to match '%s'" % (element, capture)).with_capture_metadata(term_idx, element_idx)
 
-def match_int(loc, term, element):
+def match_int(loc, term, element, ctx):
     """Determine if the JSPEC int matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECInt): The JSPEC int.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC int matches the JSON element
@@ -470,13 +937,14 @@ def match_int(loc, term, element):
         return BadMatch(loc, "expected '%s', got '%s'" % (term.spec, json.dumps(element)))
     return GoodMatch()
 
-def match_real(loc, term, element):
+def match_real(loc, term, element, ctx):
     """Determine if the JSPEC real matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECReal): The JSPEC real.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC real matches the JSON element
@@ -487,13 +955,14 @@ def match_real(loc, term, element):
         return BadMatch(loc, "expected '%s', got '%s'" % (term.spec, json.dumps(element)))
     return GoodMatch()
 
-def match_string(loc, term, element):
+def match_string(loc, term, element, ctx):
     """Determine if the JSPEC string matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECString): The JSPEC string.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC string matches the JSON element
@@ -504,13 +973,14 @@ def match_string(loc, term, element):
         return BadMatch(loc, "regex pattern '%s' failed to match '%s'" % (term.spec, json.dumps(element)))
     return GoodMatch()
 
-def match_boolean(loc, term, element):
+def match_boolean(loc, term, element, ctx):
     """Determine if the JSPEC boolean matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECBoolean): The JSPEC boolean.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC boolean matches the JSON
@@ -522,13 +992,14 @@ def match_boolean(loc, term, element):
         return BadMatch(loc, "expected '%s', got '%s'" % (term.spec, json.dumps(element)))
     return GoodMatch()
 
-def match_null(loc, term, element):
+def match_null(loc, term, element, ctx):
     """Determine if the JSPEC null matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECNull): The JSPEC null.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC null matches the JSON element
@@ -537,13 +1008,14 @@ def match_null(loc, term, element):
         return BadMatch(loc, "expected '%s', got '%s'" % (term.spec, json.dumps(element)))
     return GoodMatch()
 
-def match_wildcard(loc, term, element):
+def match_wildcard(loc, term, element, ctx):
     """Determine if the JSPEC wildcard matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECWildcard): The JSPEC wildcard.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC wildcard matches the JSON
@@ -553,66 +1025,77 @@ def match_wildcard(loc, term, element):
         return BadMatch(loc, "expected a Python native JSON element, not %s" % element.__class__)
     return GoodMatch()
 
-def match_negation(loc, term, element):
+def match_negation(loc, term, element, ctx):
     """Determine if the JSPEC negation matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECNegation): The JSPEC negation.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC negation matches the JSON element
     """
-    result = match_element(loc, term.spec, element)
+    result = match_element(loc, term.spec, element, ctx)
     if bool(result):
         return BadMatch(loc, "expected '%s', got '%s'" % (term, json.dumps(element)))
     return GoodMatch()
 
-def match_macro(loc, term, element):
+def match_macro(loc, term, element, ctx):
     """Determine if the JSPEC macro matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECMacro): The JSPEC macro.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC macro matches the JSON element
     """
-    string_value = os.getenv(term.spec, None)
-    if string_value == None:
+    status, _ = ctx.macros.resolve(term.spec)
+    if status == macro.MACRO_MISSING:
         return BadMatch(loc, "failed to find the JSPEC macro '%s'" % term)
-    try:
-        value = json.loads(string_value)
-    except json.decoder.JSONDecodeError:
+    if status == macro.MACRO_INVALID:
         return BadMatch(loc, "failed to parse the JSPEC macro '%s' as a JSON element" % term)
-    if value != element:
+    if not ctx.macros.matches(term.spec, element):
         return BadMatch(loc, "JSPEC macro '%s' failed to match '%s'" % (term, json.dumps(element)))
     return GoodMatch()
 
-def match_conditional(loc, conditional, element):
+def match_conditional(loc, conditional, element, ctx):
     """Determine if the JSPEC conditional matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECConditional): The JSPEC conditional.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC conditional matches the JSON
             element
     """
+    union = discriminated_union(conditional)
+    if union:
+        key, alternatives = union
+        value = element.get(key) if isinstance(element, dict) else None
+        matched = False
+        for term in alternatives.get(value, ()) if isinstance(value, str) else ():
+            matched = bool(match_element(loc, term, element, ctx)) or matched
+        if matched:
+            return GoodMatch()
+        return BadMatch(loc, "conditional elements %s do not match the element '%s'" % (conditional, element))
     spec = conditional.spec
     term = conditional.spec[0]
-    result = match_element(loc, term, element)
+    result = match_element(loc, term, element, ctx)
     value = bool(result)
     i = 1
     while i < len(spec):
         operator = spec[i]
         term = spec[i+1]
         i += 2
-        result = match_element(loc, term, element)
+        result = match_element(loc, term, element, ctx)
         if operator.__class__ == JSPECLogicalOperatorAnd:
             value = value and bool(result)
         elif operator.__class__ == JSPECLogicalOperatorOr:
@@ -623,13 +1106,82 @@ def match_conditional(loc, conditional, element):
         return GoodMatch()
     return BadMatch(loc, "conditional elements %s do not match the element '%s'" % (conditional, element))
 
-def match_object_placeholder(loc, term, element):
+def discriminated_union(conditional):
+    """Returns the discriminator of the JSPEC conditional, if it is a
+    discriminated union, caching it on the JSPEC conditional.
+
+    A JSPEC conditional is a discriminated union if it only uses the OR
+    operator, and every term is a JSPEC object with a pair for the same literal
+    key whose value is a literal JSPEC string, e.g.
+    ``({"type": "click", ...} | {"type": "view", ...})``. Only the terms with
+    the value of that key in a JSON object can match it, so the other terms
+    need not be matched.
+
+    Args:
+        conditional (JSPECConditional): The JSPEC conditional.
+
+    Returns:
+        tuple: The discriminator key and a dict of its values to the tuple of
+            JSPEC terms with that value, or an empty tuple if ``conditional``
+            is not a discriminated union.
+    """
+    if conditional._union is None:
+        conditional._union = _discriminate(conditional)
+    return conditional._union
+
+def _discriminate(conditional):
+    """Returns the discriminator of the JSPEC conditional, see
+    ``discriminated_union``."""
+    spec = conditional.spec
+    if len(spec) < 3 or any(op.__class__ is not JSPECLogicalOperatorOr for op in spec[1::2]):
+        return ()
+    literals = list()
+    for term in spec[::2]:
+        while isinstance(term, JSPECNamedTerm):
+            term = term.term()
+        if term.__class__ is not JSPECObject:
+            return ()
+        literals.append({
+            pair.key().spec: pair.value().spec
+            for pair in term.spec
+            if isinstance(pair, JSPECObjectPair)
+            and path.literal_key(pair.key())
+            and path.literal_key(pair.value())
+        })
+    for key in sorted(set.intersection(*(set(values) for values in literals))):
+        alternatives = dict()
+        for term, values in zip(spec[::2], literals):
+            alternatives.setdefault(values[key], list()).append(term)
+        return key, {value: tuple(terms) for value, terms in alternatives.items()}
+    return ()
+
+def match_named_term(loc, term, element, ctx):
+    """Determine if the JSPEC named term matches the JSON element, binding the
+    JSON element to the name of the JSPEC named term if it does.
+
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECNamedTerm): The JSPEC named term.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+
+    Returns:
+        Result: The result of whether the JSPEC named term matches the JSON
+            element
+    """
+    result = match_element(loc, term.term(), element, ctx)
+    if result and ctx.trail is not None:
+        ctx.trail.append((term.name(), element))
+    return result
+
+def match_object_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC object placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECObjectPlaceholder): The JSPEC object placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC object placeholder matches the
@@ -639,13 +1191,14 @@ def match_object_placeholder(loc, term, element):
         return GoodMatch()
     return BadMatch(loc, "expected an object")
 
-def match_array_placeholder(loc, term, element):
+def match_array_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC array placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECArrayPlaceholder): The JSPEC array placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC array placeholder matches the
@@ -655,13 +1208,14 @@ def match_array_placeholder(loc, term, element):
         return GoodMatch()
     return BadMatch(loc, "expected an array")
 
-def match_string_placeholder(loc, term, element):
+def match_string_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC string placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECStringPlaceholder): The JSPEC string placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC string placeholder matches the
@@ -671,13 +1225,14 @@ def match_string_placeholder(loc, term, element):
         return GoodMatch()
     return BadMatch(loc, "expected a string")
 
-def match_boolean_placeholder(loc, term, element):
+def match_boolean_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC boolean placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECBooleanPlaceholder): The JSPEC boolean placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC boolean placeholder matches the
@@ -687,13 +1242,14 @@ def match_boolean_placeholder(loc, term, element):
         return GoodMatch()
     return BadMatch(loc, "expected a boolean")
 
-def match_int_placeholder(loc, term, element):
+def match_int_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC int placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECIntPlaceholder): The JSPEC int placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC int placeholder matches the
@@ -723,13 +1279,14 @@ def match_int_placeholder(loc, term, element):
 
     raise ValueError("JSPEC does not support inequalities of class %s" % symbol.__class__)
 
-def match_real_placeholder(loc, term, element):
+def match_real_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC real placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECRealPlaceholder): The JSPEC real placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC real placeholder matches the
@@ -759,13 +1316,14 @@ def match_real_placeholder(loc, term, element):
 
     raise ValueError("JSPEC does not support inequalities of class %s" % symbol.__class__)
 
-def match_number_placeholder(loc, term, element):
+def match_number_placeholder(loc, term, element, ctx):
     """Determine if the JSPEC number placeholder matches the JSON element.
 
     Args:
         loc (str): The current location in the JSON
         term (JSPECNumberPlaceholder): The JSPEC number placeholder.
         element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
 
     Returns:
         Result: The result of whether the JSPEC number placeholder matches the
@@ -793,4 +1351,57 @@ def match_number_placeholder(loc, term, element):
             return GoodMatch()
         return BadMatch(loc, "expected a number that is more than or equal to '%s', got '%s'" % (value, json.dumps(element)))
 
-    raise ValueError("JSPEC does not support inequalities of class %s" % symbol.__class__)
\ No newline at end of file
+    raise ValueError("JSPEC does not support inequalities of class %s" % symbol.__class__)
+
+def match_custom_placeholder(loc, term, element, ctx):
+    """Determine if the JSPEC custom placeholder matches the JSON element.
+
+    Args:
+        loc (str): The current location in the JSON
+        term (JSPECCustomPlaceholder): The JSPEC custom placeholder.
+        element (obj): The Python native object representing a JSON element
+        ctx (Context): The state of the current match
+
+    Returns:
+        Result: The result of whether the JSPEC custom placeholder matches the
+            JSON element
+
+    Raises:
+        ValueError: If the placeholder is not registered.
+    """
+    try:
+        predicate, description = placeholder.PLACEHOLDERS[term.spec]
+    except KeyError:
+        raise ValueError("JSPEC placeholder '%s' is not registered" % term.spec) from None
+    if predicate(element):
+        return GoodMatch()
+    return BadMatch(loc, "expected %s" % description)
+
+MATCHERS = {
+    JSPECObjectPlaceholder: match_object_placeholder,
+    JSPECArrayPlaceholder: match_array_placeholder,
+    JSPECStringPlaceholder: match_string_placeholder,
+    JSPECBooleanPlaceholder: match_boolean_placeholder,
+    JSPECIntPlaceholder: match_int_placeholder,
+    JSPECRealPlaceholder: match_real_placeholder,
+    JSPECNumberPlaceholder: match_number_placeholder,
+    JSPECCustomPlaceholder: match_custom_placeholder,
+    JSPECObject: match_object,
+    JSPECArray: match_array,
+    JSPECString: match_string,
+    JSPECInt: match_int,
+    JSPECReal: match_real,
+    JSPECBoolean: match_boolean,
+    JSPECNull: match_null,
+    JSPECWildcard: match_wildcard,
+    JSPECNegation: match_negation,
+    JSPECMacro: match_macro,
+    JSPECConditional: match_conditional,
+    JSPECNamedTerm: match_named_term,
+}
+"""dict: The matching functions for each class of JSPEC term, see
+``register``."""
+
+_DISPATCH = dict(MATCHERS)
+"""dict: The matching functions for each class of JSPEC term that has been
+matched, including subclasses of the classes in ``MATCHERS``."""
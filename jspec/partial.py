@@ -0,0 +1,119 @@
+"""Module for matching selected parts of a JSON against the parts of a JSPEC
+which they are bound to.
+
+A selector is a JSONPath-like location, such as '$.order.items' (see
+``jspec.path.parse_selector``). Each selector is resolved to the JSPEC term
+bound to that location, following JSPEC object pairs with literal keys, JSPEC
+arrays of JSPEC terms and, for '[*]', JSPEC arrays of a single capture of a
+single term such as ``[(int)x?]``. The JSON outside the selected locations is
+not visited at all.
+"""
+
+from . import matcher
+from . import path
+from .entity import JSPECNamedTerm
+
+def select(spec, selector):
+    """Returns the JSPEC term bound to the selector ``selector`` in the JSPEC
+    ``spec``, resolving it once and caching it on ``spec``.
+
+    Args:
+        spec (JSPEC): The JSPEC
+        selector (str): The selector, e.g. '$.order.items[*]'
+
+    Returns:
+        list: The steps of the selector, see ``jspec.path.parse_selector``.
+        JSPECTerm: The JSPEC term bound to the selector.
+
+    Raises:
+        ValueError: If ``selector`` is invalid or is not bound to a JSPEC term.
+    """
+    selected = spec._selectors.get(selector)
+    if selected is None:
+        selected = spec._selectors[selector] = _resolve(spec.base, selector)
+    return selected
+
+def match(spec, element, selectors, cache=None, macros=None, limits=None, hooks=None):
+    """Determine if the JSON elements selected by ``selectors`` match the JSPEC
+    terms bound to them, without visiting the rest of the JSON.
+
+    A selected location which is missing from the JSON is a bad match, since
+    every location a selector can resolve to is required by the JSPEC.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        element (obj): A Python native object representing a JSON
+        selectors (list): The selectors, e.g. ['$.order.items', '$.customer']
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees, shared between calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done by the match.
+        hooks (Hooks, optional): The instrumentation hooks for the match.
+
+    Returns:
+        bool: ``True`` if it was a good match, otherwise ``False``.
+        str: Details on why the match failed for the first selector that
+            failed, otherwise an empty string.
+
+    Raises:
+        ValueError: If any selector is invalid or is not bound to a JSPEC term.
+        JSPECLimitError: If the match exceeds any of ``limits``.
+    """
+    selected = [select(spec, selector) for selector in selectors]
+    ctx = matcher.Context(cache, macros, limits, hooks=hooks)
+    for steps, term in selected:
+        result = match_steps("$", term, element, steps, 0, ctx)
+        if not result:
+            return False, result.reason()
+    return True, ""
+
+def match_steps(loc, term, element, steps, idx, ctx):
+    """Follow the selector steps from ``idx`` through the JSON element, then
+    match the JSPEC term against each JSON element reached.
+
+    Returns:
+        Result: The result of the first bad match, otherwise a good match.
+    """
+    if idx == len(steps):
+        return matcher.match_element(loc, term, element, ctx)
+    step = steps[idx]
+    if step is path.ALL:
+        if not isinstance(element, list):
+            return matcher.BadMatch(loc, "expected an array")
+        for i, child in enumerate(element):
+            result = match_steps("%s[%s]" % (loc, i), term, child, steps, idx + 1, ctx)
+            if not result:
+                return result
+        return matcher.GoodMatch()
+    if isinstance(step, int):
+        if not isinstance(element, list):
+            return matcher.BadMatch(loc, "expected an array")
+        if step >= len(element):
+            return matcher.BadMatch(loc, "exhausted JSON array, no JSON element at index %d" % step)
+        return match_steps("%s[%s]" % (loc, step), term, element[step], steps, idx + 1, ctx)
+    if not isinstance(element, dict):
+        return matcher.BadMatch(loc, "expected an object")
+    if step not in element:
+        return matcher.BadMatch(loc, "failed to find a JSON pair with the key '%s'" % step)
+    return match_steps(loc + "." + step, term, element[step], steps, idx + 1, ctx)
+
+def _resolve(term, selector):
+    """Returns the steps of ``selector`` and the JSPEC term bound to it, from
+    the base JSPEC term ``term``."""
+    steps = path.parse_selector(selector)
+    for step in steps:
+        while isinstance(term, JSPECNamedTerm):
+            term = term.term()
+        if step is path.ALL:
+            bound = path.array_element_binding(term)
+        elif isinstance(step, int):
+            bindings = path.array_bindings(term)
+            bound = bindings[step] if bindings is not None and step < len(bindings) else None
+        else:
+            bindings = path.object_bindings(term)
+            bound = bindings.get(step) if bindings is not None else None
+        if bound is None:
+            raise ValueError("Selector '%s' is not bound to a JSPEC term" % selector)
+        term = bound
+    return steps, term
@@ -0,0 +1,188 @@
+"""Module for resolving locations in a JSON to the JSPEC terms which match
+them.
+
+A location in a JSON is bound to a JSPEC term if every valid match of the
+JSPEC must match the JSON element at that location with that JSPEC term. This
+is the case for the values of JSPEC objects where every pair has a literal key
+(captures are allowed, since a pair with a literal key can only ever match the
+JSON pair with that key), and for the elements of JSPEC arrays where there are
+no captures. Everywhere else, backtracking decides which JSPEC term is
+used, so a location is only bound to the nearest enclosing bound term.
+"""
+
+import json
+import re
+
+from .entity import (
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECString,
+    JSPECTerm,
+    JSPECNamedTerm,
+    JSPECObjectPlaceholder,
+    JSPECArrayPlaceholder,
+    JSPECStringPlaceholder,
+)
+
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+"""frozenset: Characters that make a JSPEC string key a regex, rather than a
+literal key."""
+
+def parse_pointer(pointer):
+    """Returns the reference tokens of the JSON pointer ``pointer``, as defined
+    in RFC 6901.
+
+    Args:
+        pointer (str): The JSON pointer, e.g. '/order/items/0'
+
+    Returns:
+        list: The unescaped reference tokens, e.g. ['order', 'items', '0']
+
+    Raises:
+        ValueError: If ``pointer`` is not a valid JSON pointer.
+    """
+    if not isinstance(pointer, str):
+        raise ValueError("Expecting a JSON pointer string not %s" % pointer.__class__)
+    if pointer == "":
+        return []
+    if pointer[0] != "/":
+        raise ValueError("JSON pointer '%s' does not start with '/'" % pointer)
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+SELECTOR_MATCH = re.compile(r"""
+    \.([A-Za-z_][A-Za-z0-9_\-]*)  # a dot followed by a key
+    |\[(\d+)\]                  # or an array index in square brackets
+    |\[(\*)\]                   # or an asterisk in square brackets
+    |\[("(?:[^"\\]|\\.)*")\]    # or a JSON string key in square brackets""", re.VERBOSE).match
+"""_sre.SRE_Pattern: Pattern to match a single step of a selector."""
+
+ALL = None
+"""None: The selector step for every element of a JSON array."""
+
+def parse_selector(selector):
+    """Returns the steps of the JSONPath-like selector ``selector``.
+
+    A selector is a '$' followed by any number of steps, each of which is
+    either '.key', '["key"]' (a JSON string), '[index]' or '[*]', e.g.
+    '$.order.items[*].sku'.
+
+    Args:
+        selector (str): The selector
+
+    Returns:
+        list: The steps, each a str for an object key, an int for an array
+            index or ``ALL`` for every element of an array.
+
+    Raises:
+        ValueError: If ``selector`` is not a valid selector.
+    """
+    if not isinstance(selector, str) or not selector.startswith("$"):
+        raise ValueError("Selector '%s' does not start with '$'" % selector)
+    steps = list()
+    idx = 1
+    while idx < len(selector):
+        m = SELECTOR_MATCH(selector, idx)
+        if m is None:
+            raise ValueError("Invalid selector '%s' at char %d" % (selector, idx))
+        key, index, wildcard, string = m.groups()
+        if key is not None:
+            steps.append(key)
+        elif index is not None:
+            steps.append(int(index))
+        elif wildcard is not None:
+            steps.append(ALL)
+        else:
+            steps.append(json.loads(string))
+        idx = m.end()
+    return steps
+
+def array_index(token, size):
+    """Returns the array index for the reference token ``token`` in an array of
+    length ``size``, or None if it is not a valid index."""
+    if not token.isdigit() or (token[0] == "0" and token != "0"):
+        return None
+    idx = int(token)
+    return idx if idx < size else None
+
+def literal_key(key):
+    """Returns whether the JSPEC object pair key ``key`` only matches the
+    string it contains."""
+    return (
+        isinstance(key, JSPECString)
+        and not isinstance(key, JSPECStringPlaceholder)
+        and not REGEX_METACHARACTERS.intersection(key.spec)
+    )
+
+def object_bindings(term):
+    """Returns a dict of the literal keys to the value JSPEC terms for the
+    JSPEC object ``term``, or None if the values of ``term`` are not bound by
+    key."""
+    if not isinstance(term, JSPECObject) or isinstance(term, JSPECObjectPlaceholder):
+        return None
+    bindings = dict()
+    for pair in term.spec:
+        if not isinstance(pair, JSPECObjectPair):
+            continue
+        if not literal_key(pair.key()):
+            return None
+        bindings[pair.key().spec] = pair.value()
+    return bindings
+
+def array_bindings(term):
+    """Returns the list of JSPEC terms for the JSPEC array ``term``, or None if
+    the elements of ``term`` are not bound by index."""
+    if not isinstance(term, JSPECArray) or isinstance(term, JSPECArrayPlaceholder):
+        return None
+    if not all(isinstance(spec, JSPECTerm) for spec in term.spec):
+        return None
+    return term.spec
+
+def array_element_binding(term):
+    """Returns the JSPEC term which every element of a JSON array matching the
+    JSPEC array ``term`` is matched against, i.e. the term of an array which
+    is a single capture of a single term such as ``[(int)x?]``, or None if
+    there is no such term."""
+    if not isinstance(term, JSPECArray) or isinstance(term, JSPECArrayPlaceholder):
+        return None
+    if len(term.spec) != 1 or not isinstance(term.spec[0], JSPECArrayCaptureGroup):
+        return None
+    if len(term.spec[0].entities) != 1:
+        return None
+    return term.spec[0].entities[0]
+
+def resolve(term, element, tokens, loc="$"):
+    """Follow the reference tokens ``tokens`` from the JSPEC term ``term`` and
+    JSON element ``element``, for as long as each location is bound to a JSPEC
+    term.
+
+    Args:
+        term (JSPECTerm): The JSPEC term matching ``element``
+        element (obj): The Python native object representing a JSON element
+        tokens (list): The reference tokens to follow
+        loc (str, optional): The location of ``element`` in the JSON
+
+    Returns:
+        JSPECTerm: The deepest JSPEC term reached.
+        obj: The JSON element at the location of the deepest JSPEC term.
+        str: The location of the deepest JSPEC term.
+        int: The number of reference tokens that were followed.
+    """
+    for depth, token in enumerate(tokens):
+        while isinstance(term, JSPECNamedTerm):
+            term = term.term()
+        if isinstance(element, dict):
+            bindings = object_bindings(term)
+            if bindings is None or token not in bindings or token not in element:
+                return term, element, loc, depth
+            term, element, loc = bindings[token], element[token], loc + "." + token
+        elif isinstance(element, list):
+            bindings = array_bindings(term)
+            idx = array_index(token, len(element))
+            if bindings is None or idx is None or idx >= len(bindings):
+                return term, element, loc, depth
+            term, element, loc = bindings[idx], element[idx], "%s[%s]" % (loc, idx)
+        else:
+            return term, element, loc, depth
+    return term, element, loc, len(tokens)
@@ -0,0 +1,93 @@
+"""Command-line tool to search for JSON documents which are slow to match
+against a JSPEC document.
+
+Usage:
+
+    $ python3 -m jspec.perffuzz <jspec_file>
+
+    -- Search for the slowest JSON documents, saving them as a corpus
+    $ python3 -m jspec.perffuzz ./specs/event.jspec --corpus ./corpus/event
+    steps	seconds	size	file
+    976	0.012751	74	./corpus/event/5f0c....json
+    ...
+
+    The flag --raw-jspec can also be used to give the raw JSPEC document
+    instead of a file path. Seed JSON files can be given with --seed-json.
+    With --fail-over, the exit code is 1 if any JSON document found takes
+    more than that many steps to match.
+"""
+
+def main():
+    import argparse
+    import json
+    import jspec
+    from jspec import fuzz
+
+    prog = 'python3 -m jspec.perffuzz'
+    description = ('A simple command line tool to search for JSON documents which are slow to match against a JSPEC document')
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        'jspec_file',
+        nargs='?',
+        type=argparse.FileType(encoding="utf-8"),
+        default=None,
+        help='a JSPEC file to search against'
+    )
+    parser.add_argument(
+        '--raw-jspec',
+        dest='jspec_raw',
+        default=None,
+        help='raw JSPEC document, if none is provided in the other args'
+    )
+    parser.add_argument(
+        '--seed-json',
+        dest='seed_files',
+        action='append',
+        type=argparse.FileType(encoding="utf-8"),
+        default=list(),
+        help='a JSON file to start the search from, can be given more than once'
+    )
+    parser.add_argument('--iterations', type=int, default=1000, help='the number of JSON documents to try')
+    parser.add_argument('--max-size', type=int, default=1024, help='the maximum length of each JSON document')
+    parser.add_argument('--metric', choices=fuzz.METRICS, default='steps', help='the measure of the work done')
+    parser.add_argument('--keep', type=int, default=10, help='the number of the slowest JSON documents to keep')
+    parser.add_argument('--seed', type=int, default=None, help='the seed for the random mutations')
+    parser.add_argument('--max-steps', type=int, default=fuzz.MAX_STEPS, help='the maximum number of steps for each match')
+    parser.add_argument('--corpus', default=None, help='the directory to save the slowest JSON documents in')
+    parser.add_argument('--fail-over', type=int, default=None, help='the number of steps which fails the search')
+    options = parser.parse_args()
+
+    try:
+        if options.jspec_file is None:
+            if options.jspec_raw is None:
+                raise ValueError("The --raw-jspec flag value is not a valid JSPEC")
+            spec = jspec.loads(options.jspec_raw)
+        else:
+            spec = jspec.load(options.jspec_file)
+        seeds = [json.load(file) for file in options.seed_files]
+        samples = fuzz.search(
+            spec,
+            iterations=options.iterations,
+            max_size=options.max_size,
+            metric=options.metric,
+            seeds=seeds,
+            keep=options.keep,
+            seed=options.seed,
+            max_steps=options.max_steps,
+        )
+    except (jspec.scanner.JSPECDecodeError, ValueError) as exc:
+        raise SystemExit(exc)
+    paths = fuzz.save(samples, options.corpus) if options.corpus else [''] * len(samples)
+    sys.stdout.write('steps\tseconds\tsize\tfile\n')
+    for sample, path in zip(samples, paths):
+        steps = '>%d' % options.max_steps if sample.exceeded() else '%d' % sample.steps
+        sys.stdout.write('%s\t%.6f\t%d\t%s\n' % (steps, sample.seconds, sample.size, path))
+    if options.fail_over is not None and any(s.exceeded() or s.steps > options.fail_over for s in samples):
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    import sys
+    try:
+        main()
+    except BrokenPipeError as exc:
+        sys.exit(exc.errno)
@@ -0,0 +1,63 @@
+"""Module for registering custom JSPEC placeholders.
+
+A custom placeholder is a keyword, such as 'even', which matches any JSON
+element satisfying a Python predicate. Checking a format with a predicate is
+usually much faster than matching a long regex in a JSPEC string.
+
+Registered placeholders are global, so should be registered once, before any
+JSPEC documents using them are scanned. The format placeholders in
+``jspec.formats``, such as 'uuid' and 'date-time', are always registered.
+"""
+
+from . import formats
+from . import scanner
+
+PLACEHOLDERS = dict()
+"""dict: The predicate and description of each registered placeholder, keyed
+by its keyword."""
+
+def register(name, predicate, description=None, hook=None):
+    """Register the custom placeholder ``name``.
+
+    Args:
+        name (str): The keyword of the placeholder, made up of letters, digits,
+            underscores and hyphens, and starting with a letter or underscore.
+        predicate (func): Function taking a Python native object representing
+            a JSON element and returning whether it matches the placeholder.
+        description (str, optional): Describes the JSON elements matching the
+            placeholder in the reason for a bad match, e.g. 'a UUID'. Omit to
+            use the keyword.
+        hook (func, optional): The scanner hook for the keyword, see
+            ``jspec.scanner.register_keyword``. Omit to scan the keyword as a
+            ``JSPECCustomPlaceholder``.
+
+    Raises:
+        ValueError: If ``name`` is not a valid keyword or is already
+            registered.
+        TypeError: If ``predicate`` is not callable.
+    """
+    if not callable(predicate):
+        raise TypeError("Expecting a callable predicate not %s" % predicate.__class__)
+    scanner.register_keyword(name, hook)
+    PLACEHOLDERS[name] = (predicate, description or "a %s" % name)
+
+def unregister(name):
+    """Remove the custom placeholder ``name``.
+
+    Raises:
+        ValueError: If ``name`` is a format placeholder or is not a registered
+            custom placeholder.
+    """
+    if name in BUILTIN_PLACEHOLDERS:
+        raise ValueError("Can not unregister the JSPEC placeholder '%s'" % name)
+    if name not in PLACEHOLDERS:
+        raise ValueError("JSPEC placeholder '%s' is not registered" % name)
+    scanner.unregister_keyword(name)
+    del PLACEHOLDERS[name]
+
+for _name, _predicate, _description in formats.FORMATS:
+    register(_name, _predicate, _description)
+
+BUILTIN_PLACEHOLDERS = frozenset(PLACEHOLDERS)
+"""frozenset: The keywords of the format placeholders, which can not be
+unregistered."""
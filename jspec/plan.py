@@ -0,0 +1,333 @@
+"""Module for explaining how a JSPEC is matched against a JSON.
+
+The plan of a JSPEC is a tree with a node for each JSPEC term, holding:
+    strategy: how the JSPEC term is matched, e.g. a key lookup for a JSPEC
+        object with literal keys, or backtracking for a JSPEC array with a
+        capture which can match the same JSON elements as the JSPEC terms
+        after it.
+    bounds: what is known before matching, e.g. the required keys of a JSPEC
+        object or the minimum and maximum length of a JSPEC array.
+    complexity: a static estimate of the worst-case number of steps taken to
+        match the JSPEC term, not including its children, where n is the size
+        of the JSON element and m is the size of the JSPEC term.
+    warnings: the reasons the JSPEC term may take more than linear time to
+        match.
+The backtracking JSPEC captures, their complexity and the warnings are those
+of the risk analysis, see ``jspec.risk``, so both agree.
+"""
+
+import re
+
+from . import matcher
+from . import path
+from . import risk
+from .entity import (
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectEllipsis,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECArrayEllipsis,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECWildcard,
+    JSPECNegation,
+    JSPECMacro,
+    JSPECConditional,
+    JSPECNamedTerm,
+    JSPECObjectPlaceholder,
+    JSPECArrayPlaceholder,
+    JSPECStringPlaceholder,
+    JSPECBooleanPlaceholder,
+    JSPECIntPlaceholder,
+    JSPECRealPlaceholder,
+    JSPECNumberPlaceholder,
+    JSPECCustomPlaceholder,
+)
+
+COMPLEXITIES = ("O(1)", "O(m)", "O(n)", "O(n*m)", "O(2^n)")
+"""tuple: The complexity estimates, from the cheapest to the most expensive.
+JSPEC arrays whose captures backtrack can also be a power of n, see
+``complexity_key``."""
+
+NESTED_QUANTIFIER = re.compile(r"\((?:[^()\\]|\\.)*[+*}](?:[^()\\]|\\.)*\)[+*{]")
+"""re.Pattern: Matches a quantified group containing a quantifier, e.g.
+'(a+)+', which can make a regex backtrack exponentially."""
+
+class PlanNode:
+    """This class represents how a single JSPEC term is matched.
+
+    Attributes:
+        loc (str): The location in the JSON matched by the JSPEC term, where
+            '[*]' is any element of a JSON array and '.*' any value of a JSON
+            object
+        term (JSPECEntity): The JSPEC term, or JSPEC capture
+        strategy (str): How the JSPEC term is matched
+        bounds (str): What is known before matching, or an empty string
+        complexity (str): The estimate of the worst-case number of steps, one
+            of ``COMPLEXITIES``
+        warnings (list): The reasons the JSPEC term may take more than linear
+            time
+        children (list): The ``PlanNode`` of each JSPEC term within this one
+    """
+
+    def __init__(self, loc, term, strategy, complexity, bounds="", warnings=None):
+        self.loc = loc
+        self.term = term
+        self.strategy = strategy
+        self.complexity = complexity
+        self.bounds = bounds
+        self.warnings = warnings or list()
+        self.children = list()
+
+    def walk(self):
+        """Yields this node and every node below it, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+class Plan:
+    """This class represents how a JSPEC is matched.
+
+    Attributes:
+        spec (JSPEC): The JSPEC
+        root (PlanNode): The node for the base JSPEC term
+        worst (str): The estimate for the most expensive node
+        warnings (list): Each warning as a tuple of the location and the
+            reason, for every node
+
+    Args:
+        spec (JSPEC): The JSPEC
+        root (PlanNode): The node for the base JSPEC term
+    """
+
+    def __init__(self, spec, root):
+        self.spec = spec
+        self.root = root
+        nodes = list(root.walk())
+        self.worst = max((node.complexity for node in nodes), key=complexity_key)
+        self.warnings = [(node.loc, warning) for node in nodes for warning in node.warnings]
+
+    def __str__(self):
+        return report(self)
+
+def complexity_key(complexity):
+    """Returns the sort key of the complexity ``complexity``, which is one of
+    ``COMPLEXITIES`` or a power of n, e.g. 'O(n^2)', from
+    ``jspec.risk``, ranked between 'O(n*m)' and 'O(2^n)'."""
+    if complexity in COMPLEXITIES:
+        return (COMPLEXITIES.index(complexity), 0)
+    return (COMPLEXITIES.index("O(n*m)"), int(complexity[4:-1]))
+
+def plan(spec):
+    """Returns the plan for matching the JSPEC ``spec``.
+
+    Args:
+        spec (JSPEC): The JSPEC.
+
+    Returns:
+        Plan: How each JSPEC term of ``spec`` is matched.
+    """
+    return Plan(spec, plan_term("$", spec.base))
+
+def report(explained):
+    """Returns the text report for the plan ``explained``, with a line for
+    each node, indented by depth, then the worst case and the warnings.
+
+    Args:
+        explained (Plan): The plan.
+
+    Returns:
+        str: The report.
+    """
+    lines = list()
+    _report(explained.root, 0, lines)
+    lines.append("")
+    lines.append("Worst case: %s" % explained.worst)
+    if explained.warnings:
+        lines.append("Warnings:")
+        for loc, warning in explained.warnings:
+            lines.append("  %s - %s" % (loc, warning))
+    return "\n".join(lines)
+
+def plan_term(loc, term):
+    """Returns the plan node for the JSPEC term at the location ``loc``.
+
+    Args:
+        loc (str): The location in the JSON matched by ``term``
+        term (JSPECEntity): The JSPEC term, or JSPEC array capture
+
+    Returns:
+        PlanNode: The plan for ``term`` and the JSPEC terms within it.
+    """
+    for cls in term.__class__.__mro__:
+        planner = PLANNERS.get(cls)
+        if planner is not None:
+            return planner(loc, term)
+    return PlanNode(loc, term, "registered matcher", "O(n)")
+
+def _report(node, depth, lines):
+    fields = [node.loc, node.strategy, node.complexity]
+    if node.bounds:
+        fields.append(node.bounds)
+    lines.append("  " * depth + "  ".join(fields) + "  " + _summary(node.term))
+    for child in node.children:
+        _report(child, depth + 1, lines)
+
+def _summary(term, width=40):
+    """Returns the serialization of the JSPEC term, shortened to ``width``."""
+    string = str(term)
+    if len(string) > width:
+        string = string[:width - 3] + "..."
+    return string
+
+def _plan_object(loc, term):
+    pairs = [p for p in term.spec if isinstance(p, JSPECObjectPair)]
+    captures = [p for p in term.spec if not isinstance(p, JSPECObjectPair)]
+    literal = [p for p in pairs if path.literal_key(p.key())]
+    keys = sorted(p.key().spec for p in literal)
+    bounds = list()
+    if keys:
+        bounds.append("keys: %s" % ", ".join('"%s"' % k for k in keys))
+    if not captures:
+        bounds.append("pairs = %d" % len(pairs))
+    elif len(pairs) > 0:
+        bounds.append("pairs >= %d" % len(pairs))
+    findings, backtracking = risk.term_findings(loc, term)
+    if backtracking:
+        strategy, complexity = "backtracking", _worst(findings, "O(n*m)")
+    elif len(literal) == len(pairs):
+        strategy, complexity = "key lookup", "O(n*m)" if pairs else "O(n)"
+    else:
+        strategy, complexity = "pair search", "O(n*m)"
+    node = PlanNode(loc, term, strategy, complexity, "; ".join(bounds), _warnings(findings))
+    for pair in sorted(pairs, key=str):
+        key = pair.key().spec if path.literal_key(pair.key()) else "*"
+        node.children.append(plan_term(loc + "." + key, pair.value()))
+    for capture in captures:
+        if isinstance(capture, JSPECObjectEllipsis):
+            continue
+        for pair in capture.entities[::2]:
+            node.children.append(plan_term(loc + ".*", pair.value()))
+    return node
+
+def _plan_array(loc, term):
+    spec = term.spec
+    captures = [i for i, s in enumerate(spec) if isinstance(s, JSPECArrayCaptureGroup)]
+    minimum, maximum = len(spec) - len(captures), len(spec) - len(captures)
+    for idx in captures:
+        multiplier = spec[idx].multiplier
+        minimum += multiplier.minimum or 0
+        maximum = None if maximum is None or multiplier.maximum is None else maximum + multiplier.maximum
+    bounds = "length = %d" % minimum if minimum == maximum else (
+        "length >= %d" % minimum if maximum is None else "length %d..%d" % (minimum, maximum)
+    )
+    findings, backtracking = risk.term_findings(loc, term)
+    if not captures:
+        strategy, complexity = "positional", "O(n)"
+    elif backtracking:
+        strategy, complexity = "backtracking", _worst(findings, "O(n)")
+    else:
+        strategy, complexity = "linear scan", "O(n)"
+    node = PlanNode(loc, term, strategy, complexity, bounds, _warnings(findings))
+    for idx, entity in enumerate(spec):
+        if isinstance(entity, JSPECArrayEllipsis):
+            continue
+        if isinstance(entity, JSPECArrayCaptureGroup):
+            for capture_term in entity.entities[::2]:
+                node.children.append(plan_term(loc + "[*]", capture_term))
+        elif not captures or idx < captures[0]:
+            node.children.append(plan_term("%s[%d]" % (loc, idx), entity))
+        else:
+            node.children.append(plan_term(loc + "[?]", entity))
+    return node
+
+def _worst(findings, complexity):
+    """Returns the most expensive complexity of the risk findings, or
+    ``complexity`` if it is more expensive."""
+    return max([f.complexity for f in findings] + [complexity], key=complexity_key)
+
+def _warnings(findings):
+    """Returns the reasons of the risk findings which are at least of medium
+    severity, as ``python3 -m jspec.analyze`` fails on by default."""
+    return [f.msg for f in findings if f.severity != "low"]
+
+def _plan_string(loc, term):
+    if not path.REGEX_METACHARACTERS.intersection(term.spec):
+        return PlanNode(loc, term, "literal", "O(1)")
+    warnings = list()
+    complexity = "O(n)"
+    if NESTED_QUANTIFIER.search(term.spec):
+        complexity = "O(2^n)"
+        warnings.append("regex pattern '%s' has a quantified group containing a quantifier, which can backtrack exponentially" % term.spec)
+    return PlanNode(loc, term, "regex", complexity, warnings=warnings)
+
+def _plan_literal(loc, term):
+    return PlanNode(loc, term, "literal", "O(1)")
+
+def _plan_type(loc, term):
+    bounds = ""
+    if getattr(term, "spec", None) is not None and isinstance(term.spec, tuple):
+        symbol, value = term.spec
+        bounds = "%s %s" % (symbol, value)
+    return PlanNode(loc, term, "type check", "O(1)", bounds)
+
+def _plan_custom(loc, term):
+    return PlanNode(loc, term, "predicate", "O(1)")
+
+def _plan_wildcard(loc, term):
+    return PlanNode(loc, term, "any", "O(1)")
+
+def _plan_macro(loc, term):
+    return PlanNode(loc, term, "macro", "O(n)", "resolved once per check")
+
+def _plan_negation(loc, term):
+    node = PlanNode(loc, term, "negation", "O(1)")
+    node.children.append(plan_term(loc, term.spec))
+    return node
+
+def _plan_named_term(loc, term):
+    node = PlanNode(loc, term, "bind", "O(1)", "name: %s" % term.name())
+    node.children.append(plan_term(loc, term.term()))
+    return node
+
+def _plan_conditional(loc, term):
+    alternatives = term.spec[::2]
+    union = matcher.discriminated_union(term)
+    if union:
+        key, values = union
+        node = PlanNode(loc, term, "hash lookup", "O(1)", 'on "%s": %d values' % (key, len(values)))
+    else:
+        node = PlanNode(loc, term, "alternatives", "O(m)", "%d terms" % len(alternatives))
+    for alternative in alternatives:
+        node.children.append(plan_term(loc, alternative))
+    return node
+
+PLANNERS = {
+    JSPECObjectPlaceholder: _plan_type,
+    JSPECArrayPlaceholder: _plan_type,
+    JSPECStringPlaceholder: _plan_type,
+    JSPECBooleanPlaceholder: _plan_type,
+    JSPECIntPlaceholder: _plan_type,
+    JSPECRealPlaceholder: _plan_type,
+    JSPECNumberPlaceholder: _plan_type,
+    JSPECCustomPlaceholder: _plan_custom,
+    JSPECObject: _plan_object,
+    JSPECArray: _plan_array,
+    JSPECString: _plan_string,
+    JSPECInt: _plan_literal,
+    JSPECReal: _plan_literal,
+    JSPECBoolean: _plan_literal,
+    JSPECNull: _plan_literal,
+    JSPECWildcard: _plan_wildcard,
+    JSPECNegation: _plan_negation,
+    JSPECMacro: _plan_macro,
+    JSPECConditional: _plan_conditional,
+    JSPECNamedTerm: _plan_named_term,
+}
+"""dict: The planning function for each class of JSPEC term, found by the
+method resolution order of the class, so placeholders come before the classes
+they subclass."""
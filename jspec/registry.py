@@ -0,0 +1,298 @@
+"""Module for routing JSONs to the registered JSPECs which they match.
+
+A ``SpecRegistry`` holds many named JSPECs, and indexes what every good match
+of each JSPEC must have:
+    type: the Python native types of the JSON, e.g. a dict for a JSPEC object.
+    required keys: the literal keys of the pairs of a JSPEC object.
+    discriminators: the literal JSPEC string values of those pairs, e.g.
+        ``{"type": "click", ...}``, including the values of a discriminated
+        union of JSPEC objects (see ``jspec.matcher.discriminated_union``).
+    array length bounds: the minimum and maximum length of a JSPEC array.
+Each JSPEC is indexed under a single discriminator, so finding the candidates
+for a JSON only looks up the discriminators of the JSON, and the other
+requirements are checked before a candidate is matched.
+"""
+
+from . import macro
+from . import matcher
+from . import path
+from .entity import (
+    JSPEC,
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectPlaceholder,
+    JSPECArray,
+    JSPECArrayPlaceholder,
+    JSPECArrayCaptureGroup,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECConditional,
+    JSPECNumberPlaceholder,
+    JSPECNamedTerm,
+    JSPECLogicalOperatorOr,
+)
+
+TERM_TYPES = (
+    (JSPECObject, (dict,)),
+    (JSPECArray, (list,)),
+    (JSPECString, (str,)),
+    (JSPECInt, (int,)),
+    (JSPECReal, (float,)),
+    (JSPECBoolean, (bool,)),
+    (JSPECNull, (type(None),)),
+    (JSPECNumberPlaceholder, (int, float)),
+)
+"""tuple: The Python native types of the JSON elements that can match each
+class of JSPEC term, where ``bool`` is a subclass of ``int``."""
+
+class Requirements:
+    """This class represents what every JSON which matches a JSPEC must have.
+
+    Attributes:
+        types (tuple/None): The Python native types the JSON must have, or None
+            for any type
+        keys (frozenset): The keys a JSON object must have
+        discriminator (str/None): The key of a JSON object whose value decides
+            whether the JSPEC can match, or None if there is not one
+        values (frozenset): The JSON strings the value of ``discriminator``
+            can be
+        minimum (int): The minimum length of a JSON array
+        maximum (int/None): The maximum length of a JSON array, or None if
+            there is not one
+    """
+
+    def __init__(self, types=None, keys=frozenset(), discriminator=None,
+            values=frozenset(), minimum=0, maximum=None):
+        self.types = types
+        self.keys = keys
+        self.discriminator = discriminator
+        self.values = values
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def admits(self, element):
+        """Returns whether ``element`` has every requirement, other than the
+        discriminator, so could match the JSPEC."""
+        if self.types is not None and not isinstance(element, self.types):
+            return False
+        if isinstance(element, dict):
+            return self.keys.issubset(element)
+        if isinstance(element, list):
+            return len(element) >= self.minimum and (self.maximum is None or len(element) <= self.maximum)
+        return True
+
+def requirements(spec):
+    """Returns the requirements of the JSPEC ``spec``.
+
+    Args:
+        spec (JSPEC): The JSPEC.
+
+    Returns:
+        Requirements: What every JSON which matches ``spec`` must have.
+    """
+    term = spec.base
+    while isinstance(term, JSPECNamedTerm):
+        term = term.term()
+    types = _types(term)
+    if isinstance(term, JSPECObject) and not isinstance(term, JSPECObjectPlaceholder):
+        return _object_requirements(term, types)
+    if isinstance(term, JSPECArray) and not isinstance(term, JSPECArrayPlaceholder):
+        return _array_requirements(term, types)
+    if term.__class__ is JSPECConditional:
+        union = matcher.discriminated_union(term)
+        if union:
+            key, alternatives = union
+            return Requirements(types, frozenset([key]), key, frozenset(alternatives))
+    return Requirements(types)
+
+class SpecRegistry:
+    """This class represents a registry of named JSPECs, for finding which of
+    them a JSON matches.
+
+    JSPECs can be added and removed at any time, and the index is updated for
+    just that JSPEC. Only the JSPECs which the index can not rule out are
+    matched against a JSON.
+
+    Attributes:
+        macros (MacroResolver/dict/callable/None): The source of the values
+            for JSPEC macros, resolved for each call to ``match_all`` or
+            ``match_first``
+        limits (Limits/None): The limits on the work done by each match
+
+    Args:
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done by each match.
+    """
+
+    def __init__(self, macros=None, limits=None):
+        self.macros = macros
+        self.limits = limits
+        self._specs = dict()
+        self._order = dict()
+        self._added = 0
+        self._undiscriminated = set()
+        self._discriminated = dict()
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def names(self):
+        """Returns the names of the registered JSPECs, in the order they were
+        added."""
+        return list(self._specs)
+
+    def add(self, name, spec):
+        """Register the JSPEC ``spec`` as ``name``.
+
+        Args:
+            name (str): The name of the JSPEC.
+            spec (JSPEC): The JSPEC.
+
+        Raises:
+            TypeError: If ``spec`` is not a JSPEC.
+            ValueError: If a JSPEC is already registered as ``name``.
+        """
+        if not isinstance(spec, JSPEC):
+            raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+        if name in self._specs:
+            raise ValueError("A JSPEC is already registered as '%s'" % name)
+        reqs = requirements(spec)
+        self._specs[name] = (spec, reqs)
+        self._order[name] = self._added
+        self._added += 1
+        if reqs.discriminator is None:
+            self._undiscriminated.add(name)
+            return
+        index = self._discriminated.setdefault(reqs.discriminator, dict())
+        for value in reqs.values:
+            index.setdefault(value, set()).add(name)
+
+    def remove(self, name):
+        """Remove the JSPEC registered as ``name``.
+
+        Raises:
+            ValueError: If no JSPEC is registered as ``name``.
+        """
+        if name not in self._specs:
+            raise ValueError("No JSPEC is registered as '%s'" % name)
+        _, reqs = self._specs.pop(name)
+        del self._order[name]
+        if reqs.discriminator is None:
+            self._undiscriminated.discard(name)
+            return
+        index = self._discriminated[reqs.discriminator]
+        for value in reqs.values:
+            index[value].discard(name)
+            if not index[value]:
+                del index[value]
+        if not index:
+            del self._discriminated[reqs.discriminator]
+
+    def candidates(self, element):
+        """Returns the names of the registered JSPECs which the index can not
+        rule out for the JSON ``element``, in the order they were added.
+
+        Args:
+            element (obj): A Python native object representing a JSON
+
+        Returns:
+            list: The names of the candidate JSPECs.
+        """
+        names = set(self._undiscriminated)
+        if isinstance(element, dict):
+            for key, index in self._discriminated.items():
+                value = element.get(key)
+                if isinstance(value, str) and value in index:
+                    names.update(index[value])
+        return sorted(
+            (name for name in names if self._specs[name][1].admits(element)),
+            key=self._order.__getitem__,
+        )
+
+    def match_all(self, element):
+        """Returns the names of every registered JSPEC which the JSON
+        ``element`` matches.
+
+        Args:
+            element (obj): A Python native object representing a JSON
+
+        Returns:
+            list: The names of the matching JSPECs, in the order they were
+                added.
+
+        Raises:
+            JSPECLimitError: If any match exceeds the limits.
+        """
+        macros = macro.resolver(self.macros)
+        return [
+            name for name in self.candidates(element)
+            if matcher.match(self._specs[name][0], element, macros=macros, limits=self.limits)[0]
+        ]
+
+    def match_first(self, element):
+        """Returns the name of the first registered JSPEC which the JSON
+        ``element`` matches, or None if it matches none of them.
+
+        Raises:
+            JSPECLimitError: If any match exceeds the limits.
+        """
+        macros = macro.resolver(self.macros)
+        for name in self.candidates(element):
+            if matcher.match(self._specs[name][0], element, macros=macros, limits=self.limits)[0]:
+                return name
+        return None
+
+def _types(term):
+    """Returns the Python native types of the JSON elements which can match
+    the JSPEC term, or None if any type can."""
+    while isinstance(term, JSPECNamedTerm):
+        term = term.term()
+    if term.__class__ is JSPECConditional:
+        if any(op.__class__ is not JSPECLogicalOperatorOr for op in term.spec[1::2]):
+            return None
+        types = tuple()
+        for alternative in term.spec[::2]:
+            alternative_types = _types(alternative)
+            if alternative_types is None:
+                return None
+            types += alternative_types
+        return types
+    for cls, types in TERM_TYPES:
+        if isinstance(term, cls):
+            return types
+    return None
+
+def _object_requirements(term, types):
+    """Returns the requirements of a JSPEC object."""
+    keys = set()
+    literals = dict()
+    for pair in term.spec:
+        if isinstance(pair, JSPECObjectPair) and path.literal_key(pair.key()):
+            keys.add(pair.key().spec)
+            if path.literal_key(pair.value()):
+                literals[pair.key().spec] = pair.value().spec
+    if not literals:
+        return Requirements(types, frozenset(keys))
+    discriminator = min(literals)
+    return Requirements(types, frozenset(keys), discriminator, frozenset([literals[discriminator]]))
+
+def _array_requirements(term, types):
+    """Returns the requirements of a JSPEC array."""
+    minimum, maximum = 0, 0
+    for spec in term.spec:
+        if isinstance(spec, JSPECArrayCaptureGroup):
+            minimum += spec.multiplier.minimum or 0
+            if maximum is not None:
+                maximum = None if spec.multiplier.maximum is None else maximum + spec.multiplier.maximum
+        else:
+            minimum += 1
+            if maximum is not None:
+                maximum += 1
+    return Requirements(types, minimum=minimum, maximum=maximum)
@@ -0,0 +1,411 @@
+"""Module for finding the parts of a JSPEC which can make matching slow.
+
+Matching a JSPEC array or object with captures backtracks when the match
+fails, trying every way of splitting the JSON elements between the captures.
+The analysis walks the JSPEC, without any JSON, and reports a finding for
+each pattern which makes this backtracking expensive:
+    overlapping array captures: an unbounded array capture which can match
+        the same JSON elements as the JSPEC terms or captures after it tries
+        every split of the JSON array, so it multiplies the cost of matching
+        the rest of the JSPEC array by the length of the JSON array, e.g.
+        ``[(int)x?, (number)x?, null]`` is O(n^2) and
+        ``[..., 1, ..., 1, ..., null]`` is O(n^3).
+    adjacent array captures: unbounded array captures next to each other,
+        which do not backtrack as their JSPEC terms do not overlap, but would
+        if either were widened.
+    object captures: an object capture with a regex key tries every order of
+        the JSON pairs it matches, which is exponential in the number of
+        pairs, and more so when its keys overlap the keys of other pairs or
+        captures.
+    nested captures: a JSPEC term which backtracks, within a capture which
+        backtracks, is matched again for each split the capture tries.
+Each finding has a severity, an estimate of the worst-case complexity, the
+location in the JSON and the line and column in the JSPEC document.
+
+Whether two JSPEC terms overlap is decided conservatively, any pair of JSPEC
+terms which can not be shown to match disjoint JSON elements overlap.
+"""
+
+import re
+
+from . import path
+from . import registry
+from . import scanner
+from .entity import (
+    JSPEC,
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectCaptureGroup,
+    JSPECObjectEllipsis,
+    JSPECObjectPlaceholder,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECArrayEllipsis,
+    JSPECArrayPlaceholder,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECNegation,
+    JSPECConditional,
+    JSPECNamedTerm,
+    JSPECLogicalOperatorAnd,
+    JSPECLogicalOperatorOr,
+)
+
+SEVERITIES = ("low", "medium", "high")
+"""tuple: The severities of a finding, from the least to the most severe."""
+
+EXPONENTIAL = "O(2^n)"
+"""str: The complexity of a finding which is exponential in the size of the
+JSON."""
+
+LITERALS = (JSPECInt, JSPECReal, JSPECBoolean, JSPECNull)
+"""tuple: The classes of JSPEC terms, other than JSPEC strings, which only
+match the JSON element they contain."""
+
+class Finding:
+    """This class represents a part of a JSPEC which can make matching slow.
+
+    Attributes:
+        severity (str): How slow matching can be, one of ``SEVERITIES``
+        complexity (str): The estimate of the worst-case number of steps,
+            where n is the size of the JSON element, e.g. 'O(n^2)'
+        msg (str): The reason matching can be slow
+        loc (str): The location in the JSON matched by the part of the JSPEC,
+            where '[*]' is any element of a JSON array and '.*' any value of a
+            JSON object
+        line (int/None): The line of the JSPEC document the part starts on,
+            or None if it is not known
+        column (int/None): The column of the JSPEC document the part starts
+            on, or None if it is not known
+        pos (int/None): The index of the JSPEC document the part starts at, or
+            None if it is not known
+    """
+
+    def __init__(self, severity, complexity, msg, loc, line=None, column=None, pos=None):
+        self.severity = severity
+        self.complexity = complexity
+        self.msg = msg
+        self.loc = loc
+        self.line = line
+        self.column = column
+        self.pos = pos
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        where = "line %d column %d (char %d)" % (self.line, self.column, self.pos) if self.pos is not None else "unknown position"
+        return "%s: %s %s at %s - %s" % (where, self.severity, self.complexity, self.loc, self.msg)
+
+class Analysis:
+    """This class represents the findings for a JSPEC.
+
+    Attributes:
+        doc (str): The JSPEC document analyzed
+        spec (JSPEC): The JSPEC
+        findings (list): The ``Finding`` instances, in the order they appear
+            in ``doc``
+        complexity (str): The estimate for the most expensive finding, or
+            'O(n)' if there are no findings
+        severity (str/None): The severity of the most severe finding, or None
+            if there are no findings
+
+    Args:
+        doc (str): The JSPEC document analyzed
+        spec (JSPEC): The JSPEC
+        findings (list): The ``Finding`` instances
+    """
+
+    def __init__(self, doc, spec, findings):
+        self.doc = doc
+        self.spec = spec
+        self.findings = sorted(findings, key=lambda f: (f.pos is None, f.pos or 0, -SEVERITIES.index(f.severity)))
+        self.complexity = max([f.complexity for f in findings] + ["O(n)"], key=complexity_key)
+        self.severity = max((f.severity for f in findings), key=SEVERITIES.index, default=None)
+
+    def __str__(self):
+        lines = [str(finding) for finding in self.findings]
+        lines.append("Worst case: %s" % self.complexity)
+        return "\n".join(lines)
+
+    def at_least(self, severity):
+        """Returns the findings with a severity of at least ``severity``."""
+        return [f for f in self.findings if SEVERITIES.index(f.severity) >= SEVERITIES.index(severity)]
+
+def analyze(doc):
+    """Returns the analysis of the JSPEC document ``doc``.
+
+    Args:
+        doc (str/JSPEC): The JSPEC document, or a JSPEC, which is analyzed as
+            its serialization.
+
+    Returns:
+        Analysis: The findings for the JSPEC.
+
+    Raises:
+        JSPECDecodeError: Raised if ``doc`` does not represent a valid JSPEC.
+    """
+    if isinstance(doc, JSPEC):
+        doc = str(doc)
+    spec, positions = scanner.scan_positions(doc)
+    findings = list()
+    analyze_term("$", spec.base, _Locator(doc, positions), findings)
+    return Analysis(doc, spec, findings)
+
+def complexity_key(complexity):
+    """Returns the sort key of the complexity ``complexity``, which is the
+    power of n, or infinity for an exponential complexity."""
+    if complexity == EXPONENTIAL:
+        return float("inf")
+    if complexity == "O(n)":
+        return 1
+    return int(complexity[4:-1])
+
+def overlaps(term, other):
+    """Returns whether the JSPEC terms ``term`` and ``other`` can match the
+    same JSON element, which is True unless they can be shown to match
+    disjoint JSON elements.
+
+    Args:
+        term (JSPECTerm): A JSPEC term.
+        other (JSPECTerm): Another JSPEC term.
+
+    Returns:
+        bool: Whether ``term`` and ``other`` can match the same JSON element.
+    """
+    term, other = _unnamed(term), _unnamed(other)
+    for first, second in ((term, other), (other, term)):
+        if first.__class__ is JSPECConditional:
+            operators = set(op.__class__ for op in first.spec[1::2])
+            if operators == {JSPECLogicalOperatorOr}:
+                return any(overlaps(t, second) for t in first.spec[::2])
+            if operators == {JSPECLogicalOperatorAnd}:
+                return all(overlaps(t, second) for t in first.spec[::2])
+            return True
+    types, other_types = _types(term), _types(other)
+    if types is not None and other_types is not None and not any(
+        issubclass(a, b) or issubclass(b, a) for a in types for b in other_types
+    ):
+        return False
+    if term.__class__ in LITERALS and other.__class__ is term.__class__:
+        return term.spec == other.spec
+    if term.__class__ is JSPECString and other.__class__ is JSPECString:
+        return _strings_overlap(term, other)
+    return True
+
+def analyze_term(loc, term, locator, findings):
+    """Append the findings for the JSPEC term, and the JSPEC terms within it,
+    to ``findings``.
+
+    Args:
+        loc (str): The location in the JSON matched by ``term``
+        term (JSPECTerm): The JSPEC term
+        locator (_Locator): Finds where a JSPEC entity is in the JSPEC
+            document
+        findings (list): The findings so far
+    """
+    term = _unnamed(term)
+    if isinstance(term, JSPECObject) and not isinstance(term, JSPECObjectPlaceholder):
+        _analyze_object(loc, term, locator, findings)
+    elif isinstance(term, JSPECArray) and not isinstance(term, JSPECArrayPlaceholder):
+        _analyze_array(loc, term, locator, findings)
+    elif term.__class__ is JSPECConditional:
+        for alternative in term.spec[::2]:
+            analyze_term(loc, alternative, locator, findings)
+    elif isinstance(term, JSPECNegation):
+        analyze_term(loc, term.spec, locator, findings)
+
+def term_findings(loc, term):
+    """Returns the findings for the JSPEC array or JSPEC object ``term``
+    itself, not the JSPEC terms within it, without their positions in a JSPEC
+    document, e.g. for ``jspec.plan``.
+
+    Args:
+        loc (str): The location in the JSON matched by ``term``
+        term (JSPECTerm): The JSPEC term
+
+    Returns:
+        list: The ``Finding`` instances for ``term``.
+        list: The JSPEC captures of ``term`` which backtrack, empty unless
+            ``term`` is a JSPEC array or JSPEC object.
+    """
+    findings = list()
+    locator = _Locator("", dict())
+    term = _unnamed(term)
+    if isinstance(term, JSPECObject) and not isinstance(term, JSPECObjectPlaceholder):
+        return findings, _object_findings(loc, term, locator, findings)
+    if isinstance(term, JSPECArray) and not isinstance(term, JSPECArrayPlaceholder):
+        return findings, _array_findings(loc, term, locator, findings)
+    return findings, list()
+
+class _Locator:
+    """Finds the line, column and index where a JSPEC entity starts in the
+    JSPEC document, from the positions found by ``scanner.scan_positions``."""
+
+    def __init__(self, doc, positions):
+        self.doc = doc
+        self.positions = positions
+
+    def finding(self, entity, severity, complexity, msg, loc):
+        position = self.positions.get(id(entity))
+        if position is None:
+            return Finding(severity, complexity, msg, loc)
+        pos = position[1]
+        line = self.doc.count('\n', 0, pos) + 1
+        column = pos - self.doc.rfind('\n', 0, pos)
+        return Finding(severity, complexity, msg, loc, line, column, pos)
+
+def _analyze_array(loc, term, locator, findings):
+    spec = term.spec
+    backtracking = _array_findings(loc, term, locator, findings)
+    first_capture = min((i for i, e in enumerate(spec) if isinstance(e, JSPECArrayCaptureGroup)), default=len(spec))
+    for idx, entity in enumerate(spec):
+        if isinstance(entity, JSPECArrayEllipsis):
+            continue
+        if isinstance(entity, JSPECArrayCaptureGroup):
+            _analyze_capture(loc + "[*]", entity, entity.entities[::2], any(entity is c for c in backtracking), locator, findings)
+        elif idx < first_capture:
+            analyze_term("%s[%d]" % (loc, idx), entity, locator, findings)
+        else:
+            analyze_term(loc + "[?]", entity, locator, findings)
+
+def _analyze_object(loc, term, locator, findings):
+    spec = sorted(term.spec, key=str)
+    backtracking = _object_findings(loc, term, locator, findings)
+    for entity in spec:
+        if isinstance(entity, JSPECObjectPair):
+            key = entity.key().spec if path.literal_key(entity.key()) else "*"
+            analyze_term(loc + "." + key, entity.value(), locator, findings)
+        elif not isinstance(entity, JSPECObjectEllipsis):
+            values = [pair.value() for pair in entity.entities[::2]]
+            _analyze_capture(loc + ".*", entity, values, any(entity is c for c in backtracking), locator, findings)
+
+def _array_findings(loc, term, locator, findings):
+    """Append the findings for the JSPEC array itself to ``findings``, and
+    return its captures which backtrack."""
+    spec = term.spec
+    unbounded = [
+        idx for idx, entity in enumerate(spec)
+        if isinstance(entity, JSPECArrayCaptureGroup) and entity.multiplier.maximum is None
+    ]
+    backtracking = [
+        idx for idx in unbounded
+        if any(_entities_overlap(spec[idx], later) for later in spec[idx + 1:])
+    ]
+    # The power of n of the cost of matching the rest of the JSPEC array,
+    # from each entity. An unbounded capture scans the JSON array, and one
+    # which backtracks does so for each split.
+    power = 0
+    for idx in reversed(unbounded):
+        power = power + 1 if idx in backtracking else max(power, 1)
+    if power >= 2:
+        findings.append(locator.finding(
+            spec[backtracking[0]], "medium" if power == 2 else "high", "O(n^%d)" % power,
+            "%d unbounded array capture(s) can match the same JSON elements as the JSPEC terms after them, so a failing match tries every split of the JSON array between them" % len(backtracking),
+            loc,
+        ))
+    else:
+        adjacent = [idx for idx in unbounded if idx + 1 in unbounded]
+        if adjacent:
+            findings.append(locator.finding(
+                spec[adjacent[0]], "low", "O(n)",
+                "unbounded array captures are next to each other, which backtrack if their JSPEC terms are changed to overlap",
+                loc,
+            ))
+    return [spec[idx] for idx in backtracking]
+
+def _object_findings(loc, term, locator, findings):
+    """Append the findings for the JSPEC object itself to ``findings``, and
+    return its captures which backtrack."""
+    spec = sorted(term.spec, key=str)
+    backtracking = list()
+    for entity in spec:
+        if not isinstance(entity, JSPECObjectCaptureGroup) or isinstance(entity, JSPECObjectEllipsis):
+            continue
+        keys = [pair.key() for pair in entity.entities[::2]]
+        if all(path.literal_key(key) for key in keys):
+            continue
+        backtracking.append(entity)
+        others = [
+            other for other in spec
+            if other is not entity and any(overlaps(key, other_key) for key in keys for other_key in _keys(other))
+        ]
+        if others:
+            findings.append(locator.finding(
+                entity, "high", EXPONENTIAL,
+                "object capture '%s' has keys which overlap the keys of %s, so a failing match tries every assignment of the JSON pairs between them" % (entity, ", ".join("'%s'" % other for other in others)),
+                loc,
+            ))
+        else:
+            findings.append(locator.finding(
+                entity, "medium", EXPONENTIAL,
+                "object capture '%s' has a regex key, so a failing match tries every order of the JSON pairs it matches" % entity,
+                loc,
+            ))
+    return backtracking
+
+def _analyze_capture(loc, capture, terms, backtracks, locator, findings):
+    """Append the findings for the JSPEC terms of the capture, and a finding
+    for the capture if it backtracks over JSPEC terms which backtrack."""
+    nested = list()
+    for term in terms:
+        analyze_term(loc, term, locator, nested)
+    findings.extend(nested)
+    if not backtracks or not nested:
+        return
+    inner = max(nested, key=lambda f: complexity_key(f.complexity))
+    if inner.complexity == EXPONENTIAL:
+        complexity, least = EXPONENTIAL, "medium"
+    else:
+        power = complexity_key(inner.complexity) + 1
+        complexity, least = "O(n^%d)" % power, "medium" if power == 2 else "high"
+    severity = max([f.severity for f in nested] + [least], key=SEVERITIES.index)
+    findings.append(locator.finding(
+        capture, severity, complexity,
+        "capture '%s' backtracks over JSPEC terms which also backtrack, so they are matched again for each split the capture tries" % capture,
+        loc,
+    ))
+
+def _entities_overlap(capture, other):
+    """Returns whether the array capture ``capture`` can match the same JSON
+    element as the JSPEC term or array capture ``other``."""
+    terms = other.entities[::2] if isinstance(other, JSPECArrayCaptureGroup) else [other]
+    return any(overlaps(a, b) for a in capture.entities[::2] for b in terms)
+
+def _keys(entity):
+    """Returns the JSPEC object pair keys of the object pair, capture or
+    ellipsis ``entity``."""
+    if isinstance(entity, JSPECObjectPair):
+        return [entity.key()]
+    return [pair.key() for pair in entity.entities[::2]]
+
+def _strings_overlap(string, other):
+    """Returns whether the JSPEC strings ``string`` and ``other`` can match the
+    same JSON string."""
+    literal, other_literal = path.literal_key(string), path.literal_key(other)
+    if literal and other_literal:
+        return string.spec == other.spec
+    if not literal and not other_literal:
+        return True
+    pattern, text = (other.spec, string.spec) if literal else (string.spec, other.spec)
+    try:
+        return re.compile(pattern).fullmatch(text) is not None
+    except re.error:
+        return True
+
+def _types(term):
+    """Returns the Python native types of the JSON elements which can match
+    the JSPEC term, or None if any type can."""
+    for cls, types in registry.TERM_TYPES:
+        if isinstance(term, cls):
+            return types
+    return None
+
+def _unnamed(term):
+    """Returns the JSPEC term named by any JSPEC named terms."""
+    while isinstance(term, JSPECNamedTerm):
+        term = term.term()
+    return term
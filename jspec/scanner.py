@@ -18,6 +18,7 @@ from .entity import (
     JSPECNegation,
     JSPECMacro,
     JSPECConditional,
+    JSPECNamedTerm,
     JSPECLogicalOperatorAnd,
     JSPECLogicalOperatorOr,
     JSPECLogicalOperatorXor,
@@ -28,6 +29,7 @@ from .entity import (
     JSPECIntPlaceholder,
     JSPECRealPlaceholder,
     JSPECNumberPlaceholder,
+    JSPECCustomPlaceholder,
     JSPECInequalityLessThan,
     JSPECInequalityLessThanOrEqualTo,
     JSPECInequalityMoreThan,
@@ -72,6 +74,11 @@ MACRO_MATCH = re.compile(r"""
     >     # terminated by a closing angled parenthesis""", re.VERBOSE).match
 """_sre.SRE_Pattern: Pattern to match a JSPEC macro."""
 
+KEYWORD_MATCH = re.compile(r"""
+    [A-Za-z_]         # preceded by a letter or underscore
+    [A-Za-z0-9_\-]*   # any letters, digits, underscores or hyphens""", re.VERBOSE).match
+"""_sre.SRE_Pattern: Pattern to match a JSPEC keyword, e.g. a placeholder."""
+
 MULTIPLIER_MATCH = re.compile(r"""
     x                    # preceded by an x
     ([1-9]\d*|\?)        # non-negative integer or ?
@@ -125,6 +132,29 @@ def scan(doc, pretty=False, indent=None):
         return Scanner().scan_pretty(doc, indent)
     return Scanner().scan(doc)
 
+def scan_positions(doc):
+    """
+        Scan through characters in ``doc`` to generate a valid JSPEC instance,
+        and find where each of its JSPEC terms, pairs and captures is in
+        ``doc``.
+
+        Args:
+            doc (str): The JSPEC document.
+
+        Returns:
+            JSPEC: The JSPEC instance that is represented in ``doc``.
+            dict: The start and end indices in ``doc`` of each JSPEC term,
+                object pair and capture, as a tuple of the entity, the start
+                and the end, keyed by the identity of the entity.
+
+        Raises:
+            JSPECDecodeError: Raised if the string scanned does not represent a
+                valid JSPEC.
+    """
+    scanner = Scanner()
+    scanner._positions = dict()
+    return scanner.scan(doc), scanner._positions
+
 class Scanner():
     """This class is an interface used for scanning JSPEC documents.
     
@@ -146,6 +176,9 @@ class Scanner():
             ``self.comment_buffer``.
         _load_comments (bool): Whether comments should be loaded from
             ``self.comment_buffer`` into ``self._comment_idx``.
+        _positions (dict/None): Used to store the start and end indices of
+            each JSPEC term, object pair and capture scanned, keyed by the
+            identity of the entity, or None if they are not stored.
     """
 
     """Bracket and comma class enums, used in ``self._record_idx``.
@@ -165,6 +198,7 @@ class Scanner():
         self._comment_idx = dict()
         self._save_comments = False
         self._load_comments = False
+        self._positions = None
 
     def scan(self, doc):
         """Scan through characters in ``doc``to generate a valid JSPEC instance.
@@ -213,61 +247,19 @@ class Scanner():
         except IndexError:
             raise StopIteration(idx) from None
 
-        if nextchar == '{':
-            return self.scan_object(doc, idx)
-
-        if nextchar == '[':
-            return self.scan_array(doc, idx)
-
-        if nextchar == '"':
-            return self.scan_string(doc, idx)
-
-        if nextchar in "-0123456789":
-            return self.scan_number(doc, idx)
-
-        if nextchar == 't' and doc[idx:idx+4] == 'true':
-            return JSPECBoolean(True), idx + 4
-        
-        if nextchar == 'f' and doc[idx:idx+5] == 'false':
-            return JSPECBoolean(False), idx + 5
-
-        if nextchar == 'n' and doc[idx:idx+4] == 'null':
-            return JSPECNull(None), idx + 4
-
-        if nextchar == '*':
-            return JSPECWildcard(), idx + 1
-
-        if nextchar == '!':
-            return self.scan_negation(doc, idx)
-
-        if nextchar == '<':
-            return self.scan_macro(doc, idx)
-
-        if nextchar == '(':
-            return self.scan_conditional(doc, idx)
-
-        if nextchar == 'o' and doc[idx:idx+6] == 'object':
-            return JSPECObjectPlaceholder(), idx + 6
-
-        if nextchar == 'a' and doc[idx:idx+5] == 'array':
-            return JSPECArrayPlaceholder(), idx + 5
-
-        if nextchar == 's' and doc[idx:idx+6] == 'string':
-            return JSPECStringPlaceholder(), idx + 6
-
-        if nextchar == 'b' and doc[idx:idx+4] == 'bool':
-            return JSPECBooleanPlaceholder(), idx + 4
+        hook = CHARACTER_SCANNERS.get(nextchar)
+        if hook is not None:
+            return self._position(hook(self, doc, idx), idx)
 
-        if nextchar == 'i' and doc[idx:idx+3] == 'int':
-            return self.scan_int_placeholder(doc, idx)
-
-        if nextchar == 'r' and doc[idx:idx+4] == 'real':
-            return self.scan_real_placeholder(doc, idx)
-
-        if nextchar == 'n' and doc[idx:idx+6] == 'number':
-            return self.scan_number_placeholder(doc, idx)
-
-        raise StopIteration(idx)
+        m = KEYWORD_MATCH(doc, idx)
+        if m is None:
+            raise StopIteration(idx)
+        hook = KEYWORD_SCANNERS.get(m.group())
+        if hook is None:
+            hook = self._keyword_prefix_hook(m.group())
+        if hook is None:
+            raise StopIteration(idx)
+        return self._position(hook(self, doc, idx), idx)
 
     def scan_object(self, doc, idx):
         """Scan through characters in ``doc`` starting from index ``idx`` until the
@@ -289,6 +281,7 @@ class Scanner():
         if self._recording:
             self._record_idx[idx] = self._OBJECT_OPEN_BRACKET
         pairs = set()    
+        keys = set()
         nextchar, idx = self.skip_any_whitespace(doc, idx + 1)
         if nextchar == '':
             raise JSPECDecodeError("Unterminated object", doc, idx-1)
@@ -298,6 +291,7 @@ class Scanner():
             return JSPECObject(pairs), idx + 1
 
         while True:
+            start = idx
             nextchar = doc[idx:idx + 1]
             if nextchar == '(':
                 pair, idx = self.scan_object_capture(doc, idx)
@@ -323,8 +317,10 @@ class Scanner():
                 except StopIteration as err:
                     raise JSPECDecodeError("Expecting JSPEC term as value in object pair", doc, err.value) from None
                 pair = JSPECObjectPair((key, value))
-                if key in [pair.key() for pair in pairs if isinstance(pair, JSPECObjectPair)]:
+                if (key.__class__, key.spec) in keys:
                     raise JSPECDecodeError("Repeated object key for pair in object", doc, idx)
+                keys.add((key.__class__, key.spec))
+            self._position((pair, idx), start)
             pairs.add(pair)
 
             nextchar, idx = self.skip_any_whitespace(doc, idx)
@@ -459,9 +455,9 @@ class Scanner():
 
         while True:    
             if nextchar == '(':
-                value, idx = self.scan_array_capture(doc, idx)
+                value, idx = self._position(self.scan_array_capture(doc, idx), idx)
             elif nextchar == '.':
-                value, idx = self.scan_array_ellipsis(doc, idx)
+                value, idx = self._position(self.scan_array_ellipsis(doc, idx), idx)
             else:
                 try:
                     value, idx = self.scan_term(doc, idx)
@@ -665,6 +661,34 @@ class Scanner():
         value = JSPECMacro(s)
         return value, m.end()
 
+    def scan_named_term(self, doc, idx):
+        """Scan through characters in ``doc`` starting from index ``idx`` until the
+        characters scanned represent a valid JSPEC named term.
+
+        Args:
+            doc (str): The JSPEC document.
+            idx (int): The starting index for the scan.
+
+        Returns:
+            JSPECNamedTerm: The JSPECTerm that represents the valid JSPEC
+                named term
+            int: The index of the character in ``doc`` after the last character
+                from the valid JSPEC named term
+
+        Raises:
+            JSPECDecodeError: Raised if the string scanned cannot represent a
+                valid JSPEC named term.
+        """
+        m = KEYWORD_MATCH(doc, idx + 1)
+        if m is None:
+            raise JSPECDecodeError("Expecting name for named term", doc, idx + 1)
+        _, idx = self.skip_any_whitespace(doc, m.end())
+        try:
+            term, idx = self.scan_term(doc, idx)
+        except StopIteration as err:
+            raise JSPECDecodeError("Expecting JSPEC term in named term", doc, err.value) from None
+        return JSPECNamedTerm((m.group(), term)), idx
+
     def scan_conditional(self, doc, idx):
         """Scan through characters in ``doc`` starting from index ``idx`` until the
         characters scanned represent a valid JSPEC conditional.
@@ -1010,6 +1034,25 @@ class Scanner():
                 doc = doc[:n+1] + '\n' + indent * indent_count + doc[n+2:]
         return doc
     
+    def _position(self, scanned, start):
+        """Stores the start and end indices of the scanned entity, if
+        positions are being stored, and returns ``scanned``."""
+        if self._positions is not None:
+            entity, end = scanned
+            self._positions[id(entity)] = (entity, start, end)
+        return scanned
+
+    def _keyword_prefix_hook(self, word):
+        """Returns the hook for the longest registered keyword which is a
+        prefix of ``word``, or None if there is no such keyword. The keyword is
+        then scanned as a term, leaving the rest of ``word`` to be reported as
+        invalid by the caller."""
+        for end in range(len(word) - 1, 0, -1):
+            hook = KEYWORD_SCANNERS.get(word[:end])
+            if hook is not None:
+                return hook
+        return None
+
     def _add_comments(self, doc):
         """Add comments to the JSPEC document ``doc``, using the comment
         incides saved in ``self._comment_idx``. Returns the commented
@@ -1018,4 +1061,78 @@ class Scanner():
         comment_idx.sort(key=lambda x: -x[0])
         for idx, comments in comment_idx:
             doc = doc[:idx] + comments + doc[idx:]
-        return doc
\ No newline at end of file
+        return doc
+
+def _constant(keyword, factory):
+    """Returns a scanner hook for the constant JSPEC term ``keyword``, which is
+    created by calling ``factory``."""
+    def hook(scanner, doc, idx):
+        return factory(), idx + len(keyword)
+    return hook
+
+CHARACTER_SCANNERS = {
+    '{': Scanner.scan_object,
+    '[': Scanner.scan_array,
+    '"': Scanner.scan_string,
+    '*': _constant('*', JSPECWildcard),
+    '!': Scanner.scan_negation,
+    '<': Scanner.scan_macro,
+    '(': Scanner.scan_conditional,
+    '@': Scanner.scan_named_term,
+}
+CHARACTER_SCANNERS.update(dict.fromkeys("-0123456789", Scanner.scan_number))
+"""dict: The scanner hooks for JSPEC terms which start with punctuation or a
+digit, keyed by their first character."""
+
+KEYWORD_SCANNERS = {
+    'true': _constant('true', lambda: JSPECBoolean(True)),
+    'false': _constant('false', lambda: JSPECBoolean(False)),
+    'null': _constant('null', lambda: JSPECNull(None)),
+    'object': _constant('object', JSPECObjectPlaceholder),
+    'array': _constant('array', JSPECArrayPlaceholder),
+    'string': _constant('string', JSPECStringPlaceholder),
+    'bool': _constant('bool', JSPECBooleanPlaceholder),
+    'int': Scanner.scan_int_placeholder,
+    'real': Scanner.scan_real_placeholder,
+    'number': Scanner.scan_number_placeholder,
+}
+"""dict: The scanner hooks for JSPEC terms which start with a keyword, keyed
+by the keyword. Each hook is called with the scanner, the JSPEC document and
+the index of the keyword, and returns the JSPEC term and the index after it."""
+
+BUILTIN_KEYWORDS = frozenset(KEYWORD_SCANNERS)
+"""frozenset: The keywords of the JSPEC language, which can not be replaced."""
+
+def register_keyword(keyword, hook=None):
+    """Register the keyword ``keyword``, so it is scanned as a JSPEC term.
+
+    Args:
+        keyword (str): The keyword, made up of letters, digits, underscores and
+            hyphens, and starting with a letter or underscore.
+        hook (func, optional): The scanner hook, called with the scanner, the
+            JSPEC document and the index of the keyword, returning the JSPEC
+            term and the index after it. Omit to scan the keyword as a
+            ``JSPECCustomPlaceholder``.
+
+    Raises:
+        ValueError: If ``keyword`` is not a valid keyword or is already
+            registered.
+    """
+    if not isinstance(keyword, str) or KEYWORD_MATCH(keyword) is None or KEYWORD_MATCH(keyword).end() != len(keyword):
+        raise ValueError("Invalid JSPEC keyword '%s'" % keyword)
+    if keyword in KEYWORD_SCANNERS:
+        raise ValueError("JSPEC keyword '%s' is already registered" % keyword)
+    KEYWORD_SCANNERS[keyword] = hook or _constant(keyword, lambda: JSPECCustomPlaceholder(keyword))
+
+def unregister_keyword(keyword):
+    """Remove the registered keyword ``keyword``.
+
+    Raises:
+        ValueError: If ``keyword`` is a JSPEC language keyword or is not
+            registered.
+    """
+    if keyword in BUILTIN_KEYWORDS:
+        raise ValueError("Can not unregister the JSPEC keyword '%s'" % keyword)
+    if keyword not in KEYWORD_SCANNERS:
+        raise ValueError("JSPEC keyword '%s' is not registered" % keyword)
+    del KEYWORD_SCANNERS[keyword]
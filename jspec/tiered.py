@@ -0,0 +1,368 @@
+"""Module for tiered execution of ``check``.
+
+Each JSPEC starts in the interpreted tier, where it is matched by
+``jspec.matcher``. It counts the checks made against it, and once it has been
+checked ``THRESHOLD`` times it moves to the compiled tier, where it is first
+compiled into a tree of Python closures. A closure only decides whether a JSON
+is a good match, without any of the bookkeeping of the matcher, so it is much
+faster. The reason for a bad match is always found by the matcher, so the
+results of both tiers are the same. A discriminated union is compiled into a
+table of the closures of its alternatives by the value of the discriminator,
+see ``jspec.matcher.discriminated_union``.
+
+JSPEC terms which can backtrack, e.g. JSPEC arrays with a capture before a
+JSPEC term, and JSPEC terms with matching functions registered with
+``jspec.matcher.register``, are matched by the matcher within a compiled
+closure. Checks with limits are always interpreted, so the steps are counted,
+as are checks made whilst instrumentation hooks are installed, so the hooks
+are called for every JSPEC term (see ``jspec.instrument``).
+"""
+
+import operator
+import re
+
+from . import instrument
+from . import matcher
+from . import path
+from .entity import (
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECObjectEllipsis,
+    JSPECArray,
+    JSPECArrayCaptureGroup,
+    JSPECTerm,
+    JSPECString,
+    JSPECInt,
+    JSPECReal,
+    JSPECBoolean,
+    JSPECNull,
+    JSPECWildcard,
+    JSPECNegation,
+    JSPECConditional,
+    JSPECNamedTerm,
+    JSPECLogicalOperatorAnd,
+    JSPECLogicalOperatorOr,
+    JSPECObjectPlaceholder,
+    JSPECArrayPlaceholder,
+    JSPECStringPlaceholder,
+    JSPECBooleanPlaceholder,
+    JSPECIntPlaceholder,
+    JSPECRealPlaceholder,
+    JSPECNumberPlaceholder,
+    JSPECInequalityLessThan,
+    JSPECInequalityLessThanOrEqualTo,
+    JSPECInequalityMoreThan,
+    JSPECInequalityMoreThanOrEqualTo,
+)
+
+INTERPRETED = "interpreted"
+"""str: The tier where a JSPEC is matched by ``jspec.matcher``."""
+
+COMPILED = "compiled"
+"""str: The tier where a JSPEC is matched by its compiled closures."""
+
+TIERS = (INTERPRETED, COMPILED)
+"""tuple: The tiers, in order."""
+
+THRESHOLD = 100
+"""int: The number of checks against a JSPEC before it is compiled, see
+``set_threshold``."""
+
+LISTENERS = list()
+"""list: The functions called when a JSPEC changes tier, see
+``add_listener``."""
+
+INEQUALITIES = {
+    JSPECInequalityLessThan: operator.lt,
+    JSPECInequalityLessThanOrEqualTo: operator.le,
+    JSPECInequalityMoreThan: operator.gt,
+    JSPECInequalityMoreThanOrEqualTo: operator.ge,
+}
+"""dict: The comparison for each class of JSPEC inequality."""
+
+def set_threshold(checks):
+    """Set the number of checks against a JSPEC before it is compiled.
+
+    Args:
+        checks (int): The number of checks, 0 to compile every JSPEC on its
+            first check.
+
+    Raises:
+        ValueError: If ``checks`` is negative.
+    """
+    global THRESHOLD
+    if checks < 0:
+        raise ValueError("Expecting a non-negative threshold not %s" % checks)
+    THRESHOLD = checks
+
+def add_listener(listener):
+    """Add a function to be called whenever a JSPEC changes tier.
+
+    Args:
+        listener (func): Function called with the JSPEC, its previous tier and
+            its new tier.
+    """
+    LISTENERS.append(listener)
+
+def remove_listener(listener):
+    """Remove a function added by ``add_listener``.
+
+    Raises:
+        ValueError: If ``listener`` was not added.
+    """
+    LISTENERS.remove(listener)
+
+def tier(spec):
+    """Returns the current tier of the JSPEC ``spec``, either ``INTERPRETED``
+    or ``COMPILED``."""
+    return spec._tier
+
+def force(spec, forced_tier):
+    """Force the JSPEC ``spec`` to stay in a tier, whatever the number of
+    checks against it.
+
+    Args:
+        spec (JSPEC): The JSPEC.
+        forced_tier (str/None): Either ``INTERPRETED`` or ``COMPILED``, or None
+            to let the JSPEC move to the compiled tier after ``THRESHOLD``
+            checks again.
+
+    Raises:
+        ValueError: If ``forced_tier`` is not a tier.
+    """
+    if forced_tier is not None and forced_tier not in TIERS:
+        raise ValueError("Expecting one of %s not '%s'" % (", ".join(TIERS), forced_tier))
+    spec._forced_tier = forced_tier
+    if forced_tier is not None:
+        _move(spec, forced_tier)
+    elif spec._checks >= THRESHOLD:
+        _move(spec, COMPILED)
+
+def match(spec, element, cache=None, macros=None, limits=None):
+    """Determine if the JSPEC matches the JSON, in the current tier of the
+    JSPEC, counting the check.
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        element (obj): A Python native object representing a JSON
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees, shared between calls to ``match``.
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros.
+        limits (Limits, optional): The limits on the work done by the match.
+
+    Returns:
+        bool: ``True`` if it was a good match, otherwise ``False``.
+        str: Details on why the match failed if it was a bad match, otherwise
+            an empty string.
+
+    Raises:
+        JSPECLimitError: If the match exceeds any of ``limits``.
+    """
+    spec._checks += 1
+    if spec._tier == INTERPRETED and spec._forced_tier is None and spec._checks > THRESHOLD:
+        _move(spec, COMPILED)
+    if spec._tier == INTERPRETED or limits is not None or instrument.installed() is not None:
+        return matcher.match(spec, element, cache=cache, macros=macros, limits=limits)
+    func, interprets = spec._compiled
+    ctx = matcher.Context(cache, macros) if interprets else None
+    if func(element, ctx):
+        return True, ""
+    return matcher.match(spec, element, cache=cache, macros=ctx.macros if interprets else macros)
+
+def compile(term):
+    """Compile the JSPEC term into a closure deciding whether a JSON element
+    matches it.
+
+    Args:
+        term (JSPECTerm): The JSPEC term.
+
+    Returns:
+        func: Function taking a Python native object representing a JSON
+            element and a ``matcher.Context``, and returning whether it
+            matches ``term``.
+        bool: Whether the function uses ``jspec.matcher``, so needs a
+            ``matcher.Context``, otherwise it can be passed None.
+    """
+    uses = [False]
+    return _compile(term, uses), uses[0]
+
+def _move(spec, new_tier):
+    """Move the JSPEC to the tier ``new_tier``, compiling it if needed, and
+    notify the listeners."""
+    old_tier = spec._tier
+    if old_tier == new_tier:
+        return
+    if new_tier == COMPILED and spec._compiled is None:
+        spec._compiled = compile(spec.base)
+    spec._tier = new_tier
+    for listener in list(LISTENERS):
+        listener(spec, old_tier, new_tier)
+
+def _compile(term, uses):
+    """Returns the closure for the JSPEC term, see ``compile``. ``uses`` holds
+    whether any closure uses ``jspec.matcher``."""
+    compiler, builtin = COMPILERS.get(term.__class__, (None, None))
+    func = None
+    if compiler is not None and matcher.matcher_for(term.__class__) is builtin:
+        func = compiler(term, uses)
+    if func is None:
+        uses[0] = True
+        func = lambda element, ctx: bool(matcher.match_element("$", term, element, ctx))
+    return func
+
+def _compile_object(term, uses):
+    pairs = [p for p in term.spec if isinstance(p, JSPECObjectPair)]
+    others = [p for p in term.spec if not isinstance(p, JSPECObjectPair)]
+    if not all(path.literal_key(p.key()) for p in pairs):
+        return None
+    if len(set(p.key().spec for p in pairs)) != len(pairs):
+        return None
+    if others and (len(others) > 1 or others[0].__class__ is not JSPECObjectEllipsis):
+        return None
+    values = tuple((p.key().spec, _compile(p.value(), uses)) for p in pairs)
+    keys = frozenset(key for key, _ in values)
+    count = len(values)
+    wildcard = _compile_wildcard(None, uses)
+    def match_object(element, ctx):
+        if not isinstance(element, dict) or len(element) < count:
+            return False
+        for key, func in values:
+            if key not in element or not func(element[key], ctx):
+                return False
+        if len(element) == count:
+            return True
+        if not others:
+            return False
+        # The remaining JSON pairs are matched by the JSPEC object ellipsis.
+        return all(
+            key in keys or (isinstance(key, str) and wildcard(value, ctx))
+            for key, value in element.items()
+        )
+    return match_object
+
+def _compile_array(term, uses):
+    spec = term.spec
+    count = 0
+    while count < len(spec) and isinstance(spec[count], JSPECTerm):
+        count += 1
+    funcs = tuple(_compile(t, uses) for t in spec[:count])
+    if count == len(spec):
+        def match_array(element, ctx):
+            if not isinstance(element, list) or len(element) != count:
+                return False
+            return all(func(e, ctx) for func, e in zip(funcs, element))
+        return match_array
+    capture = spec[count]
+    if count != len(spec) - 1 or not isinstance(capture, JSPECArrayCaptureGroup) or len(capture.entities) != 1:
+        return None
+    each = _compile(capture.entities[0], uses)
+    minimum = count + (capture.multiplier.minimum or 0)
+    maximum = None if capture.multiplier.maximum is None else count + capture.multiplier.maximum
+    def match_array_capture(element, ctx):
+        if not isinstance(element, list) or len(element) < minimum:
+            return False
+        if maximum is not None and len(element) > maximum:
+            return False
+        for idx, e in enumerate(element):
+            if not (funcs[idx] if idx < count else each)(e, ctx):
+                return False
+        return True
+    return match_array_capture
+
+def _compile_string(term, uses):
+    fullmatch = re.compile(r'%s' % term.spec).fullmatch
+    return lambda element, ctx: isinstance(element, str) and fullmatch(element) is not None
+
+def _compile_literal(cls):
+    def compiler(term, uses):
+        value = term.spec
+        return lambda element, ctx: isinstance(element, cls) and value == element
+    return compiler
+
+def _compile_type(cls):
+    return lambda term, uses: (lambda element, ctx: isinstance(element, cls))
+
+def _compile_number(cls):
+    def compiler(term, uses):
+        if term.spec is None:
+            return lambda element, ctx: isinstance(element, cls)
+        symbol, value = term.spec
+        compare = INEQUALITIES.get(symbol.__class__)
+        if compare is None:
+            return None
+        return lambda element, ctx: isinstance(element, cls) and compare(element, value)
+    return compiler
+
+def _compile_negation(term, uses):
+    func = _compile(term.spec, uses)
+    return lambda element, ctx: not func(element, ctx)
+
+def _compile_conditional(term, uses):
+    union = matcher.discriminated_union(term)
+    if union:
+        return _compile_union(union, uses)
+    funcs = [_compile(t, uses) for t in term.spec[::2]]
+    operators = [op.__class__ for op in term.spec[1::2]]
+    first, rest = funcs[0], tuple(zip(operators, funcs[1:]))
+    def match_conditional(element, ctx):
+        value = first(element, ctx)
+        for op, func in rest:
+            if op is JSPECLogicalOperatorAnd:
+                value = value and func(element, ctx)
+            elif op is JSPECLogicalOperatorOr:
+                value = value or func(element, ctx)
+            else:
+                value = value != func(element, ctx)
+        return value
+    return match_conditional
+
+def _compile_union(union, uses):
+    # Only the terms with the value of the discriminator in the JSON object
+    # can match it, see ``matcher.discriminated_union``
+    key, alternatives = union
+    table = dict((value, tuple(_compile(t, uses) for t in terms)) for value, terms in alternatives.items())
+    def match_union(element, ctx):
+        if not isinstance(element, dict):
+            return False
+        value = element.get(key)
+        if not isinstance(value, str):
+            return False
+        for func in table.get(value, ()):
+            if func(element, ctx):
+                return True
+        return False
+    return match_union
+
+def _compile_named_term(term, uses):
+    return _compile(term.term(), uses)
+
+def _compile_wildcard(term, uses):
+    return lambda element, ctx: element is None or isinstance(element, matcher.PYTHON_NATIVE)
+
+def _compile_null(term, uses):
+    return lambda element, ctx: element is None
+
+COMPILERS = {
+    JSPECObject: (_compile_object, matcher.match_object),
+    JSPECArray: (_compile_array, matcher.match_array),
+    JSPECString: (_compile_string, matcher.match_string),
+    JSPECInt: (_compile_literal(int), matcher.match_int),
+    JSPECReal: (_compile_literal(float), matcher.match_real),
+    JSPECBoolean: (_compile_literal(bool), matcher.match_boolean),
+    JSPECNull: (_compile_null, matcher.match_null),
+    JSPECWildcard: (_compile_wildcard, matcher.match_wildcard),
+    JSPECNegation: (_compile_negation, matcher.match_negation),
+    JSPECConditional: (_compile_conditional, matcher.match_conditional),
+    JSPECNamedTerm: (_compile_named_term, matcher.match_named_term),
+    JSPECObjectPlaceholder: (_compile_type(dict), matcher.match_object_placeholder),
+    JSPECArrayPlaceholder: (_compile_type(list), matcher.match_array_placeholder),
+    JSPECStringPlaceholder: (_compile_type(str), matcher.match_string_placeholder),
+    JSPECBooleanPlaceholder: (_compile_type(bool), matcher.match_boolean_placeholder),
+    JSPECIntPlaceholder: (_compile_number(int), matcher.match_int_placeholder),
+    JSPECRealPlaceholder: (_compile_number(float), matcher.match_real_placeholder),
+    JSPECNumberPlaceholder: (_compile_number((int, float)), matcher.match_number_placeholder),
+}
+"""dict: The compiler for each class of JSPEC term, and the built-in matching
+function it replaces. A JSPEC term is only compiled if its class still uses
+that matching function."""
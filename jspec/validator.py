@@ -0,0 +1,212 @@
+"""Module for validators, which match a single JSPEC against many JSONs.
+"""
+
+import json
+
+from . import collect
+from . import macro
+from . import matcher
+from . import partial
+from .cache import PayloadCache
+from .entity import JSPEC
+
+class Validator:
+    """This class represents a validator for a JSPEC.
+
+    A validator binds a JSPEC to the options used to match it, so they only
+    need to be set up once for a JSPEC that is checked against many JSONs.
+
+    Attributes:
+        spec (JSPEC): The JSPEC to be checked against
+        cache (SubtreeCache/None): The cache of results for large JSON
+            subtrees, or None, which may be shared with other validators
+        payload_cache (PayloadCache/None): The cache of results for serialized
+            JSON payloads, or None
+        spec_digest (bytes): The digest of the serialization of ``spec``, used
+            with the values of its JSPEC macros to key ``payload_cache``. It
+            is updated whenever ``spec`` is set, so results cached for a
+            previous JSPEC are not used.
+        macros (MacroResolver/dict/callable/None): The resolver, or the source
+            of the values, for JSPEC macros
+        macros_per_check (bool): Whether JSPEC macros are resolved again for
+            every check, rather than once for the validator
+        limits (Limits/None): The limits on the work done by each check
+        hooks (Hooks/None): The instrumentation hooks for each check, or None
+            to use the hooks installed globally, if any
+
+    Args:
+        spec (JSPEC): The JSPEC to be checked against
+        cache (SubtreeCache, optional): A cache of results for large JSON
+            subtrees
+        payload_cache (PayloadCache, optional): A cache of results for
+            serialized JSON payloads, used by ``check_json``
+        macros (MacroResolver/dict/callable, optional): The resolver, or the
+            source of the values, for JSPEC macros. Omit to resolve macros from
+            the environment variables.
+        macros_per_check (bool, optional): Default is False, if True JSPEC
+            macros are resolved again for every check
+        limits (Limits, optional): The limits on the steps, time and JSON
+            sizes for each check, omit for unlimited checks
+        hooks (Hooks, optional): The instrumentation hooks for each check, see
+            ``jspec.instrument``
+    """
+
+    def __init__(self, spec, cache=None, payload_cache=None, macros=None, macros_per_check=False, limits=None, hooks=None):
+        self.spec = spec
+        self.cache = cache
+        self.payload_cache = payload_cache
+        self.macros = macros
+        self.macros_per_check = macros_per_check
+        self._macros = macro.resolver(macros)
+        self.limits = limits
+        self.hooks = hooks
+
+    @property
+    def spec(self):
+        return self._spec
+
+    @spec.setter
+    def spec(self, spec):
+        if not isinstance(spec, JSPEC):
+            raise TypeError("Expecting a JSPEC not %s" % spec.__class__)
+        # Results in the subtree cache are keyed by the JSPEC term, so those
+        # of a previous JSPEC are never used for this one, and are left to be
+        # evicted, as the cache may be shared with other validators
+        self._spec = spec
+        self.spec_digest = PayloadCache.digest(str(spec.base))
+
+    def check(self, element):
+        """Determine if the Python native JSON object ``element`` is a good
+        match for the JSPEC.
+
+        Args:
+            element (obj): The Python native JSON object to attempt to match.
+
+        Returns:
+            bool: Whether ``element`` is a good match for the JSPEC.
+            str: If it was a bad match, the reason why the match failed.
+
+        Raises:
+            JSPECLimitError: If the check exceeds any of the limits.
+        """
+        macros = self.macros if self.macros_per_check else self._macros
+        return self._check(element, macros)
+
+    def check_paths(self, element, selectors):
+        """Determine if the parts of the Python native JSON object ``element``
+        selected by ``selectors`` are a good match for the parts of the JSPEC
+        they are bound to.
+
+        Args:
+            element (obj): The Python native JSON object to attempt to match.
+            selectors (list): JSONPath-like selectors, e.g. ['$.customer'].
+
+        Returns:
+            bool: Whether the selected parts of ``element`` are a good match.
+            str: If it was a bad match, the reason why the match failed.
+
+        Raises:
+            ValueError: If a selector is invalid or is not bound to a JSPEC
+                term.
+            JSPECLimitError: If the check exceeds any of the limits.
+        """
+        macros = self.macros if self.macros_per_check else self._macros
+        return partial.match(self.spec, element, selectors, cache=self.cache, macros=macros, limits=self.limits, hooks=self.hooks)
+
+    def extract(self, element):
+        """Determine if the Python native JSON object ``element`` is a good
+        match for the JSPEC, extracting the elements bound by its named terms.
+
+        Args:
+            element (obj): The Python native JSON object to attempt to match.
+
+        Returns:
+            bool: Whether ``element`` is a good match for the JSPEC.
+            str: If it was a bad match, the reason why the match failed.
+            dict: If it was a good match, the element bound to each name.
+
+        Raises:
+            JSPECLimitError: If the check exceeds any of the limits.
+        """
+        macros = self.macros if self.macros_per_check else self._macros
+        return matcher.extract(self.spec, element, macros=macros, limits=self.limits, hooks=self.hooks)
+
+    def check_all(self, element, max_errors=None):
+        """Collect every failure of the Python native JSON object ``element``
+        to match the JSPEC, in a single pass.
+
+        Args:
+            element (obj): The Python native JSON object to attempt to match.
+            max_errors (int, optional): The maximum number of failures to
+                collect, omit to collect every failure.
+
+        Returns:
+            list: The ``Failure`` instances, which is empty if ``element`` is
+                a good match.
+
+        Raises:
+            JSPECLimitError: If the check exceeds any of the limits.
+        """
+        macros = self.macros if self.macros_per_check else self._macros
+        return collect.collect(
+            self.spec,
+            element,
+            max_errors=max_errors,
+            cache=self.cache,
+            macros=macros,
+            limits=self.limits,
+            hooks=self.hooks,
+        )
+
+    def check_json(self, document):
+        """Determine if the serialized JSON ``document`` is a good match for
+        the JSPEC.
+
+        If the result for an identical ``document`` is in the payload cache,
+        it is returned without decoding or matching ``document``.
+
+        Args:
+            document (str/bytes): The serialized JSON to attempt to match.
+
+        Returns:
+            bool: Whether ``document`` is a good match for the JSPEC.
+            str: If it was a bad match, the reason why the match failed.
+
+        Raises:
+            json.JSONDecodeError: If ``document`` is not a valid JSON.
+            JSPECLimitError: If the check exceeds any of the limits, in which
+                case no result is stored in the payload cache.
+        """
+        if self.payload_cache is None:
+            return self.check(json.loads(document))
+        macros = macro.resolver(self.macros) if self.macros_per_check else self._macros
+        digest = self._payload_digest(macros)
+        result = self.payload_cache.get(digest, document)
+        if result is not None:
+            return result
+        result = self._check(json.loads(document), macros)
+        self.payload_cache.put(digest, document, result)
+        return result
+
+    def invalidate(self):
+        """Removes the cached results and macro values for the JSPEC, which
+        should be called if the result of matching it can change, e.g. if a
+        JSPEC macro changes."""
+        digest = self._payload_digest(macro.resolver(self.macros) if self.macros_per_check else self._macros)
+        self._macros = macro.resolver(self.macros)
+        if self.cache is not None:
+            self.cache.discard(self.spec.base)
+        if self.payload_cache is not None:
+            self.payload_cache.invalidate(digest)
+
+    def _check(self, element, macros):
+        return matcher.match(self.spec, element, cache=self.cache, macros=macros, limits=self.limits, hooks=self.hooks)
+
+    def _payload_digest(self, macros):
+        """Returns the digest keying the results of the JSPEC in the payload
+        cache, which also covers the values ``macros`` gives its JSPEC macros,
+        so validators with different macros never share results."""
+        names = macro.names(self.spec.base)
+        if not names:
+            return self.spec_digest
+        return PayloadCache.digest(self.spec_digest + macros.fingerprint(names).encode("utf-8"))
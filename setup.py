@@ -16,7 +16,7 @@ setup(
     long_description_content_type="text/markdown",
     long_description=long_description,
     url="https://github.com/chrismalcolm/jspec",
-    packages=["jspec"],
+    packages=["jspec", "jspec.bench"],
     license="MIT",
     classifiers=[
         "Programming Language :: Python :: 3.6",
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestAnalyze(unittest.TestCase):
+    """Class for testing the function in the ``jspec.analyze`` module.
+    """
+
+    pass
@@ -0,0 +1,187 @@
+import os
+import unittest
+import subprocess
+import jspec
+from jspec import risk
+
+NL = b'\r\n' if os.name == 'nt' else b'\n'
+
+class JSPECTestAnalyze(unittest.TestCase):
+    """Class for testing the ``analyze`` function, the ``jspec.risk`` module
+    and the ``jspec.analyze`` command line tool.
+    """
+
+    def test_analyze(self):
+        """Test the severity, complexity and location of each finding, and the
+        worst case of the analysis."""
+        test_cases = [
+            {
+                "name": "Array of terms",
+                "doc": '[int, string]',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Array with a leading capture which does not overlap",
+                "doc": '[(int)x?, null]',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Array with a bounded capture",
+                "doc": '[..., (int)x1-2, null]',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Overlapping array captures",
+                "doc": '[(int)x?, (number)x?, null]',
+                "want": [("medium", "O(n^2)", "$", 1, 2)],
+                "worst": "O(n^2)",
+            },
+            {
+                "name": "Array capture overlapping a later term",
+                "doc": '[(int)x?, 1, (int)x?, null]',
+                "want": [("medium", "O(n^2)", "$", 1, 2)],
+                "worst": "O(n^2)",
+            },
+            {
+                "name": "Overlapping array captures across a capture which does not overlap",
+                "doc": '[(int)x?, (string)x?, (int)x?, null]',
+                "want": [("medium", "O(n^2)", "$", 1, 2)],
+                "worst": "O(n^2)",
+            },
+            {
+                "name": "Several ellipses",
+                "doc": '[..., 1, ..., 1, ..., null]',
+                "want": [("high", "O(n^3)", "$", 1, 2)],
+                "worst": "O(n^3)",
+            },
+            {
+                "name": "Adjacent array captures which do not overlap",
+                "doc": '[(int)x?, (string)x?, null]',
+                "want": [("low", "O(n)", "$", 1, 2)],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Named array capture term which does not match the next term",
+                "doc": '[(@x "a.*")x?, "xyz", (int)x?]',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Named array capture term which matches the next term",
+                "doc": '[(@x "a.*")x?, "abc", (int)x?]',
+                "want": [("medium", "O(n^2)", "$", 1, 2)],
+                "worst": "O(n^2)",
+            },
+            {
+                "name": "Array capture of conditionals which do not overlap",
+                "doc": '[(1 | 2)x?, 3]',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Object capture with a literal key",
+                "doc": '{("a": int)x?, ...}',
+                "want": [],
+                "worst": "O(n)",
+            },
+            {
+                "name": "Object capture with a regex key",
+                "doc": '{("a.*": int)x?, "b": string}',
+                "want": [("medium", "O(2^n)", "$", 1, 2)],
+                "worst": "O(2^n)",
+            },
+            {
+                "name": "Object capture overlapping the ellipsis",
+                "doc": '{("a.*": int)x?, ...}',
+                "want": [("high", "O(2^n)", "$", 1, 2)],
+                "worst": "O(2^n)",
+            },
+            {
+                "name": "Object capture overlapping a literal key",
+                "doc": '{"abc": int, ("a.*": int)x?}',
+                "want": [("high", "O(2^n)", "$", 1, 14)],
+                "worst": "O(2^n)",
+            },
+            {
+                "name": "Nested array",
+                "doc": '{"items": [\n  (int)x?,\n  (number)x?,\n  null\n]}',
+                "want": [("medium", "O(n^2)", "$.items", 2, 3)],
+                "worst": "O(n^2)",
+            },
+            {
+                "name": "Backtracking array within a backtracking capture",
+                "doc": '[([(int)x?, (number)x?])x?, array]',
+                "want": [
+                    ("high", "O(n^3)", "$[*]", 1, 2),
+                    ("medium", "O(n^2)", "$[*]", 1, 4),
+                ],
+                "worst": "O(n^3)",
+            },
+            {
+                "name": "Backtracking array within a trailing capture",
+                "doc": '[int, ([(int)x?, (number)x?])x?]',
+                "want": [("medium", "O(n^2)", "$[*]", 1, 9)],
+                "worst": "O(n^2)",
+            },
+        ]
+        for test_case in test_cases:
+            name, doc, want = test_case["name"], test_case["doc"], test_case["want"]
+            analysis = jspec.analyze(doc)
+            got = [(f.severity, f.complexity, f.loc, f.line, f.column) for f in analysis.findings]
+            self.assertEqual(want, got, msg="(%s) Unexpected findings" % name)
+            self.assertEqual(test_case["worst"], analysis.complexity, msg="(%s) Unexpected worst case" % name)
+
+    def test_analyze_spec(self):
+        """Test a JSPEC instance is analyzed as its serialization."""
+        analysis = jspec.analyze(jspec.loads('{"n": int, "tags": [..., "a", ...]}'))
+        self.assertEqual(analysis.doc, '{"n": int, "tags": [..., "a", ...]}')
+        self.assertEqual([(f.loc, f.line, f.column, f.pos) for f in analysis.findings], [("$.tags", 1, 21, 20)])
+        self.assertRaises(TypeError, jspec.analyze, 1)
+        self.assertRaises(jspec.scanner.JSPECDecodeError, jspec.analyze, '[int,')
+
+    def test_overlaps(self):
+        """Test whether two JSPEC terms can match the same JSON element."""
+        test_cases = [
+            ('int', 'number', True),
+            ('int', 'string', False),
+            ('bool', 'int', True),
+            ('1', '1', True),
+            ('1', '2', False),
+            ('1', 'int > 5', True),
+            ('"abc"', '"a.*"', True),
+            ('"abc"', '"b.*"', False),
+            ('"a.*"', '"b.*"', True),
+            ('(1 | 2)', '2', True),
+            ('(1 | 2)', '3', False),
+            ('(int & 1)', 'string', False),
+            ('!1', '1', True),
+            ('*', 'null', True),
+            ('@x "abc"', '"abc"', True),
+        ]
+        for term, other, want in test_cases:
+            got = risk.overlaps(jspec.loads(term).base, jspec.loads(other).base)
+            self.assertEqual(want, got, msg="Unexpected overlap of %s and %s" % (term, other))
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for analyze - Usage (1.1)."""
+        result = subprocess.run(['python3', '-m', 'jspec.analyze', './test/assets/load.jspec'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b'./test/assets/load.jspec: worst case O(n)' + NL)
+
+    def test_command_line_scripts_usage_1_2(self):
+        """Test the command line tool for analyze - Usage (1.2)."""
+        result = subprocess.run(['python3', '-m', 'jspec.analyze', '--raw-jspec=[(int)x?, (string)x?, null]'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn(b'<raw-jspec>:1:2: low O(n) at $ - ', result.stdout)
+        result = subprocess.run(['python3', '-m', 'jspec.analyze', '--fail-on=low', '--raw-jspec=[(int)x?, (string)x?, null]'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
+
+    def test_command_line_scripts_usage_1_3(self):
+        """Test the command line tool for analyze - Usage (1.3)."""
+        result = subprocess.run(['python3', '-m', 'jspec.analyze', '--raw-jspec={("a.*": int)x?, ...}'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(b'<raw-jspec>:1:2: high O(2^n) at $ - ', result.stdout)
+        self.assertIn(b'<raw-jspec>: worst case O(2^n)', result.stdout)
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestBench(unittest.TestCase):
+    """Class for testing the function in the ``jspec.bench`` package.
+    """
+
+    pass
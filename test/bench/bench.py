@@ -0,0 +1,87 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import subprocess
+from jspec.bench import cases
+from jspec.bench import runner
+
+class JSPECTestBench(unittest.TestCase):
+    """Class for testing the ``jspec.bench`` package and its command line
+    tool.
+    """
+
+    def test_result(self):
+        """Test the summary statistics of a result."""
+        test_cases = [
+            ([3.0], 3.0, 0.0),
+            ([4.0, 1.0, 3.0, 2.0], 2.5, 1.5),
+            ([1.0, 2.0, 3.0, 4.0, 100.0], 3.0, 2.0),
+        ]
+        for values, median, spread in test_cases:
+            result = runner.Result("case", values)
+            self.assertEqual((result.median, result.spread), (median, spread), msg="Unexpected summary for %s" % values)
+            self.assertEqual(result.as_dict()["min"], min(values))
+            self.assertEqual(result.as_dict()["max"], max(values))
+
+    def test_compare(self):
+        """Test results are compared against the baseline medians."""
+        results = [runner.Result("a", [1.2]), runner.Result("b", [1.3]), runner.Result("c", [0.5])]
+        baseline = {"a": 1.0, "b": 1.0, "d": 1.0}
+        changes = runner.compare(results, baseline, threshold=0.25)
+        self.assertEqual(
+            [(c.name, c.regressed(), c.describe()) for c in changes],
+            [
+                ("a", False, "+20.0%"),
+                ("b", True, "+30.0% REGRESSION"),
+                ("c", False, "new"),
+                ("d", False, "missing"),
+            ]
+        )
+
+    def test_run(self):
+        """Test cases are run by name or prefix, and the results saved and
+        loaded as a baseline."""
+        results = runner.run(cases.CASES, names=["scan.small", "fail.nested.deep"], repeat=3, number=1)
+        self.assertEqual([r.name for r in results], ["fail.nested.deep", "scan.small.plain", "scan.small.pretty"])
+        self.assertTrue(all(len(r.values) == 3 and r.number == 1 and r.median > 0 for r in results))
+        file = io.StringIO()
+        runner.save(results, file)
+        self.assertEqual(sorted(json.loads(file.getvalue())["results"]), [r.name for r in results])
+        file.seek(0)
+        self.assertEqual(runner.load(file), dict((r.name, r.median) for r in results))
+
+    def test_cases(self):
+        """Test every case can be set up and called."""
+        for name, setup in cases.CASES.items():
+            func = setup()
+            func()
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for bench - Usage (1.1)."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            result = subprocess.run([
+                'python3', '-m', 'jspec.bench', 'scan.small', '--repeat=3', '--number=1', '--output=%s' % path,
+            ], stdout=subprocess.PIPE)
+            self.assertEqual(result.returncode, 0)
+            self.assertEqual(len(result.stdout.decode().splitlines()), 3)
+            result = subprocess.run([
+                'python3', '-m', 'jspec.bench', 'scan.small.plain', '--repeat=3', '--number=1', '--baseline=%s' % path,
+                '--threshold=100',
+            ], stdout=subprocess.PIPE)
+            self.assertEqual(result.returncode, 0)
+            self.assertEqual(result.stdout.decode().splitlines()[0], 'case\tmedian\tspread\tnumber\tchange')
+            result = subprocess.run([
+                'python3', '-m', 'jspec.bench', 'scan.small.plain', '--repeat=3', '--number=1', '--baseline=%s' % path,
+                '--threshold=-1',
+            ], stdout=subprocess.PIPE)
+            self.assertEqual(result.returncode, 1)
+
+    def test_command_line_scripts_usage_1_2(self):
+        """Test the command line tool for bench - Usage (1.2)."""
+        result = subprocess.run(['python3', '-m', 'jspec.bench', '--list'], stdout=subprocess.PIPE)
+        self.assertEqual(result.stdout.decode().splitlines(), sorted(cases.CASES))
+        result = subprocess.run(['python3', '-m', 'jspec.bench', 'nothing'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
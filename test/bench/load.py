@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+import subprocess
+import jspec
+from jspec.bench import load
+
+class JSPECTestBenchLoad(unittest.TestCase):
+    """Class for testing the ``jspec.bench.load`` module and its command line
+    tool.
+    """
+
+    def test_histogram(self):
+        """Test values are recorded to the significant digits of the
+        histogram."""
+        test_cases = [
+            (2, [1, 2, 3, 4], {50: 2, 100: 4}),
+            (2, [100] * 99 + [1000000], {50: 100, 99: 100, 99.9: 1000000}),
+            (2, list(range(1, 10001)), {50: 5000, 95: 9500, 99: 9900}),
+            (3, list(range(1, 100001)), {50: 50000, 99.9: 99900}),
+        ]
+        for significant, values, percentiles in test_cases:
+            histogram = load.Histogram(significant)
+            for value in values:
+                histogram.record(value)
+            self.assertEqual((histogram.count, histogram.min, histogram.max), (len(values), min(values), max(values)))
+            self.assertLess(len(histogram.counts), 50 * 10 ** significant)
+            for percent, want in percentiles.items():
+                got = histogram.percentile(percent)
+                self.assertLessEqual(abs(got - want), want / 10 ** significant, msg="Unexpected p%s %d for %d" % (percent, got, want))
+        self.assertIsNone(load.Histogram().percentile(50))
+
+    def test_merge(self):
+        """Test merged histograms hold the values of both."""
+        first, second = load.Histogram(), load.Histogram()
+        first.record(10, count=3)
+        second.record(1000)
+        first.merge(second)
+        self.assertEqual((first.count, first.min, first.max, first.total), (4, 10, 1000, 1030))
+        self.assertEqual(first.percentile(75), 10)
+        self.assertEqual(first.percentile(100), 1000)
+        with self.assertRaises(ValueError):
+            first.merge(load.Histogram(3))
+
+    def test_measure(self):
+        """Test the corpus is checked from each number of workers, as threads
+        and as processes."""
+        document = '{"a": int, ...}'
+        corpus = [{"a": 1, "b": 2}, {"a": "x"}]
+        for mode in load.MODES:
+            for engine in load.ENGINES:
+                results = load.run(document, corpus, workers=[1, 2], mode=mode, engine=engine, duration=0.05)
+                self.assertEqual([r.workers for r in results], [1, 2])
+                for result in results:
+                    self.assertEqual(result.histogram.count, result.calls)
+                    self.assertGreater(result.throughput, 0)
+                    self.assertEqual(sorted(result.as_dict()["percentiles"]), ["p50", "p95", "p99", "p999"])
+        with self.assertRaises(ValueError):
+            load.measure(document, [], 1)
+        with self.assertRaises(ValueError):
+            load.measure(document, corpus, 1, mode="fiber")
+        with self.assertRaises(ValueError):
+            load.measure('{"a" int}', corpus, 1)
+        def fails(element):
+            raise ValueError("failed")
+        jspec.placeholder.register("failing", fails)
+        try:
+            with self.assertRaises(RuntimeError):
+                load.measure('{"a": failing}', corpus, 2, duration=0.05)
+        finally:
+            jspec.placeholder.unregister("failing")
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for loadtest - Usage (1.1)."""
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = os.path.join(directory, "corpus.ndjson")
+            output = os.path.join(directory, "results.json")
+            with open(corpus, "w", encoding="utf-8") as file:
+                file.write('{"a": 1}\n{"a": "x"}\n')
+            result = subprocess.run([
+                'python3', '-m', 'jspec.loadtest', '--raw-jspec', '{"a": int}', '--corpus', corpus,
+                '--workers', '1', '2', '--duration', '0.05', '--output', output,
+            ], stdout=subprocess.PIPE)
+            self.assertEqual(result.returncode, 0)
+            lines = result.stdout.decode().splitlines()
+            self.assertEqual(lines[0], 'workers\tthroughput\tspeedup\tp50\tp95\tp99\tp999\tmax')
+            self.assertEqual([line.split('\t')[0] for line in lines[1:]], ['1', '2'])
+            with open(output, encoding="utf-8") as file:
+                self.assertEqual([r["workers"] for r in json.load(file)], [1, 2])
+            result = subprocess.run([
+                'python3', '-m', 'jspec.loadtest', '--raw-jspec', '{"a" int}', '--corpus', corpus,
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.assertEqual(result.returncode, 1)
@@ -0,0 +1,63 @@
+import io
+import json
+import unittest
+import subprocess
+import jspec
+from jspec.bench import cases
+from jspec.bench import memory
+
+class JSPECTestBenchMemory(unittest.TestCase):
+    """Class for testing the ``jspec.bench.memory`` module and the memory
+    cases of the ``jspec.bench`` command line tool.
+    """
+
+    def test_footprint(self):
+        """Test the footprint of a JSPEC grows with its document and is broken
+        down by the class of each JSPEC entity."""
+        small = memory.footprint(cases.wide_jspec(10))
+        large = memory.footprint(cases.wide_jspec(100))
+        self.assertGreater(small.size, 0)
+        self.assertGreater(large.size, 5 * small.size)
+        self.assertEqual(large.classes["JSPECObject"][0], 1)
+        self.assertEqual(large.classes["JSPECObjectPair"][0], 100)
+        self.assertEqual(large.classes["JSPECString"][0], 100)
+        self.assertEqual(sum(size for _, size in large.classes.values()), large.size)
+        self.assertEqual(json.loads(json.dumps(large.as_dict()))["size"], large.size)
+
+    def test_peak(self):
+        """Test the peak memory of a check grows with the JSON."""
+        spec = jspec.loads('[(int)x?]')
+        short = memory.peak(spec, list(range(10)))
+        long = memory.peak(spec, list(range(200)))
+        self.assertGreater(short, 0)
+        self.assertGreater(long, short)
+        self.assertGreaterEqual(memory.peak(spec, [1], jspec.check), 0)
+
+    def test_run(self):
+        """Test the memory cases are run by name or prefix, in bytes."""
+        results = memory.run(names=["load.small", "check.nested"], repeat=2)
+        self.assertEqual([r.name for r in results], ["check.nested.deep", "load.small"])
+        self.assertTrue(all(r.unit == "B" and len(r.values) == 2 and r.median > 0 for r in results))
+        self.assertIsNone(results[0].detail)
+        self.assertIn(results[1].detail["size"], results[1].values)
+        file = io.StringIO()
+        memory.runner.save(results, file)
+        self.assertIn("classes", json.loads(file.getvalue())["results"]["load.small"]["detail"])
+
+    def test_cases(self):
+        """Test every memory case can be set up and measured."""
+        for name, setup in memory.CASES.items():
+            value, _ = setup()()
+            self.assertGreaterEqual(value, 0, msg="Unexpected measurement for %s" % name)
+
+    def test_command_line_scripts_usage_2_1(self):
+        """Test the command line tool for bench - Usage (2.1)."""
+        result = subprocess.run([
+            'python3', '-m', 'jspec.bench', '--memory', 'load.small', '--repeat=2',
+        ], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        lines = result.stdout.decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].split('\t')[1].isdigit())
+        result = subprocess.run(['python3', '-m', 'jspec.bench', '--memory', '--list'], stdout=subprocess.PIPE)
+        self.assertEqual(result.stdout.decode().splitlines(), sorted(memory.CASES))
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestCache(unittest.TestCase):
+    """Class for testing the function in the ``jspec.cache`` module.
+    """
+
+    pass
@@ -0,0 +1,121 @@
+import unittest
+import jspec
+
+from jspec.cache import SubtreeCache
+
+class JSPECTestCache(unittest.TestCase):
+    """Class for testing the ``SubtreeCache`` class in the ``jspec.cache``
+    module.
+    """
+
+    DOCUMENT = '{"customer": {"name": string, "orders": [({"id": int, "tags": [string, ...]})x?]}, ...}'
+
+    def _customer(self, orders):
+        return {
+            "name": "Chris",
+            "orders": [{"id": i, "tags": ["a", "b"]} for i in range(orders)],
+        }
+
+    def test_cache_hits(self):
+        """Test that a repeated subtree in a different JSON is matched using
+        the cache, with the same result as without the cache."""
+        spec = jspec.loads(self.DOCUMENT)
+        cache = SubtreeCache(min_size=8)
+        for n in range(3):
+            element = {"customer": self._customer(10), "message": n}
+            self.assertEqual(
+                jspec.check(spec, element, cache=cache),
+                jspec.check(spec, element),
+            )
+        self.assertGreaterEqual(cache.hits, 2)
+        self.assertGreater(cache.hit_rate(), 0)
+
+    def test_cache_bad_match_location(self):
+        """Test that a cached bad match is reported at the location of the
+        subtree in the JSON it is used for."""
+        spec = jspec.loads('{"name": string, ...}')
+        cache = SubtreeCache(min_size=2)
+        ctx = jspec.matcher.Context(cache)
+        jspec.matcher.match_element("$.a", spec.base, {"name": 1, "age": 30}, ctx)
+        result = jspec.matcher.match_element("$.b", spec.base, {"age": 30, "name": 1}, ctx)
+        want = jspec.matcher.match_element("$.b", spec.base, {"age": 30, "name": 1}, jspec.matcher.Context())
+        self.assertEqual(result.reason(), want.reason())
+        self.assertTrue(result.reason().startswith("At location $.b "))
+        self.assertEqual(cache.hits, 1)
+
+    def test_cache_macros(self):
+        """Test that validators with different macros sharing a cache do not
+        use each other's results."""
+        spec = jspec.loads('{"x": {"id": <ID>}}')
+        cache = SubtreeCache(min_size=0)
+        first = jspec.compile(spec, cache=cache, macros={"ID": 1})
+        second = jspec.compile(spec, cache=cache, macros={"ID": 2})
+        test_cases = [
+            (first, {"x": {"id": 1}}, (True, "")),
+            (second, {"x": {"id": 1}}, (False, "At location $.x.id - JSPEC macro '<ID>' failed to match '1'")),
+            (second, {"x": {"id": 2}}, (True, "")),
+            (first, {"x": {"id": 2}}, (False, "At location $.x.id - JSPEC macro '<ID>' failed to match '2'")),
+            (first, {"x": {"id": 1}}, (True, "")),
+        ]
+        for validator, element, want in test_cases:
+            self.assertEqual(validator.check(element), want)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(jspec.macro.names(spec.base), ("ID",))
+
+    def test_cache_min_size(self):
+        """Test that subtrees smaller than the minimum size are not cached."""
+        spec = jspec.loads(self.DOCUMENT)
+        cache = SubtreeCache(min_size=1000)
+        jspec.check(spec, {"customer": self._customer(10)}, cache=cache)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits + cache.misses, 0)
+
+    def test_cache_canonical(self):
+        """Test that the digest of a subtree ignores the order of object keys
+        but not the types of the values."""
+        cache = SubtreeCache(min_size=1)
+        _, a = cache.describe({"x": 1, "y": [True]}, dict())
+        _, b = cache.describe({"y": [True], "x": 1}, dict())
+        _, c = cache.describe({"x": 1.0, "y": [True]}, dict())
+        _, d = cache.describe({"x": 1, "y": [1]}, dict())
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertNotEqual(a, d)
+
+    def test_cache_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SubtreeCache(maxsize=2, min_size=1, policy="lru")
+        term = object()
+        cache.put(term, "a", 1, "A")
+        cache.put(term, "b", 1, "B")
+        cache.get(term, "a")
+        cache.put(term, "c", 1, "C")
+        self.assertEqual(cache.get(term, "a"), "A")
+        self.assertEqual(cache.get(term, "b"), None)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.hit_rate(), 2 / 3)
+
+    def test_cache_size_eviction(self):
+        """Test that the entry for the smallest subtree is evicted."""
+        cache = SubtreeCache(maxsize=2, min_size=1, policy="size")
+        term = object()
+        cache.put(term, "big", 100, "BIG")
+        cache.put(term, "small", 2, "SMALL")
+        cache.get(term, "small")
+        cache.put(term, "medium", 10, "MEDIUM")
+        self.assertEqual(cache.get(term, "big"), "BIG")
+        self.assertEqual(cache.get(term, "small"), None)
+        self.assertEqual(cache.get(term, "medium"), "MEDIUM")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_cache_invalid_policy(self):
+        """Test that an unknown eviction policy is rejected."""
+        exc = None
+        try:
+            SubtreeCache(policy="fifo")
+        except ValueError as err:
+            exc = err
+        self.assertEqual(
+            str(exc),
+            "Unsupported eviction policy 'fifo', expected one of lru, size",
+        )
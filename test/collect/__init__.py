@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestCollect(unittest.TestCase):
+    """Class for testing the function in the ``jspec.collect`` module.
+    """
+
+    pass
@@ -0,0 +1,81 @@
+import unittest
+import jspec
+
+class JSPECTestCollect(unittest.TestCase):
+    """Class for testing the ``check_all`` function and the ``jspec.collect``
+    module.
+    """
+
+    def test_check_all(self):
+        """Test that every failure is collected in a single pass."""
+        test_cases = [
+            {
+                "name": "Good match",
+                "doc": '{"id": int, "tags": [(string)x?]}',
+                "obj": {"id": 1, "tags": ["a", "b"]},
+                "want": [],
+            },
+            {
+                "name": "Object pairs and homogeneous arrays",
+                "doc": '{"id": int, "tags": [(string)x?], "items": [{"sku": string, "qty": int > 0}, ...]}',
+                "obj": {"id": "1", "tags": ["a", 1, 2], "items": [{"sku": 1, "qty": 0}, None]},
+                "want": [
+                    "At location $.id - expected an int",
+                    "At location $.items[0].qty - expected an int that is more than '0', got '0'",
+                    "At location $.items[0].sku - expected a string",
+                    "At location $.tags[1] - expected a string",
+                    "At location $.tags[2] - expected a string",
+                ],
+            },
+            {
+                "name": "Missing and unexpected object pairs",
+                "doc": '{"a": int, "b": int}',
+                "obj": {"a": "1", "c": 3},
+                "want": [
+                    "At location $.a - expected an int",
+                    "At location $ - failed to find a JSON pair for the JSPEC pair '\"b\": int'",
+                    "At location $ - exhausted JSPEC object, failed to match the following JSON pairs: [\"c\": 3]",
+                ],
+            },
+            {
+                "name": "Array lengths",
+                "doc": '[int, int, (string | null)x1-2]',
+                "obj": [1, "2", "a", 4, "b"],
+                "want": [
+                    "At location $[1] - expected an int",
+                    "At location $[3] - failed array capture, '4' failed to match '(string | null)x1-2'",
+                    "At location $[4] - exhausted JSPEC array, no JSPEC term left to match 'b'",
+                ],
+            },
+            {
+                "name": "AND conditional",
+                "doc": '(string & "a.*" & "...")',
+                "obj": "bcde",
+                "want": [
+                    "At location $ - regex pattern 'a.*' failed to match '\"bcde\"'",
+                    "At location $ - regex pattern '...' failed to match '\"bcde\"'",
+                ],
+            },
+            {
+                "name": "Not broken down",
+                "doc": '[(int)x?, string]',
+                "obj": [1, 2],
+                "want": [jspec.checks('[(int)x?, string]', [1, 2])[1]],
+            },
+        ]
+        for test_case in test_cases:
+            name, doc, obj, want = test_case["name"], test_case["doc"], test_case["obj"], test_case["want"]
+            got = [f.reason() for f in jspec.check_all(jspec.loads(doc), obj)]
+            self.assertEqual(want, got, msg="(%s) Unexpected failures" % name)
+
+    def test_check_all_max_errors(self):
+        """Test that no more than ``max_errors`` failures are collected, and
+        that a validator collects the same failures."""
+        spec = jspec.loads("[(int)x?]")
+        obj = ["a", "b", 1, "c"]
+        self.assertEqual(
+            [f.loc for f in jspec.check_all(spec, obj, max_errors=2)],
+            ["$[0]", "$[1]"],
+        )
+        self.assertEqual(jspec.compile(spec).check_all(obj), jspec.check_all(spec, obj))
+        self.assertEqual(len(jspec.check_all(spec, obj)), 3)
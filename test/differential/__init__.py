@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestDifferential(unittest.TestCase):
+    """Class for testing the matching engines against the reference matcher.
+    """
+
+    pass
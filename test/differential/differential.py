@@ -0,0 +1,120 @@
+import random
+import unittest
+import subprocess
+from jspec import differential, incremental, matcher
+
+class JSPECTestDifferential(unittest.TestCase):
+    """Class for testing the matching engines against the reference matcher,
+    and the ``jspec.differential`` module and its command line tool.
+    """
+
+    def test_render(self):
+        """Test JSPEC trees are rendered as JSPEC documents."""
+        test_cases = [
+            (("leaf", "int", ()), "int"),
+            (("object", "", (("pair", '"a"', (("leaf", "int", ()),)), ("ellipsis", "...", ()))), '{"a": int, ...}'),
+            (("array", "", (("array_capture", "x1-2", (("leaf", "1", ()), ("leaf", "2", ()))),)), "[(1 | 2)x1-2]"),
+            (("object", "", (("object_capture", "x?", (("pair", "string", (("leaf", "int", ()),)),)),)), "{(string: int)x?}"),
+            (("conditional", "&", (("leaf", "int", ()), ("negation", "", (("leaf", "0", ()),)))), "(int & !0)"),
+            (("named", "n", (("leaf", "bool", ()),)), "@n bool"),
+        ]
+        for node, want in test_cases:
+            self.assertEqual(differential.render(node), want)
+        with self.assertRaises(ValueError):
+            differential.render(("unknown", "", ()))
+
+    def test_random_spec(self):
+        """Test random JSPEC trees render to the JSPEC returned with them."""
+        rng = random.Random(0)
+        for _ in range(50):
+            node, spec = differential.random_spec(rng)
+            self.assertEqual(str(differential.scan(differential.render(node))), str(spec))
+
+    def test_compare(self):
+        """Test every engine agrees with the reference matcher on simple
+        JSPECs and JSONs."""
+        test_cases = [
+            ('{"a": int, ...}', {"a": 1, "b": 2}),
+            ('{"a": int, ...}', {"b": 2}),
+            ('[(int)x1-?, "end"]', [1, 2, "end"]),
+            ('[(int)x1-?, "end"]', [1, "x"]),
+            ('(int | string)', None),
+        ]
+        for document, element in test_cases:
+            self.assertEqual(differential.compare(document, element), [], msg="%s %r" % (document, element))
+
+    def test_search(self):
+        """Test no engine diverges from the reference matcher on random
+        JSPECs and JSONs."""
+        for seed in range(3):
+            divergences = differential.search(iterations=50, seed=seed)
+            self.assertEqual(divergences, [], msg="\n\n".join(d.describe() for d in divergences))
+        with self.assertRaises(ValueError):
+            differential.search(engines=["unknown"])
+
+    def test_shrink(self):
+        """Test a broken engine is found and its divergence minimized."""
+        @differential.engine("broken")
+        def broken(spec, element):
+            if isinstance(element, list) and len(element) > 1:
+                return True, ""
+            return matcher.match(spec, element)
+        try:
+            divergences = differential.search(iterations=200, seed=0, engines=["broken"])
+        finally:
+            del differential.ENGINES["broken"]
+        self.assertEqual(len(divergences), 1)
+        divergence = divergences[0]
+        self.assertEqual(divergence.engine, "broken")
+        self.assertEqual(divergence.expected[0], False)
+        self.assertEqual(divergence.got, (True, ""))
+        self.assertLessEqual(len(divergence.document), 10, msg=divergence.describe())
+        self.assertEqual(len(divergence.element), 2, msg=divergence.describe())
+
+    def test_diff(self):
+        """Test the JSON patch between two JSONs turns the first into the
+        second, replacing only the JSON elements which differ."""
+        test_cases = [
+            ({"a": 1}, {"a": 1}, []),
+            ({"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 3, 4]}, [
+                {"op": "replace", "path": "/b/1", "value": 3},
+                {"op": "add", "path": "/b/-", "value": 4},
+            ]),
+            ({"a/b": [1, 2, 3], "~": 0}, {"a/b": [1], "c": True}, [
+                {"op": "remove", "path": "/a~1b/2"},
+                {"op": "remove", "path": "/a~1b/1"},
+                {"op": "remove", "path": "/~0"},
+                {"op": "add", "path": "/c", "value": True},
+            ]),
+            ([1], 1, [{"op": "replace", "path": "", "value": 1}]),
+            ({"a": 1}, {"a": True}, [{"op": "replace", "path": "/a", "value": True}]),
+        ]
+        for source, target, want in test_cases:
+            patch = differential.diff(source, target)
+            self.assertEqual(patch, want)
+            self.assertEqual(incremental.apply_patch(source, patch)[0], target)
+
+    def test_incremental(self):
+        """Test the incremental engine diverges when revalidating ignores the
+        JSON patch."""
+        revalidate = incremental.revalidate
+        def broken(state, patch):
+            return revalidate(state, [])
+        incremental.revalidate = broken
+        try:
+            divergences = differential.search(iterations=50, seed=0, engines=["incremental"])
+        finally:
+            incremental.revalidate = revalidate
+        self.assertEqual(len(divergences), 1)
+        self.assertIn("after the patch", divergences[0].got)
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for difftest - Usage (1.1)."""
+        result = subprocess.run(['python3', '-m', 'jspec.difftest', '--iterations', '10', '--seed', '1'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b'')
+        result = subprocess.run(['python3', '-m', 'jspec.difftest', '--list'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('compiled', result.stdout.decode().split())
+        result = subprocess.run(['python3', '-m', 'jspec.difftest', '--engine', 'unknown'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestExplain(unittest.TestCase):
+    """Class for testing the function in the ``jspec.explain`` module.
+    """
+
+    pass
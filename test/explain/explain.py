@@ -0,0 +1,151 @@
+import os
+import unittest
+import subprocess
+import jspec
+from jspec import plan, risk
+
+NL = b'\r\n' if os.name == 'nt' else b'\n'
+
+class JSPECTestExplain(unittest.TestCase):
+    """Class for testing the ``explain`` function, the ``jspec.plan`` module
+    and the ``jspec.explain`` command line tool.
+    """
+
+    def test_explain(self):
+        """Test the strategy, bounds and estimate of the base JSPEC term, and
+        the worst case of the plan."""
+        test_cases = [
+            {
+                "name": "Object with literal keys",
+                "doc": '{"id": int, "name": string, ...}',
+                "want": ("key lookup", 'keys: "id", "name"; pairs >= 2', "O(n*m)", "O(n*m)"),
+            },
+            {
+                "name": "Object capture",
+                "doc": '{"id": int, ("a.*": int)x?}',
+                "want": ("backtracking", 'keys: "id"; pairs >= 1', "O(2^n)", "O(2^n)"),
+            },
+            {
+                "name": "Object capture with a literal key",
+                "doc": '{("a": int)x?}',
+                "want": ("key lookup", "", "O(n)", "O(n)"),
+            },
+            {
+                "name": "Array of terms",
+                "doc": '[int, string]',
+                "want": ("positional", "length = 2", "O(n)", "O(n)"),
+            },
+            {
+                "name": "Array with a trailing capture",
+                "doc": '[int, (string)x1-3]',
+                "want": ("linear scan", "length 2..4", "O(n)", "O(n)"),
+            },
+            {
+                "name": "Array with a leading capture",
+                "doc": '[(string)x?, int]',
+                "want": ("linear scan", "length >= 1", "O(n)", "O(n)"),
+            },
+            {
+                "name": "Array with an overlapping capture",
+                "doc": '[(int)x?, int]',
+                "want": ("backtracking", "length >= 1", "O(n)", "O(n)"),
+            },
+            {
+                "name": "Array with overlapping captures",
+                "doc": '[(int)x?, (number)x?, null]',
+                "want": ("backtracking", "length >= 1", "O(n^2)", "O(n^2)"),
+            },
+            {
+                "name": "Discriminated union",
+                "doc": '({"type": "a", ...} | {"type": "b", ...})',
+                "want": ("hash lookup", 'on "type": 2 values', "O(1)", "O(n*m)"),
+            },
+            {
+                "name": "Conditional",
+                "doc": '(int | "a.*" | null)',
+                "want": ("alternatives", "3 terms", "O(m)", "O(n)"),
+            },
+            {
+                "name": "Literal string",
+                "doc": '"abc"',
+                "want": ("literal", "", "O(1)", "O(1)"),
+            },
+            {
+                "name": "Regex with nested quantifiers",
+                "doc": '"(a+)+b"',
+                "want": ("regex", "", "O(2^n)", "O(2^n)"),
+            },
+            {
+                "name": "Placeholder with an inequality",
+                "doc": 'int >= 3',
+                "want": ("type check", ">= 3", "O(1)", "O(1)"),
+            },
+            {
+                "name": "Format placeholder",
+                "doc": 'uuid',
+                "want": ("predicate", "", "O(1)", "O(1)"),
+            },
+        ]
+        for test_case in test_cases:
+            name, doc, want = test_case["name"], test_case["doc"], test_case["want"]
+            explained = jspec.explain(jspec.loads(doc))
+            root = explained.root
+            got = (root.strategy, root.bounds, root.complexity, explained.worst)
+            self.assertEqual(want, got, msg="(%s) Unexpected plan" % name)
+            self.assertEqual(bool(explained.warnings), want[3] not in plan.COMPLEXITIES[:-1], msg="(%s) Unexpected warnings" % name)
+
+    def test_explain_report(self):
+        """Test the report of a plan."""
+        explained = jspec.explain(jspec.loads('{"tags": [(int)x?, (number)x?, null], "n": int}'))
+        self.assertEqual(str(explained), "\n".join([
+            '$  key lookup  O(n*m)  keys: "n", "tags"; pairs = 2  {"n": int, "tags": [(int)x?, (number)...',
+            '  $.n  type check  O(1)  int',
+            '  $.tags  backtracking  O(n^2)  length >= 1  [(int)x?, (number)x?, null]',
+            '    $.tags[*]  type check  O(1)  int',
+            '    $.tags[*]  type check  O(1)  number',
+            '    $.tags[?]  literal  O(1)  null',
+            '',
+            'Worst case: O(n^2)',
+            'Warnings:',
+            '  $.tags - 1 unbounded array capture(s) can match the same JSON elements as the JSPEC terms after them, so a failing match tries every split of the JSON array between them',
+        ]))
+
+    def test_explain_risk(self):
+        """Test the plan agrees with the risk analysis on the complexity of
+        JSPEC arrays and objects, and warns for the same JSPECs."""
+        test_cases = [
+            '[(int)x?, int]',
+            '[(string)x?, int]',
+            '[(int)x?, (string)x?]',
+            '[(int)x?, (number)x?, null]',
+            '[..., 1, ..., 1, ..., null]',
+            '{"a": int, ("b": int)x?}',
+            '{("k[0-9]": int)x?}',
+            '{"k1": int, ("k[0-9]": int)x?, ...}',
+        ]
+        for doc in test_cases:
+            explained = jspec.explain(jspec.loads(doc))
+            analysis = risk.analyze(doc)
+            backtracking = [node.complexity for node in explained.root.walk() if node.strategy == "backtracking"]
+            self.assertEqual(max(backtracking + ["O(n)"], key=plan.complexity_key), analysis.complexity, msg="Unexpected complexity for %s" % doc)
+            self.assertEqual(bool(explained.warnings), bool(analysis.at_least("medium")), msg="Unexpected warnings for %s" % doc)
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for explain - Usage (1.1)."""
+        result = subprocess.run(['python3', '-m', 'jspec.explain', './test/assets/load.jspec'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(
+            result.stdout,
+            b'$  key lookup  O(n*m)  keys: "key"; pairs = 1  {"key": "value"}' + NL +
+            b'  $.key  literal  O(1)  "value"' + NL + NL +
+            b'Worst case: O(n*m)' + NL
+        )
+
+    def test_command_line_scripts_usage_1_2(self):
+        """Test the command line tool for explain - Usage (1.2)."""
+        result = subprocess.run(['python3', '-m', 'jspec.explain', '--raw-jspec=[(int)x?, (number)x?, null]'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(b'Worst case: O(n^2)', result.stdout)
+        result = subprocess.run(['python3', '-m', 'jspec.explain', '--raw-jspec=[(int)x?, 1]'], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn(b'Worst case: O(n)', result.stdout)
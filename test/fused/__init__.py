@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestFused(unittest.TestCase):
+    """Class for testing the function in the ``jspec.fused`` module.
+    """
+
+    pass
@@ -0,0 +1,64 @@
+import unittest
+import jspec
+from jspec import fused
+
+BASE = '{"id": int, "items": [({"sku": string, "qty": int > 0})x?], ...}'
+TENANT = '{"tenant": string, "items": [({"sku": string, "qty": int > 0})x?], ...}'
+COMPLIANCE = '{"id": int > 0, "region": ("eu" | "us"), ...}'
+LIST = '[int, {"sku": string, "qty": int > 0}, *]'
+
+class JSPECTestFused(unittest.TestCase):
+    """Class for testing the ``check_many`` function and the ``jspec.fused``
+    module.
+    """
+
+    def test_check_many(self):
+        """Test that the result for each JSPEC is the same as for ``check``."""
+        test_cases = [
+            {
+                "name": "Good matches",
+                "obj": {"id": 1, "tenant": "t", "region": "eu", "items": [{"sku": "a", "qty": 1}, {"sku": "b", "qty": 2}]},
+            },
+            {
+                "name": "Bad shared item",
+                "obj": {"id": 1, "tenant": "t", "region": "eu", "items": [{"sku": "a", "qty": 0}]},
+            },
+            {
+                "name": "Bad unshared pair",
+                "obj": {"id": 0, "tenant": "t", "region": "uk", "items": []},
+            },
+            {
+                "name": "Missing pairs",
+                "obj": {"items": [{"sku": 1}]},
+            },
+            {
+                "name": "Array",
+                "obj": [1, {"sku": "a", "qty": 1}, None],
+            },
+            {
+                "name": "Not a container",
+                "obj": "a",
+            },
+        ]
+        specs = [jspec.loads(doc) for doc in (BASE, TENANT, COMPLIANCE, LIST)]
+        for test_case in test_cases:
+            name, obj = test_case["name"], test_case["obj"]
+            want = [jspec.check(spec, obj) for spec in specs]
+            got = jspec.check_many(specs, obj)
+            self.assertEqual(want, got, msg="(%s) Unexpected results" % name)
+
+    def test_check_many_shared(self):
+        """Test that identical JSPEC terms share their results."""
+        base, tenant = jspec.loads(BASE), jspec.loads(TENANT)
+        memo = fused.SharedMemo([base, tenant])
+        base_items = jspec.path.object_bindings(base.base)["items"]
+        tenant_items = jspec.path.object_bindings(tenant.base)["items"]
+        self.assertIsNot(base_items, tenant_items)
+        self.assertEqual(memo.aliases[id(tenant_items)], id(base_items))
+        self.assertNotIn(id(base.base), memo.aliases)
+        self.assertNotIn(id(tenant.base), memo.aliases)
+
+    def test_check_many_invalid(self):
+        """Test that every JSPEC must be a JSPEC instance."""
+        with self.assertRaises(TypeError):
+            jspec.check_many([jspec.loads(BASE), BASE], {})
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestFuzz(unittest.TestCase):
+    """Class for testing the function in the ``jspec.perffuzz`` module.
+    """
+
+    pass
@@ -0,0 +1,107 @@
+import os
+import json
+import random
+import tempfile
+import unittest
+import subprocess
+import jspec
+from jspec import fuzz
+
+class JSPECTestFuzz(unittest.TestCase):
+    """Class for testing the ``jspec.fuzz`` module and the ``jspec.perffuzz``
+    command line tool.
+    """
+
+    def test_measure(self):
+        """Test the work done to match a JSON is measured."""
+        spec = jspec.loads('[(int)x?, (number)x?, null]')
+        good = fuzz.measure(spec, [1, 2.5, None])
+        self.assertEqual((good.good, good.size), (True, len('[1,2.5,null]')))
+        short = fuzz.measure(spec, [1, 1, "x"])
+        long = fuzz.measure(spec, [1] * 8 + ["x"])
+        self.assertFalse(short.good)
+        self.assertLess(short.steps, long.steps)
+        exceeded = fuzz.measure(spec, [1] * 8 + ["x"], max_steps=10)
+        self.assertTrue(exceeded.exceeded())
+        self.assertEqual(exceeded.steps, 11)
+
+    def test_search(self):
+        """Test the search finds JSONs which take more work than the example,
+        within the maximum size, and is repeatable for a seed."""
+        spec = jspec.loads('[(int)x?, (number)x?, null]')
+        start = fuzz.measure(spec, fuzz.example(spec.base))
+        samples = fuzz.search(spec, iterations=200, max_size=64, keep=5, seed=1)
+        self.assertEqual(len(samples), 5)
+        self.assertGreater(samples[0].steps, 10 * start.steps)
+        self.assertEqual(samples, sorted(samples, key=lambda s: (s.steps, -s.size), reverse=True))
+        self.assertTrue(all(s.size <= 64 for s in samples))
+        again = fuzz.search(spec, iterations=200, max_size=64, keep=5, seed=1)
+        self.assertEqual([s.digest() for s in samples], [s.digest() for s in again])
+        self.assertRaises(ValueError, fuzz.search, spec, metric="memory")
+
+    def test_search_exceeded(self):
+        """Test the search ends once a JSON exceeds the maximum steps."""
+        spec = jspec.loads('[(int)x?, (number)x?, null]')
+        samples = fuzz.search(spec, iterations=1000, max_size=256, seeds=[[1] * 20 + ["x"]], seed=1, max_steps=100)
+        self.assertTrue(samples[0].exceeded())
+
+    def test_mutate(self):
+        """Test mutants are copies within the maximum size."""
+        rng = random.Random(0)
+        element = {"a": [1, "b", {"c": None}]}
+        for _ in range(100):
+            mutant = fuzz.mutate(element, rng, 40, ("key", 3))
+            self.assertLessEqual(len(json.dumps(mutant, separators=(",", ":"))), 40)
+        self.assertEqual(element, {"a": [1, "b", {"c": None}]})
+
+    def test_dictionary(self):
+        """Test the words of a JSPEC."""
+        spec = jspec.loads('{("a.*": int)x?, "b": ["c", 2.5], "n": int > 5, "o": (string | 7)}')
+        self.assertEqual(fuzz.dictionary(spec), (2.5, 5, 7, "a", "b", "c", "n", "o"))
+
+    def test_example(self):
+        """Test the JSON shaped like a JSPEC term."""
+        test_cases = [
+            ('{"a": int, "b": [string, (bool)x2-3], "c": @x "abc", ("d.*": int)x?, ...}', {"a": 0, "b": ["", False, False], "c": "abc"}),
+            ('(1 | "x")', 1),
+            ('int > 3', 4),
+            ('real <= 1.5', 1.5),
+            ('!null', 0),
+            ('"a+"', ""),
+            ('*', None),
+        ]
+        for doc, want in test_cases:
+            self.assertEqual(fuzz.example(jspec.loads(doc).base), want, msg="Unexpected example for %s" % doc)
+
+    def test_save_replay(self):
+        """Test saved JSONs are replayed."""
+        spec = jspec.loads('[(int)x?, (number)x?, null]')
+        samples = [fuzz.measure(spec, [1, "x"]), fuzz.measure(spec, [1, 1, 1, "x"])]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = fuzz.save(samples, os.path.join(directory, "corpus"))
+            self.assertEqual(sorted(os.path.basename(p) for p in paths), sorted("%s.json" % s.digest() for s in samples))
+            replayed = fuzz.replay(spec, os.path.join(directory, "corpus"))
+        self.assertEqual(
+            sorted((s.steps, s.element) for _, s in replayed),
+            sorted((s.steps, s.element) for s in samples),
+        )
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for perffuzz - Usage (1.1)."""
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run([
+                'python3', '-m', 'jspec.perffuzz', '--raw-jspec=[(int)x?, (number)x?, null]',
+                '--iterations=50', '--keep=3', '--seed=1', '--corpus=%s' % directory,
+            ], stdout=subprocess.PIPE)
+            self.assertEqual(result.returncode, 0)
+            lines = result.stdout.decode().splitlines()
+            self.assertEqual(lines[0], 'steps\tseconds\tsize\tfile')
+            self.assertEqual(len(lines), 4)
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+    def test_command_line_scripts_usage_1_2(self):
+        """Test the command line tool for perffuzz - Usage (1.2)."""
+        result = subprocess.run([
+            'python3', '-m', 'jspec.perffuzz', './test/assets/load.jspec', '--iterations=20', '--seed=1', '--fail-over=0',
+        ], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestGenerator(unittest.TestCase):
+    """Class for testing the function in the ``jspec.generate`` module.
+    """
+
+    pass
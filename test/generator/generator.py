@@ -0,0 +1,126 @@
+import io
+import json
+import unittest
+import subprocess
+import jspec
+from jspec import generator
+
+class JSPECTestGenerator(unittest.TestCase):
+    """Class for testing the ``jspec.generator`` module and the
+    ``jspec.generate`` command line tool.
+    """
+
+    def test_generate_good_match(self):
+        """Test every JSON generated is a good match for the JSPEC."""
+        test_cases = [
+            'null',
+            '*',
+            '{"a": int, "b": [string, bool], "c": {}}',
+            '[(int)x2-4, (string)x?, null]',
+            '[1, ..., "x", ...]',
+            '{"a": int, ("k[0-9]+": [number, ...])x1-3, ...}',
+            '{"n": int > 5, "m": int <= -2, "r": real >= 0.5, "p": number < 3}',
+            '(int >= 0 & int < 10 & !5)',
+            '("a" | 1 | [null] ^ [null])',
+            '!(int | string)',
+            '{"id": uuid, "ts": date-time, "d": date, "ip": (ipv4 | ipv6), "e": email}',
+            '"[A-Z]{3}-[0-9]{2,4}(-(x|yz))?"',
+            '"\\\\w+@[^@ ]{1,5}\\\\.(com|org)"',
+            '{"id": @id int, "tags": @tags [string, ...], "v": (@y string | @y int)}',
+        ]
+        for doc in test_cases:
+            spec = jspec.loads(doc)
+            for element in jspec.generate(spec, 30, seed=1):
+                result, msg = jspec.check(spec, element)
+                self.assertTrue(result, msg="%s for %s generated for %s" % (msg, element, doc))
+
+    def test_generate_conjunction(self):
+        """Test a conjunction of number placeholders gives numbers within all
+        of their inequalities."""
+        test_cases = [
+            ('(real > 0 & real < 1)', float, 0, 1),
+            ('(int >= 1 & int <= 12)', int, 1, 12),
+            ('(int > 3 & int < 6)', int, 4, 5),
+            ('(number > -0.5 & number <= 0.5 & int)', int, 0, 0),
+            ('(real >= 2 & real <= 2)', float, 2, 2),
+            ('(int > 1 & int > 4 & int < 100 & int < 7 & !5)', int, 6, 6),
+        ]
+        for doc, kind, minimum, maximum in test_cases:
+            for element in jspec.generate(jspec.loads(doc), 50, seed=1):
+                self.assertIs(element.__class__, kind, msg="Unexpected %s for %s" % (element, doc))
+                self.assertTrue(minimum <= element <= maximum, msg="Unexpected %s for %s" % (element, doc))
+        for doc in ('[(int >= 1 & int <= 12)x3]', '{"a": (int > 3 & int < 6)}', '[(real > 0 & real < 0.0001)x2]',
+                    '{("k[0-9]": int > 3 & "k[0-9]": int < 6)x2}', '[(int > 10 | real < 0)x5]'):
+            spec = jspec.loads(doc)
+            for element in jspec.generate(spec, 30, seed=1):
+                result, msg = jspec.check(spec, element)
+                self.assertTrue(result, msg="%s for %s generated for %s" % (msg, element, doc))
+
+    def test_generate_multipliers(self):
+        """Test capture multipliers bound the number of elements and pairs."""
+        test_cases = [
+            ('[(int)x3]', 3, 3),
+            ('[(int)x2-4]', 2, 4),
+            ('[(int)x?]', 0, generator.MAX_REPEAT),
+            ('{("a[0-9]": null)x1-2}', 1, 2),
+        ]
+        for doc, minimum, maximum in test_cases:
+            sizes = set(len(e) for e in jspec.generate(jspec.loads(doc), 100, seed=1))
+            self.assertEqual((min(sizes), max(sizes)), (minimum, maximum), msg="Unexpected sizes for %s" % doc)
+
+    def test_generate_seed(self):
+        """Test the same seed generates the same JSONs."""
+        spec = jspec.loads('{"a": [(number)x?], "b": "[a-z]+", ...}')
+        first = list(jspec.generate(spec, 10, seed=7))
+        self.assertEqual(first, list(jspec.generate(spec, 10, seed=7)))
+        self.assertNotEqual(first, list(jspec.generate(spec, 10, seed=8)))
+
+    def test_generate_macros(self):
+        """Test macros are resolved with the given mapping."""
+        spec = jspec.loads('{"a": <A>, "b": <B>}')
+        elements = list(jspec.generate(spec, 3, macros={"A": [1, 2], "B": "x"}))
+        self.assertEqual(elements, [{"a": [1, 2], "b": "x"}] * 3)
+
+    def test_generate_error(self):
+        """Test the JSPECs which JSONs can not be generated for."""
+        test_cases = [
+            ('"(?=a)a"', "$", "unsupported regex feature ASSERT"),
+            ('{"a": <MISSING_MACRO_NAME>}', "$.a", "failed to find the JSPEC macro"),
+            ('(int & string)', "$", "failed to generate a JSON element matching"),
+            ('(int > 3 & int < 4)', "$", "no number matches"),
+            ('{"a": (int & real > 0)}', "$.a", "no number matches"),
+            ('(real > 1 & real < 1)', "$", "no number matches"),
+        ]
+        for doc, loc, msg in test_cases:
+            spec = jspec.loads(doc)
+            with self.assertRaises(generator.JSPECGenerateError, msg="No error for %s" % doc) as context:
+                list(jspec.generate(spec, 1, seed=1, macros={}))
+            self.assertEqual(context.exception.loc, loc)
+            self.assertIn(msg, str(context.exception))
+        self.assertRaises(TypeError, jspec.generate, '[]', 1)
+
+    def test_write_ndjson(self):
+        """Test the JSONs are written as NDJSON."""
+        spec = jspec.loads('[int, string]')
+        file = io.StringIO()
+        self.assertEqual(generator.write_ndjson(spec, 5, file, seed=1), 5)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual([json.loads(line) for line in lines], list(jspec.generate(spec, 5, seed=1)))
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for generate - Usage (1.1)."""
+        result = subprocess.run([
+            'python3', '-m', 'jspec.generate', '--raw-jspec={"a": int, "b": <B>}', '-n', '4', '--seed=1', '--macro=B=[true]',
+        ], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        lines = result.stdout.decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(all(json.loads(line)["b"] == [True] for line in lines))
+
+    def test_command_line_scripts_usage_1_2(self):
+        """Test the command line tool for generate - Usage (1.2)."""
+        result = subprocess.run([
+            'python3', '-m', 'jspec.generate', '--raw-jspec="(?<=a)b"',
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 1)
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestIncremental(unittest.TestCase):
+    """Class for testing the function in the ``jspec.incremental`` module.
+    """
+
+    pass
@@ -0,0 +1,157 @@
+import copy
+import unittest
+import jspec
+
+from jspec.incremental import validate, revalidate, apply_patch, JSONPatchError
+
+class JSPECTestIncremental(unittest.TestCase):
+    """Class for testing the functions in the ``jspec.incremental`` module.
+    """
+
+    DOCUMENT = """{
+        "name": string,
+        "cart": {
+            "items": [({"sku": string, "qty": int > 0})x?],
+            "total": real >= 0.0
+        },
+        "tags": [string, string],
+        ...
+    }"""
+
+    def _document(self):
+        return {
+            "name": "Chris",
+            "cart": {
+                "items": [{"sku": "A%d" % i, "qty": 1} for i in range(50)],
+                "total": 12.5,
+            },
+            "tags": ["a", "b"],
+            "notes": None,
+        }
+
+    def test_revalidate(self):
+        """Test that revalidating after a patch gives the same result as
+        checking the whole patched JSON, and only the touched locations are
+        matched again."""
+        spec = jspec.loads(self.DOCUMENT)
+        test_cases = [
+            {
+                "name": "Replace bound value",
+                "patch": [{"op": "replace", "path": "/cart/total", "value": 3.0}],
+                "revalidated": ["$.cart.total"],
+            },
+            {
+                "name": "Replace inside capture",
+                "patch": [{"op": "replace", "path": "/cart/items/3/qty", "value": 7}],
+                "revalidated": ["$.cart.items"],
+            },
+            {
+                "name": "Replace bound array element",
+                "patch": [{"op": "replace", "path": "/tags/1", "value": "c"}],
+                "revalidated": ["$.tags[1]"],
+            },
+            {
+                "name": "Add to ellipsis",
+                "patch": [{"op": "add", "path": "/extra", "value": [1, 2]}],
+                "revalidated": ["$"],
+            },
+            {
+                "name": "Several operations",
+                "patch": [
+                    {"op": "add", "path": "/cart/items/-", "value": {"sku": "B", "qty": 2}},
+                    {"op": "test", "path": "/name", "value": "Chris"},
+                    {"op": "copy", "from": "/cart/items/0", "path": "/cart/items/1"},
+                    {"op": "replace", "path": "/tags/0", "value": "z"},
+                ],
+                "revalidated": ["$.cart.items", "$.tags[0]"],
+            },
+            {
+                "name": "Bad replacement",
+                "patch": [{"op": "replace", "path": "/cart/items/3/qty", "value": 0}],
+                "revalidated": None,
+            },
+            {
+                "name": "Bad removal",
+                "patch": [{"op": "remove", "path": "/tags/1"}],
+                "revalidated": None,
+            },
+        ]
+        for test_case in test_cases:
+            name, patch, want = test_case["name"], test_case["patch"], test_case["revalidated"]
+            state = validate(spec, self._document())
+            self.assertTrue(state, msg="(%s) Expected a good match" % name)
+            new_state = revalidate(state, patch)
+            self.assertEqual(
+                new_state.result,
+                jspec.check(spec, new_state.document),
+                msg="(%s) Unexpected result" % name,
+            )
+            self.assertEqual(
+                new_state.revalidated,
+                want,
+                msg="(%s) Unexpected locations revalidated" % name,
+            )
+
+    def test_revalidate_bad_state(self):
+        """Test that a bad match is always checked in full."""
+        spec = jspec.loads(self.DOCUMENT)
+        document = self._document()
+        document["name"] = 1
+        state = revalidate(validate(spec, document), [{"op": "replace", "path": "/name", "value": "Bob"}])
+        self.assertEqual(state.result, (True, ""))
+        self.assertEqual(state.revalidated, None)
+
+    def test_apply_patch(self):
+        """Test applying JSON patches."""
+        document = {"a": [1, 2, 3], "b": {"c": "d"}}
+        document, _ = apply_patch(document, [
+            {"op": "remove", "path": "/a/0"},
+            {"op": "move", "from": "/b/c", "path": "/a/1"},
+            {"op": "replace", "path": "/b", "value": {"e~f/g": True}},
+            {"op": "test", "path": "/b/e~0f~1g", "value": True},
+        ])
+        self.assertEqual(document, {"a": [2, "d", 3], "b": {"e~f/g": True}})
+        document, touched = apply_patch(document, [{"op": "replace", "path": "", "value": 1}])
+        self.assertEqual(document, 1)
+        self.assertEqual(touched, [[]])
+
+    def test_apply_patch_errors(self):
+        """Test that a patch which fails is not applied at all."""
+        test_cases = [
+            {
+                "name": "Missing location",
+                "patch": [{"op": "add", "path": "/a/-", "value": 4}, {"op": "remove", "path": "/x"}],
+                "errmsg": "Operation 1 - location '/x' does not exist",
+            },
+            {
+                "name": "Failed test",
+                "patch": [{"op": "remove", "path": "/b"}, {"op": "test", "path": "/a/0", "value": True}],
+                "errmsg": "Operation 1 - test failed at '/a/0'",
+            },
+            {
+                "name": "Move into child",
+                "patch": [{"op": "move", "from": "/b", "path": "/b/c/d"}],
+                "errmsg": "Operation 0 - can not move a location into one of its children",
+            },
+            {
+                "name": "Unknown operation",
+                "patch": [{"op": "swap", "path": "/a"}],
+                "errmsg": "Operation 0 - unknown operation 'swap'",
+            },
+            {
+                "name": "Invalid pointer",
+                "patch": [{"op": "remove", "path": "a"}],
+                "errmsg": "Operation 0 - JSON pointer 'a' does not start with '/'",
+            },
+        ]
+        for test_case in test_cases:
+            name, patch, errmsg = test_case["name"], test_case["patch"], test_case["errmsg"]
+            document = {"a": [1, 2, 3], "b": {"c": "d"}}
+            original = copy.deepcopy(document)
+            exc = None
+            try:
+                apply_patch(document, patch)
+            except JSONPatchError as err:
+                exc = err
+            self.assertEqual(str(exc), errmsg, msg="(%s) Unexpected error" % name)
+            self.assertEqual(document, original, msg="(%s) Patch was partially applied" % name)
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestInstrument(unittest.TestCase):
+    """Class for testing the instrumentation hooks of the matcher.
+    """
+
+    pass
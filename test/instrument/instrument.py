@@ -0,0 +1,147 @@
+import unittest
+import jspec
+from jspec import instrument, matcher, tiered
+from jspec.limits import JSPECLimitError, Limits
+
+class Recorder(instrument.Hooks):
+    """Hooks recording the calls made to them."""
+
+    def __init__(self):
+        self.calls = list()
+        self.durations = list()
+
+    def enter(self, term, loc, element):
+        self.calls.append(("enter", term.__class__.__name__, loc, element))
+
+    def exit(self, term, loc, element, result, duration):
+        self.durations.append(duration)
+        outcome = None if result is None else bool(result)
+        self.calls.append(("exit", term.__class__.__name__, loc, outcome))
+
+class JSPECTestInstrument(unittest.TestCase):
+    """Class for testing the instrumentation hooks of the matcher.
+    """
+
+    def tearDown(self):
+        instrument.uninstall()
+
+    def test_hooks(self):
+        """Test the hooks are called before and after each JSPEC term is
+        matched."""
+        test_cases = [
+            ('int', 1, [
+                ("enter", "JSPECIntPlaceholder", "$", 1),
+                ("exit", "JSPECIntPlaceholder", "$", True),
+            ]),
+            ('{"a": (1 | 2)}', {"a": 2}, [
+                ("enter", "JSPECObject", "$", {"a": 2}),
+                ("enter", "JSPECConditional", "$.a", 2),
+                ("enter", "JSPECInt", "$.a", 2),
+                ("exit", "JSPECInt", "$.a", False),
+                ("enter", "JSPECInt", "$.a", 2),
+                ("exit", "JSPECInt", "$.a", True),
+                ("exit", "JSPECConditional", "$.a", True),
+                ("exit", "JSPECObject", "$", True),
+            ]),
+            ('["a", !null]', ["a", None], [
+                ("enter", "JSPECArray", "$", ["a", None]),
+                ("enter", "JSPECString", "$[0]", "a"),
+                ("exit", "JSPECString", "$[0]", True),
+                ("enter", "JSPECNegation", "$[1]", None),
+                ("enter", "JSPECNull", "$[1]", None),
+                ("exit", "JSPECNull", "$[1]", True),
+                ("exit", "JSPECNegation", "$[1]", False),
+                ("exit", "JSPECArray", "$", False),
+            ]),
+        ]
+        for document, element, want in test_cases:
+            hooks = Recorder()
+            spec = jspec.loads(document)
+            self.assertEqual(matcher.match(spec, element, hooks=hooks), matcher.match(spec, element))
+            self.assertEqual(hooks.calls, want, msg=document)
+            self.assertTrue(all(duration >= 0 for duration in hooks.durations))
+
+    def test_limit(self):
+        """Test the hooks are called with no result for a match which raises
+        an error."""
+        hooks = Recorder()
+        with self.assertRaises(JSPECLimitError):
+            matcher.match(jspec.loads('[int, int]'), [1, 2], limits=Limits(max_steps=2), hooks=hooks)
+        self.assertEqual(hooks.calls[-1], ("exit", "JSPECArray", "$", None))
+
+    def test_disabled(self):
+        """Test a match without hooks uses the dispatch table of the
+        matcher."""
+        self.assertIs(matcher.Context().dispatch, matcher._DISPATCH)
+        ctx = matcher.Context(hooks=instrument.Hooks())
+        self.assertIsNot(ctx.dispatch, matcher._DISPATCH)
+        instrument.install(instrument.Hooks())
+        self.assertIsNot(matcher.Context().dispatch, matcher._DISPATCH)
+        instrument.uninstall()
+        self.assertIs(matcher.Context().dispatch, matcher._DISPATCH)
+
+    def test_validator(self):
+        """Test the hooks of a validator are called for each of its
+        checks."""
+        spec = jspec.loads('{"a": @a int, "b": [string]}')
+        element = {"a": 1, "b": ["x"]}
+        hooks = Recorder()
+        validator = jspec.compile(spec, hooks=hooks)
+        test_cases = [
+            (lambda: validator.check(element), 10),
+            (lambda: validator.extract(element), 10),
+            (lambda: validator.check_paths(element, ["$.b"]), 4),
+            (lambda: validator.check_all({"a": 1, "b": [1]}), 18),
+        ]
+        for check, calls in test_cases:
+            hooks.calls = list()
+            check()
+            self.assertEqual(len(hooks.calls), calls)
+        hooks.calls = list()
+        jspec.compile(spec).check(element)
+        self.assertEqual(hooks.calls, [])
+
+    def test_install(self):
+        """Test hooks installed globally are called for every match, in either
+        tier, unless a match is given its own hooks."""
+        spec = jspec.loads('[int, (1 | 2)]')
+        tiered.force(spec, tiered.COMPILED)
+        hooks, own = Recorder(), Recorder()
+        instrument.install(hooks)
+        self.assertIs(instrument.installed(), hooks)
+        self.assertEqual(jspec.check(spec, [1, 2]), (True, ""))
+        self.assertEqual(len(hooks.calls), 8)
+        matcher.match(spec, [1, 2], hooks=own)
+        self.assertEqual((len(hooks.calls), len(own.calls)), (8, 8))
+        instrument.uninstall()
+        self.assertIsNone(instrument.installed())
+        jspec.check(spec, [1, 2])
+        self.assertEqual(len(hooks.calls), 8)
+        with self.assertRaises(TypeError):
+            instrument.install(object())
+
+    def test_profile(self):
+        """Test a profile counts the matches of each key."""
+        spec = jspec.loads('[(int | string)x?-?, (null | 0)]')
+        profile = instrument.Profile()
+        validator = jspec.compile(spec, hooks=profile)
+        validator.check([1, "a", None])
+        validator.check([1, 0])
+        calls = dict((key, stats[:2]) for key, stats in profile.stats.items())
+        self.assertEqual(calls, {
+            "JSPECArray": [2, 0],
+            "JSPECInt": [3, 2],
+            "JSPECIntPlaceholder": [3, 1],
+            "JSPECNull": [3, 2],
+            "JSPECStringPlaceholder": [3, 2],
+        })
+        for _, _, total, own in profile.stats.values():
+            self.assertLessEqual(own, total + 1e-9)
+        lines = profile.report().splitlines()
+        self.assertEqual(lines[0], "key\tcalls\tfailures\ttotal\tself")
+        self.assertEqual(sorted(line.split("\t")[0] for line in lines[1:]), sorted(calls))
+        profile.clear()
+        self.assertEqual(profile.stats, {})
+        profile = instrument.Profile(key=lambda term, loc: loc)
+        matcher.match(jspec.loads('{"a": [int]}'), {"a": [1]}, hooks=profile)
+        self.assertEqual(sorted(profile.stats), ["$", "$.a", "$.a[0]"])
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestLimits(unittest.TestCase):
+    """Class for testing the function in the ``jspec.limits`` module.
+    """
+
+    pass
@@ -0,0 +1,72 @@
+import unittest
+import jspec
+
+from jspec.limits import Limits, JSPECLimitError
+
+class JSPECTestLimits(unittest.TestCase):
+    """Class for testing the ``Limits`` class in the ``jspec.limits`` module.
+    """
+
+    def _limit_error(self, spec, element, limits):
+        """Returns the ``JSPECLimitError`` raised when checking ``element``
+        against ``spec`` with ``limits``."""
+        with self.assertRaises(JSPECLimitError) as ctx:
+            jspec.check(jspec.loads(spec), element, limits=limits)
+        return ctx.exception
+
+    def test_within_limits(self):
+        """Test that checks within the limits have the same result as
+        unlimited checks."""
+        limits = Limits(max_steps=100, timeout=10, max_depth=3, max_container_size=5, max_string_length=5)
+        spec = jspec.loads('{"a": [(int | [int, ...])x?], "b": string}')
+        self.assertEqual(jspec.check(spec, {"a": [1, [2, 3]], "b": "abc"}, limits=limits), (True, ""))
+        self.assertEqual(
+            jspec.check(spec, {"a": [1, [2, "3"]], "b": "abc"}, limits=limits),
+            jspec.check(spec, {"a": [1, [2, "3"]], "b": "abc"}),
+        )
+
+    def test_max_steps(self):
+        """Test that the number of steps is limited, including the steps
+        taken whilst backtracking."""
+        err = self._limit_error("[(int)x?, (number)x?, (int | real)x?, 0]", list(range(1, 30)), Limits(max_steps=50))
+        self.assertEqual(err.limit, "max_steps")
+        self.assertTrue(str(err).endswith("exceeded the maximum of 50 steps"))
+
+    def test_timeout(self):
+        """Test that the time taken is limited, using a fake clock."""
+        now = [0.0]
+
+        def clock():
+            now[0] += 0.2
+            return now[0]
+
+        err = self._limit_error("[int, ...]", list(range(300)), Limits(timeout=0.5, clock=clock))
+        self.assertEqual(err.limit, "timeout")
+        self.assertTrue(str(err).endswith("exceeded the timeout of 0.5 seconds"))
+
+    def test_json_limits(self):
+        """Test that the depth, container sizes and string lengths of the
+        JSON elements visited are limited."""
+        err = self._limit_error("[[[*]]]", [[[1]]], Limits(max_depth=2))
+        self.assertEqual(str(err), "At location $[0][0] - exceeded the maximum depth of 2")
+        err = self._limit_error('({"a": *} | {"b": *})', {"b": [1, 2, 3]}, Limits(max_depth=1, max_container_size=2))
+        self.assertEqual(str(err), "At location $.b - exceeded the maximum depth of 1")
+        err = self._limit_error('{"a": array}', {"a": [1, 2, 3]}, Limits(max_container_size=2))
+        self.assertEqual(str(err), "At location $.a - exceeded the maximum container size of 2, got 3")
+        err = self._limit_error('{"a": string}', {"a": "abcdef"}, Limits(max_string_length=5))
+        self.assertEqual(err.limit, "max_string_length")
+        self.assertEqual(err.loc, "$.a")
+
+    def test_validator_limits(self):
+        """Test that a validator applies its limits to every check, and does
+        not cache a result for a check which exceeds them."""
+        validator = jspec.compile(
+            jspec.loads("[int, ...]"),
+            payload_cache=jspec.cache.PayloadCache(),
+            limits=Limits(max_steps=10),
+        )
+        self.assertEqual(validator.check_json("[1, 2, 3]"), (True, ""))
+        for _ in range(2):
+            with self.assertRaises(JSPECLimitError):
+                validator.check_json("[%s]" % ", ".join(["1"] * 20))
+        self.assertEqual(len(validator.payload_cache), 1)
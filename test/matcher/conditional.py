@@ -2,6 +2,8 @@
 ``JSPECTestMatcherConditional``.
 """
 
+import jspec
+from jspec import matcher
 from test.matcher import JSPECTestMatcher
 
 class JSPECTestMatcherConditional(JSPECTestMatcher):
@@ -83,6 +85,16 @@ class JSPECTestMatcherConditional(JSPECTestMatcher):
                 "doc": '(((int < 7 & (int < 1 |int > 3))))',
                 "obj": 4,
             },
+            {
+                "name": "Discriminated union",
+                "doc": '({"type": "click", "x": int} | {"type": "view", "page": string} | {"type": "view", "id": int})',
+                "obj": {"type": "view", "id": 3},
+            },
+            {
+                "name": "Discriminated union of named objects",
+                "doc": '(@click {"type": "click", ...} | {"type": "view", ...})',
+                "obj": {"type": "click", "x": 1},
+            },
         ]
         self._good_match(test_cases)
 
@@ -110,5 +122,67 @@ class JSPECTestMatcherConditional(JSPECTestMatcher):
                 "obj": ["a", 1, 1.1],
                 "want": "At location $ - conditional elements (string | int | (1.1 | 2.2 | 3.3)) do not match the element '['a', 1, 1.1]'"
             },
+            {
+                "name": "Discriminated union wrong",
+                "doc": '({"type": "click", "x": int} | {"type": "view", "url": string})',
+                "obj": {"type": "click", "url": "a"},
+                "want": "At location $ - conditional elements ({\"type\": \"click\", \"x\": int} | {\"type\": \"view\", \"url\": string}) do not match the element '{'type': 'click', 'url': 'a'}'",
+            },
+            {
+                "name": "Discriminated union unknown discriminator",
+                "doc": '({"type": "click"} | {"type": "view"})',
+                "obj": {"type": "scroll"},
+                "want": "At location $ - conditional elements ({\"type\": \"click\"} | {\"type\": \"view\"}) do not match the element '{'type': 'scroll'}'",
+            },
+            {
+                "name": "Discriminated union missing discriminator",
+                "doc": '({"type": "click"} | {"type": "view"})',
+                "obj": {"kind": "click"},
+                "want": "At location $ - conditional elements ({\"type\": \"click\"} | {\"type\": \"view\"}) do not match the element '{'kind': 'click'}'",
+            },
+            {
+                "name": "Discriminated union not an object",
+                "doc": '({"type": "click"} | {"type": "view"})',
+                "obj": ["click"],
+                "want": "At location $ - conditional elements ({\"type\": \"click\"} | {\"type\": \"view\"}) do not match the element '['click']'",
+            },
+        ]
+        self._bad_match(test_cases)
+
+    def test_matcher_conditional_discriminated_union(self):
+        """Test that only conditionals of JSPEC objects sharing a literal key
+        with literal JSPEC string values are discriminated unions."""
+        test_cases = [
+            {
+                "name": "Shared literal key",
+                "doc": '({"type": "click", "kind": "a"} | {"type": "view", "kind": "b.*"})',
+                "want": ("type", ["click", "view"]),
+            },
+            {
+                "name": "First shared literal key",
+                "doc": '({"type": "click", "kind": "a"} | {"kind": "b", "type": "view"})',
+                "want": ("kind", ["a", "b"]),
+            },
+            {
+                "name": "Regex value",
+                "doc": '({"type": "click"} | {"type": "v.*"})',
+                "want": None,
+            },
+            {
+                "name": "Not only OR",
+                "doc": '({"type": "click", ...} & {"type": "view", ...})',
+                "want": None,
+            },
+            {
+                "name": "Not only objects",
+                "doc": '({"type": "click"} | null)',
+                "want": None,
+            },
         ]
-        self._bad_match(test_cases)
\ No newline at end of file
+        for test_case in test_cases:
+            name, doc, want = test_case["name"], test_case["doc"], test_case["want"]
+            conditional = jspec.loads(doc).base
+            union = matcher.discriminated_union(conditional)
+            got = (union[0], sorted(union[1])) if union else None
+            self.assertEqual(want, got, msg="(%s) Unexpected discriminator" % name)
+            self.assertIs(union, matcher.discriminated_union(conditional))
\ No newline at end of file
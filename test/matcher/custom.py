@@ -0,0 +1,89 @@
+"""JSPEC Testing Module for matching JSPEC documents for
+``JSPECTestMatcherCustom``.
+"""
+
+import jspec
+from test.matcher import JSPECTestMatcher
+
+def is_even(element):
+    return isinstance(element, int) and not isinstance(element, bool) and element % 2 == 0
+
+class JSPECTestMatcherCustom(JSPECTestMatcher):
+    """Class for testing the behaviour when using the ``match`` method for
+    custom placeholders.
+
+    A JSPEC custom placeholder will match any JSON element which satisfies the
+    predicate registered for it.
+    """
+
+    def setUp(self):
+        jspec.placeholder.register("even", is_even, "an even int")
+
+    def tearDown(self):
+        jspec.placeholder.unregister("even")
+
+    def test_matcher_custom_good(self):
+        """Test examples of good matches.
+        The ``match`` method should return a matching ``JSPEC`` with a
+        ``JSPECCustomPlaceholder`` as its element.
+        """
+        test_cases = [
+            {
+                "name": "Custom placeholder",
+                "doc": "even",
+                "obj": 4,
+            },
+            {
+                "name": "Custom placeholder in array",
+                "doc": "[even, ...]",
+                "obj": [0, 2, -8],
+            },
+            {
+                "name": "Custom placeholder in conditional",
+                "doc": "(even | null)",
+                "obj": None,
+            },
+        ]
+        self._good_match(test_cases)
+
+    def test_matcher_custom_bad(self):
+        """Test examples of bad matches.
+        The ``match`` method should not return a matching ``JSPEC`` with the
+        specified ``JSPECCustomPlaceholder`` as its element.
+        """
+        test_cases = [
+            {
+                "name": "Odd int",
+                "doc": "even",
+                "obj": 3,
+                "want": "At location $ - expected an even int",
+            },
+            {
+                "name": "Not an int",
+                "doc": '{"a": even}',
+                "obj": {"a": "2"},
+                "want": "At location $.a - expected an even int",
+            },
+        ]
+        self._bad_match(test_cases)
+
+    def test_matcher_custom_registry(self):
+        """Test that custom placeholders serialize as their keyword, that
+        keywords can only be registered once, and that matching functions are
+        found for subclasses of registered JSPEC term classes.
+        """
+        spec = jspec.loads('{"a": even}')
+        self.assertEqual(str(spec), '{"a": even}')
+        self.assertEqual(jspec.loads(str(spec)), spec)
+        with self.assertRaises(ValueError):
+            jspec.placeholder.register("even", is_even)
+        with self.assertRaises(ValueError):
+            jspec.placeholder.register("int", is_even)
+        with self.assertRaises(ValueError):
+            jspec.placeholder.register("not valid", is_even)
+
+        class JSPECPositiveInt(jspec.entity.JSPECInt):
+            pass
+
+        self.assertIs(jspec.matcher.matcher_for(JSPECPositiveInt), jspec.matcher.match_int)
+        self.assertTrue(jspec.matcher.match(jspec.entity.JSPEC(JSPECPositiveInt("3")), 3)[0])
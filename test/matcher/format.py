@@ -0,0 +1,162 @@
+"""JSPEC Testing Module for matching JSPEC documents for
+``JSPECTestMatcherFormat``.
+"""
+
+import re
+
+import jspec
+from test.matcher import JSPECTestMatcher
+
+class JSPECTestMatcherFormat(JSPECTestMatcher):
+    """Class for testing the behaviour when using the ``match`` method for
+    format placeholders.
+
+    A JSPEC format placeholder will match a JSON string in that format.
+    """
+
+    def test_matcher_format_good(self):
+        """Test examples of good matches.
+        The ``match`` method should return a matching ``JSPEC`` with a format
+        placeholder as its element.
+        """
+        test_cases = [
+            {
+                "name": "UUID",
+                "doc": "uuid",
+                "obj": "123e4567-e89b-12d3-A456-426614174000",
+            },
+            {
+                "name": "Date",
+                "doc": "date",
+                "obj": "2000-02-29",
+            },
+            {
+                "name": "Date-time in UTC",
+                "doc": "date-time",
+                "obj": "2021-12-31T23:59:60Z",
+            },
+            {
+                "name": "Date-time with fraction and offset",
+                "doc": "date-time",
+                "obj": "2021-06-01t08:30:00.123456-05:30",
+            },
+            {
+                "name": "IPv4 address",
+                "doc": "ipv4",
+                "obj": "255.0.10.1",
+            },
+            {
+                "name": "IPv6 address",
+                "doc": "ipv6",
+                "obj": "2001:db8::ff00:42:8329",
+            },
+            {
+                "name": "Email address",
+                "doc": "email",
+                "obj": "first.last+tag@mail.example.com",
+            },
+            {
+                "name": "Format placeholders in a conditional",
+                "doc": "(ipv4 | ipv6)",
+                "obj": "::1",
+            },
+        ]
+        self._good_match(test_cases)
+
+    def test_matcher_format_bad(self):
+        """Test examples of bad matches.
+        The ``match`` method should not return a matching ``JSPEC`` with the
+        specified format placeholder as its element.
+        """
+        test_cases = [
+            {
+                "name": "UUID with a missing hyphen",
+                "doc": "uuid",
+                "obj": "123e4567e-89b-12d3-a456-426614174000",
+                "want": "At location $ - expected a UUID",
+            },
+            {
+                "name": "UUID which is not a string",
+                "doc": "uuid",
+                "obj": 123,
+                "want": "At location $ - expected a UUID",
+            },
+            {
+                "name": "Date on the 29th February of a non-leap year",
+                "doc": "date",
+                "obj": "1900-02-29",
+                "want": "At location $ - expected an RFC 3339 date",
+            },
+            {
+                "name": "Date-time without an offset",
+                "doc": "date-time",
+                "obj": "2021-12-31T23:59:59",
+                "want": "At location $ - expected an RFC 3339 date-time",
+            },
+            {
+                "name": "Date-time with an invalid hour",
+                "doc": '{"at": date-time}',
+                "obj": {"at": "2021-12-31T24:00:00Z"},
+                "want": "At location $.at - expected an RFC 3339 date-time",
+            },
+            {
+                "name": "IPv4 address with a leading zero",
+                "doc": "ipv4",
+                "obj": "192.168.01.1",
+                "want": "At location $ - expected an IPv4 address",
+            },
+            {
+                "name": "IPv6 address with a scope",
+                "doc": "ipv6",
+                "obj": "fe80::1%eth0",
+                "want": "At location $ - expected an IPv6 address",
+            },
+            {
+                "name": "Email address without a domain",
+                "doc": "email",
+                "obj": "someone@localhost",
+                "want": "At location $ - expected an email address",
+            },
+        ]
+        self._bad_match(test_cases)
+
+    def test_matcher_format_serialization(self):
+        """Test that format placeholders are serialized as their keyword, and
+        can not be unregistered.
+        """
+        doc = '{"at": date-time, "id": uuid, "ip": (ipv4 | ipv6)}'
+        spec = jspec.loads(doc)
+        self.assertEqual(str(spec), doc)
+        self.assertEqual(jspec.loads(str(spec)), spec)
+        with self.assertRaises(ValueError):
+            jspec.placeholder.unregister("uuid")
+
+    def test_matcher_format_regex_equivalent(self):
+        """Test that the UUID and IPv4 placeholders agree with the regex they
+        replace.
+        """
+        regexes = {
+            "uuid": r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
+            "ipv4": r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)",
+        }
+        strings = [
+            "123e4567-e89b-12d3-a456-426614174000",
+            "123e4567-e89b-12d3-a456-42661417400g",
+            "123e4567-e89b-12d3-a456-4266141740000",
+            "123e4567-e89b-12d3--456-426614174000",
+            "0.0.0.0",
+            "255.255.255.255",
+            "256.1.1.1",
+            "1.2.3",
+            "01.2.3.4",
+            "1.2.3.4.",
+            "",
+        ]
+        for name, regex in regexes.items():
+            spec = jspec.loads(name)
+            for string in strings:
+                self.assertEqual(
+                    jspec.check(spec, string)[0],
+                    re.fullmatch(regex, string) is not None,
+                    msg="(%s) Disagrees with regex for '%s'" % (name, string),
+                )
@@ -2,8 +2,12 @@
 ``JSPECTestMatcherMacro``.
 """
 
+import datetime
 import os
 
+import jspec
+import jspec.cache
+
 from test.matcher import JSPECTestMatcher
 
 os.environ["TEST_OBJECT"] = '{"hello": "world"}'
@@ -91,4 +95,78 @@ class JSPECTestMatcherMacro(JSPECTestMatcher):
                 "want": "At location $ - JSPEC macro '<TEST_OBJECT>' failed to match '{\"goodbye\": \"world\"}'",
             },
         ]
-        self._bad_match(test_cases)
\ No newline at end of file
+        self._bad_match(test_cases)
+    def test_matcher_macro_sources(self):
+        """Test that JSPEC macros can be resolved from a dict or a function
+        instead of the environment variables, with the same reasons returned
+        for missing macros and bad matches.
+        """
+        spec = jspec.scanner.scan('{"a": <LIMIT>, "b": <NAMES>}')
+        values = {"LIMIT": 3, "NAMES": ["x", "y"]}
+        for macros in [values, values.__getitem__]:
+            result, _ = jspec.matcher.match(spec, {"a": 3, "b": ["x", "y"]}, macros=macros)
+            self.assertTrue(result)
+            result, got = jspec.matcher.match(spec, {"a": 3, "b": ["x"]}, macros=macros)
+            self.assertFalse(result)
+            self.assertEqual(got, "At location $.b - JSPEC macro '<NAMES>' failed to match '[\"x\"]'")
+            result, got = jspec.matcher.match(spec, {"a": 3, "b": ["x", "y"]}, macros={"LIMIT": 3})
+            self.assertEqual(got, "At location $.b - failed to find the JSPEC macro '<NAMES>'")
+        with self.assertRaises(TypeError):
+            jspec.matcher.match(spec, {}, macros=["LIMIT"])
+
+    def test_matcher_macro_resolved_once(self):
+        """Test that each JSPEC macro is resolved at most once by a resolver,
+        and that a snapshot of the environment variables is not affected by
+        later changes to them.
+        """
+        calls = list()
+
+        def source(name):
+            calls.append(name)
+            return 1
+
+        spec = jspec.scanner.scan('[<ONE>, ...]')
+        result, _ = jspec.matcher.match(spec, [1] * 50, macros=source)
+        self.assertTrue(result)
+        self.assertEqual(calls, ["ONE"])
+
+        snapshot = jspec.macro.snapshot()
+        os.environ["TEST_INT"] = '789'
+        try:
+            self.assertTrue(jspec.matcher.match(jspec.scanner.scan("<TEST_INT>"), 456, macros=snapshot)[0])
+            self.assertTrue(jspec.matcher.match(jspec.scanner.scan("<TEST_INT>"), 789)[0])
+        finally:
+            os.environ["TEST_INT"] = '456'
+
+    def test_matcher_macro_validator(self):
+        """Test that a validator resolves JSPEC macros once, unless it is
+        invalidated or asked to resolve them for every check.
+        """
+        fixed = jspec.compile(jspec.scanner.scan("<TEST_INT>"))
+        per_check = jspec.compile(jspec.scanner.scan("<TEST_INT>"), macros_per_check=True)
+        self.assertTrue(fixed.check(456)[0])
+        os.environ["TEST_INT"] = '789'
+        try:
+            self.assertTrue(fixed.check(456)[0])
+            self.assertTrue(per_check.check(789)[0])
+            fixed.invalidate()
+            self.assertTrue(fixed.check(789)[0])
+        finally:
+            os.environ["TEST_INT"] = '456'
+
+    def test_matcher_macro_not_json(self):
+        """Test that a JSPEC macro from a dict or callable whose value is not a
+        JSON element is invalid, also when a validator checks a JSON string.
+        """
+        bad = "At location $.x - failed to parse the JSPEC macro '<ID>' as a JSON element"
+        spec = jspec.loads('{"x": <ID>}')
+        sources = [
+            {"ID": {1, 2}},
+            lambda name: datetime.datetime(2020, 1, 1),
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                validator = jspec.compile(spec, payload_cache=jspec.cache.PayloadCache(), macros=source)
+                self.assertEqual(validator.check_json('{"x": 1}'), (False, bad))
+                self.assertEqual(jspec.matcher.match(spec, {"x": 1}, macros=source), (False, bad))
+        self.assertTrue(jspec.matcher.match(spec, {"x": [1, 2]}, macros={"ID": (1, 2)})[0])
@@ -0,0 +1,82 @@
+"""JSPEC Testing Module for matching JSPEC documents for
+``JSPECTestMatcherMemo``.
+"""
+
+import jspec
+from test.matcher import JSPECTestMatcher
+
+class JSPECTestMatcherMemo(JSPECTestMatcher):
+    """Class for testing the behaviour when using the ``match`` method for
+    JSPECs which backtrack over the same JSON objects and arrays.
+
+    The results of matching JSON objects and arrays are memoized for a single
+    call to ``match``, which should not change the outcome of the match.
+    """
+
+    def test_matcher_memo_good(self):
+        """Test examples of good matches.
+        The ``match`` method should return a matching ``JSPEC`` when the
+        same JSON elements are matched multiple times whilst backtracking.
+        """
+        test_cases = [
+            {
+                "name": "Backtracking array captures",
+                "doc": '[({"a": [int, ...]})x?, ({"a": [int, ...]} | null)x?, "end"]',
+                "obj": [{"a": [1, 2]}, {"a": [3]}, None, {"a": [4]}, "end"],
+            },
+            {
+                "name": "Backtracking object pairs",
+                "doc": '{"x": {"a": [int, ...]}, "y": {"a": [int, ...]}, ("z.*": [...])x?}',
+                "obj": {"x": {"a": [1]}, "y": {"a": [2]}, "z1": [], "z2": [1]},
+            },
+            {
+                "name": "Same JSON element at different locations",
+                "doc": '[{"a": 1}, ({"a": 1})x2]',
+                "obj": [{"a": 1}] * 3,
+            },
+        ]
+        self._good_match(test_cases)
+
+    def test_matcher_memo_bad(self):
+        """Test examples of bad matches.
+        The ``match`` method should return the same reason when the same JSON
+        elements are matched multiple times whilst backtracking.
+        """
+        test_cases = [
+            {
+                "name": "Backtracking array captures",
+                "doc": '[({"a": [int, ...]})x?, ({"a": [int, ...]} | null)x?, "end"]',
+                "obj": [{"a": [1, 2]}, {"a": [3]}, None, {"a": [4]}, "nope"],
+                "want": "At location $[4] - regex pattern 'end' failed to match '\"nope\"'",
+            },
+            {
+                "name": "Same JSON element at different locations",
+                "doc": '[{"a": 1}, {"a": 1}, {"a": 2}]',
+                "obj": [{"a": 1}] * 3,
+                "want": "At location $[2].a - expected '2', got '1'",
+            },
+        ]
+        self._bad_match(test_cases)
+
+    def test_matcher_memo_once_per_term(self):
+        """Test that a JSON object inside an array capture is matched at most
+        once against each JSPEC term, however much the array backtracks.
+        """
+        calls = dict()
+        match_term = jspec.matcher.match_term
+
+        def counting_match_term(loc, term, element, ctx):
+            if isinstance(element, dict):
+                key = (id(term), id(element))
+                calls[key] = calls.get(key, 0) + 1
+            return match_term(loc, term, element, ctx)
+
+        spec = jspec.scanner.scan('[({"a": [int, ...]})x?, ({"a": [int, ...]} | null)x?, "end"]')
+        obj = [{"a": list(range(20))} for _ in range(8)] + ["nope"]
+        jspec.matcher.match_term = counting_match_term
+        try:
+            result, _ = jspec.matcher.match(spec, obj)
+        finally:
+            jspec.matcher.match_term = match_term
+        self.assertFalse(result)
+        self.assertEqual(max(calls.values()), 1)
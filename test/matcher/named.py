@@ -0,0 +1,101 @@
+"""JSPEC Testing Module for matching JSPEC documents for
+``JSPECTestMatcherNamed``.
+"""
+
+import jspec
+from test.matcher import JSPECTestMatcher
+
+class JSPECTestMatcherNamed(JSPECTestMatcher):
+    """Class for testing the behaviour when using the ``match`` and
+    ``extract`` methods for named terms.
+
+    A JSPEC named term will match a JSON element that matches its JSPEC term,
+    and bind the JSON element to its name.
+    """
+
+    def test_matcher_named_good(self):
+        """Test examples of good matches.
+        The ``match`` method should return a matching ``JSPEC`` with a
+        ``JSPECNamedTerm`` as its element.
+        """
+        test_cases = [
+            {
+                "name": "Named int",
+                "doc": "@id int",
+                "obj": 1,
+            },
+            {
+                "name": "Named object values",
+                "doc": '{"id": @id int, "tags": @tags [string, ...]}',
+                "obj": {"id": 1, "tags": ["a", "b"]},
+            },
+        ]
+        self._good_match(test_cases)
+
+    def test_matcher_named_bad(self):
+        """Test examples of bad matches.
+        The ``match`` method should return the reason of the named JSPEC term.
+        """
+        test_cases = [
+            {
+                "name": "Named int",
+                "doc": '{"id": @id int}',
+                "obj": {"id": "1"},
+                "want": "At location $.id - expected an int",
+            },
+        ]
+        self._bad_match(test_cases)
+
+    def test_matcher_named_extract(self):
+        """Test that ``extract`` returns the JSON elements bound by the named
+        terms of the match, discarding bindings from failed and abandoned
+        matches.
+        """
+        test_cases = [
+            {
+                "name": "Object values",
+                "doc": '{"id": @id int, "items": @items [...], "total": @total number, ...}',
+                "obj": {"id": 7, "items": [1, 2], "total": 3.5, "note": ""},
+                "want": {"id": 7, "items": [1, 2], "total": 3.5},
+            },
+            {
+                "name": "Conditional",
+                "doc": '(@name string | @number int)',
+                "obj": 4,
+                "want": {"number": 4},
+            },
+            {
+                "name": "Negation",
+                "doc": '[!@neg string, @pos string]',
+                "obj": [1, "a"],
+                "want": {"pos": "a"},
+            },
+            {
+                "name": "Backtracking array captures",
+                "doc": '[(@first int)x?, (@second int)x1, "end"]',
+                "obj": [1, 2, 3, "end"],
+                "want": {"first": 2, "second": 3},
+            },
+            {
+                "name": "Backtracking object captures",
+                "doc": '{("a.*": @a int)x?, ("ab": @b int)x1}',
+                "obj": {"ab": 1, "ac": 2},
+                "want": {"a": 2, "b": 1},
+            },
+            {
+                "name": "Memoized array elements",
+                "doc": '[({"id": @id int})x?, ({"id": @id int} | null)x?, "end"]',
+                "obj": [{"id": 1}, None, {"id": 2}, "end"],
+                "want": {"id": 2},
+            },
+        ]
+        for test_case in test_cases:
+            name, doc, obj, want = test_case["name"], test_case["doc"], test_case["obj"], test_case["want"]
+            result, reason, got = jspec.extract(jspec.loads(doc), obj)
+            self.assertTrue(result, msg="(%s) Unexpected bad match: %s" % (name, reason))
+            self.assertEqual(want, got, msg="(%s) Unexpected bindings" % name)
+
+        result, reason, got = jspec.extract(jspec.loads('{"id": @id int, "n": int}'), {"id": 1, "n": "2"})
+        self.assertEqual((result, reason, got), (False, "At location $.n - expected an int", {}))
+        validator = jspec.compile(jspec.loads('[@first *, ...]'))
+        self.assertEqual(validator.extract([3, 4]), (True, "", {"first": 3}))
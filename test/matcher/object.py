@@ -89,5 +89,17 @@ class JSPECTestMatcherObject(JSPECTestMatcher):
                 "obj": {"a": 1, "b": 2},
                 "want": "At location $ - exhausted JSON object, failed to match the following JSPEC pairs: [\"c\": 3]",
             },
+            {
+                "name": "Missing key with ellipsis",
+                "doc": '{"a": int, "b": int, ...}',
+                "obj": {"a": 1, "x": 2, "y": 3},
+                "want": "At location $ - exhausted JSON object, failed to match the following JSPEC pairs: [\"b\": int, ...]",
+            },
+            {
+                "name": "Incorrect value with ellipsis",
+                "doc": '{"a": int, ("x[0-9]": int)x2, ...}',
+                "obj": {"a": "1", "x1": 2, "x2": 3, "y": 4},
+                "want": "At location $ - exhausted JSON object, failed to match the following JSPEC pairs: [\"a\": int, (\"x[0-9]\": int)x2, ...]",
+            },
         ]
         self._bad_match(test_cases)
\ No newline at end of file
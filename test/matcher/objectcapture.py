@@ -223,6 +223,24 @@ class JSPECTestMatcherObjectCapture(JSPECTestMatcher):
                 "obj": {"a1": "b", "a2": "b", "a3": "b"},
                 "want": "At location $ - failed to match the following JSON pairs: [\"a1\": \"b\", \"a2\": \"b\", \"a3\": \"b\"]",
             },
+            {
+                "name": "Basic object capture (6)",
+                "doc": '{("a\d+":"b")x?}',
+                "obj": dict([("a%d" % i, "b") for i in range(11)] + [("a11", "c")]),
+                "want": "At location $ - failed object capture, '\"a11\": \"c\"' failed to match '(\"a\\d+\": \"b\")x?'",
+            },
+            {
+                "name": "Basic object capture (7)",
+                "doc": '{("a\d+":"b")x?}',
+                "obj": {"a1": "b", "a2": "b", "a3": "c"},
+                "want": "At location $ - failed object capture, '\"a3\": \"c\"' failed to match '(\"a\\d+\": \"b\")x?'",
+            },
+            {
+                "name": "Basic object capture (8)",
+                "doc": '{("a\d+":"b")x1-3}',
+                "obj": {"a2": "c", "a1": "b"},
+                "want": "At location $ - failed object capture, '\"a2\": \"c\"' failed to match '(\"a\\d+\": \"b\")x1-3'",
+            },
             {
                 "name": "Object ellipsis (1)",
                 "doc": '{..., "c": "d"}',
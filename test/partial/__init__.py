@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestPartial(unittest.TestCase):
+    """Class for testing the function in the ``jspec.partial`` module.
+    """
+
+    pass
@@ -0,0 +1,97 @@
+import unittest
+import jspec
+
+DOCUMENT = '''{
+    "order": {
+        "id": int,
+        "items": [({"sku": string, "qty": int > 0})x?],
+        "note": @note string
+    },
+    "customer": {"name": string, "tags": [string, string]},
+    "weird key": bool,
+    ...
+}'''
+
+class JSPECTestPartial(unittest.TestCase):
+    """Class for testing the ``check_paths`` function and the
+    ``jspec.partial`` module.
+    """
+
+    def test_check_paths(self):
+        """Test that only the selected parts of the JSON are checked."""
+        obj = {
+            "order": {"id": "bad", "items": [{"sku": "a", "qty": 1}, {"sku": "b", "qty": 0}], "note": "n"},
+            "customer": {"name": "c", "tags": ["x", "y"]},
+            "weird key": True,
+        }
+        test_cases = [
+            {
+                "name": "Good object",
+                "paths": ["$.customer"],
+                "want": (True, ""),
+            },
+            {
+                "name": "Good array element",
+                "paths": ['$.customer.tags[1]', '$["weird key"]'],
+                "want": (True, ""),
+            },
+            {
+                "name": "Good through every array element",
+                "paths": ["$.order.items[*].sku"],
+                "want": (True, ""),
+            },
+            {
+                "name": "Good named term",
+                "paths": ["$.order.note"],
+                "want": (True, ""),
+            },
+            {
+                "name": "Bad object pair",
+                "paths": ["$.customer", "$.order.id"],
+                "want": (False, "At location $.order.id - expected an int"),
+            },
+            {
+                "name": "Bad through every array element",
+                "paths": ["$.order.items[*].qty"],
+                "want": (False, "At location $.order.items[1].qty - expected an int that is more than '0', got '0'"),
+            },
+            {
+                "name": "Selected pair is missing",
+                "paths": ["$.customer.name"],
+                "obj": {"customer": {}},
+                "want": (False, "At location $.customer - failed to find a JSON pair with the key 'name'"),
+            },
+            {
+                "name": "Selected element is missing",
+                "paths": ["$.customer.tags[1]"],
+                "obj": {"customer": {"tags": ["x"]}},
+                "want": (False, "At location $.customer.tags - exhausted JSON array, no JSON element at index 1"),
+            },
+            {
+                "name": "Selected parent is the wrong type",
+                "paths": ["$.order.items[*]"],
+                "obj": {"order": {"items": {}}},
+                "want": (False, "At location $.order.items - expected an array"),
+            },
+        ]
+        for test_case in test_cases:
+            name, paths, want = test_case["name"], test_case["paths"], test_case["want"]
+            spec = jspec.loads(DOCUMENT)
+            got = jspec.check_paths(spec, test_case.get("obj", obj), paths)
+            self.assertEqual(want, got, msg="(%s) Unexpected result" % name)
+            self.assertEqual(want, jspec.compile(spec).check_paths(test_case.get("obj", obj), paths), msg="(%s) Unexpected validator result" % name)
+
+    def test_check_paths_invalid(self):
+        """Test that selectors which are invalid, or are not bound to a JSPEC
+        term, raise a ValueError."""
+        spec = jspec.loads(DOCUMENT)
+        for selector in ["order", "$.", "$[x]", "$.order.*", "$.other", "$.order.items[0]", "$.customer.tags[2]", "$.customer.tags[*]"]:
+            with self.assertRaises(ValueError, msg="(%s) Expected a ValueError" % selector):
+                jspec.check_paths(spec, {}, [selector])
+
+    def test_selectors_cached(self):
+        """Test that each selector is resolved once for a JSPEC."""
+        spec = jspec.loads(DOCUMENT)
+        first = jspec.partial.select(spec, "$.order.items[*]")
+        self.assertIs(first, jspec.partial.select(spec, "$.order.items[*]"))
+        self.assertEqual(str(first[1]), '{"qty": int > 0, "sku": string}')
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestRegistry(unittest.TestCase):
+    """Class for testing the function in the ``jspec.registry`` module.
+    """
+
+    pass
@@ -0,0 +1,101 @@
+import unittest
+import jspec
+from jspec.registry import SpecRegistry
+
+SPECS = [
+    ("click", '{"type": "click", "x": int, "y": int, ...}'),
+    ("view", '{"type": "view", "page": string, ...}'),
+    ("view-or-leave", '({"type": "view", ...} | {"type": "leave", ...})'),
+    ("pair", '[int, (string)x?-2]'),
+    ("ints", '[(int)x?]'),
+    ("number", '(int | real)'),
+    ("anything", '*'),
+]
+
+class JSPECTestRegistry(unittest.TestCase):
+    """Class for testing the ``jspec.registry`` module.
+    """
+
+    def _registry(self):
+        reg = SpecRegistry()
+        for name, doc in SPECS:
+            reg.add(name, jspec.loads(doc))
+        return reg
+
+    def test_registry_match(self):
+        """Test that the registry finds every matching JSPEC, and only matches
+        the candidates which the index can not rule out."""
+        test_cases = [
+            {
+                "name": "Discriminated object",
+                "obj": {"type": "click", "x": 1, "y": 2},
+                "candidates": ["click", "anything"],
+                "want": ["click", "anything"],
+            },
+            {
+                "name": "Discriminated union",
+                "obj": {"type": "view", "page": "home"},
+                "candidates": ["view", "view-or-leave", "anything"],
+                "want": ["view", "view-or-leave", "anything"],
+            },
+            {
+                "name": "Missing required key",
+                "obj": {"type": "view"},
+                "candidates": ["view-or-leave", "anything"],
+                "want": ["view-or-leave", "anything"],
+            },
+            {
+                "name": "Unknown discriminator",
+                "obj": {"type": "scroll", "x": 1, "y": 2},
+                "candidates": ["anything"],
+                "want": ["anything"],
+            },
+            {
+                "name": "Array length bounds",
+                "obj": [1, "a", "b", "c"],
+                "candidates": ["ints", "anything"],
+                "want": ["anything"],
+            },
+            {
+                "name": "Array",
+                "obj": [1, "a"],
+                "candidates": ["pair", "ints", "anything"],
+                "want": ["pair", "anything"],
+            },
+            {
+                "name": "Type",
+                "obj": 1.5,
+                "candidates": ["number", "anything"],
+                "want": ["number", "anything"],
+            },
+        ]
+        reg = self._registry()
+        for test_case in test_cases:
+            name, obj = test_case["name"], test_case["obj"]
+            self.assertEqual(test_case["candidates"], reg.candidates(obj), msg="(%s) Unexpected candidates" % name)
+            self.assertEqual(test_case["want"], reg.match_all(obj), msg="(%s) Unexpected matches" % name)
+            self.assertEqual(test_case["want"][0], reg.match_first(obj), msg="(%s) Unexpected first match" % name)
+            want = [n for n, doc in SPECS if jspec.checks(doc, obj)[0]]
+            self.assertEqual(want, reg.match_all(obj), msg="(%s) Differs from checking every JSPEC" % name)
+
+    def test_registry_add_remove(self):
+        """Test that the index is updated as JSPECs are added and removed."""
+        reg = self._registry()
+        obj = {"type": "view", "page": "home"}
+        reg.remove("view")
+        reg.remove("anything")
+        self.assertEqual(reg.match_all(obj), ["view-or-leave"])
+        reg.remove("view-or-leave")
+        self.assertEqual(reg.candidates(obj), [])
+        self.assertIsNone(reg.match_first(obj))
+        reg.add("view", jspec.loads(SPECS[1][1]))
+        self.assertEqual(reg.match_all(obj), ["view"])
+        self.assertEqual(len(reg), 5)
+        self.assertIn("view", reg)
+        self.assertEqual(reg.names(), ["click", "pair", "ints", "number", "view"])
+        with self.assertRaises(ValueError):
+            reg.add("view", jspec.loads("object"))
+        with self.assertRaises(ValueError):
+            reg.remove("missing")
+        with self.assertRaises(TypeError):
+            reg.add("doc", "object")
@@ -0,0 +1,8 @@
+import unittest
+
+class JSPECTestScaling(unittest.TestCase):
+    """Class for testing the growth of the time of the scanner and the
+    matcher with the size of their input.
+    """
+
+    pass
@@ -0,0 +1,125 @@
+"""JSPEC Testing Module for the growth of the work of the scanner and the
+matcher with the size of the JSPEC documents and JSON documents, for
+``JSPECTestScaling``.
+"""
+
+import os
+import sys
+import unittest
+import subprocess
+import jspec
+from jspec import matcher
+from jspec.bench import cases, scaling
+from jspec.limits import Limits
+
+def steps(document, element):
+    """Returns the number of steps taken to match the JSON against the JSPEC
+    document."""
+    ctx = matcher.Context(limits=Limits(max_steps=10 ** 9))
+    matcher.match_element("$", jspec.loads(document).base, element, ctx)
+    return ctx.steps
+
+def events(func):
+    """Returns the number of events traced while calling ``func``, one for
+    each call, line and return of Python code, which counts the work of code
+    without a step counter, such as the scanner."""
+    count = [0]
+    def trace(frame, event, arg):
+        count[0] += 1
+        return trace
+    previous = sys.gettrace()
+    sys.settrace(trace)
+    try:
+        func()
+    finally:
+        sys.settrace(previous)
+    return count[0]
+
+def failing(element, key, value):
+    """Returns the JSON object with the value of ``key`` replaced."""
+    element[key] = value
+    return element
+
+class JSPECTestScaling(unittest.TestCase):
+    """Class for testing the ``jspec.bench.scaling`` module, and that the
+    time of the scanner and the matcher grows within the bound of each scaling
+    case.
+    """
+
+    def test_exponent(self):
+        """Test the growth exponent is fitted to the sizes and times."""
+        sizes = [1000, 2000, 4000, 8000]
+        test_cases = [
+            ([0.5] * 4, 0.0),
+            ([n * 1e-6 for n in sizes], 1.0),
+            ([n * n * 1e-9 for n in sizes], 2.0),
+            ([n * 1e-6 * (1.1 if i % 2 else 0.9) for i, n in enumerate(sizes)], 1.06),
+        ]
+        for times, exponent in test_cases:
+            self.assertAlmostEqual(scaling.exponent(sizes, times), exponent, places=2, msg="Unexpected exponent for %s" % times)
+        growth = scaling.Growth("case", sizes, [n * n * 1e-9 for n in sizes], scaling.LINEAR)
+        self.assertTrue(growth.exceeded())
+        self.assertAlmostEqual(growth.as_dict()["exponent"], 2.0)
+
+    def test_steps(self):
+        """Test the number of steps of the matcher grows linearly with the
+        size of the JSON, which unlike the time does not depend on the load of
+        the machine."""
+        sizes = [1000, 2000, 4000, 8000]
+        test_cases = [
+            ("match.object.wide", cases.wide_jspec, cases.wide_json),
+            ("match.object.ellipsis", lambda n: '{"key0": int, ...}', cases.wide_json),
+            ("match.object.capture", lambda n: '{("key[0-9]+": int)x?}', cases.wide_json),
+            ("match.object.mixed", lambda n: '{"key0": int, ("key[0-9]+": int)x?, ...}', cases.wide_json),
+            ("match.array.long", lambda n: '[%s]' % ", ".join(["int"] * n), lambda n: list(range(n))),
+            ("match.array.capture", lambda n: '[(int)x?]', lambda n: list(range(n))),
+            ("match.array.captures", lambda n: '[(int)x?, (string)x?]', lambda n: list(range(n // 2)) + ["x"] * (n // 2)),
+            ("fail.object.ellipsis", lambda n: '{"key0": int, ...}', lambda n: failing(cases.wide_json(n), "key0", "x")),
+            ("fail.object.capture", lambda n: '{("key[0-9]+": int)x?}', lambda n: failing(cases.wide_json(n), "key%d" % (n - 1), "x")),
+            ("fail.array.last", lambda n: '[(int)x?, null]', lambda n: list(range(n)) + ["x"]),
+        ]
+        for name, document, element in test_cases:
+            counts = [steps(document(n), element(n)) for n in sizes]
+            self.assertLessEqual(scaling.exponent(sizes, counts), 1.05, msg="Unexpected steps for %s: %s" % (name, counts))
+
+    def test_events(self):
+        """Test the work of the scanner grows linearly with the size of the
+        JSPEC document, counted in traced events rather than time."""
+        sizes = [250, 500, 1000, 2000]
+        test_cases = [
+            ("scan.object.wide", cases.wide_jspec, False),
+            ("scan.object.pretty", cases.wide_jspec, True),
+            ("scan.array.long", lambda n: '[%s]' % ", ".join(["int"] * n), False),
+        ]
+        for name, document, pretty in test_cases:
+            documents = [document(n) for n in sizes]
+            counts = [events(lambda: jspec.loads(d, pretty=pretty)) for d in documents]
+            self.assertLessEqual(scaling.exponent(sizes, counts), 1.05, msg="Unexpected events for %s: %s" % (name, counts))
+
+    @unittest.skipUnless(os.environ.get("JSPEC_SCALING_TESTS"), "set JSPEC_SCALING_TESTS=1 to time the scaling cases")
+    def test_bounds(self):
+        """Test the growth exponent of the time of every scaling case is
+        within its bound. The times depend on the load of the machine, so this
+        test only runs if the environment variable JSPEC_SCALING_TESTS is
+        set."""
+        for name, (setup, bound) in sorted(scaling.CASES.items()):
+            growth = scaling.measure(name, setup, bound)
+            if growth.exceeded():
+                # A busy machine can slow a single size, so the case is timed
+                # once more before it fails
+                growth = scaling.measure(name, setup, bound)
+            self.assertFalse(growth.exceeded(), msg="Unexpected growth for %s: %s" % (name, growth.as_dict()))
+
+    def test_command_line_scripts_usage_1_1(self):
+        """Test the command line tool for bench - Usage (1.1)."""
+        result = subprocess.run([
+            'python3', '-m', 'jspec.bench', '--scaling', 'fail.object', '--repeat=1',
+        ], stdout=subprocess.PIPE)
+        # The exit code is 1 if a case exceeds its bound, which depends on
+        # the load of the machine, see test_bounds
+        self.assertIn(result.returncode, (0, 1))
+        lines = result.stdout.decode().splitlines()
+        self.assertEqual(lines[0], 'case\texponent\tbound')
+        self.assertEqual([line.split('\t')[0] for line in lines[1:]], ['fail.object.capture', 'fail.object.ellipsis', 'fail.object.missing'])
+        result = subprocess.run(['python3', '-m', 'jspec.bench', '--scaling', '--memory'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 2)
@@ -0,0 +1,82 @@
+"""JSPEC Testing Module for scanning JSPEC documents for
+``JSPECTestScannerNamed``.
+"""
+
+from test.scanner import JSPECTestScanner
+from jspec.entity import (
+    JSPEC,
+    JSPECNamedTerm,
+    JSPECObject,
+    JSPECObjectPair,
+    JSPECString,
+    JSPECInt,
+    JSPECIntPlaceholder,
+    JSPECStringPlaceholder,
+    JSPECConditional,
+    JSPECLogicalOperatorOr,
+)
+
+class JSPECTestScannerNamed(JSPECTestScanner):
+    """Class for testing the behaviour when using the ``scan`` method for
+    named terms.
+
+    A valid JSPEC named term is a name preceded by an at sign, followed by a
+    JSPEC term.
+    """
+
+    def test_scanner_named_good(self):
+        """Test examples of good matches.
+        The ``scan`` method should return a matching ``JSPEC`` with a
+        ``JSPECNamedTerm`` as its element.
+        """
+        test_cases = [
+            {
+                "name": "Named int placeholder",
+                "doc": '@id int',
+                "want": JSPEC(
+                    JSPECNamedTerm(("id", JSPECIntPlaceholder(None))),
+                )
+            },
+            {
+                "name": "Named conditional without whitespace",
+                "doc": '@key(string | 1)',
+                "want": JSPEC(
+                    JSPECNamedTerm(("key", JSPECConditional([
+                        JSPECStringPlaceholder(),
+                        JSPECLogicalOperatorOr(),
+                        JSPECInt(1),
+                    ]))),
+                )
+            },
+            {
+                "name": "Named object value",
+                "doc": '{"a": @first_a /* comment */ "b"}',
+                "want": JSPEC(
+                    JSPECObject({
+                        JSPECObjectPair((JSPECString("a"), JSPECNamedTerm(("first_a", JSPECString("b"))))),
+                    }),
+                )
+            },
+        ]
+        self._good_match(test_cases)
+
+    def test_scanner_named_error(self):
+        """Test examples of error matches.
+        The ``scan`` method should raise an error, associated with attempting
+        to scan for a ``JSPEC`` with a ``JSPECNamedTerm`` as its element.
+        """
+        test_cases = [
+            {
+                "name": "No name",
+                "doc": '@ int',
+                "errmsg": "Expecting name for named term",
+                "errpos": 1,
+            },
+            {
+                "name": "No term",
+                "doc": '[@id]',
+                "errmsg": "Expecting JSPEC term in named term",
+                "errpos": 4,
+            },
+        ]
+        self._error_match(test_cases)
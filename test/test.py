@@ -3,6 +3,25 @@ import unittest
 from test.parse.parse import JSPECTestParse
 from test.check.check import JSPECTestCheck
 from test.exported.exported import JSPECTestExported
+from test.cache.cache import JSPECTestCache
+from test.validator.validator import JSPECTestValidator
+from test.incremental.incremental import JSPECTestIncremental
+from test.limits.limits import JSPECTestLimits
+from test.collect.collect import JSPECTestCollect
+from test.partial.partial import JSPECTestPartial
+from test.registry.registry import JSPECTestRegistry
+from test.fused.fused import JSPECTestFused
+from test.tiered.tiered import JSPECTestTiered
+from test.explain.explain import JSPECTestExplain
+from test.analyze.analyze import JSPECTestAnalyze
+from test.fuzz.fuzz import JSPECTestFuzz
+from test.generator.generator import JSPECTestGenerator
+from test.bench.bench import JSPECTestBench
+from test.bench.memory import JSPECTestBenchMemory
+from test.bench.load import JSPECTestBenchLoad
+from test.scaling.scaling import JSPECTestScaling
+from test.differential.differential import JSPECTestDifferential
+from test.instrument.instrument import JSPECTestInstrument
 
 from test.scanner.array import JSPECTestScannerArray
 from test.scanner.arraycapture import JSPECTestScannerArrayCapture
@@ -11,6 +30,7 @@ from test.scanner.comment import JSPECTestScannerComment
 from test.scanner.conditional import JSPECTestScannerConditional
 from test.scanner.macro import JSPECTestScannerMacro
 from test.scanner.int import JSPECTestScannerInt
+from test.scanner.named import JSPECTestScannerNamed
 from test.scanner.negation import JSPECTestScannerNegation
 from test.scanner.null import JSPECTestScannerNull
 from test.scanner.object import JSPECTestScannerObject
@@ -24,9 +44,13 @@ from test.matcher.array import JSPECTestMatcherArray
 from test.matcher.arraycapture import JSPECTestMatcherArrayCapture
 from test.matcher.boolean import JSPECTestMatcherBoolean
 from test.matcher.conditional import JSPECTestMatcherConditional
+from test.matcher.custom import JSPECTestMatcherCustom
 from test.matcher.error import JSPECTestMatcherError
+from test.matcher.format import JSPECTestMatcherFormat
 from test.matcher.int import JSPECTestMatcherInt
 from test.matcher.macro import JSPECTestMatcherMacro
+from test.matcher.memo import JSPECTestMatcherMemo
+from test.matcher.named import JSPECTestMatcherNamed
 from test.matcher.null import JSPECTestMatcherNull
 from test.matcher.negation import JSPECTestMatcherNegation
 from test.matcher.object import JSPECTestMatcherObject
@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestTiered(unittest.TestCase):
+    """Class for testing the function in the ``jspec.tiered`` module.
+    """
+
+    pass
@@ -0,0 +1,150 @@
+import unittest
+import jspec
+from jspec import tiered
+
+from test.matcher.array import JSPECTestMatcherArray
+from test.matcher.arraycapture import JSPECTestMatcherArrayCapture
+from test.matcher.boolean import JSPECTestMatcherBoolean
+from test.matcher.conditional import JSPECTestMatcherConditional
+from test.matcher.custom import JSPECTestMatcherCustom
+from test.matcher.error import JSPECTestMatcherError
+from test.matcher.format import JSPECTestMatcherFormat
+from test.matcher.int import JSPECTestMatcherInt
+from test.matcher.macro import JSPECTestMatcherMacro
+from test.matcher.named import JSPECTestMatcherNamed
+from test.matcher.null import JSPECTestMatcherNull
+from test.matcher.negation import JSPECTestMatcherNegation
+from test.matcher.object import JSPECTestMatcherObject
+from test.matcher.objectcapture import JSPECTestMatcherObjectCapture
+from test.matcher.placeholder import JSPECTestMatcherPlaceholder
+from test.matcher.real import JSPECTestMatcherReal
+from test.matcher.string import JSPECTestMatcherString
+from test.matcher.wildcard import JSPECTestMatcherWildcard
+
+MATCHER_TESTS = (
+    JSPECTestMatcherArray,
+    JSPECTestMatcherArrayCapture,
+    JSPECTestMatcherBoolean,
+    JSPECTestMatcherConditional,
+    JSPECTestMatcherCustom,
+    JSPECTestMatcherError,
+    JSPECTestMatcherFormat,
+    JSPECTestMatcherInt,
+    JSPECTestMatcherMacro,
+    JSPECTestMatcherNamed,
+    JSPECTestMatcherNull,
+    JSPECTestMatcherNegation,
+    JSPECTestMatcherObject,
+    JSPECTestMatcherObjectCapture,
+    JSPECTestMatcherPlaceholder,
+    JSPECTestMatcherReal,
+    JSPECTestMatcherString,
+    JSPECTestMatcherWildcard,
+)
+
+def _compare(self, test_cases):
+    """Check that each test case has the same result in both tiers."""
+    for test_case in test_cases:
+        name, obj = test_case["name"], test_case["obj"]
+        spec = test_case.get("spec") or jspec.scanner.scan(test_case["doc"])
+        try:
+            want = jspec.matcher.match(spec, obj)
+        except ValueError as err:
+            want = err
+        tiered.force(spec, tiered.COMPILED)
+        try:
+            got = tiered.match(spec, obj)
+        except ValueError as err:
+            got = err
+        self.assertEqual(repr(want), repr(got), msg="(%s) Unexpected compiled result" % name)
+
+class JSPECTestTiered(unittest.TestCase):
+    """Class for testing the ``jspec.tiered`` module.
+    """
+
+    def setUp(self):
+        self.threshold = tiered.THRESHOLD
+
+    def tearDown(self):
+        tiered.set_threshold(self.threshold)
+
+    def test_tiered_compiled(self):
+        """Test that every matcher test case has the same result when the
+        JSPEC is compiled."""
+        for cls in MATCHER_TESTS:
+            compared = type(cls.__name__, (cls,), {
+                "_good_match": _compare,
+                "_bad_match": _compare,
+                "_error_match": _compare,
+            })
+            for name in dir(cls):
+                if name.startswith("test_"):
+                    with self.subTest(test="%s.%s" % (cls.__name__, name)):
+                        test = compared(name)
+                        test.setUp()
+                        try:
+                            getattr(test, name)()
+                        finally:
+                            test.tearDown()
+
+    def test_tiered_union(self):
+        """Test that a discriminated union has the same result in both tiers,
+        and is compiled without the matcher."""
+        documents = [
+            ('({"type": "a", "x": int} | {"type": "b", "y": string, ...} | {"type": "b", "z": null})', False),
+            ('[({"kind": "one", ...} | @two {"kind": "two", "n": (int > 2)})x?]', True),
+        ]
+        elements = [
+            {"type": "a", "x": 1}, {"type": "b", "y": "s", "q": 1}, {"type": "b", "z": None},
+            {"type": "b", "z": 1}, {"type": "c", "x": 1}, {"type": 1}, {"x": 1}, [], "a",
+            [{"kind": "one"}, {"kind": "two", "n": 3}], [{"kind": "two", "n": 1}], [{"kind": ["two"]}],
+        ]
+        for document, interprets in documents:
+            interpreted, compiled = jspec.loads(document), jspec.loads(document)
+            tiered.force(compiled, tiered.COMPILED)
+            self.assertEqual(compiled._compiled[1], interprets)
+            for element in elements:
+                self.assertEqual(jspec.check(compiled, element), jspec.matcher.match(interpreted, element), msg="%s %s" % (document, element))
+
+    def test_tiered_threshold(self):
+        """Test that a JSPEC is compiled after ``THRESHOLD`` checks, and that
+        its transitions are observed."""
+        transitions = list()
+        listener = lambda spec, old, new: transitions.append((spec, old, new))
+        tiered.add_listener(listener)
+        try:
+            tiered.set_threshold(3)
+            spec = jspec.loads('{"id": int, "tags": [(string)x?]}')
+            for _ in range(3):
+                self.assertEqual(jspec.check(spec, {"id": 1, "tags": ["a"]}), (True, ""))
+            self.assertEqual(tiered.tier(spec), tiered.INTERPRETED)
+            self.assertEqual(transitions, [])
+            self.assertEqual(jspec.check(spec, {"id": 1, "tags": [1]}), jspec.matcher.match(spec, {"id": 1, "tags": [1]}))
+            self.assertEqual(tiered.tier(spec), tiered.COMPILED)
+            self.assertEqual(transitions, [(spec, tiered.INTERPRETED, tiered.COMPILED)])
+        finally:
+            tiered.remove_listener(listener)
+
+    def test_tiered_force(self):
+        """Test that a JSPEC can be forced to stay in a tier."""
+        tiered.set_threshold(0)
+        spec = jspec.loads("[int, string]")
+        tiered.force(spec, tiered.INTERPRETED)
+        jspec.check(spec, [1, "a"])
+        self.assertEqual(tiered.tier(spec), tiered.INTERPRETED)
+        tiered.force(spec, None)
+        self.assertEqual(tiered.tier(spec), tiered.COMPILED)
+        tiered.force(spec, tiered.INTERPRETED)
+        self.assertEqual(tiered.tier(spec), tiered.INTERPRETED)
+        with self.assertRaises(ValueError):
+            tiered.force(spec, "jit")
+        with self.assertRaises(ValueError):
+            tiered.set_threshold(-1)
+
+    def test_tiered_limits(self):
+        """Test that checks with limits are interpreted, so steps are
+        counted."""
+        spec = jspec.loads("[(int)x?]")
+        tiered.force(spec, tiered.COMPILED)
+        with self.assertRaises(jspec.limits.JSPECLimitError):
+            jspec.check(spec, [1, 2, 3, 4], limits=jspec.limits.Limits(max_steps=2))
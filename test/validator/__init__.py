@@ -0,0 +1,7 @@
+import unittest
+
+class JSPECTestValidator(unittest.TestCase):
+    """Class for testing the function in the ``jspec.validator`` module.
+    """
+
+    pass
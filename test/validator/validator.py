@@ -0,0 +1,121 @@
+import unittest
+import jspec
+
+from jspec.cache import PayloadCache, SubtreeCache
+
+class JSPECTestValidator(unittest.TestCase):
+    """Class for testing the ``Validator`` class in the ``jspec.validator``
+    module.
+    """
+
+    def test_check(self):
+        """Test the ``Validator.check`` method."""
+        validator = jspec.compile(jspec.loads('{"id": int}'))
+        self.assertEqual(validator.check({"id": 1}), (True, ""))
+        self.assertEqual(
+            validator.check({"id": "1"}),
+            (False, "At location $.id - expected an int"),
+        )
+        exc = None
+        try:
+            jspec.compile('{"id": int}')
+        except TypeError as err:
+            exc = err
+        self.assertEqual(str(exc), "Expecting a JSPEC not <class 'str'>")
+
+    def test_check_json_payload_cache(self):
+        """Test that identical payloads are returned from the payload cache."""
+        cache = PayloadCache()
+        validator = jspec.compile(jspec.loads('{"id": int}'), payload_cache=cache)
+        self.assertEqual(validator.check_json('{"id": 1}'), (True, ""))
+        self.assertEqual(validator.check_json(b'{"id": 1}'), (True, ""))
+        self.assertEqual(
+            validator.check_json('{"id": "1"}'),
+            (False, "At location $.id - expected an int"),
+        )
+        self.assertEqual(
+            validator.check_json('{"id": "1"}'),
+            (False, "At location $.id - expected an int"),
+        )
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_check_json_spec_change(self):
+        """Test that cached results are not used once the JSPEC changes."""
+        cache = PayloadCache()
+        validator = jspec.compile(jspec.loads('{"id": int}'), payload_cache=cache)
+        self.assertEqual(validator.check_json('{"id": 1}'), (True, ""))
+        validator.spec = jspec.loads('{"id": string}')
+        self.assertEqual(
+            validator.check_json('{"id": 1}'),
+            (False, "At location $.id - expected a string"),
+        )
+        validator.invalidate()
+        self.assertEqual(len(cache), 1)
+
+    def test_check_json_macros(self):
+        """Test that validators with different macros sharing a payload cache
+        do not use or invalidate each other's results."""
+        cache = PayloadCache()
+        spec = jspec.loads('{"x": {"id": <ID>}}')
+        first = jspec.compile(spec, payload_cache=cache, macros={"ID": 1})
+        second = jspec.compile(spec, payload_cache=cache, macros={"ID": 2})
+        test_cases = [
+            (first, (True, "")),
+            (second, (False, "At location $.x.id - JSPEC macro '<ID>' failed to match '1'")),
+            (first, (True, "")),
+            (second, (False, "At location $.x.id - JSPEC macro '<ID>' failed to match '1'")),
+        ]
+        for validator, want in test_cases:
+            self.assertEqual(validator.check_json('{"x": {"id": 1}}'), want)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        second.invalidate()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(first.check_json('{"x": {"id": 1}}'), (True, ""))
+        self.assertEqual(cache.hits, 3)
+        per_check = jspec.compile(spec, payload_cache=cache, macros={"ID": 1}, macros_per_check=True)
+        self.assertEqual(per_check.check_json('{"x": {"id": 1}}'), (True, ""))
+        self.assertEqual(cache.hits, 4)
+
+    def test_shared_subtree_cache(self):
+        """Test that setting the JSPEC of a validator, or invalidating it,
+        leaves the results of other validators sharing its subtree cache."""
+        cache = SubtreeCache(min_size=0)
+        first = jspec.compile(jspec.loads('{"a": {"id": int}}'), cache=cache)
+        second = jspec.compile(jspec.loads('{"b": {"id": string}}'), cache=cache)
+        self.assertEqual(first.check({"a": {"id": 1}}), (True, ""))
+        self.assertEqual(second.check({"b": {"id": "x"}}), (True, ""))
+        filled = len(cache)
+        first.spec = jspec.loads('{"a": {"id": string}}')
+        self.assertEqual(len(cache), filled)
+        self.assertEqual(first.check({"a": {"id": 1}}), (False, "At location $.a.id - expected a string"))
+        self.assertEqual(second.check({"b": {"id": "x"}}), (True, ""))
+        hits = cache.hits
+        first.invalidate()
+        self.assertEqual(second.check({"b": {"id": "x"}}), (True, ""))
+        self.assertEqual(cache.hits, hits + 1)
+        self.assertEqual(first.check({"a": {"id": 1}}), (False, "At location $.a.id - expected a string"))
+        self.assertEqual(cache.hits, hits + 1)
+
+    def test_payload_cache_ttl(self):
+        """Test that entries in the payload cache expire."""
+        now = [0.0]
+        cache = PayloadCache(ttl=10, clock=lambda: now[0])
+        cache.put(b"spec", '[]', (True, ""))
+        now[0] = 9.0
+        self.assertEqual(cache.get(b"spec", '[]'), (True, ""))
+        now[0] = 10.0
+        self.assertEqual(cache.get(b"spec", '[]'), None)
+        self.assertEqual(len(cache), 0)
+
+    def test_payload_cache_max_bytes(self):
+        """Test that the least recently used entries are evicted once the
+        memory bound is exceeded."""
+        cache = PayloadCache(max_bytes=2 * PayloadCache.ENTRY_OVERHEAD)
+        cache.put(b"spec", '1', (True, ""))
+        cache.put(b"spec", '2', (True, ""))
+        cache.get(b"spec", '1')
+        cache.put(b"spec", '3', (True, ""))
+        self.assertEqual(cache.get(b"spec", '1'), (True, ""))
+        self.assertEqual(cache.get(b"spec", '2'), None)
+        self.assertEqual(cache.stats()["evictions"], 1)